@@ -10,11 +10,28 @@ def suggest_links(ctx, node_name):
     suggestions = engine.suggest_links(node_name=node_name)
     click.echo(suggestions)
 
-# Die Gruppe 'neo' wird beibehalten, um eine konsistente Befehlsstruktur zu gewährleisten,
-# auch wenn sie derzeit nur einen Befehl enthält.
+@click.command(name="refresh-links")
+@click.option('--full', is_flag=True, help='Alle Vorschläge neu berechnen statt nur die geänderten.')
+@click.option('--write-graph', is_flag=True, help='Vorschläge zusätzlich als :SUGGESTED_LINK speichern.')
+@click.pass_context
+def refresh_links(ctx, full, write_graph):
+    """Berechnet die gecachten Link-Vorschläge aus dem Graphen neu."""
+    engine = CortexAIEngine(workspace_path=str(ctx.obj.get('cortex_path', '.')))
+    try:
+        stats = engine.local_ai.refresh_link_predictions(full=full)
+    except Exception as e:
+        raise click.ClickException(f"Could not refresh link predictions: {e}")
+    click.echo(f"Scored {stats['rescored']} of {stats['notes']} notes "
+               f"({stats['links']} links) in {stats['seconds']}s")
+    if write_graph:
+        with engine.local_ai.connector.driver.session() as session:
+            written = engine.local_ai.predictor.write_to_graph(session)
+        click.echo(f"Wrote {written} SUGGESTED_LINK relationships")
+
 @click.group()
 def neo():
     """Befehle zur Interaktion mit dem Neo4j-Graphen mittels interner AI."""
     pass
 
 neo.add_command(suggest_links)
+neo.add_command(refresh_links)
@@ -4,20 +4,26 @@ Cortex AI Engine - Extracted from gap_detection_engine.py
 Professional knowledge gap detection for CLI package
 """
 
-import os
-import json
 import yaml
 import logging
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Any
-from collections import Counter
 import re
 import hashlib
-from neo4j import GraphDatabase  # Neo4j integration
 
 from .local_ai import LocalAI
+from .gap_rules import BUILTIN_RULES, GapScanner, rules_from_config
+from .gap_store import GapStore
+from ..utils.neo4j_registry import get_driver
+from ..utils.parse_cache import get_parse_cache
+from ..utils.workspace_crawler import WorkspaceCrawler
+
+# Parse cache keys of the per-file scans; bump the version when the
+# matching or preview code changes (the gap rules have their own fingerprint)
+MARKDOWN_GAPS_CACHE_KEY = "ai_engine.markdown_gaps:v1"
+DOC_PLACEHOLDER_CACHE_KEY = "ai_engine.doc_placeholder:v1"
 
 @dataclass
 class KnowledgeGap:
@@ -34,6 +40,7 @@ class KnowledgeGap:
     last_research_attempt: Optional[str] = None
     filled_date: Optional[str] = None
     filled_by: Optional[str] = None  # 'web_research', 'manual', 'ai_generation'
+    source_file: Optional[str] = None  # File the gap was detected in
     
 @dataclass
 class ResearchResult:
@@ -61,6 +68,9 @@ class GapFillStrategy:
 class CortexAIEngine:
     """Main engine for detecting and filling knowledge gaps - CLI version"""
     
+    CODE_EXTENSIONS = ('.py', '.js', '.ts', '.java', '.cpp', '.c')
+    DOC_DIRS = ('docs', 'documentation', 'wiki')
+    
     def __init__(self, workspace_path: str = None):
         if workspace_path:
             self.workspace_path = Path(workspace_path)
@@ -81,22 +91,52 @@ class CortexAIEngine:
         self.config = self.load_config()
         self.gap_strategies = self.load_gap_strategies()
         
-        # Initialize the local AI module
-        self.local_ai = LocalAI()
+        # Shared Markdown parse cache under .cortex/cache/
+        self.parse_cache = get_parse_cache(self.workspace_path)
+        
+        # Single-pass file walk shared by all analyzers
+        self.crawler = WorkspaceCrawler(
+            self.workspace_path,
+            ignore_globs=self.config.get("crawler", {}).get("ignore_globs", [])
+        )
+        
+        # Gap rules: built-ins plus analysis_patterns from ai_config.yaml
+        rules = BUILTIN_RULES + rules_from_config(self.config.get("analysis_patterns", {}))
+        self.markdown_scanner = GapScanner(r for r in rules if 'markdown' in r.applies_to)
+        self.code_scanner = GapScanner(r for r in rules if 'code' in r.applies_to)
+        
+        # Initialize the local AI module; link predictions are cached under .cortex/cache/
+        link_config = self.config.get("link_prediction", {})
+        self.local_ai = LocalAI(
+            cache_dir=self.workspace_path / ".cortex" / "cache",
+            top_k=link_config.get("top_k", 10),
+            metric=link_config.get("metric", "adamic_adar"),
+            max_age=link_config.get("max_age_seconds", 3600),
+        )
 
-        # Neo4j driver initialization
-        neo4j_uri = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
-        neo4j_user = os.environ.get("NEO4J_USER", "neo4j")
-        neo4j_password = os.environ.get("NEO4J_PASSWORD", "neo4jtest")
-        self.neo4j_driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+        # Neo4j driver comes from the shared registry on first use (neo4j_driver)
+        self._neo4j_driver = None
 
         # Initialize data stores
-        self.detected_gaps: List[KnowledgeGap] = []
+        self.gap_store = GapStore(self.gap_data_path, KnowledgeGap)
         self.research_results: Dict[str, List[ResearchResult]] = {}
+        # Files whose read failed during the current scan; their gaps are kept
+        self._unreadable: set = set()
         
         # Load existing data
         self.load_existing_gaps()
     
+    @property
+    def neo4j_driver(self):
+        """Shared Neo4j driver, created lazily so graph-free runs never connect"""
+        if self._neo4j_driver is None:
+            self._neo4j_driver = get_driver()
+        return self._neo4j_driver
+
+    @neo4j_driver.setter
+    def neo4j_driver(self, driver):
+        self._neo4j_driver = driver
+
     def setup_logging(self):
         """Setup logging configuration"""
         log_dir = self.workspace_path / ".cortex" / "logs"
@@ -136,6 +176,17 @@ class CortexAIEngine:
                 "max_results_per_query": 5,
                 "cache_duration_hours": 24,
                 "quality_threshold": 0.7
+            },
+            "crawler": {
+                # Skipped in addition to .git, .venv, node_modules and .cortex
+                "ignore_globs": []
+            },
+            "link_prediction": {
+                # Ranking metric: common_neighbors, adamic_adar or jaccard
+                "metric": "adamic_adar",
+                "top_k": 10,
+                # Older caches are refreshed incrementally on the next lookup
+                "max_age_seconds": 3600
             }
         }
         
@@ -179,159 +230,217 @@ class CortexAIEngine:
             )
         ]
     
+    @property
+    def detected_gaps(self) -> GapStore:
+        """All known gaps, keyed by gap_id (iterable like a list)"""
+        return self.gap_store
+    
+    @detected_gaps.setter
+    def detected_gaps(self, gaps: List[KnowledgeGap]):
+        self.gap_store.clear()
+        self.gap_store.extend(gaps)
+    
     def load_existing_gaps(self):
         """Load previously detected gaps"""
-        gaps_file = self.gap_data_path / "detected_gaps.json"
-        if gaps_file.exists():
-            try:
-                with open(gaps_file, 'r', encoding='utf-8') as f:
-                    gaps_data = json.load(f)
-                    self.detected_gaps = [
-                        KnowledgeGap(**gap) for gap in gaps_data
-                    ]
-                self.logger.info(f"Loaded {len(self.detected_gaps)} existing gaps")
-            except Exception as e:
-                self.logger.warning(f"Could not load existing gaps: {e}")
+        try:
+            self.gap_store.load()
+            if len(self.gap_store):
+                self.logger.info(f"Loaded {len(self.gap_store)} existing gaps")
+        except Exception as e:
+            self.logger.warning(f"Could not load existing gaps: {e}")
     
     def analyze_workspace(self) -> List[KnowledgeGap]:
         """Main analysis method - detects knowledge gaps in workspace"""
         self.logger.info("Starting workspace knowledge gap analysis")
         
-        # Analyze different types of files
-        new_gaps = []
-        
-        # Analyze markdown files
-        md_gaps = self.analyze_markdown_files()
-        new_gaps.extend(md_gaps)
-        
-        # Analyze code files
-        code_gaps = self.analyze_code_files()
-        new_gaps.extend(code_gaps)
-        
-        # Analyze documentation
-        doc_gaps = self.analyze_documentation()
-        new_gaps.extend(doc_gaps)
-        
-        # Update detected gaps
-        self.detected_gaps.extend(new_gaps)
+        # One walk over the workspace, each file dispatched to its analyzers
+        md_gaps, code_gaps, doc_gaps = [], [], []
+        scanned = set()
+        self._unreadable = set()
+        for file_path in self.crawler.iter_files():
+            scanned.add(str(file_path))
+            if self._is_markdown_file(file_path):
+                md_gaps.extend(self.analyze_markdown_file(file_path))
+            if self._is_code_file(file_path):
+                code_gaps.extend(self.analyze_code_file(file_path))
+            if self._is_documentation_file(file_path):
+                doc_gaps.extend(self.analyze_documentation_file(file_path))
+        self.parse_cache.save()
+        
+        new_gaps = md_gaps + code_gaps + doc_gaps
+        
+        # Upsert by gap_id so re-running analysis does not duplicate gaps
+        known = sum(1 for gap in new_gaps if gap.gap_id in self.gap_store)
+        for gap in new_gaps:
+            self.gap_store.upsert(gap)
+        removed = self._remove_resolved_gaps(
+            {gap.gap_id for gap in new_gaps}, scanned - self._unreadable
+        )
         
         # Save results
         self.save_detected_gaps()
         
-        self.logger.info(f"Analysis complete. Found {len(new_gaps)} new gaps")
+        self.logger.info(
+            f"Analysis complete. Found {len(new_gaps) - known} new gaps "
+            f"({known} already known, {removed} resolved)"
+        )
         return new_gaps
     
+    def _remove_resolved_gaps(self, found_ids: set, scanned_files: set) -> int:
+        """Drop unfilled gaps that a full scan no longer detects
+
+        Only gaps of files that were read in this scan (or no longer exist)
+        are dropped; a file that could not be read keeps its gaps.
+        """
+        removed = 0
+        for source_file in self.gap_store.files():
+            if source_file not in scanned_files and Path(source_file).exists():
+                continue
+            for gap in self.gap_store.by_file(source_file):
+                if gap.gap_id not in found_ids and gap.filled_date is None:
+                    self.gap_store.delete(gap.gap_id)
+                    removed += 1
+        return removed
+    
+    def _is_markdown_file(self, file_path: Path) -> bool:
+        return file_path.suffix == '.md'
+    
+    def _is_code_file(self, file_path: Path) -> bool:
+        return file_path.suffix in self.CODE_EXTENSIONS
+    
+    def _is_documentation_file(self, file_path: Path) -> bool:
+        if file_path.suffix != '.md':
+            return False
+        try:
+            top_dir = file_path.relative_to(self.workspace_path).parts[0]
+        except (ValueError, IndexError):
+            return False
+        return top_dir in self.DOC_DIRS and file_path.parent != self.workspace_path
+    
     def analyze_markdown_files(self) -> List[KnowledgeGap]:
         """Analyze markdown files for knowledge gaps"""
         gaps = []
-        
-        for md_file in self.workspace_path.rglob("*.md"):
-            if ".cortex" in str(md_file):
-                continue  # Skip our own files
-                
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Look for TODO, FIXME, research needed, etc.
-                gap_patterns = [
-                    (r'TODO.*research', 'incomplete_research'),
-                    (r'FIXME.*performance', 'missing_benchmarks'),
-                    (r'need.*benchmark', 'missing_benchmarks'),
-                    (r'missing.*data', 'incomplete_research')
-                ]
-                
-                for pattern, gap_type in gap_patterns:
-                    matches = re.finditer(pattern, content, re.IGNORECASE)
-                    for match in matches:
-                        gap = self.create_gap_from_match(
-                            md_file, match, gap_type, content
-                        )
-                        gaps.append(gap)
-                        
-            except Exception as e:
-                self.logger.warning(f"Error analyzing {md_file}: {e}")
-        
+        for md_file in self.crawler.iter_files():
+            if self._is_markdown_file(md_file):
+                gaps.extend(self.analyze_markdown_file(md_file))
+        self.parse_cache.save()
         return gaps
     
+    def _find_markdown_matches(self, content: str) -> List[list]:
+        return [
+            [rule, gap_type, start, end, text, self._match_context(content, start, end)]
+            for rule, gap_type, start, end, text in self.markdown_scanner.scan(content)
+        ]
+    
+    def analyze_markdown_file(self, md_file: Path) -> List[KnowledgeGap]:
+        """Look for TODO, FIXME, research needed, etc. in a markdown file"""
+        try:
+            # Matches are memoized per file content; the key changes with the rules
+            scans = self.markdown_scanner.scans
+            matches = self.parse_cache.derive(
+                md_file,
+                f"{MARKDOWN_GAPS_CACHE_KEY}.{self.markdown_scanner.fingerprint}",
+                self._find_markdown_matches
+            )
+            if matches is None:
+                self.logger.warning(f"Error analyzing {md_file}: unreadable")
+                self._unreadable.add(str(md_file))
+                return []
+            if self.markdown_scanner.scans == scans:
+                self.markdown_scanner.record_cached(m[:5] for m in matches)
+            
+            return [
+                self.create_gap(md_file, gap_type, start, text, context)
+                for _, gap_type, start, _, text, context in matches
+            ]
+        except Exception as e:
+            self.logger.warning(f"Error analyzing {md_file}: {e}")
+            self._unreadable.add(str(md_file))
+            return []
+    
     def analyze_code_files(self) -> List[KnowledgeGap]:
         """Analyze code files for knowledge gaps"""
         gaps = []
-        
-        code_extensions = ['.py', '.js', '.ts', '.java', '.cpp', '.c']
-        
-        for ext in code_extensions:
-            for code_file in self.workspace_path.rglob(f"*{ext}"):
-                if ".cortex" in str(code_file) or ".venv" in str(code_file):
-                    continue
-                    
-                try:
-                    with open(code_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Look for performance TODOs, missing error handling, etc.
-                    gap_patterns = [
-                        (r'# TODO.*performance', 'missing_benchmarks'),
-                        (r'// TODO.*optimize', 'missing_benchmarks'),
-                        (r'raise NotImplementedError', 'incomplete_research')
-                    ]
+        for code_file in self.crawler.iter_files():
+            if self._is_code_file(code_file):
+                gaps.extend(self.analyze_code_file(code_file))
+        return gaps
+    
+    def analyze_code_file(self, code_file: Path) -> List[KnowledgeGap]:
+        """Look for performance TODOs, missing error handling, etc. in a code file"""
+        gaps = []
+        try:
+            with open(code_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            for _, gap_type, start, end, text in self.code_scanner.scan(content):
+                context = self._match_context(content, start, end)
+                gaps.append(self.create_gap(code_file, gap_type, start, text, context))
                     
-                    for pattern, gap_type in gap_patterns:
-                        matches = re.finditer(pattern, content, re.IGNORECASE)
-                        for match in matches:
-                            gap = self.create_gap_from_match(
-                                code_file, match, gap_type, content
-                            )
-                            gaps.append(gap)
-                            
-                except Exception as e:
-                    self.logger.warning(f"Error analyzing {code_file}: {e}")
+        except Exception as e:
+            self.logger.warning(f"Error analyzing {code_file}: {e}")
+            self._unreadable.add(str(code_file))
         
         return gaps
     
     def analyze_documentation(self) -> List[KnowledgeGap]:
         """Analyze documentation for knowledge gaps"""
         gaps = []
-        
-        # Look for documentation directories
-        doc_dirs = ["docs", "documentation", "wiki"]
-        
-        for doc_dir in doc_dirs:
-            doc_path = self.workspace_path / doc_dir
-            if doc_path.exists():
-                for doc_file in doc_path.rglob("*.md"):
-                    try:
-                        with open(doc_file, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        
-                        # Look for empty sections, placeholders
-                        if "TBD" in content or "To be determined" in content:
-                            gap = self.create_documentation_gap(doc_file, content)
-                            gaps.append(gap)
-                            
-                    except Exception as e:
-                        self.logger.warning(f"Error analyzing {doc_file}: {e}")
-        
+        for doc_file in self.crawler.iter_files():
+            if self._is_documentation_file(doc_file):
+                gaps.extend(self.analyze_documentation_file(doc_file))
+        self.parse_cache.save()
         return gaps
     
+    def analyze_documentation_file(self, doc_file: Path) -> List[KnowledgeGap]:
+        """Look for empty sections and placeholders in a documentation file"""
+        try:
+            preview = self.parse_cache.derive(
+                doc_file, DOC_PLACEHOLDER_CACHE_KEY, self._placeholder_preview
+            )
+            if preview is None:
+                self._unreadable.add(str(doc_file))
+            elif preview:
+                return [self.create_documentation_gap(doc_file, preview)]
+                
+        except Exception as e:
+            self.logger.warning(f"Error analyzing {doc_file}: {e}")
+            self._unreadable.add(str(doc_file))
+        
+        return []
+    
+    @staticmethod
+    def _placeholder_preview(content: str) -> str:
+        """Start of a document containing placeholders, empty otherwise"""
+        if "TBD" in content or "To be determined" in content:
+            return content[:200]
+        return ""
+    
+    @staticmethod
+    def _match_context(content: str, start: int, end: int) -> str:
+        """Text surrounding a match (100 characters on each side)"""
+        return content[max(0, start - 100):min(len(content), end + 100)]
+    
     def create_gap_from_match(self, file_path: Path, match, gap_type: str, content: str) -> KnowledgeGap:
         """Create a KnowledgeGap from a regex match"""
-        context_start = max(0, match.start() - 100)
-        context_end = min(len(content), match.end() + 100)
-        context = content[context_start:context_end]
-        
-        gap_id = hashlib.md5(f"{file_path}{match.start()}{gap_type}".encode()).hexdigest()[:8]
+        context = self._match_context(content, match.start(), match.end())
+        return self.create_gap(file_path, gap_type, match.start(), match.group(0), context)
+    
+    def create_gap(self, file_path: Path, gap_type: str, start: int, text: str, context: str) -> KnowledgeGap:
+        """Create a KnowledgeGap from a match offset, its text and context"""
+        gap_id = hashlib.md5(f"{file_path}{start}{gap_type}".encode()).hexdigest()[:8]
         
         return KnowledgeGap(
             gap_id=gap_id,
             gap_type=gap_type,
             title=f"{gap_type.replace('_', ' ').title()} in {file_path.name}",
-            description=match.group(0),
+            description=text,
             context=context,
             priority=self.calculate_priority(gap_type, context),
             confidence=0.8,  # Default confidence
             research_queries=self.generate_research_queries(gap_type, context),
-            detected_date=datetime.now().isoformat()
+            detected_date=datetime.now().isoformat(),
+            source_file=str(file_path)
         )
     
     def create_documentation_gap(self, file_path: Path, content: str) -> KnowledgeGap:
@@ -347,7 +456,8 @@ class CortexAIEngine:
             priority="medium",
             confidence=0.9,
             research_queries=[f"how to document {file_path.stem}"],
-            detected_date=datetime.now().isoformat()
+            detected_date=datetime.now().isoformat(),
+            source_file=str(file_path)
         )
     
     def calculate_priority(self, gap_type: str, context: str) -> str:
@@ -382,29 +492,28 @@ class CortexAIEngine:
         return queries[:2]  # Limit queries
     
     def save_detected_gaps(self):
-        """Save detected gaps to file"""
-        gaps_file = self.gap_data_path / "detected_gaps.json"
-        
-        gaps_data = [asdict(gap) for gap in self.detected_gaps]
-        
-        with open(gaps_file, 'w', encoding='utf-8') as f:
-            json.dump(gaps_data, f, indent=2)
-        
-        self.logger.info(f"Saved {len(self.detected_gaps)} gaps to {gaps_file}")
+        """Persist gap changes to the gap store log"""
+        self.gap_store.flush()
+        self.logger.info(f"Saved {len(self.gap_store)} gaps to {self.gap_store.log_file}")
     
     def get_gap_summary(self) -> Dict[str, Any]:
         """Get summary of detected gaps"""
-        if not self.detected_gaps:
+        if not len(self.gap_store):
             return {"total": 0, "by_type": {}, "by_priority": {}}
         
-        gap_types = Counter(gap.gap_type for gap in self.detected_gaps)
-        priorities = Counter(gap.priority for gap in self.detected_gaps)
-        
         return {
-            "total": len(self.detected_gaps),
-            "by_type": dict(gap_types),
-            "by_priority": dict(priorities),
-            "last_analysis": datetime.now().isoformat()
+            "total": len(self.gap_store),
+            "by_type": self.gap_store.counts('gap_type'),
+            "by_priority": self.gap_store.counts('priority'),
+            "last_analysis": datetime.now().isoformat(),
+            "scanner": self.get_scanner_stats()
+        }
+    
+    def get_scanner_stats(self) -> Dict[str, Any]:
+        """Per-rule hit counts and timings of the gap scanners"""
+        return {
+            "markdown": self.markdown_scanner.get_stats(),
+            "code": self.code_scanner.get_stats()
         }
 
     async def research_gap(self, gap_id: str) -> Optional[KnowledgeGap]:
@@ -412,13 +521,14 @@ class CortexAIEngine:
         Performs AI-powered research to fill a specific knowledge gap
         by using the local AI to find related nodes in the graph.
         """
-        gap_to_fill = next((g for g in self.detected_gaps if g.gap_id == gap_id), None)
+        gap_to_fill = self.gap_store.get(gap_id)
         if not gap_to_fill:
             self.logger.error(f"Gap with ID '{gap_id}' not found.")
             return None
 
         self.logger.info(f"Researching gap with local AI: {gap_to_fill.title}")
         gap_to_fill.last_research_attempt = datetime.now().isoformat()
+        self.gap_store.update(gap_to_fill)
 
         # Extract a potential node name from the gap's context or title
         # This is a simple heuristic and could be improved.
@@ -432,7 +542,7 @@ class CortexAIEngine:
 
         try:
             # Use the local AI to get suggestions
-            suggestions = self.local_ai.suggest_links_for_node(node_name)
+            suggestions = await self.local_ai.suggest_links_for_node_async(node_name)
 
             # Create a single research result summarizing the findings
             content = "No suggestions found."
@@ -467,23 +577,8 @@ class CortexAIEngine:
         return gap_to_fill
 
     def get_potential_links_from_neo4j(self, node_name: str) -> List[dict]:
-        """Query Neo4j for potential links based on common neighbors."""
-        query = '''
-        MATCH (n:Node {name: $node_name})-[:LINKS_TO]-(neighbor)-[:LINKS_TO]-(potential)
-        WHERE NOT (n)-[:LINKS_TO]-(potential) AND n <> potential
-        RETURN potential.name AS potential_link, count(DISTINCT neighbor) AS common_neighbors_score
-        ORDER BY common_neighbors_score DESC, potential_link
-        LIMIT 10
-        '''
-        with self.neo4j_driver.session() as session:
-            results = session.run(query, node_name=node_name)
-            return [
-                {
-                    "potential_link": record["potential_link"],
-                    "common_neighbors_score": record["common_neighbors_score"]
-                }
-                for record in results
-            ]
+        """Potential links for a note from the precomputed link predictions."""
+        return self.local_ai.suggest_links_for_node(node_name)
 
     def suggest_links(self, node_name: str) -> str:
         """Suggest new links for a given node using Neo4j and format the output."""
@@ -6,6 +6,10 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Any
 
+from .minhash_lsh import MinHashStore, note_tokens
+from .tag_similarity import jaccard
+from ..utils.parse_cache import get_parse_cache
+
 # Logger einrichten
 logging.basicConfig(
     level=logging.INFO,
@@ -93,6 +97,90 @@ class CrossVaultLinker:
 
         return result
 
+    def suggest_links(
+        self,
+        min_similarity: float = 0.3,
+        mode: str = "lsh",
+        num_perm: int = 128,
+        bands: int = 32,
+    ) -> List[Dict[str, Any]]:
+        """
+        Schlägt Links zwischen Notizen verschiedener Vaults vor
+
+        Vaults sind die Verzeichnisse der ersten Ebene unter cortex_root.
+        Im Modus "lsh" werden nur Kandidatenpaare aus gemeinsamen
+        LSH-Buckets bewertet; "exact" vergleicht alle Paare.
+
+        Args:
+            min_similarity: Minimale Jaccard-Ähnlichkeit der Tags
+            mode: "lsh" oder "exact"
+            num_perm: Anzahl der MinHash-Permutationen
+            bands: Anzahl der LSH-Bänder (mehr Bänder = höherer Recall)
+
+        Returns:
+            list: Vorschläge (source, target, similarity, shared_tags),
+                  absteigend nach Ähnlichkeit
+        """
+        if mode not in ("lsh", "exact"):
+            raise ValueError(f"Unknown mode: {mode}")
+
+        root = Path(self.cortex_root)
+        parse_cache = get_parse_cache(root)
+        notes: Dict[str, Dict[str, Any]] = {}
+        for path in sorted(root.rglob("*.md")):
+            rel = path.relative_to(root)
+            if len(rel.parts) < 2 or rel.parts[0].startswith("."):
+                continue
+            parsed = parse_cache.get(path)
+            if parsed is None or not parsed.tags:
+                continue
+            notes[str(rel)] = {
+                'vault': rel.parts[0],
+                'tags': set(parsed.tags),
+                'tokens': note_tokens(parsed.tags, parsed.headings),
+            }
+        parse_cache.save()
+
+        keys = list(notes)
+        if mode == "lsh":
+            store = MinHashStore(
+                root / ".cortex" / "cache" / f"minhash_{num_perm}.json",
+                num_perm,
+            )
+            index = store.build_index(
+                {k: n['tokens'] for k, n in notes.items()}, bands
+            )
+            pairs = {
+                tuple(sorted((key, other)))
+                for key in keys
+                for other in index.candidates(key)
+            }
+        else:
+            pairs = {
+                (a, b) for i, a in enumerate(keys) for b in keys[i + 1:]
+            }
+
+        suggestions = []
+        for source, target in sorted(pairs):
+            if notes[source]['vault'] == notes[target]['vault']:
+                continue
+            tags1, tags2 = notes[source]['tags'], notes[target]['tags']
+            similarity = jaccard(tags1, tags2)
+            if similarity >= min_similarity:
+                suggestions.append({
+                    'source': source,
+                    'target': target,
+                    'similarity': similarity,
+                    'shared_tags': sorted(tags1 & tags2),
+                })
+
+        suggestions.sort(key=lambda s: s['similarity'], reverse=True)
+        logger.info(
+            "Link suggestions (%s): %d notes, %d pairs scored, %d suggested",
+            mode, len(notes), len(pairs), len(suggestions)
+        )
+        return suggestions
+
     def _find_all_links(self) -> List[Dict[str, Any]]:
         """
         Findet alle Links im Workspace
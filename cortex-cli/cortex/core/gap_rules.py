@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Gap Rule Engine - single-pass scanning for knowledge gap patterns
+
+All rules of a scanner are reduced to their leading literal (e.g. ``TODO``
+for ``TODO.*research``) and the distinct literals are compiled into one
+case-insensitive alternation with named groups. Each file is scanned once
+with that prefilter; a rule's full regex only runs where its literal
+occurs. Rules without a usable leading literal are scanned on their own.
+
+Results are identical to running ``re.finditer`` per rule: matches are
+returned rule by rule in rule order, and each rule's matches do not
+overlap each other.
+"""
+
+import hashlib
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Characters that end the literal prefix of a pattern
+_REGEX_META = set('.^$*+?{}[]|()')
+_QUANTIFIERS = set('*+?{')
+_MIN_LITERAL_LENGTH = 2
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GapRule:
+    """A regex that marks a knowledge gap of a given type"""
+    name: str
+    gap_type: str
+    pattern: str
+    applies_to: Tuple[str, ...] = ('markdown', 'code')
+    regex: Any = field(init=False, repr=False)
+    literal: Optional[str] = field(init=False, default=None)
+
+    def __post_init__(self):
+        self.regex = re.compile(self.pattern, re.IGNORECASE)
+        self.literal = leading_literal(self.pattern)
+
+
+# (rule name, gap_type, start, end, matched text)
+GapMatch = Tuple[str, str, int, int, str]
+
+
+def leading_literal(pattern: str) -> Optional[str]:
+    """Literal text every match of ``pattern`` starts with, lowercased
+
+    Returns None if the pattern has no usable prefix (top-level
+    alternation, inline flags, or fewer than two literal characters).
+    """
+    if '|' in pattern or pattern.startswith('(?'):
+        return None
+
+    chars: List[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                break  # \d, \b, \w ... are not literals
+            char = pattern[i + 1]
+            i += 2
+        elif char in _REGEX_META:
+            break
+        else:
+            i += 1
+        if i < len(pattern) and pattern[i] in _QUANTIFIERS:
+            break  # the last character is optional or repeated
+        chars.append(char)
+
+    literal = ''.join(chars).lower()
+    return literal if len(literal) >= _MIN_LITERAL_LENGTH else None
+
+
+BUILTIN_RULES = [
+    GapRule('todo_research', 'incomplete_research', r'TODO.*research', ('markdown',)),
+    GapRule('fixme_performance', 'missing_benchmarks', r'FIXME.*performance', ('markdown',)),
+    GapRule('need_benchmark', 'missing_benchmarks', r'need.*benchmark', ('markdown',)),
+    GapRule('missing_data', 'incomplete_research', r'missing.*data', ('markdown',)),
+    GapRule('code_todo_performance', 'missing_benchmarks', r'# TODO.*performance', ('code',)),
+    GapRule('code_todo_optimize', 'missing_benchmarks', r'// TODO.*optimize', ('code',)),
+    GapRule('not_implemented', 'incomplete_research', r'raise NotImplementedError', ('code',)),
+]
+
+
+def rules_from_config(analysis_patterns: Dict[str, Any]) -> List[GapRule]:
+    """Rules from the ``analysis_patterns`` section of ai_config.yaml
+
+    Each gap type may list regexes under ``patterns`` and restrict them
+    with ``applies_to`` (markdown, code); ``keywords`` and ``indicators``
+    are not scan rules.
+    """
+    rules = []
+    for gap_type, settings in (analysis_patterns or {}).items():
+        if not isinstance(settings, dict):
+            continue
+        applies_to = tuple(settings.get('applies_to') or ('markdown', 'code'))
+        for i, pattern in enumerate(settings.get('patterns') or []):
+            try:
+                rules.append(GapRule(f"{gap_type}.{i}", gap_type, pattern, applies_to))
+            except re.error as e:
+                logger.warning("Ignoring invalid gap pattern %r: %s", pattern, e)
+    return rules
+
+
+class GapScanner:
+    """Scans text for all rules of one file kind in a single pass"""
+
+    def __init__(self, rules: Iterable[GapRule]):
+        self.rules = list(rules)
+        self.stats: Dict[str, Dict[str, float]] = {
+            rule.name: {'hits': 0, 'seconds': 0.0} for rule in self.rules
+        }
+        self.scans = 0
+        self.prefilter_seconds = 0.0
+
+        self._anchored: Dict[str, List[int]] = {}
+        self._unanchored: List[int] = []
+        for index, rule in enumerate(self.rules):
+            if rule.literal:
+                self._anchored.setdefault(rule.literal, []).append(index)
+            else:
+                self._unanchored.append(index)
+
+        # One named group per distinct literal, longest first. A hit on a
+        # literal also means that all literals it starts with occur there.
+        literals = sorted(self._anchored, key=len, reverse=True)
+        self._group_literals = {
+            f"l{i}": [other for other in literals if literal.startswith(other)]
+            for i, literal in enumerate(literals)
+        }
+        self._prefilter = re.compile(
+            '|'.join(f"(?P<l{i}>{re.escape(literal)})" for i, literal in enumerate(literals)),
+            re.IGNORECASE
+        ) if literals else None
+
+    @property
+    def fingerprint(self) -> str:
+        """Changes whenever the rule set changes (for memoized results)"""
+        spec = repr([(r.name, r.gap_type, r.pattern) for r in self.rules])
+        return hashlib.md5(spec.encode()).hexdigest()[:8]
+
+    def scan(self, content: str) -> List[GapMatch]:
+        """All rule matches in ``content``, rule by rule in rule order"""
+        self.scans += 1
+        per_rule: List[List[GapMatch]] = [[] for _ in self.rules]
+
+        if self._prefilter is not None:
+            next_start = [0] * len(self.rules)
+            start = time.perf_counter()
+            rule_seconds = 0.0
+            hit = self._prefilter.search(content)
+            while hit:
+                pos = hit.start()
+                # Every literal occurring here, not only the alternative that won
+                for literal in self._group_literals[hit.lastgroup]:
+                    for index in self._anchored[literal]:
+                        if pos < next_start[index]:
+                            continue
+                        rule_start = time.perf_counter()
+                        match = self.rules[index].regex.match(content, pos)
+                        elapsed = time.perf_counter() - rule_start
+                        rule_seconds += elapsed
+                        self.stats[self.rules[index].name]['seconds'] += elapsed
+                        if match:
+                            per_rule[index].append(self._to_match(index, match))
+                            next_start[index] = max(match.end(), pos + 1)
+                hit = self._prefilter.search(content, pos + 1)
+            self.prefilter_seconds += time.perf_counter() - start - rule_seconds
+
+        for index in self._unanchored:
+            rule_start = time.perf_counter()
+            per_rule[index] = [
+                self._to_match(index, match)
+                for match in self.rules[index].regex.finditer(content)
+            ]
+            self.stats[self.rules[index].name]['seconds'] += time.perf_counter() - rule_start
+
+        matches = []
+        for index, rule_matches in enumerate(per_rule):
+            self.stats[self.rules[index].name]['hits'] += len(rule_matches)
+            matches.extend(rule_matches)
+        return matches
+
+    def _to_match(self, index: int, match) -> GapMatch:
+        rule = self.rules[index]
+        return (rule.name, rule.gap_type, match.start(), match.end(), match.group(0))
+
+    def record_cached(self, matches: Iterable[GapMatch]):
+        """Count hits of results served from a cache instead of a scan"""
+        for match in matches:
+            if match[0] in self.stats:
+                self.stats[match[0]]['hits'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-rule hit counts and timings"""
+        return {
+            'scans': self.scans,
+            'prefilter_seconds': round(self.prefilter_seconds, 6),
+            'rules': {
+                name: {'hits': int(s['hits']), 'seconds': round(s['seconds'], 6)}
+                for name, s in self.stats.items()
+            }
+        }
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Gap Store - gap_id keyed store for detected knowledge gaps
+
+Gaps are kept in memory keyed by ``gap_id`` with secondary indexes by
+source file, gap type and priority. Changes are persisted to an
+append-only JSONL log (one upsert or delete record per line); the log is
+compacted to one record per live gap once it grows beyond
+``compact_ratio`` times the number of gaps.
+"""
+
+import json
+import logging
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+LOG_FILE_NAME = "detected_gaps.jsonl"
+LEGACY_FILE_NAME = "detected_gaps.json"
+
+
+class GapStore:
+    """Upserting, indexed gap store backed by a compacting JSONL log
+
+    Behaves like a list of gaps for iteration, ``len`` and ``append``
+    (which upserts), so callers that treated ``detected_gaps`` as a list
+    keep working. Call ``load()`` to read persisted gaps.
+    """
+
+    # Fields kept from the stored gap when the same gap is detected again
+    PRESERVED_FIELDS = ('detected_date', 'last_research_attempt', 'filled_date', 'filled_by')
+    INDEXED_FIELDS = ('source_file', 'gap_type', 'priority')
+
+    def __init__(self, data_path: Path, gap_factory: Callable[..., Any],
+                 compact_ratio: float = 2.0, min_compact_records: int = 1000):
+        self.data_path = Path(data_path)
+        self.log_file = self.data_path / LOG_FILE_NAME
+        self.gap_factory = gap_factory
+        self.compact_ratio = compact_ratio
+        self.min_compact_records = min_compact_records
+
+        self._gaps: Dict[str, Any] = {}
+        self._indexes: Dict[str, Dict[Any, Set[str]]] = {
+            name: {} for name in self.INDEXED_FIELDS
+        }
+        self._pending: List[str] = []
+        self._log_records = 0
+
+    # ---------- list-like access ----------
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self._gaps.values()))
+
+    def __len__(self) -> int:
+        return len(self._gaps)
+
+    def __contains__(self, gap_id: str) -> bool:
+        return gap_id in self._gaps
+
+    def append(self, gap):
+        self.upsert(gap)
+
+    def extend(self, gaps: Iterable[Any]):
+        for gap in gaps:
+            self.upsert(gap)
+
+    # ---------- lookups ----------
+
+    def get(self, gap_id: str) -> Optional[Any]:
+        return self._gaps.get(gap_id)
+
+    def by_file(self, source_file: str) -> List[Any]:
+        return self._lookup('source_file', source_file)
+
+    def by_type(self, gap_type: str) -> List[Any]:
+        return self._lookup('gap_type', gap_type)
+
+    def by_priority(self, priority: str) -> List[Any]:
+        return self._lookup('priority', priority)
+
+    def files(self) -> List[str]:
+        return [f for f in self._indexes['source_file'] if f is not None]
+
+    def counts(self, field_name: str) -> Dict[Any, int]:
+        """Number of gaps per value of an indexed field"""
+        return {value: len(ids) for value, ids in self._indexes[field_name].items()}
+
+    def _lookup(self, field_name: str, value) -> List[Any]:
+        return [self._gaps[gap_id] for gap_id in self._indexes[field_name].get(value, ())]
+
+    # ---------- changes ----------
+
+    def upsert(self, gap) -> bool:
+        """Insert or update a gap; returns True if anything changed"""
+        existing = self._gaps.get(gap.gap_id)
+        if existing is not None:
+            for name in self.PRESERVED_FIELDS:
+                if getattr(existing, name, None) is not None:
+                    setattr(gap, name, getattr(existing, name))
+            if asdict(existing) == asdict(gap):
+                return False
+            self._unindex(existing)
+
+        self._gaps[gap.gap_id] = gap
+        self._index(gap)
+        self._pending.append(json.dumps({'op': 'upsert', 'gap': asdict(gap)}))
+        return True
+
+    def update(self, gap):
+        """Record in-place changes of a stored gap (e.g. research attempts)"""
+        self._unindex(gap)
+        self._index(gap)
+        self._pending.append(json.dumps({'op': 'upsert', 'gap': asdict(gap)}))
+
+    def delete(self, gap_id: str) -> bool:
+        gap = self._gaps.pop(gap_id, None)
+        if gap is None:
+            return False
+        self._unindex(gap)
+        self._pending.append(json.dumps({'op': 'delete', 'gap_id': gap_id}))
+        return True
+
+    def clear(self):
+        for gap_id in list(self._gaps):
+            self.delete(gap_id)
+
+    def _index(self, gap):
+        for name in self.INDEXED_FIELDS:
+            self._indexes[name].setdefault(getattr(gap, name, None), set()).add(gap.gap_id)
+
+    def _unindex(self, gap):
+        for name in self.INDEXED_FIELDS:
+            value = getattr(gap, name, None)
+            ids = self._indexes[name].get(value)
+            if ids is not None:
+                ids.discard(gap.gap_id)
+                if not ids:
+                    del self._indexes[name][value]
+
+    # ---------- persistence ----------
+
+    def load(self):
+        """Replay the log, or import the legacy JSON list on first use"""
+        self._gaps = {}
+        self._indexes = {name: {} for name in self.INDEXED_FIELDS}
+        self._pending = []
+        self._log_records = 0
+
+        if self.log_file.exists():
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                        if record['op'] == 'upsert':
+                            self._replace(self.gap_factory(**record['gap']))
+                        elif record['op'] == 'delete':
+                            gap = self._gaps.pop(record['gap_id'], None)
+                            if gap is not None:
+                                self._unindex(gap)
+                    except (ValueError, KeyError, TypeError) as e:
+                        # A torn last line after a crash; everything before is valid
+                        logger.warning("Skipping invalid gap log record: %s", e)
+                    self._log_records += 1
+            return
+
+        legacy_file = self.data_path / LEGACY_FILE_NAME
+        if legacy_file.exists():
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                for data in json.load(f):
+                    self._replace(self.gap_factory(**data))
+            self.compact()
+
+    def _replace(self, gap):
+        existing = self._gaps.get(gap.gap_id)
+        if existing is not None:
+            self._unindex(existing)
+        self._gaps[gap.gap_id] = gap
+        self._index(gap)
+
+    def flush(self):
+        """Append pending changes to the log, compacting it if needed"""
+        if self._pending:
+            self.data_path.mkdir(parents=True, exist_ok=True)
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(self._pending) + '\n')
+            self._log_records += len(self._pending)
+            self._pending = []
+
+        if (self._log_records > self.min_compact_records
+                and self._log_records > self.compact_ratio * max(len(self._gaps), 1)):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the log with one record per live gap"""
+        self.data_path.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.log_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for gap in self._gaps.values():
+                f.write(json.dumps({'op': 'upsert', 'gap': asdict(gap)}) + '\n')
+        os.replace(tmp_file, self.log_file)
+        self._log_records = len(self._gaps)
+        self._pending = []
@@ -0,0 +1,324 @@
+"""
+Link Prediction
+
+Precomputed link suggestions for the note graph. The ``LINKS_TO`` edges
+between notes are exported with one query and treated as undirected. For
+every note the candidates two hops away are scored with
+
+    common_neighbors(x, y) = |N(x) & N(y)|
+    adamic_adar(x, y)      = sum(1 / log|N(z)|  for z in N(x) & N(y))
+    jaccard(x, y)          = |N(x) & N(y)| / |N(x) | N(y)|
+
+and the top k per note are kept in a JSON cache, so a suggestion lookup is
+a dictionary access instead of a graph traversal. With scipy the scores
+come from sparse products of the adjacency matrix (A @ A and
+A @ diag(1 / log deg) @ A) in row blocks; otherwise from the neighbor sets.
+
+When links change, ``update`` recomputes only the notes within two hops of
+an added or removed edge; all other rows cannot have changed.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .tag_similarity import SCIPY_AVAILABLE, default_backend, top_k
+
+if SCIPY_AVAILABLE:
+    import numpy as np
+    from scipy import sparse
+
+METRICS = ('common_neighbors', 'adamic_adar', 'jaccard')
+CACHE_VERSION = 1
+DEFAULT_TOP_K = 10
+DEFAULT_METRIC = 'adamic_adar'
+
+# (target, common_neighbors, adamic_adar, jaccard)
+Suggestion = Tuple[str, int, float, float]
+
+EXPORT_QUERY = """
+MATCH (n:Note)
+OPTIONAL MATCH (n)-[:LINKS_TO]-(m:Note)
+WHERE m <> n
+RETURN n.name AS name, collect(DISTINCT m.name) AS neighbors
+"""
+
+CLEAR_SUGGESTED_QUERY = """
+UNWIND $sources AS source
+MATCH (:Note {name: source})-[r:SUGGESTED_LINK]->()
+DELETE r
+"""
+
+WRITE_SUGGESTED_QUERY = """
+UNWIND $rows AS row
+MATCH (a:Note {name: row.source}), (b:Note {name: row.target})
+MERGE (a)-[r:SUGGESTED_LINK]->(b)
+SET r.rank = row.rank,
+    r.common_neighbors = row.common_neighbors,
+    r.adamic_adar = row.adamic_adar,
+    r.jaccard = row.jaccard,
+    r.computed_at = timestamp()
+"""
+
+
+def export_adjacency(session) -> Dict[str, Set[str]]:
+    """Undirected note adjacency from a single export query."""
+    adjacency: Dict[str, Set[str]] = {}
+    for record in session.run(EXPORT_QUERY):
+        name = record['name']
+        if name is None:
+            continue
+        adjacency.setdefault(name, set()).update(n for n in record['neighbors'] if n is not None)
+    # LINKS_TO may point to names that only exist as link targets
+    for name, neighbors in list(adjacency.items()):
+        for neighbor in neighbors:
+            adjacency.setdefault(neighbor, set()).add(name)
+    return adjacency
+
+
+def _rank(candidates: Iterable[Suggestion], k: int, metric: str) -> List[Suggestion]:
+    """Best k candidates by metric; ties are broken by name."""
+    position = METRICS.index(metric) + 1
+    ordered = sorted(candidates, key=lambda s: s[0])
+    return [s for _, s in top_k(((s[position], s) for s in ordered), k)]
+
+
+def _score_rows_python(adjacency: Dict[str, Set[str]], sources: Iterable[str],
+                       k: int, metric: str) -> Dict[str, List[Suggestion]]:
+    weights = {
+        name: 1.0 / math.log(len(neighbors))
+        for name, neighbors in adjacency.items() if len(neighbors) > 1
+    }
+    result: Dict[str, List[Suggestion]] = {}
+    for source in sources:
+        neighbors = adjacency.get(source, set())
+        common: Dict[str, int] = {}
+        adamic: Dict[str, float] = {}
+        for middle in neighbors:
+            weight = weights.get(middle, 0.0)
+            for candidate in adjacency[middle]:
+                if candidate == source or candidate in neighbors:
+                    continue
+                common[candidate] = common.get(candidate, 0) + 1
+                adamic[candidate] = adamic.get(candidate, 0.0) + weight
+        degree = len(neighbors)
+        result[source] = _rank((
+            (candidate, count, round(adamic[candidate], 6),
+             round(count / (degree + len(adjacency[candidate]) - count), 6))
+            for candidate, count in common.items()
+        ), k, metric)
+    return result
+
+
+def _score_rows_sparse(adjacency: Dict[str, Set[str]], sources: Iterable[str],
+                       k: int, metric: str, block_size: int = 1024
+                       ) -> Dict[str, List[Suggestion]]:
+    names = sorted(adjacency)
+    index = {name: i for i, name in enumerate(names)}
+    indptr = [0]
+    indices: List[int] = []
+    for name in names:
+        indices.extend(sorted(index[n] for n in adjacency[name]))
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float64), np.asarray(indices, dtype=np.int64),
+         np.asarray(indptr)),
+        shape=(len(names), len(names)),
+    )
+    degrees = np.diff(matrix.indptr)
+    weights = np.zeros(len(names))
+    hubs = degrees > 1
+    weights[hubs] = 1.0 / np.log(degrees[hubs])
+    weighted = sparse.diags(weights) @ matrix
+
+    rows = sorted(index[s] for s in sources if s in index)
+    result: Dict[str, List[Suggestion]] = {}
+    for start in range(0, len(rows), block_size):
+        block_rows = rows[start:start + block_size]
+        block = matrix[block_rows]
+        common = (block @ matrix).tocsr()
+        adamic = (block @ weighted).tocsr()
+        for offset, row in enumerate(block_rows):
+            linked = set(block.indices[block.indptr[offset]:block.indptr[offset + 1]].tolist())
+            lo, hi = common.indptr[offset], common.indptr[offset + 1]
+            adamic_row = dict(zip(
+                adamic.indices[adamic.indptr[offset]:adamic.indptr[offset + 1]].tolist(),
+                adamic.data[adamic.indptr[offset]:adamic.indptr[offset + 1]].tolist(),
+            ))
+            candidates = []
+            for col, count in zip(common.indices[lo:hi].tolist(), common.data[lo:hi].tolist()):
+                if col == row or col in linked or count == 0:
+                    continue
+                count = int(round(count))
+                union = degrees[row] + degrees[col] - count
+                candidates.append((names[col], count, round(adamic_row.get(col, 0.0), 6),
+                                   round(count / union, 6)))
+            result[names[row]] = _rank(candidates, k, metric)
+    return result
+
+
+def score_rows(adjacency: Dict[str, Set[str]], sources: Iterable[str],
+               k: int = DEFAULT_TOP_K, metric: str = DEFAULT_METRIC,
+               backend: Optional[str] = None) -> Dict[str, List[Suggestion]]:
+    """Top-k suggestions for each source note."""
+    if metric not in METRICS:
+        raise ValueError(f"Unknown link prediction metric: {metric}")
+    sources = list(sources)
+    if default_backend(backend) == 'sparse':
+        return _score_rows_sparse(adjacency, sources, k, metric)
+    return _score_rows_python(adjacency, sources, k, metric)
+
+
+def affected_nodes(old: Dict[str, Set[str]], new: Dict[str, Set[str]]) -> Set[str]:
+    """Notes whose suggestions may differ between two adjacencies.
+
+    A changed edge (a, b) alters the common neighbors of pairs through a
+    and b, and the degrees of a and b (Jaccard, Adamic-Adar). That touches
+    every note within two hops of a or b, in either graph.
+    """
+    changed: Set[str] = set()
+    for name in set(old) | set(new):
+        if old.get(name) != new.get(name):
+            changed.add(name)
+    affected: Set[str] = set()
+    for adjacency in (old, new):
+        frontier = {n for n in changed if n in adjacency}
+        reached = set(frontier)
+        for _ in range(2):
+            frontier = {m for n in frontier for m in adjacency[n]} - reached
+            reached |= frontier
+        affected |= reached
+    return affected
+
+
+class LinkPredictor:
+    """Cached top-k link suggestions per note."""
+
+    def __init__(self, cache_file: Path, k: int = DEFAULT_TOP_K,
+                 metric: str = DEFAULT_METRIC, backend: Optional[str] = None):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown link prediction metric: {metric}")
+        self.cache_file = Path(cache_file)
+        self.k = k
+        self.metric = metric
+        self.backend = backend
+        self.adjacency: Dict[str, Set[str]] = {}
+        self.suggestions: Dict[str, List[Suggestion]] = {}
+        self.built_at: Optional[float] = None
+
+    def build(self, adjacency: Dict[str, Set[str]]) -> int:
+        """Score every note; returns the number of rows computed."""
+        self.adjacency = adjacency
+        self.suggestions = score_rows(adjacency, adjacency, self.k, self.metric, self.backend)
+        self.built_at = time.time()
+        return len(self.suggestions)
+
+    def update(self, adjacency: Dict[str, Set[str]]) -> int:
+        """Rescore only the notes affected by changed links.
+
+        The new rows go into a copy that replaces ``suggestions`` at the end,
+        so concurrent lookups never see a half-updated table.
+        """
+        if self.built_at is None:
+            return self.build(adjacency)
+        affected = affected_nodes(self.adjacency, adjacency)
+        suggestions = dict(self.suggestions)
+        for name in affected - set(adjacency):
+            suggestions.pop(name, None)
+        suggestions.update(score_rows(
+            adjacency, (n for n in affected if n in adjacency), self.k, self.metric, self.backend
+        ))
+        self.adjacency, self.suggestions = adjacency, suggestions
+        self.built_at = time.time()
+        return len(affected & set(adjacency))
+
+    def refresh_from_graph(self, session, full: bool = False) -> Dict[str, Any]:
+        """Export the graph, update the scores and save the cache."""
+        started = time.perf_counter()
+        adjacency = export_adjacency(session)
+        rescored = self.build(adjacency) if full or not self.load() else self.update(adjacency)
+        self.save()
+        return {
+            'notes': len(adjacency),
+            'links': sum(len(n) for n in adjacency.values()) // 2,
+            'rescored': rescored,
+            'seconds': round(time.perf_counter() - started, 3),
+        }
+
+    def write_to_graph(self, session, sources: Optional[Iterable[str]] = None,
+                       chunk_size: int = 1000) -> int:
+        """Store suggestions as (:Note)-[:SUGGESTED_LINK]->(:Note) edges.
+
+        Existing SUGGESTED_LINK edges of the written sources are replaced.
+        Returns the number of edges written.
+        """
+        sources = sorted(self.suggestions if sources is None else sources)
+        written = 0
+        for start in range(0, len(sources), chunk_size):
+            chunk = sources[start:start + chunk_size]
+            rows = [
+                {'source': source, 'target': target, 'rank': rank,
+                 'common_neighbors': common, 'adamic_adar': adamic, 'jaccard': jaccard}
+                for source in chunk
+                for rank, (target, common, adamic, jaccard)
+                in enumerate(self.suggestions.get(source, []), start=1)
+            ]
+            session.execute_write(self._write_chunk, chunk, rows)
+            written += len(rows)
+        return written
+
+    @staticmethod
+    def _write_chunk(tx, sources: List[str], rows: List[Dict[str, Any]]):
+        tx.run(CLEAR_SUGGESTED_QUERY, sources=sources).consume()
+        tx.run(WRITE_SUGGESTED_QUERY, rows=rows).consume()
+
+    def knows(self, name: str) -> bool:
+        return name in self.suggestions
+
+    def is_stale(self, max_age: Optional[float]) -> bool:
+        if self.built_at is None:
+            return True
+        return max_age is not None and time.time() - self.built_at > max_age
+
+    def suggest(self, name: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Cached suggestions for a note, best first."""
+        return [
+            {'potential_link': target, 'common_neighbors_score': common,
+             'adamic_adar': adamic, 'jaccard': jaccard}
+            for target, common, adamic, jaccard in self.suggestions.get(name, [])[:limit]
+        ]
+
+    def save(self):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': CACHE_VERSION,
+                'k': self.k,
+                'metric': self.metric,
+                'built_at': self.built_at,
+                'adjacency': {name: sorted(n) for name, n in self.adjacency.items()},
+                'suggestions': self.suggestions,
+            }, f)
+        os.replace(tmp_file, self.cache_file)
+
+    def load(self) -> bool:
+        """Load the cache; False if missing or computed with other settings."""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if (data.get('version') != CACHE_VERSION or data.get('k') != self.k
+                or data.get('metric') != self.metric):
+            return False
+        self.adjacency = {name: set(n) for name, n in data.get('adjacency', {}).items()}
+        self.suggestions = {
+            name: [tuple(s) for s in rows] for name, rows in data.get('suggestions', {}).items()
+        }
+        self.built_at = data.get('built_at')
+        return True
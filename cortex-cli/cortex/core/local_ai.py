@@ -1,30 +1,53 @@
 """
 Cortex Local AI - Graphen-basierte Intelligenz direkt aus Neo4j.
 """
-import os
-from neo4j import GraphDatabase, Driver
-from typing import List, Dict, Any
+import asyncio
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from .link_prediction import DEFAULT_METRIC, DEFAULT_TOP_K, LinkPredictor
+from ..utils.neo4j_async import AsyncGraph
+from ..utils.neo4j_registry import connection_settings, get_driver
+
+logger = logging.getLogger(__name__)
+
+COMMON_NEIGHBORS_QUERY = """
+MATCH (n1:{label} {{name: $node_name}})-[:LINKS_TO]->(common_neighbor)<-[:LINKS_TO]-(n2:{label})
+WHERE n1 <> n2 AND NOT (n1)-[:LINKS_TO]->(n2)
+RETURN n2.name AS potential_link, count(common_neighbor) AS common_neighbors_score
+ORDER BY common_neighbors_score DESC
+LIMIT 10
+"""
 
 class Neo4jConnector:
     """
     Stellt eine Verbindung zur Neo4j-Datenbank her und bietet Methoden
     zum Abrufen von Graphendaten.
+
+    Der Treiber stammt aus der prozessweiten Registry und wird erst bei der
+    ersten Abfrage angelegt.
     """
     def __init__(self):
-        uri = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
-        user = os.environ.get("NEO4J_USER", "neo4j")
-        password = os.environ.get("NEO4J_PASSWORD", "neo4jtest")
+        self.uri, self.user, self.password = connection_settings()
+        self._driver = None
+        self._async_graph = None
 
-        try:
-            self._driver: Driver = GraphDatabase.driver(uri, auth=(user, password))
-            self._driver.verify_connectivity()
-        except Exception as e:
-            raise ConnectionError(f"Could not connect to Neo4j database at {uri}. Error: {e}")
+    @property
+    def driver(self):
+        """Geteilter Neo4j-Treiber, beim ersten Zugriff erzeugt."""
+        if self._driver is None:
+            try:
+                self._driver = get_driver(self.uri, self.user, self.password)
+            except Exception as e:
+                raise ConnectionError(f"Could not connect to Neo4j database at {self.uri}. Error: {e}")
+        return self._driver
 
     def close(self):
-        """Schließt die Datenbankverbindung."""
-        if self._driver:
-            self._driver.close()
+        """Gibt den geteilten Treiber frei; geschlossen wird er beim Prozessende."""
+        self._driver = None
 
     def get_common_neighbors_for_node(self, node_name: str, node_label: str = "Note") -> List[Dict[str, Any]]:
         """
@@ -39,32 +62,116 @@ class Neo4jConnector:
         Returns:
             Eine Liste von Dictionaries, die potenzielle neue Links und deren Score enthalten.
         """
-        query = f"""
-        MATCH (n1:{node_label} {{name: $node_name}})-[:LINKS_TO]->(common_neighbor)<-[:LINKS_TO]-(n2:{node_label})
-        WHERE n1 <> n2 AND NOT (n1)-[:LINKS_TO]->(n2)
-        RETURN n2.name AS potential_link, count(common_neighbor) AS common_neighbors_score
-        ORDER BY common_neighbors_score DESC
-        LIMIT 10
-        """
-        with self._driver.session() as session:
+        query = COMMON_NEIGHBORS_QUERY.format(label=node_label)
+        with self.driver.session() as session:
             result = session.run(query, node_name=node_name)
             return [record.data() for record in result]
 
+    @property
+    def async_graph(self) -> AsyncGraph:
+        """Asynchroner Zugriff mit denselben Verbindungsdaten."""
+        if self._async_graph is None:
+            self._async_graph = AsyncGraph(self.uri, self.user, self.password)
+        return self._async_graph
+
+    async def get_common_neighbors_for_node_async(self, node_name: str,
+                                                  node_label: str = "Note") -> List[Dict[str, Any]]:
+        """Wie get_common_neighbors_for_node, ohne die Event-Loop zu blockieren."""
+        query = COMMON_NEIGHBORS_QUERY.format(label=node_label)
+        return await self.async_graph.read(query, node_name=node_name)
+
 class LocalAI:
     """
     Implementiert die Logik für die interne, datengetriebene AI.
     Nutzt den Neo4jConnector, um Graphenanalysen durchzuführen.
+
+    Link-Vorschläge kommen aus dem vorberechneten Cache des LinkPredictor
+    (``<cache_dir>/link_suggestions.json``). Ist der Cache älter als
+    ``max_age`` Sekunden, wird er im Hintergrund inkrementell aus dem Graphen
+    aufgefrischt und bis dahin der alte Stand verwendet; Knoten, die der
+    Cache (noch) nicht kennt, werden direkt im Graphen abgefragt.
     """
-    def __init__(self):
+    # Abstand zwischen zwei Auffrisch-Versuchen, wenn einer fehlgeschlagen ist
+    REFRESH_RETRY_SECONDS = 60.0
+
+    def __init__(self, cache_dir: Optional[Path] = None, top_k: int = DEFAULT_TOP_K,
+                 metric: str = DEFAULT_METRIC, max_age: Optional[float] = 3600):
         self.connector = Neo4jConnector()
+        cache_dir = Path(cache_dir) if cache_dir else Path.cwd() / ".cortex" / "cache"
+        self.predictor = LinkPredictor(cache_dir / "link_suggestions.json", k=top_k, metric=metric)
+        self.max_age = max_age
+        self._cache_loaded = False
+        # Laden und Auffrischen verändern den Predictor; immer nur eines davon läuft
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_started: Optional[float] = None
+
+    def refresh_link_predictions(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Exportiert den Graphen und aktualisiert den Vorschlags-Cache.
+
+        Gleichzeitige Aufrufe warten aufeinander.
+        """
+        with self._refresh_lock, self.connector.driver.session() as session:
+            return self.predictor.refresh_from_graph(session, full=full)
+
+    @property
+    def refreshing(self) -> bool:
+        """Ob gerade ein Auffrischen im Hintergrund läuft"""
+        return self._refresh_thread is not None and self._refresh_thread.is_alive()
+
+    def _ensure_predictions(self):
+        """
+        Lädt den Cache; ist er veraltet, wird das Auffrischen im Hintergrund
+        gestartet, statt die Abfrage auf Export und Neuberechnung warten zu lassen.
+
+        Läuft bereits ein Laden oder Auffrischen, gilt der aktuelle Stand.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if not self._cache_loaded:
+                self._cache_loaded = self.predictor.load()
+            if not self.predictor.is_stale(self.max_age) or self.refreshing:
+                return
+            if (self._refresh_started is not None
+                    and time.monotonic() - self._refresh_started < self.REFRESH_RETRY_SECONDS):
+                return
+            self._refresh_started = time.monotonic()
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_in_background, name="link-predictions-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh_link_predictions()
+            self._cache_loaded = True
+        except Exception as e:
+            # Ein veralteter Cache ist besser als keiner
+            logger.warning(f"Could not refresh link predictions: {e}")
 
     def suggest_links_for_node(self, node_name: str) -> List[Dict[str, Any]]:
         """
         Schlägt neue Links für einen bestimmten Knoten vor, basierend auf
-        Graphenalgorithmen wie "Common Neighbors".
+        Graphenalgorithmen wie "Common Neighbors" und "Adamic-Adar".
         """
+        self._ensure_predictions()
+        if self.predictor.knows(node_name):
+            return self.predictor.suggest(node_name)
         return self.connector.get_common_neighbors_for_node(node_name)
 
+    async def suggest_links_for_node_async(self, node_name: str) -> List[Dict[str, Any]]:
+        """
+        Async-Variante von suggest_links_for_node: das Laden des Caches
+        läuft in einem Worker-Thread, die Graph-Abfrage über den Async-Treiber.
+        """
+        await asyncio.to_thread(self._ensure_predictions)
+        if self.predictor.knows(node_name):
+            return self.predictor.suggest(node_name)
+        return await self.connector.get_common_neighbors_for_node_async(node_name)
+
     def __del__(self):
         self.connector.close()
-
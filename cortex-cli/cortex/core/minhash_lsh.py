@@ -0,0 +1,263 @@
+"""
+MinHash / LSH Candidate Search
+
+Approximate candidate generation for tag/keyword similarity. Each note's
+token set is summarized by a MinHash signature of ``num_perm`` values; the
+signature is cut into ``bands`` bands of ``num_perm // bands`` rows and every
+band is hashed into a bucket. Only notes that share at least one bucket are
+returned as candidates, so scoring work follows the number of collisions
+instead of the number of note pairs.
+
+Recall/precision knobs:
+    - more bands (fewer rows per band) -> more collisions, higher recall
+    - fewer bands (more rows per band) -> fewer collisions, higher precision
+    - num_perm trades signature accuracy against compute and storage
+
+A pair with Jaccard similarity ``s`` becomes a candidate with probability
+``1 - (1 - s**rows) ** bands``.
+
+Signatures are persisted in a JSON store together with a fingerprint of the
+token set, so only new or changed notes are hashed again.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import random
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+STORE_VERSION = 1
+
+
+KEYWORD_STOPWORDS = {
+    "the", "and", "for", "with", "from", "this", "that", "into", "über",
+    "und", "der", "die", "das", "mit", "für", "eine", "einer", "notes",
+}
+
+
+def note_tokens(tags: Iterable[str], headings: Iterable) -> Set[str]:
+    """Token set of a note: its tags plus keywords from its headings."""
+    tokens = {f"tag:{t}" for t in tags}
+    for _, text in headings:
+        for word in str(text).lower().split():
+            word = word.strip(".,:;!?()[]{}\"'`#*")
+            if len(word) > 3 and word not in KEYWORD_STOPWORDS:
+                tokens.add(f"kw:{word}")
+    return tokens
+
+
+def token_hash(token: str) -> int:
+    """Stable 32-bit hash of a token (independent of PYTHONHASHSEED)."""
+    return int.from_bytes(
+        hashlib.md5(token.encode("utf-8")).digest()[:4], "little"
+    )
+
+
+def tokens_fingerprint(tokens: Iterable[str]) -> str:
+    """Fingerprint of a token set, used to detect changed notes."""
+    return hashlib.md5("\n".join(sorted(tokens)).encode("utf-8")).hexdigest()
+
+
+def candidate_probability(similarity: float, num_perm: int, bands: int) -> float:
+    """Probability that a pair with the given Jaccard becomes a candidate."""
+    rows = num_perm // bands
+    return 1.0 - (1.0 - similarity ** rows) ** bands
+
+
+class MinHasher:
+    """Computes MinHash signatures with universal hashing (a*x + b) mod p."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        if num_perm <= 0:
+            raise ValueError("num_perm must be positive")
+        self.num_perm = num_perm
+        self.seed = seed
+
+        rng = random.Random(seed)
+        self._a = [rng.randint(1, MAX_HASH) for _ in range(num_perm)]
+        self._b = [rng.randint(0, MAX_HASH) for _ in range(num_perm)]
+        if NUMPY_AVAILABLE:
+            self._a_np = np.asarray(self._a, dtype=np.uint64)[:, None]
+            self._b_np = np.asarray(self._b, dtype=np.uint64)[:, None]
+
+    def signature(self, tokens: Set[str]) -> List[int]:
+        """MinHash signature of a non-empty token set."""
+        if not tokens:
+            raise ValueError("Cannot compute a MinHash of an empty set")
+        hashes = [token_hash(t) for t in tokens]
+
+        if NUMPY_AVAILABLE:
+            values = np.asarray(hashes, dtype=np.uint64)[None, :]
+            permuted = (self._a_np * values + self._b_np) % np.uint64(MERSENNE_PRIME)
+            permuted &= np.uint64(MAX_HASH)
+            return [int(v) for v in permuted.min(axis=1)]
+
+        return [
+            min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes)
+            for a, b in zip(self._a, self._b)
+        ]
+
+
+class LSHIndex:
+    """Banded LSH buckets over MinHash signatures."""
+
+    def __init__(self, num_perm: int = 128, bands: int = 32):
+        if bands <= 0 or num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [
+            defaultdict(set) for _ in range(bands)
+        ]
+        self._keys: Dict[str, List[Tuple[int, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, ...]]:
+        return [
+            tuple(signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def insert(self, key: str, signature: List[int]) -> None:
+        """Insert or replace a key."""
+        if key in self._keys:
+            self.remove(key)
+        band_keys = self._band_keys(signature)
+        for band, band_key in enumerate(band_keys):
+            self._buckets[band][band_key].add(key)
+        self._keys[key] = band_keys
+
+    def remove(self, key: str) -> None:
+        band_keys = self._keys.pop(key, None)
+        if band_keys is None:
+            return
+        for band, band_key in enumerate(band_keys):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def candidates(self, key: str) -> Set[str]:
+        """Keys sharing at least one bucket with ``key`` (excluding itself)."""
+        result: Set[str] = set()
+        for band, band_key in enumerate(self._keys.get(key, [])):
+            result |= self._buckets[band].get(band_key, set())
+        result.discard(key)
+        return result
+
+    def query(self, signature: List[int]) -> Set[str]:
+        """Keys colliding with an arbitrary signature."""
+        result: Set[str] = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            result |= self._buckets[band].get(band_key, set())
+        return result
+
+
+class MinHashStore:
+    """Persistent key -> (fingerprint, signature) store for incremental LSH."""
+
+    def __init__(self, store_file: Path, num_perm: int = 128, seed: int = 1):
+        self.store_file = Path(store_file)
+        self.hasher = MinHasher(num_perm, seed)
+        self.entries: Dict[str, Dict] = {}
+        self.stats = {"reused": 0, "computed": 0, "removed": 0}
+        self._dirty = False
+        self.load()
+
+    @property
+    def num_perm(self) -> int:
+        return self.hasher.num_perm
+
+    def load(self) -> None:
+        if not self.store_file.exists():
+            return
+        try:
+            with open(self.store_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not load MinHash store %s: %s", self.store_file, e)
+            return
+        if (data.get("version") != STORE_VERSION
+                or data.get("num_perm") != self.hasher.num_perm
+                or data.get("seed") != self.hasher.seed):
+            logger.info("Discarding MinHash store with different parameters")
+            return
+        self.entries = data.get("entries", {})
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            self.store_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.store_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": STORE_VERSION,
+                    "num_perm": self.hasher.num_perm,
+                    "seed": self.hasher.seed,
+                    "entries": self.entries,
+                }, f)
+            os.replace(tmp_file, self.store_file)
+            self._dirty = False
+        except OSError as e:
+            logger.warning("Could not save MinHash store %s: %s", self.store_file, e)
+
+    def signature(self, key: str, tokens: Set[str]) -> Optional[List[int]]:
+        """Signature for a key, recomputed only if its tokens changed."""
+        if not tokens:
+            return None
+        fingerprint = tokens_fingerprint(tokens)
+        entry = self.entries.get(key)
+        if entry and entry["fingerprint"] == fingerprint:
+            self.stats["reused"] += 1
+            return entry["signature"]
+
+        sig = self.hasher.signature(tokens)
+        self.entries[key] = {"fingerprint": fingerprint, "signature": sig}
+        self.stats["computed"] += 1
+        self._dirty = True
+        return sig
+
+    def prune(self, keep_keys: Iterable[str]) -> int:
+        """Remove signatures of notes that no longer exist."""
+        keep = set(keep_keys)
+        stale = [k for k in self.entries if k not in keep]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self._dirty = True
+        self.stats["removed"] += len(stale)
+        return len(stale)
+
+    def build_index(self, token_sets: Dict[str, Set[str]], bands: int) -> LSHIndex:
+        """Update signatures for ``token_sets`` and bucket them."""
+        index = LSHIndex(self.hasher.num_perm, bands)
+        for key, tokens in token_sets.items():
+            sig = self.signature(key, tokens)
+            if sig is not None:
+                index.insert(key, sig)
+        self.prune(token_sets.keys())
+        self.save()
+        return index
@@ -8,18 +8,21 @@ from __future__ import annotations
 
 import logging
 import re
-from collections import defaultdict
-from dataclasses import dataclass
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
 
 try:
     from .storage_provider import StorageProvider, MarkdownFSProvider
+    from ..utils.parse_cache import get_parse_cache
 except ImportError:  # pragma: no cover - fallback for direct execution
     import sys
     sys.path.insert(0, str(Path(__file__).parent))
+    sys.path.insert(0, str(Path(__file__).parent.parent / "utils"))
     from storage_provider import StorageProvider, MarkdownFSProvider
+    from parse_cache import get_parse_cache
 
 
 @dataclass
@@ -35,6 +38,179 @@ class LinkRule:
     enabled: bool = True
 
 
+@dataclass
+class FileFeatures:
+    """Per-cycle parsed view of a file used for link candidate generation."""
+
+    tags: Set[str]
+    stem: str
+    words: Set[str]
+    content: Optional[str] = None  # lowercased, loaded on demand
+
+
+# Shared non-common words from which file contents count as related
+MIN_SHARED_WORDS = 3
+
+# Parse cache key of the word sets; bump the version when they change
+WORDS_CACHE_KEY = 'rule_linker.words:v1'
+
+
+def _substrings(text: str, shortest: int = 0, longest: Optional[int] = None) -> Set[str]:
+    """Substrings of ``text`` with ``shortest`` to ``longest`` characters."""
+    longest = len(text) if longest is None else min(longest, len(text))
+    return {
+        text[start:start + size]
+        for size in range(shortest, longest + 1)
+        for start in range(len(text) - size + 1)
+    }
+
+
+def _mention_anchor(name: str, common_words: FrozenSet[str]) -> Optional[str]:
+    """Token of ``name`` that is a substring of a word wherever it occurs.
+
+    Any occurrence of ``name`` in a text puts its longest ``\\w+`` token
+    inside one word of that text.  None when that word could be a common
+    word (not in the word sets) or ``name`` has no token at all.
+    """
+    tokens = re.findall(r'\w+', name)
+    if not tokens:
+        return None
+    anchor = max(tokens, key=len)
+    if any(anchor in word for word in common_words):
+        return None
+    return anchor
+
+
+@dataclass
+class LinkCandidateIndex:
+    """Inverted index (tag/stem/keyword -> files) built once per linking cycle.
+
+    ``candidates`` returns every file that ``RuleBasedLinker.should_link_files``
+    can link to a given one:
+
+    * files sharing a tag,
+    * files whose normalized stems contain one another (``name_neighbors``),
+    * files sharing at least ``MIN_SHARED_WORDS`` keywords,
+    * files whose lower-cased stem may occur in the other's content.  The
+      stem's longest token (its mention anchor) then lies inside one word of
+      that content, so ``index_names`` maps each vocabulary word to the
+      anchors it contains (``word_anchors``).  Stems without a usable anchor
+      (``unanchored``) are paired with every file.
+
+    With ``max_keyword_df`` > 0, keywords that occur in more than that many
+    files are dropped from the keyword postings.  This is opt-in: pairs
+    that only share such keywords are then no longer candidates, although
+    the content check would link them.
+    """
+
+    max_keyword_df: int = 0
+    common_words: FrozenSet[str] = frozenset()
+    features: Dict[Path, FileFeatures] = field(default_factory=dict)
+    tag_postings: Dict[str, Set[Path]] = field(
+        default_factory=lambda: defaultdict(set)
+    )
+    keyword_postings: Dict[str, Set[Path]] = field(
+        default_factory=lambda: defaultdict(set)
+    )
+    name_postings: Dict[str, Set[Path]] = field(
+        default_factory=lambda: defaultdict(set)
+    )
+    name_neighbors: Dict[str, Set[str]] = field(
+        default_factory=lambda: defaultdict(set)
+    )
+    anchors: Dict[Path, str] = field(default_factory=dict)
+    anchor_owners: Dict[str, Set[Path]] = field(
+        default_factory=lambda: defaultdict(set)
+    )
+    anchor_postings: Dict[str, Set[Path]] = field(
+        default_factory=lambda: defaultdict(set)
+    )
+    word_anchors: Dict[str, Set[str]] = field(default_factory=dict)
+    unanchored: Set[Path] = field(default_factory=set)
+
+    def add(self, path: Path, features: FileFeatures) -> None:
+        """Register a file and its postings."""
+        self.features[path] = features
+        self.name_postings[features.stem].add(path)
+        anchor = _mention_anchor(path.stem.lower(), self.common_words)
+        if anchor is None:
+            self.unanchored.add(path)
+        else:
+            self.anchors[path] = anchor
+            self.anchor_owners[anchor].add(path)
+        for tag in features.tags:
+            self.tag_postings[tag].add(path)
+        for word in features.words:
+            self.keyword_postings[word].add(path)
+
+    def index_names(self) -> None:
+        """Pair stems that contain one another and index name mentions.
+
+        Must run before ``prune``: mentions are looked up in all words.
+        """
+        self.name_neighbors.clear()
+        stems = set(self.name_postings)
+        for stem in stems:
+            for contained in _substrings(stem) & stems:
+                self.name_neighbors[stem].add(contained)
+                self.name_neighbors[contained].add(stem)
+
+        self.word_anchors.clear()
+        self.anchor_postings.clear()
+        if not self.anchor_owners:
+            return
+        shortest = min(map(len, self.anchor_owners))
+        longest = max(map(len, self.anchor_owners))
+        for word, files in self.keyword_postings.items():
+            contained = _substrings(word, shortest, longest).intersection(self.anchor_owners)
+            if contained:
+                self.word_anchors[word] = contained
+                for anchor in contained:
+                    self.anchor_postings[anchor] |= files
+
+    def prune(self) -> int:
+        """Drop over-frequent keyword postings; returns number removed."""
+        if self.max_keyword_df <= 0:
+            return 0
+        frequent = [
+            word for word, files in self.keyword_postings.items()
+            if len(files) > self.max_keyword_df
+        ]
+        for word in frequent:
+            del self.keyword_postings[word]
+        return len(frequent)
+
+    def candidates(self, path: Path) -> Set[Path]:
+        """Return all files sharing at least one posting with ``path``."""
+        features = self.features.get(path)
+        if features is None:
+            return set()
+
+        result: Set[Path] = set()
+        for tag in features.tags:
+            result |= self.tag_postings.get(tag, set())
+        for stem in self.name_neighbors.get(features.stem, ()):
+            result |= self.name_postings[stem]
+
+        shared = Counter()
+        for word in features.words:
+            shared.update(self.keyword_postings.get(word, ()))
+            # Other files' names mentioned here
+            for anchor in self.word_anchors.get(word, ()):
+                result |= self.anchor_owners[anchor]
+        result.update(p for p, count in shared.items() if count >= MIN_SHARED_WORDS)
+
+        # This file's name mentioned in other files' content
+        anchor = self.anchors.get(path)
+        if anchor is not None:
+            result |= self.anchor_postings.get(anchor, set())
+        result |= self.unanchored
+        if path in self.unanchored:
+            result.update(self.features)
+        result.discard(path)
+        return result
+
+
 @dataclass
 class LinkMatch:
     """Represents a successful rule match."""
@@ -50,6 +226,13 @@ class LinkMatch:
 class RuleBasedLinker:
     """Rule-based cross-vault linking engine."""
 
+    NAME_PREFIXES = ['adr-', 'project-', 'insight-', 'session-']
+    NAME_SUFFIXES = ['-workspace', '-analysis', '-report']
+    COMMON_WORDS = {
+        'the', 'and', 'or', 'but', 'in', 'on', 'at',
+        'to', 'for', 'of', 'with', 'by'
+    }
+
     def __init__(
         self,
         cortex_path: Path,
@@ -76,8 +259,10 @@ class RuleBasedLinker:
         self.load_rules()
 
         # Cache for performance
-        self.file_cache = {}
+        self.parse_cache = get_parse_cache(self.cortex_path)
+        self.file_cache: Dict[str, FileFeatures] = {}
         self.tag_cache = {}
+        self.index: Optional[LinkCandidateIndex] = None
 
     def load_rules(self):
         """Load linking rules from configuration."""
@@ -152,10 +337,10 @@ class RuleBasedLinker:
 
         tags = []
         try:
-            content = self.storage.read_text(file_path)
-            hashtags = re.findall(r'#([a-zA-Z0-9-_/]+)', content)
-            tags.extend(hashtags)
-            self.tag_cache[str(file_path)] = tags
+            parsed = self.parse_cache.get(file_path, self.storage.read_text)
+            if parsed is not None:
+                tags.extend(parsed.hashtags)
+                self.tag_cache[str(file_path)] = tags
         except Exception as e:
             self.logger.error(
                 "Error extracting tags from %s: %s", file_path, e
@@ -163,6 +348,85 @@ class RuleBasedLinker:
 
         return tags
 
+    def normalize_stem(self, file_path: Path) -> str:
+        """Lowercase file stem without the common prefixes/suffixes."""
+        name = file_path.stem.lower()
+        for prefix in self.NAME_PREFIXES:
+            name = name.removeprefix(prefix)
+        for suffix in self.NAME_SUFFIXES:
+            name = name.removesuffix(suffix)
+        return name
+
+    def get_file_features(self, file_path: Path) -> Optional[FileFeatures]:
+        """Tokenize a file once per cycle (parsed data comes from the cache)."""
+        key = str(file_path)
+        if key in self.file_cache:
+            return self.file_cache[key]
+
+        try:
+            words = self.parse_cache.derive(
+                file_path,
+                WORDS_CACHE_KEY,
+                lambda content: sorted(
+                    set(re.findall(r'\w+', content.lower()))
+                    - self.COMMON_WORDS
+                ),
+                self.storage.read_text
+            )
+        except Exception as e:
+            self.logger.error("Error reading %s: %s", file_path, e)
+            return None
+        if words is None:
+            return None
+
+        stem = self.normalize_stem(file_path)
+        features = FileFeatures(
+            tags=set(self.extract_tags_from_file(file_path)),
+            stem=stem,
+            words=set(words)
+        )
+        self.file_cache[key] = features
+        return features
+
+    def get_file_content(self, file_path: Path) -> str:
+        """Lowercased file content, read at most once per cycle."""
+        features = self.get_file_features(file_path)
+        if features is None:
+            return ""
+        if features.content is None:
+            features.content = self.storage.read_text(file_path).lower()
+        return features.content
+
+    def build_index(self, files: Iterable[Path]) -> LinkCandidateIndex:
+        """Build the candidate index for a set of files."""
+        unique_files = list(dict.fromkeys(files))
+        max_df = 0
+        if self.config.get('prune_frequent_keywords', False):
+            ratio = float(self.config.get('max_keyword_df_ratio', 0.05))
+            min_df = int(self.config.get('min_keyword_df_limit', 50))
+            max_df = max(min_df, int(len(unique_files) * ratio))
+        index = LinkCandidateIndex(
+            max_keyword_df=max_df, common_words=frozenset(self.COMMON_WORDS)
+        )
+
+        for file_path in unique_files:
+            features = self.get_file_features(file_path)
+            if features is not None:
+                index.add(file_path, features)
+
+        index.index_names()
+        pruned = index.prune()
+        self.logger.debug(
+            "Indexed %d files (%d tags, %d stems, %d keywords, %d pruned)",
+            len(index.features),
+            len(index.tag_postings),
+            len(index.name_postings),
+            len(index.keyword_postings),
+            pruned
+        )
+        self.parse_cache.save()
+        return index
+
     def files_share_tags(
         self, file1: Path, file2: Path, min_shared: int = 1
     ) -> bool:
@@ -172,25 +436,46 @@ class RuleBasedLinker:
         shared = tags1.intersection(tags2)
         return len(shared) >= min_shared
 
-    def apply_rule(self, rule: LinkRule) -> List[LinkMatch]:
-        """Apply a single rule and find matches."""
+    def get_rule_files(self, rule: LinkRule):
+        """Return (trigger_files, target_files) for a rule."""
+        trigger_pattern = rule.trigger.get('path_pattern', '')
+        target_pattern = rule.target.get('path_pattern', '')
+        return (
+            self.find_files_matching_pattern(trigger_pattern),
+            self.find_files_matching_pattern(target_pattern)
+        )
+
+    def apply_rule(
+        self, rule: LinkRule, index: Optional[LinkCandidateIndex] = None
+    ) -> List[LinkMatch]:
+        """Apply a single rule and find matches.
+
+        Candidate pairs come from the inverted index; pass a prebuilt
+        ``index`` to share it across rules of one cycle.
+        """
         matches = []
 
         if not rule.enabled:
             return matches
 
         try:
-            trigger_pattern = rule.trigger.get('path_pattern', '')
-            trigger_files = self.find_files_matching_pattern(trigger_pattern)
+            trigger_files, target_files = self.get_rule_files(rule)
+
+            if index is None:
+                index = self.build_index(trigger_files + target_files)
 
-            target_pattern = rule.target.get('path_pattern', '')
-            target_files = self.find_files_matching_pattern(target_pattern)
+            target_order = {
+                path: i for i, path in enumerate(dict.fromkeys(target_files))
+            }
 
             for source_file in trigger_files:
-                for target_file in target_files:
-                    if source_file == target_file:
-                        continue
+                candidates = [
+                    path for path in index.candidates(source_file)
+                    if path in target_order
+                ]
+                candidates.sort(key=target_order.__getitem__)
 
+                for target_file in candidates:
                     if self.should_link_files(source_file, target_file, rule):
                         match = LinkMatch(
                             rule_name=rule.name,
@@ -233,21 +518,8 @@ class RuleBasedLinker:
 
     def files_have_similar_names(self, file1: Path, file2: Path) -> bool:
         """Check if files have similar names (basic implementation)."""
-        name1 = file1.stem.lower()
-        name2 = file2.stem.lower()
-
-        # Remove common prefixes/suffixes
-        prefixes = ['adr-', 'project-', 'insight-', 'session-']
-        suffixes = ['-workspace', '-analysis', '-report']
-
-        for prefix in prefixes:
-            name1 = name1.removeprefix(prefix)
-            name2 = name2.removeprefix(prefix)
-
-        for suffix in suffixes:
-            name1 = name1.removesuffix(suffix)
-            name2 = name2.removesuffix(suffix)
-
+        name1 = self.normalize_stem(file1)
+        name2 = self.normalize_stem(file2)
         return name1 in name2 or name2 in name1
 
     def files_have_content_relationship(
@@ -255,28 +527,21 @@ class RuleBasedLinker:
     ) -> bool:
         """Check if files have content relationships."""
         try:
-            source_content = self.storage.read_text(source).lower()
-            target_content = self.storage.read_text(target).lower()
-
-            source_name = source.stem.lower()
-            target_name = target.stem.lower()
+            source_features = self.get_file_features(source)
+            target_features = self.get_file_features(target)
+            if source_features is None or target_features is None:
+                return False
 
-            if source_name in target_content or target_name in source_content:
+            # Common words are already filtered out of the word sets
+            shared_words = source_features.words & target_features.words
+            if len(shared_words) >= MIN_SHARED_WORDS:
                 return True
 
-            source_words = set(re.findall(r'\w+', source_content))
-            target_words = set(re.findall(r'\w+', target_content))
-
-            # Filter out common words
-            common_words = {
-                'the', 'and', 'or', 'but', 'in', 'on', 'at',
-                'to', 'for', 'of', 'with', 'by'
-            }
-            source_words -= common_words
-            target_words -= common_words
+            source_name = source.stem.lower()
+            target_name = target.stem.lower()
 
-            shared_words = source_words.intersection(target_words)
-            return len(shared_words) >= 3
+            return (source_name in self.get_file_content(target)
+                    or target_name in self.get_file_content(source))
 
         except Exception as e:
             self.logger.error("Error checking content relationship: %s", e)
@@ -286,13 +551,24 @@ class RuleBasedLinker:
         """Apply all enabled rules and collect matches."""
         all_matches = []
 
-        for rule in self.rules:
-            if rule.enabled:
-                matches = self.apply_rule(rule)
-                all_matches.extend(matches)
-                self.logger.info(
-                    "Rule '%s' found %d matches", rule.name, len(matches)
-                )
+        # Fresh per-cycle caches: files may have changed since the last run
+        self.file_cache.clear()
+        self.tag_cache.clear()
+
+        enabled_rules = [rule for rule in self.rules if rule.enabled]
+        cycle_files: List[Path] = []
+        for rule in enabled_rules:
+            trigger_files, target_files = self.get_rule_files(rule)
+            cycle_files.extend(trigger_files)
+            cycle_files.extend(target_files)
+        self.index = self.build_index(cycle_files)
+
+        for rule in enabled_rules:
+            matches = self.apply_rule(rule, self.index)
+            all_matches.extend(matches)
+            self.logger.info(
+                "Rule '%s' found %d matches", rule.name, len(matches)
+            )
 
         return all_matches
 
@@ -0,0 +1,142 @@
+"""
+Tag Similarity Engine
+
+Vectorized Jaccard similarity between sets of tags. Each file's tag set is
+encoded as a row of a sparse binary matrix; the intersection sizes of all
+file pairs between two vaults come from one sparse matrix product, and the
+Jaccard score is derived from the row sums:
+
+    jaccard(a, b) = |a & b| / (|a| + |b| - |a & b|)
+
+Only pairs with at least one shared tag produce a non-zero entry, so the
+work is proportional to the number of overlapping pairs. Rows are processed
+in blocks to keep the size of each product bounded.
+"""
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    sparse = None
+    SCIPY_AVAILABLE = False
+
+# (left_row, right_row, jaccard)
+ScoredPair = Tuple[int, int, float]
+
+
+def build_vocabulary(tag_sets: Iterable[Set[str]]) -> Dict[str, int]:
+    """Assign a stable column index to every tag."""
+    vocabulary: Dict[str, int] = {}
+    for tags in tag_sets:
+        for tag in sorted(tags):
+            if tag not in vocabulary:
+                vocabulary[tag] = len(vocabulary)
+    return vocabulary
+
+
+def encode_tag_sets(
+    tag_sets: Sequence[Set[str]], vocabulary: Dict[str, int]
+):
+    """Encode tag sets as rows of a binary CSR matrix."""
+    if not SCIPY_AVAILABLE:
+        raise ImportError(
+            "scipy is required for the sparse similarity engine: "
+            "pip install scipy"
+        )
+
+    indptr = [0]
+    indices: List[int] = []
+    for tags in tag_sets:
+        indices.extend(sorted(vocabulary[t] for t in tags if t in vocabulary))
+        indptr.append(len(indices))
+
+    data = np.ones(len(indices), dtype=np.int32)
+    return sparse.csr_matrix(
+        (data, np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+        shape=(len(tag_sets), len(vocabulary)),
+    )
+
+
+def iter_similar_pairs(
+    left,
+    right,
+    min_similarity: float,
+    block_size: int = 1024,
+) -> Iterator[ScoredPair]:
+    """Yield (i, j, jaccard) for row pairs with jaccard >= min_similarity.
+
+    Pairs are yielded in row-major order (by ``i``, then ``j``). Pairs
+    without any shared tag are never yielded.
+    """
+    if left.shape[0] == 0 or right.shape[0] == 0:
+        return
+
+    left_sizes = np.asarray(left.sum(axis=1)).ravel()
+    right_sizes = np.asarray(right.sum(axis=1)).ravel()
+    right_t = right.T.tocsc()
+
+    for start in range(0, left.shape[0], block_size):
+        block = left[start:start + block_size]
+        inter = (block @ right_t).tocoo()
+        if inter.nnz == 0:
+            continue
+
+        rows = inter.row + start
+        cols = inter.col
+        shared = inter.data.astype(np.float64)
+        union = left_sizes[rows] + right_sizes[cols] - shared
+        scores = shared / union
+
+        keep = scores >= min_similarity
+        rows, cols, scores = rows[keep], cols[keep], scores[keep]
+
+        order = np.lexsort((cols, rows))
+        for k in order:
+            yield int(rows[k]), int(cols[k]), float(scores[k])
+
+
+def top_k(
+    pairs: Iterable[Tuple[float, object]], k: int
+) -> List[Tuple[float, object]]:
+    """Keep the k best (score, item) entries of a stream, best first.
+
+    Memory stays O(k). On equal scores the earlier item wins, matching a
+    stable sort of the full stream.
+    """
+    if k <= 0:
+        return []
+    heap: List[Tuple[float, int, object]] = []
+    for seq, (score, item) in enumerate(pairs):
+        entry = (score, -seq, item)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+    heap.sort(key=lambda e: e[:2], reverse=True)
+    return [(score, item) for score, _, item in heap]
+
+
+def jaccard(tags1: Set[str], tags2: Set[str]) -> float:
+    """Reference Jaccard similarity of two tag sets."""
+    if not tags1 or not tags2:
+        return 0.0
+    total = tags1 | tags2
+    return len(tags1 & tags2) / len(total) if total else 0.0
+
+
+def default_backend(preferred: Optional[str] = None) -> str:
+    """Resolve 'auto' to the best available backend."""
+    if preferred in (None, "auto"):
+        return "sparse" if SCIPY_AVAILABLE else "python"
+    if preferred == "sparse" and not SCIPY_AVAILABLE:
+        raise ImportError(
+            "scipy is required for the sparse similarity engine: "
+            "pip install scipy"
+        )
+    return preferred
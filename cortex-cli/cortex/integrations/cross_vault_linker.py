@@ -8,14 +8,17 @@ from __future__ import annotations
 
 import json
 import logging
-import re
+import time
 from collections import defaultdict
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
+from ..core import tag_similarity
+from ..core.minhash_lsh import MinHashStore, note_tokens
 from ..core.storage_provider import StorageProvider, MarkdownFSProvider
+from ..utils.parse_cache import get_parse_cache
 
 
 @dataclass
@@ -96,6 +99,9 @@ class CrossVaultLinker:
         for path in (self.data_path, self.cache_path, self.logs_path):
             path.mkdir(parents=True, exist_ok=True)
 
+        self.parse_cache = get_parse_cache(self.hub_path)
+        self.lsh_stats: Dict[str, int] = {}
+
         self._setup_logging()
 
     def _setup_logging(self) -> None:
@@ -148,34 +154,175 @@ class CrossVaultLinker:
     # ---------- extraction ----------
 
     def extract_file_tags(self, file_path: Path) -> Set[str]:
-        content = self._read_file_safe(file_path)
-        if not content:
+        # Hashtags plus frontmatter tags (tags: [a, b]) from the parse cache
+        parsed = self.parse_cache.get(file_path, self.storage.read_text)
+        if parsed is None:
             return set()
-        tags = set(re.findall(r"#([A-Za-z0-9_\-]+)", content))
-        # YAML frontmatter tags: tags: [a, b]
-        for block in re.findall(r"tags:\s*\[(.*?)\]", content, re.IGNORECASE):
-            parts = (
-                t.strip().strip("'\"") for t in block.split(",") if t.strip()
-            )
-            tags.update(parts)
-        return tags
+        return set(parsed.tags)
 
     # ---------- analysis ----------
 
     def calculate_file_similarity(
         self, file1_tags: Set[str], file2_tags: Set[str]
     ) -> float:
-        if not file1_tags or not file2_tags:
-            return 0.0
-        shared = file1_tags & file2_tags
-        total = file1_tags | file2_tags
-        return len(shared) / len(total) if total else 0.0
+        return tag_similarity.jaccard(file1_tags, file2_tags)
+
+    def _build_suggestion(
+        self,
+        v1: str,
+        file1: Path,
+        tags1: Set[str],
+        v2: str,
+        file2: Path,
+        tags2: Set[str],
+        sim: float,
+    ) -> LinkSuggestion:
+        shared = sorted((tags1 & tags2))
+        conf = min(sim * 1.5, 1.0)
+        if sim >= 0.7:
+            lt = "strong"
+        elif sim >= 0.5:
+            lt = "medium"
+        else:
+            lt = "weak"
+        reason_str = (
+            "Shared tags: "
+            + ", ".join(f"#{t}" for t in shared[:3])
+        )
+        return LinkSuggestion(
+            source_vault=v1,
+            source_file=file1.name,
+            target_vault=v2,
+            target_file=file2.name,
+            correlation_score=sim,
+            shared_tags=shared,
+            confidence=conf,
+            reason=reason_str,
+            link_type=lt,
+            created_date=datetime.now().isoformat(),
+            is_actionable=sim >= 0.5,
+        )
+
+    def _iter_scored_pairs_python(
+        self,
+        vault_files: Dict[str, Dict[Path, Set[str]]],
+        min_similarity: float,
+    ):
+        names = list(vault_files.keys())
+        for i, v1 in enumerate(names):
+            for v2 in names[i + 1:]:
+                for file1, tags1 in vault_files[v1].items():
+                    for file2, tags2 in vault_files[v2].items():
+                        sim = self.calculate_file_similarity(tags1, tags2)
+                        if sim < min_similarity:
+                            continue
+                        yield sim, (v1, file1, tags1, v2, file2, tags2)
+
+    def _iter_scored_pairs_sparse(
+        self,
+        vault_files: Dict[str, Dict[Path, Set[str]]],
+        min_similarity: float,
+        block_size: int,
+    ):
+        vocabulary = tag_similarity.build_vocabulary(
+            tags for files in vault_files.values() for tags in files.values()
+        )
+        names = list(vault_files.keys())
+        entries = {v: list(vault_files[v].items()) for v in names}
+        matrices = {
+            v: tag_similarity.encode_tag_sets(
+                [tags for _, tags in entries[v]], vocabulary
+            )
+            for v in names
+        }
+
+        for i, v1 in enumerate(names):
+            for v2 in names[i + 1:]:
+                pairs = tag_similarity.iter_similar_pairs(
+                    matrices[v1], matrices[v2], min_similarity, block_size
+                )
+                for row, col, sim in pairs:
+                    file1, tags1 = entries[v1][row]
+                    file2, tags2 = entries[v2][col]
+                    yield sim, (v1, file1, tags1, v2, file2, tags2)
+
+    def _iter_scored_pairs_lsh(
+        self,
+        vault_files: Dict[str, Dict[Path, Set[str]]],
+        min_similarity: float,
+        num_perm: int,
+        bands: int,
+    ):
+        token_sets: Dict[str, Set[str]] = {}
+        vault_of: Dict[str, str] = {}
+        for vault, files in vault_files.items():
+            for path in files:
+                parsed = self.parse_cache.get(path, self.storage.read_text)
+                if parsed is None:
+                    continue
+                key = str(path)
+                token_sets[key] = note_tokens(parsed.tags, parsed.headings)
+                vault_of[key] = vault
+
+        store = MinHashStore(
+            self.cache_path / f"minhash_{num_perm}.json", num_perm
+        )
+        index = store.build_index(token_sets, bands)
+        self.lsh_stats = dict(store.stats, candidate_pairs=0, scored_pairs=0)
+
+        names = list(vault_files.keys())
+        order = {
+            str(path): pos
+            for files in vault_files.values()
+            for pos, path in enumerate(files)
+        }
+        for i, v1 in enumerate(names):
+            later = set(names[i + 1:])
+            for file1, tags1 in vault_files[v1].items():
+                by_vault: Dict[str, List[str]] = defaultdict(list)
+                for key in index.candidates(str(file1)):
+                    if vault_of[key] in later:
+                        by_vault[vault_of[key]].append(key)
+                for v2 in names[i + 1:]:
+                    keys = sorted(by_vault.get(v2, []), key=order.__getitem__)
+                    self.lsh_stats["candidate_pairs"] += len(keys)
+                    for key in keys:
+                        file2 = Path(key)
+                        tags2 = vault_files[v2][file2]
+                        sim = self.calculate_file_similarity(tags1, tags2)
+                        if sim < min_similarity:
+                            continue
+                        self.lsh_stats["scored_pairs"] += 1
+                        yield sim, (v1, file1, tags1, v2, file2, tags2)
 
     def find_cross_vault_links(
-        self, min_similarity: float = 0.3
+        self,
+        min_similarity: float = 0.3,
+        top_k: Optional[int] = None,
+        backend: str = "auto",
+        block_size: int = 1024,
+        num_perm: int = 128,
+        bands: int = 32,
     ) -> List[LinkSuggestion]:
+        """Suggest links between files of different vaults by tag Jaccard.
+
+        Args:
+            min_similarity: Minimum Jaccard similarity of two files' tags.
+            top_k: Keep only the k best suggestions while streaming, so
+                memory stays bounded on large estates.
+            backend: 'sparse' (scipy matrix products), 'python' (pairwise
+                set operations), 'lsh' (approximate MinHash/LSH candidates,
+                scored exactly) or 'auto'.
+            block_size: Rows per sparse product block.
+            num_perm: MinHash permutations (lsh backend).
+            bands: LSH bands; more bands raise recall, fewer raise
+                precision (lsh backend).
+        """
+        backend = tag_similarity.default_backend(backend)
         self.logger.info(
-            "Discovering links with min_similarity=%.2f", min_similarity
+            "Discovering links with min_similarity=%.2f (backend=%s)",
+            min_similarity,
+            backend,
         )
         start = datetime.now()
 
@@ -188,45 +335,30 @@ class CrossVaultLinker:
                 if tags:
                     files[md] = tags
             vault_files[vault.name] = files
+        self.parse_cache.save()
+
+        if backend == "sparse":
+            scored = self._iter_scored_pairs_sparse(
+                vault_files, min_similarity, block_size
+            )
+        elif backend == "lsh":
+            scored = self._iter_scored_pairs_lsh(
+                vault_files, min_similarity, num_perm, bands
+            )
+        else:
+            scored = self._iter_scored_pairs_python(
+                vault_files, min_similarity
+            )
+
+        if top_k is not None:
+            best = tag_similarity.top_k(scored, top_k)
+            suggestions = [self._build_suggestion(*pair, sim)
+                           for sim, pair in best]
+        else:
+            suggestions = [self._build_suggestion(*pair, sim)
+                           for sim, pair in scored]
+            suggestions.sort(key=lambda s: s.correlation_score, reverse=True)
 
-        suggestions: List[LinkSuggestion] = []
-        names = list(vault_files.keys())
-        for i, v1 in enumerate(names):
-            for v2 in names[i + 1:]:
-                for file1, tags1 in vault_files[v1].items():
-                    for file2, tags2 in vault_files[v2].items():
-                        sim = self.calculate_file_similarity(tags1, tags2)
-                        if sim < min_similarity:
-                            continue
-                        shared = sorted((tags1 & tags2))
-                        conf = min(sim * 1.5, 1.0)
-                        if sim >= 0.7:
-                            lt = "strong"
-                        elif sim >= 0.5:
-                            lt = "medium"
-                        else:
-                            lt = "weak"
-                        reason_str = (
-                            "Shared tags: "
-                            + ", ".join(f"#{t}" for t in shared[:3])
-                        )
-                        suggestions.append(
-                            LinkSuggestion(
-                                source_vault=v1,
-                                source_file=file1.name,
-                                target_vault=v2,
-                                target_file=file2.name,
-                                correlation_score=sim,
-                                shared_tags=shared,
-                                confidence=conf,
-                                reason=reason_str,
-                                link_type=lt,
-                                created_date=datetime.now().isoformat(),
-                                is_actionable=sim >= 0.5,
-                            )
-                        )
-
-        suggestions.sort(key=lambda s: s.correlation_score, reverse=True)
         elapsed = (datetime.now() - start).total_seconds()
         self.logger.info(
             "Found %d suggestions in %.2fs",
@@ -235,6 +367,50 @@ class CrossVaultLinker:
         )
         return suggestions
 
+    def benchmark_lsh(
+        self,
+        min_similarity: float = 0.3,
+        num_perm: int = 128,
+        bands: int = 32,
+    ) -> Dict[str, Any]:
+        """Compare the LSH backend with the exact backend on this estate.
+
+        recall: share of exact suggestions also found via LSH.
+        candidate_precision: share of LSH candidate pairs that passed
+        min_similarity (LSH suggestions are scored exactly, so they never
+        contain false positives).
+        """
+        start = time.perf_counter()
+        exact = self.find_cross_vault_links(min_similarity)
+        exact_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        approx = self.find_cross_vault_links(
+            min_similarity, backend="lsh", num_perm=num_perm, bands=bands
+        )
+        lsh_seconds = time.perf_counter() - start
+
+        def key(s: LinkSuggestion):
+            return (s.source_vault, s.source_file, s.target_vault, s.target_file)
+
+        exact_keys = {key(s) for s in exact}
+        found = len(exact_keys & {key(s) for s in approx})
+        candidates = self.lsh_stats.get("candidate_pairs", 0)
+        return {
+            "min_similarity": min_similarity,
+            "num_perm": num_perm,
+            "bands": bands,
+            "exact_suggestions": len(exact),
+            "lsh_suggestions": len(approx),
+            "recall": found / len(exact_keys) if exact_keys else 1.0,
+            "candidate_pairs": candidates,
+            "candidate_precision": len(approx) / candidates if candidates else 1.0,
+            "exact_seconds": round(exact_seconds, 4),
+            "lsh_seconds": round(lsh_seconds, 4),
+            "signatures_reused": self.lsh_stats.get("reused", 0),
+            "signatures_computed": self.lsh_stats.get("computed", 0),
+        }
+
     def generate_vault_connections(self) -> List[VaultConnection]:
         self.logger.info("Aggregating vault connections ...")
         vaults = self.discover_vaults()
@@ -250,6 +426,7 @@ class CrossVaultLinker:
                     counts[t] += 1
             tag_usage[v.name] = dict(counts)
             file_counts[v.name] = total
+        self.parse_cache.save()
 
         conns: List[VaultConnection] = []
         names = list(tag_usage.keys())
@@ -288,9 +465,22 @@ class CrossVaultLinker:
 
     # ---------- report ----------
 
-    def run_full_analysis(self, min_similarity: float = 0.3) -> LinkingReport:
+    def run_full_analysis(
+        self,
+        min_similarity: float = 0.3,
+        top_k: Optional[int] = None,
+        backend: str = "auto",
+        num_perm: int = 128,
+        bands: int = 32,
+    ) -> LinkingReport:
         start = datetime.now()
-        suggestions = self.find_cross_vault_links(min_similarity)
+        suggestions = self.find_cross_vault_links(
+            min_similarity,
+            top_k=top_k,
+            backend=backend,
+            num_perm=num_perm,
+            bands=bands,
+        )
         connections = self.generate_vault_connections()
         elapsed = (datetime.now() - start).total_seconds()
 
@@ -339,12 +529,51 @@ def main() -> None:
         default=0.3,
         help="Minimum similarity threshold",
     )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=None,
+        help="Keep only the k best suggestions (bounded memory)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["auto", "sparse", "python", "lsh"],
+        default="auto",
+        help="Similarity backend",
+    )
+    parser.add_argument(
+        "--num-perm", type=int, default=128, help="MinHash permutations (lsh)"
+    )
+    parser.add_argument(
+        "--bands", type=int, default=32, help="LSH bands (lsh)"
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Compare the lsh backend against exact scoring",
+    )
     parser.add_argument("--output", help="Optional output file (JSON)")
 
     args = parser.parse_args()
 
     linker = CrossVaultLinker(args.hub_path)
-    report = linker.run_full_analysis(args.min_similarity)
+
+    if args.benchmark:
+        result = linker.benchmark_lsh(
+            args.min_similarity, num_perm=args.num_perm, bands=args.bands
+        )
+        print("\n=== LSH Benchmark ===")
+        for name, value in result.items():
+            print(f"{name}: {value}")
+        return
+
+    report = linker.run_full_analysis(
+        args.min_similarity,
+        top_k=args.top_k,
+        backend=args.backend,
+        num_perm=args.num_perm,
+        bands=args.bands,
+    )
 
     print("\n=== Cross-Vault Linking Report ===")
     print(f"Total Suggestions: {report.total_suggestions}")
@@ -18,6 +18,14 @@ from typing import Dict, List, Tuple, Optional, Set, Any
 from collections import defaultdict, Counter
 import re
 import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+from ..utils.parse_cache import ParsedMarkdown, get_parse_cache, parse_markdown
+
+# Parse cache keys of the per-file extractions; bump the version when
+# _structure_indicators or _tag_contexts change
+STRUCTURE_CACHE_KEY = 'multi_vault.structure:v1'
+TAG_CONTEXTS_CACHE_KEY = 'multi_vault.tag_contexts:v1'
 
 
 @dataclass
@@ -48,6 +56,121 @@ class VaultProfile:
     dominant_tags: List[str] = None
     structure_complexity: float = 0.0
     activity_level: str = "unknown"
+    link_density: float = 0.0
+
+
+@dataclass
+class FileContribution:
+    """Contribution of a single file to its vault's aggregate metrics"""
+    mtime: float
+    size: int
+    content_hash: str
+    tags: Dict[str, int]
+    words: int
+    links: int
+    structure: List[str]
+
+
+class VaultManifest:
+    """
+    Persistent per-vault file manifest with running aggregates
+
+    Every analyzed file is recorded with its stat, content hash and
+    contribution (tag counts, words, links, structure indicators). Vault
+    aggregates are updated by subtracting the contribution of removed or
+    changed files and adding the new one, so re-analysis costs time
+    proportional to the change instead of the vault size.
+    """
+
+    VERSION = 1
+
+    def __init__(self, manifest_file: Path):
+        self.manifest_file = manifest_file
+        self.files: Dict[str, FileContribution] = {}
+        self.tag_frequency: Counter = Counter()
+        self.structure_counts: Counter = Counter()
+        self.total_words = 0
+        self.total_links = 0
+        self.total_size = 0
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        if not self.manifest_file.exists():
+            return
+        try:
+            with open(self.manifest_file, 'r') as f:
+                data = json.load(f)
+            if data.get('version') != self.VERSION:
+                return
+            self.files = {
+                path: FileContribution(**entry)
+                for path, entry in data['files'].items()
+            }
+            self.tag_frequency = Counter(data['tag_frequency'])
+            self.structure_counts = Counter(data['structure_counts'])
+            self.total_words = data['total_words']
+            self.total_links = data['total_links']
+            self.total_size = data['total_size']
+        except Exception:
+            # Unreadable manifest: start over with a full analysis
+            self.files = {}
+            self.tag_frequency = Counter()
+            self.structure_counts = Counter()
+            self.total_words = self.total_links = self.total_size = 0
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.manifest_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({
+                'version': self.VERSION,
+                'files': {path: asdict(c) for path, c in self.files.items()},
+                'tag_frequency': dict(self.tag_frequency),
+                'structure_counts': dict(self.structure_counts),
+                'total_words': self.total_words,
+                'total_links': self.total_links,
+                'total_size': self.total_size
+            }, f)
+        os.replace(tmp_file, self.manifest_file)
+        self._dirty = False
+
+    def is_current(self, rel_path: str, mtime: float, size: int) -> bool:
+        entry = self.files.get(rel_path)
+        return entry is not None and entry.mtime == mtime and entry.size == size
+
+    def add(self, rel_path: str, contribution: FileContribution):
+        self.remove(rel_path)
+        self.files[rel_path] = contribution
+        self.tag_frequency.update(contribution.tags)
+        self.structure_counts.update(contribution.structure)
+        self.total_words += contribution.words
+        self.total_links += contribution.links
+        self.total_size += contribution.size
+        self._dirty = True
+
+    def remove(self, rel_path: str):
+        contribution = self.files.pop(rel_path, None)
+        if contribution is None:
+            return
+        self.tag_frequency.subtract(contribution.tags)
+        self.structure_counts.subtract(contribution.structure)
+        for counter, keys in ((self.tag_frequency, contribution.tags),
+                              (self.structure_counts, contribution.structure)):
+            for key in keys:
+                if counter[key] <= 0:
+                    del counter[key]
+        self.total_words -= contribution.words
+        self.total_links -= contribution.links
+        self.total_size -= contribution.size
+        self._dirty = True
+
+    def dominant_tags(self, limit: int = 10) -> List[str]:
+        """Most frequent tags, ties broken alphabetically"""
+        ranked = sorted(self.tag_frequency.items(), key=lambda item: (-item[1], item[0]))
+        return [tag for tag, _ in ranked[:limit]]
 
 
 @dataclass
@@ -101,9 +224,12 @@ class MultiVaultAI:
         
         self.setup_logging()
         self.config = self.load_config()
+        self.parse_cache = get_parse_cache(self.hub_path)
         
         # Learning data structures
         self.vault_profiles: Dict[str, VaultProfile] = {}
+        self.vault_manifests: Dict[str, VaultManifest] = {}
+        self._pending_deltas: Dict[str, Tuple[Dict[str, Path], List[str]]] = {}
         self.tag_correlations: List[TagCorrelation] = []
         self.cross_vault_patterns: List[CrossVaultPattern] = []
         self.ai_insights: List[AIInsight] = []
@@ -164,7 +290,9 @@ class MultiVaultAI:
             'performance': {
                 'max_analysis_time_minutes': 30,
                 'enable_parallel_processing': True,
-                'cache_analysis_results': True
+                'cache_analysis_results': True,
+                'max_workers': None,  # None = os.cpu_count()
+                'file_chunk_size': 200  # files per worker task
             }
         }
         
@@ -351,25 +479,66 @@ class MultiVaultAI:
             return 0.0
     
     async def analyze_vaults_parallel(self, vaults: List[Path], force_refresh: bool = False):
-        """Analyze vaults in parallel for improved performance"""
-        tasks = []
+        """Analyze vaults in parallel for improved performance
         
+        The changed files of all vaults are split into chunks and parsed in
+        a process pool; the parent merges the returned contributions into
+        the vault manifests in vault order, so the result is independent of
+        worker scheduling.
+        """
+        deltas = []
         for vault_path in vaults:
             if force_refresh or await self._needs_analysis(vault_path):
-                task = asyncio.create_task(self.analyze_vault_async(vault_path))
-                tasks.append(task)
+                delta = self._pending_deltas.pop(str(vault_path), None)
+                try:
+                    deltas.append((vault_path, *(delta or self._manifest_delta(vault_path))))
+                except Exception as e:
+                    self.logger.error(f"Error analyzing vault {vault_path}: {e}")
         
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            successful_analyses = 0
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    self.logger.error(f"Error analyzing vault {vaults[i]}: {result}")
+        if not deltas:
+            return
+        
+        performance = self.config['performance']
+        max_workers = performance.get('max_workers') or os.cpu_count() or 1
+        chunk_size = max(1, performance.get('file_chunk_size') or 200)
+        
+        files = [str(md_file) for _, changed, _ in deltas for md_file in changed.values()]
+        chunks = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+        
+        results: Dict[str, Tuple[Optional[ParsedMarkdown], Optional[FileContribution]]] = {}
+        if max_workers > 1 and len(chunks) > 1:
+            try:
+                loop = asyncio.get_running_loop()
+                with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+                    chunk_results = await asyncio.gather(*[
+                        loop.run_in_executor(pool, compute_file_contributions, chunk)
+                        for chunk in chunks
+                    ])
+                for chunk, chunk_result in zip(chunks, chunk_results):
+                    results.update(zip(chunk, chunk_result))
+            except Exception as e:
+                self.logger.warning(f"Process pool unavailable, analyzing in-process: {e}")
+                results = {}
+        
+        successful_analyses = 0
+        for vault_path, changed, removed in deltas:
+            contributions = {}
+            for rel_path, md_file in changed.items():
+                if str(md_file) in results:
+                    parsed, contribution = results[str(md_file)]
+                    if parsed is not None:
+                        self.parse_cache.put(parsed)
+                    contributions[rel_path] = contribution
                 else:
-                    successful_analyses += 1
+                    contributions[rel_path] = self._safe_file_contribution(md_file)
             
-            self.logger.info(f"Parallel analysis: {successful_analyses}/{len(tasks)} vaults successful")
+            if self._apply_vault_delta(vault_path, contributions, removed) is not None:
+                successful_analyses += 1
+        
+        self.logger.info(
+            f"Parallel analysis: {successful_analyses}/{len(deltas)} vaults successful "
+            f"({len(files)} files in {len(chunks)} chunks, {max_workers} workers)"
+        )
     
     async def analyze_vaults_sequential(self, vaults: List[Path], force_refresh: bool = False):
         """Analyze vaults sequentially (fallback method)"""
@@ -391,93 +560,153 @@ class MultiVaultAI:
         if datetime.now() - last_analyzed > timedelta(hours=24):
             return True
         
-        # Check for recent file modifications
+        # Compare file stats against the manifest; the delta is kept for
+        # analyze_vault_async so the vault is only walked once
         try:
-            for md_file in vault_path.glob('**/*.md'):
-                if md_file.exists():
-                    file_time = datetime.fromtimestamp(md_file.stat().st_mtime)
-                    if file_time > last_analyzed:
-                        return True
+            changed, removed = self._manifest_delta(vault_path)
         except Exception:
-            pass
+            return False
+        if changed or removed:
+            self._pending_deltas[str(vault_path)] = (changed, removed)
+            return True
         
         return False
     
+    def _get_manifest(self, vault_name: str) -> VaultManifest:
+        """Per-vault manifest stored next to the learning data"""
+        if vault_name not in self.vault_manifests:
+            self.vault_manifests[vault_name] = VaultManifest(
+                self.data_path / "manifests" / f"{vault_name}.json"
+            )
+        return self.vault_manifests[vault_name]
+    
+    def _manifest_delta(self, vault_path: Path) -> Tuple[Dict[str, Path], List[str]]:
+        """Files added or changed since the last analysis, and files removed
+        
+        Returns:
+            ({relative path: absolute path} of new/changed files,
+             [relative paths of removed files])
+        """
+        manifest = self._get_manifest(vault_path.name)
+        seen = set()
+        changed = {}
+        
+        for md_file in vault_path.glob('**/*.md'):
+            if self._is_excluded_file(md_file):
+                continue
+            try:
+                stat = md_file.stat()
+            except OSError:
+                continue
+            rel_path = md_file.relative_to(vault_path).as_posix()
+            seen.add(rel_path)
+            if not manifest.is_current(rel_path, stat.st_mtime, stat.st_size):
+                changed[rel_path] = md_file
+        
+        removed = [rel_path for rel_path in manifest.files if rel_path not in seen]
+        return changed, removed
+    
+    def _file_contribution(self, md_file: Path) -> Optional[FileContribution]:
+        """Tag, word, link and structure contribution of a single file"""
+        parsed = self.parse_cache.get(md_file)
+        if parsed is None:
+            return None
+        
+        structure = self.parse_cache.derive(md_file, STRUCTURE_CACHE_KEY, self._structure_indicators) or []
+        return self._contribution_from_parsed(parsed, structure)
+    
+    @classmethod
+    def _contribution_from_parsed(cls, parsed: ParsedMarkdown,
+                                  structure: List[str]) -> FileContribution:
+        real_tags = Counter(tag for tag in parsed.hashtags if not cls._is_excluded_tag(tag))
+        return FileContribution(
+            mtime=parsed.mtime,
+            size=parsed.size,
+            content_hash=parsed.content_hash,
+            tags=dict(real_tags),
+            words=parsed.word_count,
+            links=len(parsed.wiki_links),
+            structure=list(structure)
+        )
+    
+    def _safe_file_contribution(self, md_file: Path) -> Optional[FileContribution]:
+        try:
+            return self._file_contribution(md_file)
+        except Exception as e:
+            self.logger.warning(f"Error analyzing file {md_file}: {e}")
+            return None
+    
     async def analyze_vault_async(self, vault_path: Path) -> VaultProfile:
-        """Asynchronously analyze a single vault with enhanced profiling"""
+        """Asynchronously analyze a single vault with enhanced profiling
+        
+        Only files added, changed or removed since the last analysis are
+        processed; their contributions are applied to the vault manifest.
+        """
+        try:
+            delta = self._pending_deltas.pop(str(vault_path), None)
+            changed, removed = delta or self._manifest_delta(vault_path)
+            contributions = {
+                rel_path: self._safe_file_contribution(md_file)
+                for rel_path, md_file in changed.items()
+            }
+        except Exception as e:
+            self.logger.error(f"Error analyzing vault {vault_path}: {e}")
+            return None
+        
+        return self._apply_vault_delta(vault_path, contributions, removed)
+    
+    def _apply_vault_delta(self, vault_path: Path,
+                           contributions: Dict[str, Optional[FileContribution]],
+                           removed: List[str]) -> Optional[VaultProfile]:
+        """Apply file contributions to the vault manifest and rebuild the profile
+        
+        Args:
+            vault_path: Vault directory
+            contributions: New contributions of added/changed files
+                (None for files that could not be read)
+            removed: Relative paths of files that no longer exist
+        """
         try:
             vault_name = vault_path.name
             analysis_start = time.time()
             
-            # Basic metrics
-            md_files = list(vault_path.glob('**/*.md'))
-            file_count = len([f for f in md_files if not self._is_excluded_file(f)])
-            
-            total_size = sum(f.stat().st_size for f in md_files if f.exists())
-            size_mb = total_size / (1024 * 1024)
-            
-            # Enhanced tag analysis
-            all_tags = set()
-            tag_frequency = Counter()
-            content_analysis = {
-                'total_words': 0,
-                'avg_file_length': 0,
-                'link_density': 0,
-                'structure_indicators': []
-            }
+            manifest = self._get_manifest(vault_name)
             
-            for md_file in md_files:
-                if self._is_excluded_file(md_file):
-                    continue
-                
-                try:
-                    with open(md_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        
-                        # Tag extraction and analysis
-                        tags = re.findall(r'#([a-zA-Z0-9_-]+)', content)
-                        real_tags = [tag for tag in tags if not self._is_excluded_tag(tag)]
-                        all_tags.update(real_tags)
-                        tag_frequency.update(real_tags)
-                        
-                        # Content analysis
-                        words = len(content.split())
-                        content_analysis['total_words'] += words
-                        
-                        # Link analysis
-                        wiki_links = len(re.findall(r'\[\[([^\]]+)\]\]', content))
-                        content_analysis['link_density'] += wiki_links
-                        
-                        # Structure indicators
-                        if content.startswith('#'):
-                            content_analysis['structure_indicators'].append('structured_headers')
-                        if '>' in content:
-                            content_analysis['structure_indicators'].append('has_quotes')
-                        if '```' in content:
-                            content_analysis['structure_indicators'].append('has_code_blocks')
-                            
-                except Exception as e:
-                    self.logger.warning(f"Error analyzing file {md_file}: {e}")
+            for rel_path in removed:
+                manifest.remove(rel_path)
+            
+            for rel_path in sorted(contributions):
+                contribution = contributions[rel_path]
+                if contribution is None:
+                    self.logger.warning(f"Error analyzing file {vault_path / rel_path}: unreadable")
+                    manifest.remove(rel_path)
+                else:
+                    manifest.add(rel_path, contribution)
             
             # Calculate advanced metrics
-            avg_file_length = content_analysis['total_words'] / max(file_count, 1)
-            link_density = content_analysis['link_density'] / max(file_count, 1)
-            structure_complexity = len(set(content_analysis['structure_indicators'])) / 3.0
+            file_count = len(manifest.files)
+            all_tags = set(manifest.tag_frequency)
+            size_mb = manifest.total_size / (1024 * 1024)
+            link_density = manifest.total_links / max(file_count, 1)
+            structure_complexity = len(manifest.structure_counts) / 3.0
             
             # Determine vault type and activity level
             vault_type = self._determine_vault_type(vault_path, all_tags)
-            activity_level = self._calculate_activity_level(vault_path)
+            activity_level = self._activity_level_from_mtimes(
+                [c.mtime for c in manifest.files.values()]
+            )
             health_score = self._calculate_health_score(file_count, len(all_tags), structure_complexity)
             
             # Get dominant tags
-            dominant_tags = [tag for tag, count in tag_frequency.most_common(10)]
+            dominant_tags = manifest.dominant_tags(10)
             
             # Create enhanced profile
+            existing = self.vault_profiles.get(vault_name)
             profile = VaultProfile(
                 name=vault_name,
                 path=str(vault_path),
                 type=vault_type,
-                created=self.vault_profiles.get(vault_name, {}).get('created', datetime.now().isoformat()),
+                created=existing.created if existing else datetime.now().isoformat(),
                 last_analyzed=datetime.now().isoformat(),
                 file_count=file_count,
                 tag_count=len(all_tags),
@@ -486,13 +715,18 @@ class MultiVaultAI:
                 health_score=health_score,
                 dominant_tags=dominant_tags,
                 structure_complexity=structure_complexity,
-                activity_level=activity_level
+                activity_level=activity_level,
+                link_density=round(link_density, 3)
             )
             
             self.vault_profiles[vault_name] = profile
             
             analysis_time = time.time() - analysis_start
-            self.logger.info(f"Analyzed vault '{vault_name}': {file_count} files, {len(all_tags)} tags, health: {health_score:.2f} (took {analysis_time:.2f}s)")
+            self.logger.info(
+                f"Analyzed vault '{vault_name}': {file_count} files, {len(all_tags)} tags, "
+                f"health: {health_score:.2f} ({len(contributions)} changed, {len(removed)} removed, "
+                f"took {analysis_time:.2f}s)"
+            )
             
             return profile
             
@@ -500,6 +734,31 @@ class MultiVaultAI:
             self.logger.error(f"Error analyzing vault {vault_path}: {e}")
             return None
     
+    @staticmethod
+    def _structure_indicators(content: str) -> List[str]:
+        """Structure indicators of a file's content"""
+        indicators = []
+        if content.startswith('#'):
+            indicators.append('structured_headers')
+        if '>' in content:
+            indicators.append('has_quotes')
+        if '```' in content:
+            indicators.append('has_code_blocks')
+        return indicators
+    
+    @staticmethod
+    def _tag_contexts(content: str) -> Dict[str, List[str]]:
+        """Text surrounding each hashtag occurrence (first match per tag)"""
+        contexts = defaultdict(list)
+        for tag in re.findall(r'#([a-zA-Z0-9_-]+)', content):
+            tag_pattern = f'#{tag}'
+            tag_index = content.find(tag_pattern)
+            if tag_index != -1:
+                start = max(0, tag_index - 50)
+                end = min(len(content), tag_index + len(tag_pattern) + 50)
+                contexts[tag].append(content[start:end].strip())
+        return dict(contexts)
+    
     def _is_excluded_file(self, file_path: Path) -> bool:
         """Enhanced file exclusion logic"""
         file_name = file_path.name.lower()
@@ -512,7 +771,8 @@ class MultiVaultAI:
         
         return any(pattern in file_name or pattern in file_str for pattern in exclude_patterns)
     
-    def _is_excluded_tag(self, tag: str) -> bool:
+    @staticmethod
+    def _is_excluded_tag(tag: str) -> bool:
         """Enhanced tag exclusion logic"""
         exclude_patterns = [
             'test', 'performance', 'benchmark', 'temp', 'draft', 
@@ -546,28 +806,35 @@ class MultiVaultAI:
     
     def _calculate_activity_level(self, vault_path: Path) -> str:
         """Calculate vault activity level"""
+        try:
+            mtimes = [
+                md_file.stat().st_mtime
+                for md_file in vault_path.glob('**/*.md')
+                if md_file.exists() and not self._is_excluded_file(md_file)
+            ]
+        except Exception:
+            return 'unknown'
+        return self._activity_level_from_mtimes(mtimes)
+    
+    @staticmethod
+    def _activity_level_from_mtimes(mtimes: List[float]) -> str:
+        """Activity level from file modification times"""
         try:
             now = datetime.now()
-            week_ago = now - timedelta(days=7)
-            month_ago = now - timedelta(days=30)
-            
-            recent_files = 0
-            total_files = 0
-            
-            for md_file in vault_path.glob('**/*.md'):
-                if md_file.exists() and not self._is_excluded_file(md_file):
-                    total_files += 1
-                    file_time = datetime.fromtimestamp(md_file.stat().st_mtime)
-                    
-                    if file_time > week_ago:
-                        recent_files += 2  # Weight recent files more
-                    elif file_time > month_ago:
-                        recent_files += 1
+            week_ago = (now - timedelta(days=7)).timestamp()
+            month_ago = (now - timedelta(days=30)).timestamp()
             
-            if total_files == 0:
+            if not mtimes:
                 return 'empty'
             
-            activity_ratio = recent_files / total_files
+            recent_files = 0
+            for mtime in mtimes:
+                if mtime > week_ago:
+                    recent_files += 2  # Weight recent files more
+                elif mtime > month_ago:
+                    recent_files += 1
+            
+            activity_ratio = recent_files / len(mtimes)
             
             if activity_ratio > 0.3:
                 return 'high'
@@ -689,21 +956,11 @@ class MultiVaultAI:
                     continue
                 
                 try:
-                    with open(md_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        tags = re.findall(r'#([a-zA-Z0-9_-]+)', content)
-                        
-                        # Analyze context around each tag
-                        for tag in tags:
-                            if not self._is_excluded_tag(tag):
-                                # Get surrounding words for context
-                                tag_pattern = f'#{tag}'
-                                tag_index = content.find(tag_pattern)
-                                if tag_index != -1:
-                                    start = max(0, tag_index - 50)
-                                    end = min(len(content), tag_index + len(tag_pattern) + 50)
-                                    context = content[start:end].strip()
-                                    tag_contexts[tag].append(context)
+                    # Analyze context around each tag
+                    file_contexts = self.parse_cache.derive(md_file, TAG_CONTEXTS_CACHE_KEY, self._tag_contexts) or {}
+                    for tag, contexts in file_contexts.items():
+                        if not self._is_excluded_tag(tag):
+                            tag_contexts[tag].extend(contexts)
                                     
                 except Exception as e:
                     self.logger.debug(f"Error analyzing semantic patterns in {md_file}: {e}")
@@ -874,22 +1131,23 @@ class MultiVaultAI:
                         continue
                     
                     try:
-                        with open(md_file, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            tags = [tag for tag in re.findall(r'#([a-zA-Z0-9_-]+)', content) 
-                                   if not self._is_excluded_tag(tag)]
-                            
-                            # Record vault usage
-                            for tag in tags:
-                                tag_vault_usage[tag].add(vault_name)
-                            
-                            # Record co-occurrences
-                            for i, tag1 in enumerate(tags):
-                                for tag2 in tags[i+1:]:
-                                    if tag1 != tag2:
-                                        # Bidirectional recording
-                                        tag_cooccurrences[tag1][tag2] += 1
-                                        tag_cooccurrences[tag2][tag1] += 1
+                        parsed = self.parse_cache.get(md_file)
+                        if parsed is None:
+                            continue
+                        tags = [tag for tag in parsed.hashtags
+                               if not self._is_excluded_tag(tag)]
+                        
+                        # Record vault usage
+                        for tag in tags:
+                            tag_vault_usage[tag].add(vault_name)
+                        
+                        # Record co-occurrences
+                        for i, tag1 in enumerate(tags):
+                            for tag2 in tags[i+1:]:
+                                if tag1 != tag2:
+                                    # Bidirectional recording
+                                    tag_cooccurrences[tag1][tag2] += 1
+                                    tag_cooccurrences[tag2][tag1] += 1
                                         
                     except Exception as e:
                         self.logger.debug(f"Error processing correlations in {md_file}: {e}")
@@ -1161,6 +1419,11 @@ class MultiVaultAI:
             with open(metrics_file, 'w') as f:
                 json.dump(self.analysis_metrics, f, indent=2)
             
+            for manifest in self.vault_manifests.values():
+                manifest.save()
+            
+            self.parse_cache.save()
+            
             self.logger.info("Learning data saved successfully")
             
         except Exception as e:
@@ -1206,6 +1469,31 @@ class MultiVaultAI:
         }
 
 
+def compute_file_contributions(
+    paths: List[str]
+) -> List[Tuple[Optional[ParsedMarkdown], Optional[FileContribution]]]:
+    """Process-pool worker: parse a chunk of files and compute contributions
+    
+    The parsed entries are returned as well so the parent can warm its
+    parse cache; unreadable files yield (None, None).
+    """
+    results = []
+    for path in paths:
+        md_file = Path(path).absolute()
+        try:
+            stat = md_file.stat()
+            content = md_file.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            results.append((None, None))
+            continue
+        
+        parsed = parse_markdown(content, str(md_file), stat.st_mtime, stat.st_size)
+        structure = MultiVaultAI._structure_indicators(content)
+        parsed.derived[STRUCTURE_CACHE_KEY] = structure
+        results.append((parsed, MultiVaultAI._contribution_from_parsed(parsed, structure)))
+    return results
+
+
 # Main CLI integration functions
 async def run_multi_vault_analysis(force_refresh: bool = False) -> Dict:
     """Run comprehensive multi-vault AI analysis"""
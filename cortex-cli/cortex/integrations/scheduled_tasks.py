@@ -148,6 +148,7 @@ class TaskScheduler:
         self.running_tasks: Dict[str, asyncio.Task] = {}
         self.is_running = False
         self.start_time = datetime.now(timezone.utc)
+        self.graph = None  # AsyncGraph, created by the first graph health check
         
         # Load configuration
         self._load_configuration()
@@ -214,7 +215,7 @@ class TaskScheduler:
                 'retry_delay_seconds': 120,
                 'timeout_seconds': 300,
                 'dependencies': [],
-                'parameters': {'check_files': True, 'check_links': True}
+                'parameters': {'check_files': True, 'check_links': True, 'check_graph': True}
             },
             # Cross-Vault Sync (every 15 minutes) 
             {
@@ -288,15 +289,20 @@ class TaskScheduler:
                 self._schedule_task(task)
         
         # Main scheduler loop
-        while self.is_running:
-            try:
-                await self._process_scheduled_tasks()
-                await self._cleanup_completed_tasks()
-                await asyncio.sleep(30)  # Check every 30 seconds
-                
-            except Exception as e:
-                self.logger.error(f"Scheduler error: {e}")
-                await asyncio.sleep(60)
+        try:
+            while self.is_running:
+                try:
+                    await self._process_scheduled_tasks()
+                    await self._cleanup_completed_tasks()
+                    await asyncio.sleep(30)  # Check every 30 seconds
+                    
+                except Exception as e:
+                    self.logger.error(f"Scheduler error: {e}")
+                    await asyncio.sleep(60)
+        finally:
+            if self.graph is not None:
+                from ..utils.neo4j_async import close_async_drivers
+                await close_async_drivers()
     
     def _schedule_task(self, task: TaskDefinition):
         """Schedule a task based on its cron expression"""
@@ -525,11 +531,31 @@ class TaskScheduler:
                 total_files = len(md_files)
                 health_results.append(f"Files: {total_files} MD files found")
             
+            # Check the knowledge graph
+            if task.parameters.get('check_graph', False):
+                health_results.append(await self._check_graph_health())
+            
             return " | ".join(health_results) if health_results else "Health check completed"
             
         except Exception as e:
             raise Exception(f"Health check task failed: {e}")
     
+    async def _check_graph_health(self) -> str:
+        """Graph reachability and size, counted with concurrent async queries"""
+        from ..utils.neo4j_async import AsyncGraph
+        
+        if self.graph is None:
+            self.graph = AsyncGraph()
+        if not await self.graph.ping():
+            return "Graph: unavailable"
+        notes, links, tags = await asyncio.gather(
+            self.graph.read("MATCH (n:Note) RETURN count(n) AS count"),
+            self.graph.read("MATCH (:Note)-[r:LINKS_TO]->(:Note) RETURN count(r) AS count"),
+            self.graph.read("MATCH (t:Tag) RETURN count(t) AS count"),
+        )
+        return (f"Graph: {notes[0]['count']} notes, {links[0]['count']} links, "
+                f"{tags[0]['count']} tags")
+    
     async def _run_sync_task(self, task: TaskDefinition) -> str:
         """Run cross-vault sync task"""
         try:
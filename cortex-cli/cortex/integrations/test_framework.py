@@ -10,6 +10,8 @@ from datetime import datetime
 from typing import Dict, Any
 import logging
 
+from ..utils.parse_cache import get_parse_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -96,6 +98,7 @@ class CortexAnalyzer:
         self.cortex_path = Path(cortex_path)
         self.markdown_files = []
         self.broken_links = []
+        self.parse_cache = get_parse_cache(self.cortex_path)
         
     def analyze_links(self) -> Dict[str, Any]:
         """Analyze all links in the Cortex repository"""
@@ -107,6 +110,7 @@ class CortexAnalyzer:
         # Analyze each file
         for md_file in self.markdown_files:
             self._analyze_file(md_file)
+        self.parse_cache.save()
         # Compile results
         results = {
             'timestamp': datetime.now().isoformat(),
@@ -139,36 +143,31 @@ class CortexAnalyzer:
     def _analyze_file(self, file_path: Path):
         """Analyze a single markdown file for broken links"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            parsed = self.parse_cache.get(file_path)
+            if parsed is None:
+                raise IOError(f"Could not read {file_path}")
             
             # Check wikilinks [[...]]
-            wikilink_pattern = re.compile(r'\[\[([^\]]+)\]\]')
-            for match in wikilink_pattern.finditer(content):
-                link_target = match.group(1)
+            for link_target, line in parsed.wiki_links:
                 if not self._is_valid_wikilink(link_target, file_path):
                     self.broken_links.append({
                         'file': str(file_path.relative_to(self.cortex_path)),
-                        'line': content[:match.start()].count('\n') + 1,
+                        'line': line,
                         'type': 'wikilink',
                         'target': link_target,
-                        'raw_match': match.group(0)
+                        'raw_match': f"[[{link_target}]]"
                     })
             
             # Check markdown links [...](...)
-            markdown_pattern = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
-            for match in markdown_pattern.finditer(content):
-                link_text = match.group(1)
-                link_target = match.group(2)
-                
+            for link_text, link_target, line in parsed.markdown_links:
                 if not self._is_valid_markdown_link(link_target, file_path):
                     self.broken_links.append({
                         'file': str(file_path.relative_to(self.cortex_path)),
-                        'line': content[:match.start()].count('\n') + 1,
+                        'line': line,
                         'type': 'markdown',
                         'target': link_target,
                         'text': link_text,
-                        'raw_match': match.group(0)
+                        'raw_match': f"[{link_text}]({link_target})"
                     })
                     
         except (IOError, UnicodeDecodeError, OSError) as e:
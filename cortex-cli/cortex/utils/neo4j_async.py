@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Async Neo4j Access for Cortex
+Non-blocking graph queries for the MCP server, the scheduler and the async
+engines, built on the neo4j ``AsyncGraphDatabase`` driver.
+
+Async drivers are bound to the event loop they were created in, so the
+registry keeps one driver per (event loop, uri, user); pool settings are
+the same as for the synchronous registry (see neo4j_registry). Each
+``AsyncGraph`` bounds the number of sessions it has open at once
+(``NEO4J_ASYNC_MAX_SESSIONS``, default: the pool size), so bursts of
+concurrent queries wait for a free session instead of exhausting the
+connection pool.
+
+Usage:
+
+    graph = AsyncGraph()
+    notes, links = await asyncio.gather(
+        graph.read("MATCH (n:Note) RETURN count(n) AS c"),
+        graph.read("MATCH ()-[r:LINKS_TO]->() RETURN count(r) AS c"),
+    )
+"""
+
+import asyncio
+import logging
+import os
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .neo4j_registry import connection_settings, pool_settings
+
+logger = logging.getLogger(__name__)
+
+_drivers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str, str], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_driver(uri: Optional[str] = None, user: Optional[str] = None,
+                     password: Optional[str] = None):
+    """Return the async driver for (uri, user) in the running event loop
+
+    Must be called from a coroutine. No connection is opened here.
+    Raises ImportError if the neo4j package is not installed.
+    """
+    loop = asyncio.get_running_loop()
+    key = connection_settings(uri, user, password)
+    drivers = _drivers.setdefault(loop, {})
+    driver = drivers.get(key)
+    if driver is None:
+        from neo4j import AsyncGraphDatabase
+
+        driver = AsyncGraphDatabase.driver(key[0], auth=(key[1], key[2]), **pool_settings())
+        drivers[key] = driver
+        logger.debug("Created async Neo4j driver for %s as %s", key[0], key[1])
+    return driver
+
+
+async def close_async_drivers():
+    """Close all async drivers of the running event loop
+
+    Call before the loop ends (e.g. at the end of ``asyncio.run``), since
+    the drivers cannot be closed from another loop.
+    """
+    drivers = _drivers.pop(asyncio.get_running_loop(), {})
+    for driver in drivers.values():
+        try:
+            await driver.close()
+        except Exception as e:
+            logger.debug("Error closing async Neo4j driver: %s", e)
+
+
+def default_max_sessions() -> int:
+    value = os.environ.get("NEO4J_ASYNC_MAX_SESSIONS")
+    try:
+        return max(int(value), 1) if value else pool_settings()['max_connection_pool_size']
+    except ValueError:
+        logger.warning("Invalid NEO4J_ASYNC_MAX_SESSIONS=%r", value)
+        return pool_settings()['max_connection_pool_size']
+
+
+async def _fetch(tx, query: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    result = await tx.run(query, params)
+    return await result.data()
+
+
+async def _fetch_all(tx, statements: Sequence[Tuple[str, Dict[str, Any]]],
+                     check: Optional[Callable[[List[List[Dict[str, Any]]]], None]] = None
+                     ) -> List[List[Dict[str, Any]]]:
+    rows = []
+    for query, params in statements:
+        result = await tx.run(query, params)
+        rows.append(await result.data())
+    if check is not None:
+        check(rows)
+    return rows
+
+
+class AsyncGraph:
+    """Bounded concurrent access to the graph from async code"""
+
+    def __init__(self, uri: Optional[str] = None, user: Optional[str] = None,
+                 password: Optional[str] = None, max_sessions: Optional[int] = None):
+        self.uri, self.user, self.password = connection_settings(uri, user, password)
+        self.max_sessions = max_sessions or default_max_sessions()
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @property
+    def driver(self):
+        return get_async_driver(self.uri, self.user, self.password)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._slots.get(loop)
+        if semaphore is None:
+            semaphore = self._slots[loop] = asyncio.Semaphore(self.max_sessions)
+        return semaphore
+
+    async def read(self, query: str, **params) -> List[Dict[str, Any]]:
+        """Run a read query (retried on transient errors) and return its rows"""
+        async with self._semaphore():
+            async with self.driver.session() as session:
+                return await session.execute_read(_fetch, query, params)
+
+    async def write(self, query: str, **params) -> List[Dict[str, Any]]:
+        """Run a write query in its own transaction and return its rows"""
+        async with self._semaphore():
+            async with self.driver.session() as session:
+                return await session.execute_write(_fetch, query, params)
+
+    async def write_many(self, statements: Sequence[Tuple[str, Dict[str, Any]]],
+                         check: Optional[Callable[[List[List[Dict[str, Any]]]], None]] = None
+                         ) -> List[List[Dict[str, Any]]]:
+        """Run (query, params) pairs in order in one transaction; rows per query
+
+        ``check(rows)`` runs inside the transaction after the last statement;
+        an exception it raises rolls the transaction back and propagates.
+        """
+        async with self._semaphore():
+            async with self.driver.session() as session:
+                return await session.execute_write(_fetch_all, list(statements), check)
+
+    async def ping(self) -> bool:
+        """Whether the server is reachable"""
+        try:
+            await self.driver.verify_connectivity()
+            return True
+        except Exception as e:
+            logger.debug("Neo4j not reachable at %s: %s", self.uri, e)
+            return False
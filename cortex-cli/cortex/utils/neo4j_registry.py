@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Neo4j Driver Registry for Cortex
+Process-wide, lazily created Neo4j drivers shared by all components.
+
+A driver is only created when a caller first needs the graph, and one
+driver (with its connection pool) is kept per (uri, user, password), so
+changed credentials get a fresh driver instead of the stale one. Creating a
+driver does not open a connection, so commands that never run a query
+skip the connection handshake entirely. All drivers are closed at
+interpreter exit.
+
+Pool settings come from the environment and can be overridden with
+``configure()``:
+
+    NEO4J_MAX_POOL_SIZE             max_connection_pool_size (default 50)
+    NEO4J_ACQUISITION_TIMEOUT       connection_acquisition_timeout in s (default 60)
+    NEO4J_MAX_CONNECTION_LIFETIME   max_connection_lifetime in s (default 3600)
+"""
+
+import atexit
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_URI = "bolt://localhost:7687"
+DEFAULT_USER = "neo4j"
+DEFAULT_PASSWORD = "neo4jtest"
+
+# driver keyword -> (environment variable, type, default)
+POOL_SETTINGS = {
+    'max_connection_pool_size': ('NEO4J_MAX_POOL_SIZE', int, 50),
+    'connection_acquisition_timeout': ('NEO4J_ACQUISITION_TIMEOUT', float, 60.0),
+    'max_connection_lifetime': ('NEO4J_MAX_CONNECTION_LIFETIME', float, 3600.0),
+}
+
+_drivers: Dict[Tuple[str, str, str], Any] = {}
+_overrides: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def connection_settings(uri: Optional[str] = None, user: Optional[str] = None,
+                        password: Optional[str] = None) -> Tuple[str, str, str]:
+    """URI and credentials, falling back to NEO4J_URI/NEO4J_USER/NEO4J_PASSWORD"""
+    return (
+        uri or os.environ.get("NEO4J_URI", DEFAULT_URI),
+        user or os.environ.get("NEO4J_USER", DEFAULT_USER),
+        password or os.environ.get("NEO4J_PASSWORD", DEFAULT_PASSWORD),
+    )
+
+
+def pool_settings() -> Dict[str, Any]:
+    """Effective pool settings: configure() overrides, environment, defaults"""
+    settings = {}
+    for name, (env_var, cast, default) in POOL_SETTINGS.items():
+        value = _overrides.get(name, os.environ.get(env_var))
+        try:
+            settings[name] = cast(value) if value is not None else default
+        except (TypeError, ValueError):
+            logger.warning("Invalid %s=%r, using %s", env_var, value, default)
+            settings[name] = default
+    return settings
+
+
+def configure(**settings):
+    """Override pool settings for drivers created from now on
+
+    Accepts the keys of ``POOL_SETTINGS``; existing drivers keep their
+    settings until they are closed.
+    """
+    unknown = set(settings) - set(POOL_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown Neo4j pool settings: {', '.join(sorted(unknown))}")
+    with _lock:
+        _overrides.update(settings)
+
+
+def get_driver(uri: Optional[str] = None, user: Optional[str] = None,
+               password: Optional[str] = None):
+    """Return the shared driver for (uri, user, password), creating it on first use
+
+    No connection is opened here; the pool connects on the first query.
+    Raises ImportError if the neo4j package is not installed.
+    """
+    key = connection_settings(uri, user, password)
+    with _lock:
+        driver = _drivers.get(key)
+        if driver is None:
+            from neo4j import GraphDatabase
+
+            driver = GraphDatabase.driver(key[0], auth=(key[1], key[2]), **pool_settings())
+            _drivers[key] = driver
+            logger.debug("Created Neo4j driver for %s as %s", key[0], key[1])
+        return driver
+
+
+def has_driver(uri: Optional[str] = None, user: Optional[str] = None,
+               password: Optional[str] = None) -> bool:
+    """Whether a driver for (uri, user, password) has been created already"""
+    with _lock:
+        return connection_settings(uri, user, password) in _drivers
+
+
+def close_driver(uri: Optional[str] = None, user: Optional[str] = None,
+                 password: Optional[str] = None) -> bool:
+    """Close and forget the shared driver for (uri, user, password), if any"""
+    with _lock:
+        driver = _drivers.pop(connection_settings(uri, user, password), None)
+    if driver is None:
+        return False
+    _close(driver)
+    return True
+
+
+def close_all():
+    """Close all shared drivers (registered to run at interpreter exit)"""
+    with _lock:
+        drivers = list(_drivers.values())
+        _drivers.clear()
+    for driver in drivers:
+        _close(driver)
+
+
+def _close(driver):
+    try:
+        driver.close()
+    except Exception as e:
+        logger.debug("Error closing Neo4j driver: %s", e)
+
+
+atexit.register(close_all)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Markdown Parse Cache for Cortex CLI
+Persistent, content-addressed cache of parsed Markdown files shared by all
+workspace scanners (AI engine, linkers, multi-vault analysis, link checks).
+
+Entries are keyed by absolute path and validated by (mtime, size). When the
+stat changes but the content hash is unchanged (e.g. a touch or checkout),
+the entry is reused without parsing again.
+
+Scanners memoize their own per-file values with ``derive``. Derive keys
+carry a version (``"<scanner>.<value>:v<N>"``); bump it whenever the code
+that computes the value changes, so an upgraded checkout does not serve
+values of the old logic.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 2
+CACHE_FILE_NAME = "parse_cache.json"
+
+HASHTAG_PATTERN = re.compile(r'#([A-Za-z0-9_\-/]+)')
+INLINE_TAGS_PATTERN = re.compile(r'tags:\s*\[(.*?)\]', re.IGNORECASE)
+WIKI_LINK_PATTERN = re.compile(r'\[\[([^\]]+)\]\]')
+MARKDOWN_LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
+FRONTMATTER_PATTERN = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+
+
+@dataclass
+class ParsedMarkdown:
+    """Extracted, content-derived facts about a single Markdown file"""
+    path: str
+    mtime: float
+    size: int
+    content_hash: str
+    hashtags: List[str]  # in document order, duplicates kept
+    frontmatter_tags: List[str]
+    wiki_links: List[List[Any]]  # [target, line]
+    markdown_links: List[List[Any]]  # [text, target, line]
+    headings: List[List[Any]]  # [level, text]
+    word_count: int
+    derived: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def tags(self) -> List[str]:
+        """Unique hashtags and frontmatter tags, in first-seen order"""
+        return list(dict.fromkeys(self.hashtags + self.frontmatter_tags))
+
+
+def content_hash(content: str) -> str:
+    """Stable hash of file content used as the fallback cache key"""
+    return hashlib.md5(content.encode('utf-8')).hexdigest()
+
+
+def _line_number(line_starts: List[int], offset: int) -> int:
+    """1-based line number of a character offset"""
+    low, high = 0, len(line_starts)
+    while low < high:
+        mid = (low + high) // 2
+        if line_starts[mid] <= offset:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+def _frontmatter_tags(content: str) -> List[str]:
+    tags: List[str] = []
+
+    match = FRONTMATTER_PATTERN.match(content)
+    if match:
+        try:
+            data = yaml.safe_load(match.group(1)) or {}
+        except yaml.YAMLError:
+            data = {}
+        value = data.get('tags') if isinstance(data, dict) else None
+        if isinstance(value, str):
+            value = [t for t in re.split(r'[,\s]+', value) if t]
+        if isinstance(value, list):
+            tags.extend(str(t).strip().lstrip('#') for t in value if t)
+
+    # Inline `tags: [a, b]` lists anywhere in the document
+    for block in INLINE_TAGS_PATTERN.findall(content):
+        tags.extend(
+            t.strip().strip("'\"") for t in block.split(',') if t.strip()
+        )
+
+    return list(dict.fromkeys(t for t in tags if t))
+
+
+def parse_markdown(content: str, path: str = "", mtime: float = 0.0,
+                   size: int = 0, digest: Optional[str] = None) -> ParsedMarkdown:
+    """Parse Markdown content into a ParsedMarkdown record"""
+    line_starts = [0] + [m.end() for m in re.finditer(r'\n', content)]
+
+    return ParsedMarkdown(
+        path=path,
+        mtime=mtime,
+        size=size,
+        content_hash=digest or content_hash(content),
+        hashtags=HASHTAG_PATTERN.findall(content),
+        frontmatter_tags=_frontmatter_tags(content),
+        wiki_links=[
+            [m.group(1), _line_number(line_starts, m.start())]
+            for m in WIKI_LINK_PATTERN.finditer(content)
+        ],
+        markdown_links=[
+            [m.group(1), m.group(2), _line_number(line_starts, m.start())]
+            for m in MARKDOWN_LINK_PATTERN.finditer(content)
+        ],
+        headings=[
+            [len(m.group(1)), m.group(2).strip()]
+            for m in HEADING_PATTERN.finditer(content)
+        ],
+        word_count=len(content.split())
+    )
+
+
+class MarkdownParseCache:
+    """On-disk parse cache stored under ``<root>/.cortex/cache/``"""
+
+    def __init__(self, root_path: Path, cache_file: Optional[Path] = None):
+        self.root_path = Path(root_path)
+        self.cache_file = Path(cache_file) if cache_file else (
+            self.root_path / ".cortex" / "cache" / CACHE_FILE_NAME
+        )
+        self.entries: Dict[str, ParsedMarkdown] = {}
+        self.stats = {'hits': 0, 'hash_hits': 0, 'misses': 0, 'errors': 0}
+        self._dirty = False
+        self._lock = threading.RLock()
+        self.load()
+
+    def load(self):
+        """Load cache entries from disk, ignoring incompatible files"""
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CACHE_VERSION:
+                logger.info("Discarding parse cache with version %s", data.get('version'))
+                return
+            self.entries = {
+                path: ParsedMarkdown(**entry)
+                for path, entry in data.get('entries', {}).items()
+            }
+            logger.debug("Loaded %d parse cache entries", len(self.entries))
+        except Exception as e:
+            logger.warning("Could not load parse cache %s: %s", self.cache_file, e)
+            self.entries = {}
+
+    def save(self):
+        """Persist the cache atomically if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_file.with_suffix('.tmp')
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'version': CACHE_VERSION,
+                        'entries': {p: asdict(e) for p, e in self.entries.items()}
+                    }, f)
+                os.replace(tmp_file, self.cache_file)
+                self._dirty = False
+            except Exception as e:
+                logger.warning("Could not save parse cache %s: %s", self.cache_file, e)
+
+    def get(self, file_path: Path,
+            read_text: Optional[Callable[[Path], str]] = None) -> Optional[ParsedMarkdown]:
+        """Return the parsed file, re-parsing only if it changed
+
+        Args:
+            file_path: Markdown file to look up
+            read_text: Optional reader (e.g. a StorageProvider's read_text)
+
+        Returns:
+            ParsedMarkdown or None if the file cannot be read
+        """
+        entry, _ = self._lookup(file_path, read_text)
+        return entry
+
+    def derive(self, file_path: Path, key: str, compute: Callable[[str], Any],
+               read_text: Optional[Callable[[Path], str]] = None) -> Any:
+        """Memoize a scanner-specific value computed from the file content
+
+        The value is stored with the entry and dropped whenever the file
+        content changes. ``compute`` only runs on a cache miss. Storing a
+        value drops the values of other versions of the same key.
+        """
+        entry, content = self._lookup(file_path, read_text)
+        if entry is None:
+            return None
+        if key in entry.derived:
+            return entry.derived[key]
+
+        if content is None:
+            content = self._read(Path(file_path), read_text)
+            if content is None:
+                return None
+        value = compute(content)
+        name = key.split(':', 1)[0]
+        with self._lock:
+            for stale in [k for k in entry.derived if k.split(':', 1)[0] == name]:
+                del entry.derived[stale]
+            entry.derived[key] = value
+            self._dirty = True
+        return value
+
+    def put(self, entry: ParsedMarkdown):
+        """Store an entry parsed elsewhere (e.g. in a worker process)"""
+        with self._lock:
+            self.entries[self._key(entry.path)] = entry
+            self._dirty = True
+
+    def invalidate(self, file_path: Path):
+        """Drop the entry for a file"""
+        with self._lock:
+            if self.entries.pop(self._key(file_path), None) is not None:
+                self._dirty = True
+
+    def prune(self, keep_paths) -> int:
+        """Remove entries for files not in ``keep_paths``"""
+        keep = {self._key(p) for p in keep_paths}
+        with self._lock:
+            stale = [p for p in self.entries if p not in keep]
+            for path in stale:
+                del self.entries[path]
+            if stale:
+                self._dirty = True
+        return len(stale)
+
+    # ---------- internals ----------
+
+    @staticmethod
+    def _key(file_path: Path) -> str:
+        return str(Path(file_path).absolute())
+
+    def _read(self, file_path: Path,
+              read_text: Optional[Callable[[Path], str]]) -> Optional[str]:
+        try:
+            if read_text is not None:
+                return read_text(file_path)
+            return file_path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError) as e:
+            logger.debug("Parse cache read error %s: %s", file_path, e)
+            self.stats['errors'] += 1
+            return None
+
+    def _lookup(self, file_path: Path, read_text):
+        file_path = Path(file_path)
+        key = self._key(file_path)
+
+        try:
+            stat = file_path.stat()
+        except OSError:
+            self.invalidate(file_path)
+            self.stats['errors'] += 1
+            return None, None
+
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry and entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+            self.stats['hits'] += 1
+            return entry, None
+
+        content = self._read(file_path, read_text)
+        if content is None:
+            return None, None
+
+        digest = content_hash(content)
+        with self._lock:
+            if entry and entry.content_hash == digest:
+                entry.mtime = stat.st_mtime
+                entry.size = stat.st_size
+                self._dirty = True
+                self.stats['hash_hits'] += 1
+                return entry, content
+
+            entry = parse_markdown(
+                content, key, stat.st_mtime, stat.st_size, digest
+            )
+            self.entries[key] = entry
+            self._dirty = True
+            self.stats['misses'] += 1
+        return entry, content
+
+
+_caches: Dict[str, MarkdownParseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_parse_cache(root_path: Path) -> MarkdownParseCache:
+    """Return the process-wide parse cache for a workspace root"""
+    key = str(Path(root_path).absolute())
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = MarkdownParseCache(Path(root_path))
+        return _caches[key]
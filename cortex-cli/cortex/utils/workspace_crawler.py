@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Workspace Crawler for Cortex CLI
+Single-pass, os.scandir-based file walk that prunes ignored directories
+before descending into them.
+"""
+
+import fnmatch
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IGNORED_DIRS = frozenset({'.git', '.venv', 'node_modules', '.cortex'})
+
+
+class WorkspaceCrawler:
+    """Yields workspace files in one walk, skipping ignored directories
+
+    Directory names in ``ignored_dirs`` are pruned without being listed.
+    ``ignore_globs`` are matched against the entry name and its path
+    relative to the root (e.g. ``build``, ``*.min.js``, ``docs/archive/*``)
+    and apply to directories and files. Symlinked directories are not
+    followed.
+    """
+
+    def __init__(self, root: Path, ignore_globs: Optional[Iterable[str]] = None,
+                 ignored_dirs: Iterable[str] = DEFAULT_IGNORED_DIRS):
+        self.root = Path(root)
+        self.ignored_dirs = frozenset(ignored_dirs)
+        globs = list(ignore_globs or [])
+        # All globs compiled once into a single alternation
+        self._ignore = re.compile(
+            '|'.join(fnmatch.translate(g) for g in globs)
+        ) if globs else None
+
+    def is_ignored(self, name: str, rel_path: str) -> bool:
+        if self._ignore is None:
+            return False
+        return bool(self._ignore.match(name) or self._ignore.match(rel_path))
+
+    def iter_files(self) -> Iterator[Path]:
+        """Yield all non-ignored files below the root, in sorted order"""
+        stack = [(str(self.root), '')]
+        while stack:
+            directory, rel_dir = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError as e:
+                logger.debug("Cannot list %s: %s", directory, e)
+                continue
+
+            subdirs = []
+            for entry in entries:
+                rel_path = f"{rel_dir}{entry.name}"
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if (entry.name not in self.ignored_dirs
+                                and not self.is_ignored(entry.name, rel_path)):
+                            subdirs.append((entry.path, rel_path + '/'))
+                    elif entry.is_file() and not self.is_ignored(entry.name, rel_path):
+                        yield Path(entry.path)
+                except OSError:
+                    continue
+
+            # Reversed so that directories are visited in name order
+            stack.extend(reversed(subdirs))
@@ -9,7 +9,7 @@ import json
 import sys
 from pathlib import Path
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -171,7 +171,8 @@ class TestAIEngineCore:
             engine.detected_gaps.append(gap)
 
             # Mock the method that the engine's logic depends on
-            with patch.object(engine.local_ai, 'suggest_links_for_node') as mock_suggest:
+            with patch.object(engine.local_ai, 'suggest_links_for_node_async',
+                              new_callable=AsyncMock) as mock_suggest:
                 mock_suggest.return_value = [{'potential_link': 'Node2', 'common_neighbors_score': 5}]
 
                 # Call the method under test
@@ -217,3 +218,97 @@ class TestAIEngineIntegration:
             assert gap.gap_id == "integration_test"
         except Exception as e:
             pytest.fail(f"Basic KnowledgeGap instantiation failed: {e}")
+
+
+class TestWorkspaceScan:
+    """Single-pass workspace crawl used by analyze_workspace"""
+
+    @pytest.fixture
+    def workspace(self, tmp_path):
+        files = {
+            "notes/a.md": "TODO: research caching",
+            "docs/guide.md": "Setup: TBD",
+            "src/app.py": "# TODO improve performance\nraise NotImplementedError",
+            ".git/objects/x.md": "TODO research inside git",
+            "node_modules/pkg/index.js": "// TODO optimize",
+            "build/out.py": "raise NotImplementedError",
+        }
+        for name, content in files.items():
+            path = tmp_path / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+        (tmp_path / ".cortex").mkdir(exist_ok=True)
+        (tmp_path / ".cortex" / "ai_config.yaml").write_text(
+            "crawler:\n  ignore_globs: [build]\n", encoding="utf-8"
+        )
+        return tmp_path
+
+    def test_crawler_prunes_ignored_directories(self, workspace):
+        from cortex.utils.workspace_crawler import WorkspaceCrawler
+
+        crawler = WorkspaceCrawler(workspace, ignore_globs=["build", "*.yaml"])
+        found = [p.relative_to(workspace).as_posix() for p in crawler.iter_files()]
+
+        assert found == ["docs/guide.md", "notes/a.md", "src/app.py"]
+
+    @patch('cortex.core.local_ai.Neo4jConnector')
+    def test_analyze_workspace_single_pass(self, MockNeo4jConnector, workspace):
+        engine = AIEngine(str(workspace))
+        engine.detected_gaps = []
+
+        walks = []
+        original = engine.crawler.iter_files
+        engine.crawler.iter_files = lambda: walks.append(1) or original()
+        gaps = engine.analyze_workspace()
+
+        assert len(walks) == 1
+        assert sorted((Path(g.title.split(" in ")[-1]).name, g.gap_type) for g in gaps) == [
+            ("a.md", "incomplete_research"),
+            ("app.py", "incomplete_research"),
+            ("app.py", "missing_benchmarks"),
+            ("guide.md", "incomplete_research"),
+        ]
+
+    @patch('cortex.core.local_ai.Neo4jConnector')
+    def test_reanalysis_upserts_gaps(self, MockNeo4jConnector, workspace):
+        engine = AIEngine(str(workspace))
+        first = engine.analyze_workspace()
+        engine.gap_store.get(first[0].gap_id).filled_by = "manual"
+        engine.gap_store.update(engine.gap_store.get(first[0].gap_id))
+        engine.save_detected_gaps()
+
+        (workspace / "src" / "app.py").write_text("print('done')", encoding="utf-8")
+        engine = AIEngine(str(workspace))
+        assert len(engine.detected_gaps) == len(first)
+
+        engine.analyze_workspace()
+        reloaded = AIEngine(str(workspace))
+
+        assert len(reloaded.detected_gaps) == len(first) - 2
+        assert reloaded.gap_store.get(first[0].gap_id).filled_by == "manual"
+        assert reloaded.gap_store.by_file(str(workspace / "src" / "app.py")) == []
+        assert reloaded.get_gap_summary()["by_type"] == {"incomplete_research": 2}
+
+    @patch('cortex.core.local_ai.Neo4jConnector')
+    def test_unreadable_file_keeps_its_gaps(self, MockNeo4jConnector, workspace):
+        AIEngine(str(workspace)).analyze_workspace()
+        app = workspace / "src" / "app.py"
+        note = workspace / "notes" / "a.md"
+        app.write_bytes(b"\xff\xfe TODO broken encoding")
+        note.write_bytes(b"\xff\xfe TODO broken encoding")
+
+        AIEngine(str(workspace)).analyze_workspace()
+        reloaded = AIEngine(str(workspace))
+
+        assert len(reloaded.gap_store.by_file(str(app))) == 2
+        assert len(reloaded.gap_store.by_file(str(note))) == 1
+
+    @patch('cortex.core.local_ai.Neo4jConnector')
+    def test_deleted_file_loses_its_gaps(self, MockNeo4jConnector, workspace):
+        AIEngine(str(workspace)).analyze_workspace()
+        (workspace / "src" / "app.py").unlink()
+
+        AIEngine(str(workspace)).analyze_workspace()
+        reloaded = AIEngine(str(workspace))
+
+        assert reloaded.gap_store.by_file(str(workspace / "src" / "app.py")) == []
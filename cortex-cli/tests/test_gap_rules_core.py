@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test suite for the gap rule engine
+Tests for cortex/core/gap_rules.py
+"""
+
+import random
+import re
+
+from cortex.core.gap_rules import (
+    BUILTIN_RULES,
+    GapRule,
+    GapScanner,
+    leading_literal,
+    rules_from_config,
+)
+
+
+def _finditer_reference(rules, content):
+    return [
+        (rule.name, rule.gap_type, m.start(), m.end(), m.group(0))
+        for rule in rules
+        for m in re.finditer(rule.pattern, content, re.IGNORECASE)
+    ]
+
+
+class TestLeadingLiteral:
+    """Literal prefixes used by the prefilter"""
+
+    def test_literal_extraction(self):
+        assert leading_literal(r'TODO.*research') == 'todo'
+        assert leading_literal(r'# TODO.*performance') == '# todo'
+        assert leading_literal(r'need\.s?x') == 'need.'
+        assert leading_literal(r'tests?') == 'test'
+        assert leading_literal(r'a|b') is None
+        assert leading_literal(r'\bword') is None
+
+
+class TestGapScanner:
+    """Single-pass scan must equal one finditer per rule"""
+
+    def test_matches_per_rule_finditer(self):
+        rules = BUILTIN_RULES + [
+            GapRule('todo_any', 'incomplete_research', r'todo'),
+            GapRule('todo_long', 'incomplete_research', r'todo list'),
+            GapRule('unanchored', 'outdated_data', r'\b20(20|21)\b'),
+        ]
+        words = ["TODO", "research", "todo list", "FIXME", "performance",
+                 "need", "benchmark", "missing", "data", "2020", "\n", "x"]
+        rng = random.Random(3)
+        scanner = GapScanner(rules)
+
+        for _ in range(200):
+            content = " ".join(rng.choice(words) for _ in range(40))
+            assert scanner.scan(content) == _finditer_reference(rules, content)
+
+    def test_stats_and_config_rules(self):
+        rules = rules_from_config({
+            "missing_examples": {"patterns": ["example needed", "("], "applies_to": ["markdown"]},
+            "outdated_data": {"keywords": ["old"]},
+        })
+        assert [r.name for r in rules] == ["missing_examples.0"]
+
+        scanner = GapScanner(rules)
+        scanner.scan("Example needed here. example needed there.")
+        stats = scanner.get_stats()
+
+        assert stats["scans"] == 1
+        assert stats["rules"]["missing_examples.0"]["hits"] == 2
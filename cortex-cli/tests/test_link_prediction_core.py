@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test suite for the precomputed link suggestions
+Tests for cortex/core/link_prediction.py
+"""
+
+import math
+import threading
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from cortex.core import link_prediction
+from cortex.core.link_prediction import LinkPredictor, affected_nodes, score_rows
+from cortex.core.local_ai import LocalAI
+from cortex.core.tag_similarity import SCIPY_AVAILABLE
+
+BACKENDS = ["python"] + (["sparse"] if SCIPY_AVAILABLE else [])
+
+
+def graph(*edges):
+    adjacency = {}
+    for a, b in edges:
+        adjacency.setdefault(a, set()).add(b)
+        adjacency.setdefault(b, set()).add(a)
+    return adjacency
+
+
+# A and D share B and C; E hangs off C
+GRAPH = graph(("A", "B"), ("A", "C"), ("D", "B"), ("D", "C"), ("C", "E"))
+
+
+class TestScoring:
+    """Common neighbors, Adamic-Adar and Jaccard per candidate"""
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_scores(self, backend):
+        rows = score_rows(GRAPH, ["A"], backend=backend)
+
+        target, common, adamic, jaccard = rows["A"][0]
+        assert target == "D"
+        assert common == 2
+        assert adamic == pytest.approx(1 / math.log(2) + 1 / math.log(3), abs=1e-6)
+        assert jaccard == 1.0
+        # Already linked notes and the note itself are never suggested
+        assert {s[0] for s in rows["A"]} == {"D", "E"}
+
+    def test_backends_agree(self):
+        if not SCIPY_AVAILABLE:
+            pytest.skip("scipy not installed")
+        assert score_rows(GRAPH, GRAPH, backend="sparse") == score_rows(GRAPH, GRAPH, backend="python")
+
+    def test_unknown_metric_is_rejected(self):
+        with pytest.raises(ValueError):
+            score_rows(GRAPH, ["A"], metric="katz")
+
+
+class TestLinkPredictor:
+    """Cached lookups and incremental refresh"""
+
+    def test_affected_nodes_are_within_two_hops(self):
+        new = graph(("A", "B"), ("A", "C"), ("D", "B"), ("D", "C"), ("C", "E"), ("X", "Y"))
+        new["E"].add("F")
+        new["F"] = {"E"}
+
+        affected = affected_nodes(GRAPH, new)
+
+        assert {"E", "F", "C", "A", "D", "X", "Y"} <= affected
+        assert "B" not in affected
+
+    def test_update_matches_full_rebuild(self, tmp_path):
+        predictor = LinkPredictor(tmp_path / "links.json", k=3)
+        predictor.build(GRAPH)
+        changed = graph(("A", "B"), ("A", "C"), ("D", "B"), ("C", "E"), ("E", "F"))
+
+        predictor.update(changed)
+
+        assert predictor.suggestions == score_rows(changed, changed, k=3)
+
+    def test_cache_round_trip_and_lookup(self, tmp_path):
+        predictor = LinkPredictor(tmp_path / "links.json")
+        predictor.build(GRAPH)
+        predictor.save()
+
+        loaded = LinkPredictor(tmp_path / "links.json")
+        assert loaded.load()
+        assert loaded.suggest("A")[0]["potential_link"] == "D"
+        assert loaded.suggest("A")[0]["common_neighbors_score"] == 2
+        assert not LinkPredictor(tmp_path / "links.json", metric="jaccard").load()
+
+    def test_refresh_from_graph_uses_one_export_query(self, tmp_path):
+        session = Mock()
+        session.run.return_value = [
+            {"name": name, "neighbors": sorted(neighbors)} for name, neighbors in GRAPH.items()
+        ]
+        predictor = LinkPredictor(tmp_path / "links.json")
+
+        stats = predictor.refresh_from_graph(session)
+
+        session.run.assert_called_once_with(link_prediction.EXPORT_QUERY)
+        assert stats["notes"] == 5
+        assert stats["links"] == 5
+        assert (tmp_path / "links.json").exists()
+
+    def test_write_to_graph_batches_rows(self, tmp_path):
+        predictor = LinkPredictor(tmp_path / "links.json")
+        predictor.build(GRAPH)
+        session = Mock()
+
+        written = predictor.write_to_graph(session, chunk_size=2)
+
+        assert session.execute_write.call_count == 3
+        assert written == sum(len(s) for s in predictor.suggestions.values())
+
+
+class TestLocalAISuggestions:
+    """Lookups serve the cache while a stale cache is refreshed"""
+
+    def test_stale_cache_is_served_while_refreshing(self, tmp_path):
+        predictor = LinkPredictor(tmp_path / "link_suggestions.json")
+        predictor.build(GRAPH)
+        predictor.built_at -= 7200
+        predictor.save()
+        ai = LocalAI(cache_dir=tmp_path, max_age=3600)
+        release = threading.Event()
+
+        with patch.object(ai, "refresh_link_predictions", side_effect=lambda: release.wait(5)) as refresh:
+            assert ai.suggest_links_for_node("A")[0]["potential_link"] == "D"
+            assert ai.refreshing
+            ai.suggest_links_for_node("A")
+            release.set()
+            ai._refresh_thread.join(5)
+
+        refresh.assert_called_once_with()
+        assert not ai.refreshing
+
+    def test_refreshes_do_not_overlap(self, tmp_path):
+        ai = LocalAI(cache_dir=tmp_path, max_age=3600)
+        ai.connector._driver = MagicMock()
+        running, overlaps = [], []
+
+        def refresh(session, full=False):
+            running.append(1)
+            overlaps.append(len(running))
+            threading.Event().wait(0.05)
+            running.pop()
+            return {}
+
+        with patch.object(ai.predictor, "refresh_from_graph", side_effect=refresh):
+            threads = [threading.Thread(target=ai.refresh_link_predictions) for _ in range(3)]
+            threads += [threading.Thread(target=ai._ensure_predictions) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+            if ai._refresh_thread:
+                ai._refresh_thread.join(5)
+
+        assert overlaps and max(overlaps) == 1
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test suite for MinHash/LSH candidate search
+Tests for cortex/core/minhash_lsh.py and the lsh modes of both
+CrossVaultLinker variants
+"""
+
+from pathlib import Path
+
+import pytest
+
+from cortex.core import minhash_lsh
+from cortex.core.minhash_lsh import LSHIndex, MinHasher, MinHashStore
+
+
+NOTES = {
+    "hub": {
+        "a.md": "# Machine Learning Basics\n#ml #python #data",
+        "b.md": "# Cluster Operations\n#ops #k8s",
+        "c.md": "#ml #data",
+    },
+    "research": {
+        "x.md": "# Machine Learning Papers\n#ml #python #data",
+        "y.md": "#k8s #ops",
+    },
+    "projects": {"p.md": "#ml #data #python", "q.md": "#writing"},
+}
+
+
+@pytest.fixture
+def estate(tmp_path):
+    for vault, files in NOTES.items():
+        for name, content in files.items():
+            path = tmp_path / vault / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+    return tmp_path
+
+
+class TestMinHash:
+    """Signatures and buckets"""
+
+    def test_numpy_and_python_signatures_match(self, monkeypatch):
+        tokens = {f"tag:t{i}" for i in range(20)}
+        hasher = MinHasher(num_perm=64, seed=3)
+        with_numpy = hasher.signature(tokens)
+
+        monkeypatch.setattr(minhash_lsh, "NUMPY_AVAILABLE", False)
+        assert MinHasher(num_perm=64, seed=3).signature(tokens) == with_numpy
+
+    def test_identical_sets_always_collide(self):
+        hasher = MinHasher(num_perm=32)
+        index = LSHIndex(num_perm=32, bands=8)
+        index.insert("a", hasher.signature({"x", "y", "z"}))
+        index.insert("b", hasher.signature({"x", "y", "z"}))
+        index.insert("c", hasher.signature({"q"}))
+
+        assert index.candidates("a") == {"b"}
+        index.remove("b")
+        assert index.candidates("a") == set()
+
+    def test_bands_must_divide_num_perm(self):
+        with pytest.raises(ValueError):
+            LSHIndex(num_perm=128, bands=30)
+
+    def test_store_only_rehashes_changed_sets(self, tmp_path):
+        store_file = tmp_path / "sigs.json"
+        MinHashStore(store_file, num_perm=16).build_index(
+            {"a": {"x"}, "b": {"y"}, "gone": {"z"}}, bands=4
+        )
+
+        store = MinHashStore(store_file, num_perm=16)
+        store.build_index({"a": {"x"}, "b": {"y", "w"}}, bands=4)
+
+        assert store.stats == {"reused": 1, "computed": 1, "removed": 1}
+        assert set(store.entries) == {"a", "b"}
+
+
+class TestCrossVaultLinkerLSH:
+    """LSH results are a subset of exact results with exact scores"""
+
+    @staticmethod
+    def _key(suggestions):
+        return [
+            (s.source_vault, s.source_file, s.target_vault, s.target_file,
+             s.correlation_score)
+            for s in suggestions
+        ]
+
+    def test_integration_linker_lsh_matches_exact(self, estate):
+        from cortex.integrations.cross_vault_linker import CrossVaultLinker
+
+        linker = CrossVaultLinker(str(estate / "hub"))
+        exact = linker.find_cross_vault_links(0.5, backend="python")
+        approx = linker.find_cross_vault_links(
+            0.5, backend="lsh", num_perm=64, bands=32
+        )
+
+        assert exact
+        assert set(self._key(approx)) <= set(self._key(exact))
+        # rows=2 gives near-certain recall for these highly similar notes
+        assert self._key(approx) == self._key(exact)
+
+        stats = linker.benchmark_lsh(0.5, num_perm=64, bands=32)
+        assert stats["recall"] == 1.0
+        assert stats["signatures_computed"] == 0
+
+    def test_core_linker_modes_agree(self, estate):
+        from cortex.core.cross_vault_linker import CrossVaultLinker
+
+        linker = CrossVaultLinker(Path(estate))
+        exact = linker.suggest_links(0.5, mode="exact")
+        approx = linker.suggest_links(0.5, mode="lsh", num_perm=64, bands=32)
+
+        assert approx == exact
+        assert {(s["source"], s["target"]) for s in exact} >= {
+            ("hub/a.md", "research/x.md"), ("hub/b.md", "research/y.md")
+        }
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test suite for incremental Multi-Vault AI analysis
+Tests for the vault manifest in cortex/integrations/multi_vault_ai.py
+"""
+
+import asyncio
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from cortex.integrations.multi_vault_ai import STRUCTURE_CACHE_KEY, MultiVaultAI
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def _metrics(profile):
+    return (profile.file_count, profile.tag_count, profile.dominant_tags,
+            profile.link_density, profile.structure_complexity, profile.size_mb)
+
+
+@pytest.fixture
+def vault():
+    # pytest's tmp_path contains "test-", which the vault file filter excludes
+    with tempfile.TemporaryDirectory(prefix="vaults") as root:
+        hub = Path(root) / "hub"
+        _write(hub / "a.md", "# A\n#ml #python [[b]]")
+        _write(hub / "b.md", "#ml #ops\n```code```")
+        _write(hub / "notes" / "c.md", "#python [[a]] [[b]]")
+        yield hub
+
+
+def _analyze(hub):
+    ai = MultiVaultAI(str(hub))
+    return ai, asyncio.run(ai.analyze_vault_async(hub))
+
+
+class TestIncrementalVaultAnalysis:
+    """Applying deltas must give the same profile as a full analysis"""
+
+    def test_initial_analysis(self, vault):
+        _, profile = _analyze(vault)
+
+        assert profile.file_count == 3
+        assert profile.tag_count == 3
+        assert profile.dominant_tags == ["ml", "python", "ops"]
+        assert profile.link_density == 1.0
+
+    def test_delta_matches_full_analysis(self, vault):
+        ai, _ = _analyze(vault)
+        asyncio.run(ai.save_learning_data_async())
+
+        _write(vault / "b.md", "#ops #k8s #k8s")
+        (vault / "notes" / "c.md").unlink()
+        _write(vault / "d.md", "#new [[a]]")
+
+        ai = MultiVaultAI(str(vault))
+        assert asyncio.run(ai._needs_analysis(vault))
+        reads = []
+        original = ai._file_contribution
+        ai._file_contribution = lambda f: reads.append(f.name) or original(f)
+        incremental = asyncio.run(ai.analyze_vault_async(vault))
+
+        assert sorted(reads) == ["b.md", "d.md"]
+
+        manifest_dir = ai.data_path / "manifests"
+        for manifest_file in manifest_dir.iterdir():
+            manifest_file.unlink()
+        _, full = _analyze(vault)
+
+        assert _metrics(incremental) == _metrics(full)
+        assert incremental.dominant_tags == ["k8s", "ml", "new", "ops", "python"]
+
+    def test_unchanged_vault_needs_no_analysis(self, vault):
+        ai, _ = _analyze(vault)
+        asyncio.run(ai.save_learning_data_async())
+
+        ai = MultiVaultAI(str(vault))
+        assert not asyncio.run(ai._needs_analysis(vault))
+
+
+class TestParallelVaultAnalysis:
+    """The process pool must produce the same profiles as sequential analysis"""
+
+    def test_parallel_matches_sequential(self, vault):
+        sibling = vault.parent / "research"
+        for i in range(6):
+            _write(sibling / f"n{i}.md", f"#topic{i % 3} #shared [[n{i - 1}]]")
+        vaults = [vault, sibling]
+
+        ai = MultiVaultAI(str(vault))
+        asyncio.run(ai.analyze_vaults_sequential(vaults))
+        sequential = {name: _metrics(p) for name, p in ai.vault_profiles.items()}
+
+        ai = MultiVaultAI(str(vault))
+        ai.vault_manifests = {}
+        ai.config['performance'].update(max_workers=2, file_chunk_size=2)
+        for manifest_file in (ai.data_path / "manifests").glob("*.json"):
+            manifest_file.unlink()
+        asyncio.run(ai.analyze_vaults_parallel(vaults, force_refresh=True))
+        parallel = {name: _metrics(p) for name, p in ai.vault_profiles.items()}
+
+        assert parallel == sequential
+        assert ai.parse_cache.get(sibling / "n0.md").derived[STRUCTURE_CACHE_KEY] == [
+            "structured_headers"
+        ]
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test suite for the async Neo4j access layer
+Tests for cortex/utils/neo4j_async.py
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cortex.utils import neo4j_async
+from cortex.utils.neo4j_async import AsyncGraph
+
+
+class FakeSession:
+    """Async session whose transactions take a moment and count overlap"""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_read(self, fn, query, params):
+        self.stats["open"] += 1
+        self.stats["peak"] = max(self.stats["peak"], self.stats["open"])
+        await asyncio.sleep(0.01)
+        self.stats["open"] -= 1
+        return [{"query": query, **params}]
+
+    execute_write = execute_read
+
+
+def fake_driver(stats):
+    driver = MagicMock()
+    driver.session.side_effect = lambda: FakeSession(stats)
+    driver.close = AsyncMock()
+    return driver
+
+
+class TestAsyncGraph:
+    """Concurrent queries share a bounded number of sessions"""
+
+    def test_queries_run_concurrently_up_to_the_session_limit(self):
+        stats = {"open": 0, "peak": 0}
+        graph = AsyncGraph("bolt://db:7687", "neo4j", "secret", max_sessions=2)
+
+        async def run():
+            with patch.object(neo4j_async, "get_async_driver", return_value=fake_driver(stats)):
+                return await asyncio.gather(*(graph.read("RETURN $i", i=i) for i in range(5)))
+
+        results = asyncio.run(run())
+
+        assert [r[0]["i"] for r in results] == [0, 1, 2, 3, 4]
+        assert stats["peak"] == 2
+
+    def test_write_many_runs_all_statements_in_one_transaction(self):
+        tx = MagicMock()
+        tx.run = AsyncMock(side_effect=lambda query, params: MagicMock(
+            data=AsyncMock(return_value=[{"query": query, **params}])))
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=False)
+
+        async def execute_write(fn, *args):
+            return await fn(tx, *args)
+
+        session.execute_write = AsyncMock(side_effect=execute_write)
+        driver = MagicMock()
+        driver.session.return_value = session
+        graph = AsyncGraph("bolt://db:7687", "neo4j", "secret")
+
+        async def run():
+            with patch.object(neo4j_async, "get_async_driver", return_value=driver):
+                return await graph.write_many([("CREATE $a", {"a": 1}), ("CREATE $b", {"b": 2})])
+
+        rows = asyncio.run(run())
+
+        assert rows == [[{"query": "CREATE $a", "a": 1}], [{"query": "CREATE $b", "b": 2}]]
+        session.execute_write.assert_awaited_once()
+
+    def test_write_many_check_runs_inside_the_transaction(self):
+        tx = MagicMock()
+        tx.run = AsyncMock(return_value=MagicMock(data=AsyncMock(return_value=[])))
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=False)
+        committed = []
+
+        async def execute_write(fn, *args):
+            rows = await fn(tx, *args)
+            committed.append(rows)
+            return rows
+
+        session.execute_write = AsyncMock(side_effect=execute_write)
+        driver = MagicMock()
+        driver.session.return_value = session
+        graph = AsyncGraph("bolt://db:7687", "neo4j", "secret")
+
+        def check(rows):
+            if not rows[0]:
+                raise LookupError("nothing matched")
+
+        async def run():
+            with patch.object(neo4j_async, "get_async_driver", return_value=driver):
+                return await graph.write_many([("MATCH (n) SET n.x = 1", {})], check)
+
+        with pytest.raises(LookupError):
+            asyncio.run(run())
+        assert committed == []
+
+    def test_one_driver_per_event_loop(self):
+        async def create_twice():
+            first = neo4j_async.get_async_driver("bolt://db:7687", "neo4j", "secret")
+            second = neo4j_async.get_async_driver("bolt://db:7687", "neo4j", "secret")
+            await neo4j_async.close_async_drivers()
+            return first, second
+
+        with patch("neo4j.AsyncGraphDatabase.driver", side_effect=lambda *a, **k: fake_driver({})) as factory:
+            first, second = asyncio.run(create_twice())
+            other, _ = asyncio.run(create_twice())
+
+        assert first is second
+        assert other is not first
+        assert factory.call_count == 2
+        first.close.assert_awaited_once()
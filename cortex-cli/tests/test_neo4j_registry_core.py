@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test suite for the process-wide Neo4j driver registry
+Tests for cortex/utils/neo4j_registry.py
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from cortex.utils import neo4j_registry
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    for env_var, _, _ in neo4j_registry.POOL_SETTINGS.values():
+        monkeypatch.delenv(env_var, raising=False)
+    neo4j_registry.close_all()
+    neo4j_registry._overrides.clear()
+    with patch("neo4j.GraphDatabase.driver") as driver_factory:
+        yield driver_factory
+    neo4j_registry.close_all()
+    neo4j_registry._overrides.clear()
+
+
+class TestNeo4jRegistry:
+    """One lazily created driver per (uri, user), shared by all callers"""
+
+    def test_driver_is_created_once_and_shared(self, registry):
+        first = neo4j_registry.get_driver("bolt://db:7687", "neo4j", "secret")
+        second = neo4j_registry.get_driver("bolt://db:7687", "neo4j", "secret")
+
+        assert first is second
+        registry.assert_called_once()
+        first.verify_connectivity.assert_not_called()
+
+    def test_pool_settings_from_environment(self, registry, monkeypatch):
+        monkeypatch.setenv("NEO4J_MAX_POOL_SIZE", "7")
+        monkeypatch.setenv("NEO4J_ACQUISITION_TIMEOUT", "not-a-number")
+        neo4j_registry.configure(max_connection_lifetime=120)
+
+        neo4j_registry.get_driver("bolt://db:7687", "neo4j", "secret")
+
+        _, kwargs = registry.call_args
+        assert kwargs["max_connection_pool_size"] == 7
+        assert kwargs["connection_acquisition_timeout"] == 60.0
+        assert kwargs["max_connection_lifetime"] == 120
+
+    def test_configure_rejects_unknown_settings(self, registry):
+        with pytest.raises(ValueError):
+            neo4j_registry.configure(pool=3)
+
+    def test_close_all_closes_and_forgets_drivers(self, registry):
+        driver = neo4j_registry.get_driver("bolt://db:7687", "neo4j", "secret")
+        assert neo4j_registry.has_driver("bolt://db:7687", "neo4j", "secret")
+
+        neo4j_registry.close_all()
+
+        driver.close.assert_called_once()
+        assert not neo4j_registry.has_driver("bolt://db:7687", "neo4j", "secret")
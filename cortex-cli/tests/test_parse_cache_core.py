@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test suite for the Markdown parse cache
+Tests for cortex/utils/parse_cache.py
+"""
+
+import os
+
+import pytest
+
+from cortex.utils.parse_cache import MarkdownParseCache, parse_markdown
+
+
+SAMPLE = """---
+title: Sample
+tags: [alpha, beta]
+---
+# Heading One
+Some text #gamma and #nested/tag.
+See [[Other Note]] and [docs](./docs.md).
+
+## Heading Two
+More words [[Third|alias]]
+"""
+
+
+@pytest.fixture
+def note(tmp_path):
+    path = tmp_path / "note.md"
+    path.write_text(SAMPLE, encoding="utf-8")
+    return path
+
+
+class TestParseMarkdown:
+    """Extraction of tags, links, headings and word counts"""
+
+    def test_extracts_all_fields(self):
+        parsed = parse_markdown(SAMPLE)
+
+        assert parsed.hashtags == ["gamma", "nested/tag"]
+        assert parsed.frontmatter_tags == ["alpha", "beta"]
+        assert parsed.tags == ["gamma", "nested/tag", "alpha", "beta"]
+        assert parsed.wiki_links == [["Other Note", 7], ["Third|alias", 10]]
+        assert parsed.markdown_links == [["docs", "./docs.md", 7]]
+        assert parsed.headings == [[1, "Heading One"], [2, "Heading Two"]]
+        assert parsed.word_count == len(SAMPLE.split())
+
+
+class TestMarkdownParseCache:
+    """Persistence and invalidation"""
+
+    def test_cache_is_persisted_and_reused(self, tmp_path, note):
+        cache = MarkdownParseCache(tmp_path)
+        assert cache.get(note).hashtags == ["gamma", "nested/tag"]
+        cache.save()
+        assert (tmp_path / ".cortex" / "cache" / "parse_cache.json").exists()
+
+        reloaded = MarkdownParseCache(tmp_path)
+        reads = []
+        parsed = reloaded.get(note, lambda p: reads.append(p) or p.read_text())
+
+        assert parsed.frontmatter_tags == ["alpha", "beta"]
+        assert reads == []
+        assert reloaded.stats["hits"] == 1
+
+    def test_changed_file_is_reparsed(self, tmp_path, note):
+        cache = MarkdownParseCache(tmp_path)
+        cache.get(note)
+        note.write_text("#fresh content that is longer", encoding="utf-8")
+
+        assert cache.get(note).hashtags == ["fresh"]
+        assert cache.stats["misses"] == 2
+
+    def test_touched_file_uses_content_hash(self, tmp_path, note):
+        cache = MarkdownParseCache(tmp_path)
+        cache.get(note)
+        stat = note.stat()
+        os.utime(note, (stat.st_atime, stat.st_mtime + 10))
+
+        cache.get(note)
+        assert cache.stats["hash_hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_derived_values_are_dropped_on_change(self, tmp_path, note):
+        cache = MarkdownParseCache(tmp_path)
+        calls = []
+
+        def count_lines(content):
+            calls.append(content)
+            return content.count("\n")
+
+        first = cache.derive(note, "lines", count_lines)
+        assert cache.derive(note, "lines", count_lines) == first
+        assert len(calls) == 1
+
+        note.write_text("one\ntwo\nthree and more\n", encoding="utf-8")
+        assert cache.derive(note, "lines", count_lines) == 3
+        assert len(calls) == 2
+
+    def test_new_key_version_recomputes_and_drops_the_old_value(self, tmp_path, note):
+        cache = MarkdownParseCache(tmp_path)
+
+        assert cache.derive(note, "scanner.lines:v1", lambda content: "old") == "old"
+        assert cache.derive(note, "scanner.lines:v2", lambda content: "new") == "new"
+
+        entry = cache.get(note)
+        assert "scanner.lines:v1" not in entry.derived
+        assert entry.derived["scanner.lines:v2"] == "new"
+
+    def test_missing_file_returns_none(self, tmp_path):
+        cache = MarkdownParseCache(tmp_path)
+        assert cache.get(tmp_path / "missing.md") is None
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test suite for the Rule-Based Linker candidate index
+Tests for cortex/core/rule_based_linker.py
+"""
+
+from pathlib import Path
+
+import pytest
+
+from cortex.core.rule_based_linker import LinkRule, RuleBasedLinker
+
+
+def _write(root: Path, rel: str, content: str) -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def linker(tmp_path):
+    _write(tmp_path, "01-Projects/alpha/Project-Search.md",
+           "# Search\n#search #backend\nIndexing pipeline notes")
+    _write(tmp_path, "01-Projects/beta/Project-Billing.md",
+           "# Billing\n#payments\nInvoices and ledgers")
+    _write(tmp_path, "01-Projects/gamma/Project-Misc.md",
+           "# Misc\nUnrelated scribbles")
+    _write(tmp_path, "03-Decisions/ADR-001-search.md",
+           "# ADR 001\n#backend\nWe choose a search engine")
+    _write(tmp_path, "03-Decisions/ADR-002-ledger.md",
+           "# ADR 002\nInvoices ledgers payments storage decision")
+    _write(tmp_path, "03-Decisions/ADR-003-colour.md",
+           "# ADR 003\nPalette")
+    return RuleBasedLinker(tmp_path)
+
+
+def _brute_force_pairs(linker, rule):
+    trigger_files, target_files = linker.get_rule_files(rule)
+    return {
+        (source.name, target.name)
+        for source in trigger_files
+        for target in target_files
+        if source != target and linker.should_link_files(source, target, rule)
+    }
+
+
+class TestLinkCandidateIndex:
+    """Candidate generation must not lose matches of the pairwise check"""
+
+    def test_index_matches_pairwise_check(self, linker):
+        rule = LinkRule(
+            name="project_to_decisions",
+            description="Link project files to related decisions",
+            trigger={"path_pattern": "01-Projects/**/*.md"},
+            target={"path_pattern": "03-Decisions/ADR-*.md"},
+            action="link_related",
+            strength=0.8
+        )
+
+        indexed = {
+            (m.source_file.name, m.target_file.name)
+            for m in linker.apply_rule(rule)
+        }
+
+        assert indexed == _brute_force_pairs(linker, rule)
+        assert ("Project-Search.md", "ADR-001-search.md") in indexed
+        assert ("Project-Billing.md", "ADR-002-ledger.md") in indexed
+        assert not any(src == "Project-Misc.md" for src, _ in indexed)
+
+    def test_unrelated_files_are_not_candidates(self, linker, tmp_path):
+        misc = tmp_path / "01-Projects/gamma/Project-Misc.md"
+        colour = tmp_path / "03-Decisions/ADR-003-colour.md"
+        index = linker.build_index([misc, colour])
+
+        assert colour not in index.candidates(misc)
+
+    def test_candidates_cover_brute_force_on_common_words(self, tmp_path):
+        for i in range(30):
+            _write(tmp_path, f"01-Projects/p{i}/Project-Topic{i}.md",
+                   f"# Topic {i}\nsystem design review notes item{i}")
+            _write(tmp_path, f"03-Decisions/ADR-{100 + i}.md",
+                   f"# Decision\nsystem design review outcome choice{i}")
+        # Linked only by a substring name match, no shared token
+        _write(tmp_path, "01-Projects/api/Project-Apigateway.md", "zzz")
+        _write(tmp_path, "03-Decisions/ADR-api.md", "qqq")
+        # Linked only because "adr-api" occurs inside "adr-apigateway"
+        _write(tmp_path, "01-Projects/gw/Project-Gateway-Plan.md", "see adr-apigateway notes")
+        linker = RuleBasedLinker(tmp_path)
+        files = sorted(tmp_path.glob("0[13]-*/**/*.md"))
+        index = linker.build_index(files)
+        rule = LinkRule("all", "all", {}, {}, "link_related", 0.5)
+
+        missed = [
+            (source.name, target.name)
+            for source in files
+            for target in files
+            if source != target
+            and linker.should_link_files(source, target, rule)
+            and target not in index.candidates(source)
+        ]
+
+        assert missed == []
+        assert (tmp_path / "03-Decisions/ADR-api.md") in index.candidates(
+            tmp_path / "01-Projects/api/Project-Apigateway.md")
+        plan = tmp_path / "01-Projects/gw/Project-Gateway-Plan.md"
+        adr = tmp_path / "03-Decisions/ADR-api.md"
+        assert linker.should_link_files(plan, adr, rule)
+        assert adr in index.candidates(plan) and plan in index.candidates(adr)
+        # Shared words alone need MIN_SHARED_WORDS ("system design review")
+        assert len(index.candidates(tmp_path / "03-Decisions/ADR-100.md")) < len(files) - 1
+
+    def test_frequent_keywords_are_pruned_when_enabled(self, linker, tmp_path):
+        files = list(tmp_path.glob("03-Decisions/*.md"))
+        assert "adr" in linker.build_index(files).keyword_postings
+
+        linker.config = {"prune_frequent_keywords": True,
+                         "max_keyword_df_ratio": 0, "min_keyword_df_limit": 1}
+        files = list(tmp_path.glob("03-Decisions/*.md"))
+        index = linker.build_index(files)
+
+        assert "adr" not in index.keyword_postings
+        assert all(len(p) <= 1 for p in index.keyword_postings.values())
+
+    def test_cycle_reads_each_file_once(self, linker, monkeypatch):
+        reads = []
+        original = linker.storage.read_text
+
+        def counting_read(path):
+            reads.append(Path(path))
+            return original(path)
+
+        monkeypatch.setattr(linker.storage, "read_text", counting_read)
+        linker.apply_rules()
+
+        assert len(reads) == len(set(reads))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test suite for the sparse tag similarity engine
+Tests for cortex/core/tag_similarity.py and its use in
+cortex/integrations/cross_vault_linker.py
+"""
+
+import random
+
+import pytest
+
+from cortex.core import tag_similarity
+
+pytestmark = pytest.mark.skipif(
+    not tag_similarity.SCIPY_AVAILABLE, reason="scipy not available"
+)
+
+
+def _random_tag_sets(rng, count, vocabulary):
+    return [set(rng.sample(vocabulary, rng.randint(0, 5))) for _ in range(count)]
+
+
+class TestSparseJaccard:
+    """Sparse products must reproduce the pairwise set computation"""
+
+    def test_matches_pairwise_jaccard(self):
+        rng = random.Random(7)
+        vocabulary_tags = [f"tag{i}" for i in range(12)]
+        left = _random_tag_sets(rng, 40, vocabulary_tags)
+        right = _random_tag_sets(rng, 35, vocabulary_tags)
+
+        vocabulary = tag_similarity.build_vocabulary(left + right)
+        pairs = list(tag_similarity.iter_similar_pairs(
+            tag_similarity.encode_tag_sets(left, vocabulary),
+            tag_similarity.encode_tag_sets(right, vocabulary),
+            min_similarity=0.3,
+            block_size=7,
+        ))
+
+        expected = [
+            (i, j, tag_similarity.jaccard(a, b))
+            for i, a in enumerate(left)
+            for j, b in enumerate(right)
+            if tag_similarity.jaccard(a, b) >= 0.3
+        ]
+        assert pairs == expected
+
+    def test_top_k_keeps_best_and_first_on_ties(self):
+        stream = [(0.5, "a"), (0.9, "b"), (0.5, "c"), (0.7, "d"), (0.9, "e")]
+
+        assert tag_similarity.top_k(stream, 3) == [
+            (0.9, "b"), (0.9, "e"), (0.7, "d")
+        ]
+        assert [item for _, item in tag_similarity.top_k(stream, 10)] == [
+            "b", "e", "d", "a", "c"
+        ]
+        assert tag_similarity.top_k(stream, 0) == []
+
+
+class TestCrossVaultLinkerBackends:
+    """find_cross_vault_links returns the same suggestions on both backends"""
+
+    @pytest.fixture
+    def linker(self, tmp_path):
+        from cortex.integrations.cross_vault_linker import CrossVaultLinker
+
+        notes = {
+            "hub": {"a.md": "#ml #python", "b.md": "#ops #k8s", "c.md": "#ml"},
+            "research": {"x.md": "#ml #python #papers", "y.md": "#k8s"},
+            "projects": {"p.md": "tags: [ml, ops]", "q.md": "#python"},
+        }
+        for vault, files in notes.items():
+            for name, content in files.items():
+                path = tmp_path / vault / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(content, encoding="utf-8")
+        return CrossVaultLinker(str(tmp_path / "hub"))
+
+    @staticmethod
+    def _key(suggestions):
+        return [
+            (s.source_vault, s.source_file, s.target_vault, s.target_file,
+             s.correlation_score, s.shared_tags, s.link_type)
+            for s in suggestions
+        ]
+
+    def test_backends_agree(self, linker):
+        sparse_result = linker.find_cross_vault_links(0.3, backend="sparse")
+        python_result = linker.find_cross_vault_links(0.3, backend="python")
+
+        assert sparse_result
+        assert self._key(sparse_result) == self._key(python_result)
+
+    def test_top_k_is_prefix_of_full_result(self, linker):
+        full = linker.find_cross_vault_links(0.2, backend="sparse")
+        best = linker.find_cross_vault_links(0.2, top_k=2, backend="sparse")
+
+        assert self._key(best) == self._key(full[:2])
@@ -9,9 +9,14 @@ import click
 import os
 import sys
 from datetime import datetime
-from neo4j import GraphDatabase
 import logging
 
+# Shared, lazily created Neo4j drivers from the cortex-cli package
+try:
+    from .neo4j_connection import close_driver, get_driver
+except ImportError:
+    from neo4j_connection import close_driver, get_driver
+
 # Configuration
 NEO4J_URI = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.environ.get("NEO4J_USER", "neo4j")
@@ -38,7 +43,11 @@ def echo_and_flush(message, err=False):
 
 
 class Neo4jHelper:
-    """Helper class for Neo4j database operations"""
+    """Helper class for Neo4j database operations
+
+    The driver comes from the process-wide registry and is only created by
+    commands that actually query the graph.
+    """
     _driver = None
 
     @classmethod
@@ -46,8 +55,8 @@ class Neo4jHelper:
         """Get or create Neo4j driver instance"""
         if cls._driver is None:
             try:
-                cls._driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
-                echo_and_flush(f"🔗 Connected to Neo4j: {NEO4J_URI}")
+                cls._driver = get_driver(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
+                logger.debug(f"🔗 Neo4j driver ready: {NEO4J_URI}")
             except Exception as e:
                 echo_and_flush(f"❌ Neo4j connection failed: {e}", err=True)
                 raise
@@ -57,7 +66,7 @@ class Neo4jHelper:
     def close(cls):
         """Close Neo4j driver connection"""
         if cls._driver:
-            cls._driver.close()
+            close_driver(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
             cls._driver = None
             echo_and_flush("🔌 Neo4j connection closed")
 
@@ -265,9 +274,43 @@ def show_note(name):
 
 
 # === STATUS COMMANDS ===
+def load_snapshot():
+    """Lokaler Graph-Snapshot für --offline; Fehlermeldung wenn keiner existiert"""
+    from graph_analytics import GraphSnapshot
+
+    snapshot = GraphSnapshot()
+    snapshot.require()
+    return snapshot
+
+
+def snapshot_age(snapshot):
+    if not snapshot.built_at:
+        return "unbekannt"
+    return datetime.fromtimestamp(snapshot.built_at / 1000).strftime('%Y-%m-%d %H:%M:%S')
+
+
 @cli.command()
-def cortex_status():
+@click.option('--offline', is_flag=True, help='Aus dem lokalen Graph-Snapshot antworten (siehe analytics --refresh)')
+def cortex_status(offline):
     """Zeigt umfassenden Cortex-System-Status"""
+    if offline:
+        try:
+            snapshot = load_snapshot()
+            summary = snapshot.summary()
+            echo_and_flush("🎯 CORTEX SYSTEM STATUS OVERVIEW (offline)")
+            echo_and_flush("=" * 50)
+            echo_and_flush(f"🗂️  Snapshot vom {snapshot_age(snapshot)}")
+            echo_and_flush(f"\n📈 DATA STATISTICS:")
+            echo_and_flush(f"   📝 Notes: {summary['notes']}")
+            echo_and_flush(f"   🔄 Workflows: {summary.get('workflows', 0)}")
+            echo_and_flush(f"   🏷️ Tags: {summary.get('tags', 0)}")
+            echo_and_flush(f"   🔗 Links: {summary['links']}")
+            echo_and_flush(f"   🧩 Komponenten: {summary['components']} "
+                           f"(größte: {summary['largest_component']} Notes)")
+        except Exception as e:
+            echo_and_flush(f"❌ Status query failed: {e}", err=True)
+        return
+
     try:
         echo_and_flush("🎯 CORTEX SYSTEM STATUS OVERVIEW")
         echo_and_flush("=" * 50)
@@ -304,8 +347,29 @@ def cortex_status():
 
 
 @cli.command()
-def smart_overview():
+@click.option('--offline', is_flag=True, help='Aus dem lokalen Graph-Snapshot antworten (siehe analytics --refresh)')
+def smart_overview(offline):
     """Smart Overview - Kombiniert mehrere Status-Abfragen"""
+    if offline:
+        try:
+            snapshot = load_snapshot()
+            summary = snapshot.summary()
+            echo_and_flush("🧠 SMART OVERVIEW - Intelligent System Summary (offline)")
+            echo_and_flush("=" * 60)
+            echo_and_flush(f"📊 QUICK STATS (Snapshot vom {snapshot_age(snapshot)}):")
+            echo_and_flush(f"   📝 Notes: {summary['notes']}")
+            echo_and_flush(f"   🏷️ Tags: {summary.get('tags', 0)}")
+            echo_and_flush(f"   🔄 Workflows: {summary.get('workflows', 0)}")
+            if summary['note_types']:
+                echo_and_flush(f"   📋 Note Types: {', '.join(summary['note_types'][:3])}")
+            top = snapshot.top(snapshot.pagerank(), limit=3)
+            if top:
+                echo_and_flush(f"   ⭐ Zentrale Notes: {', '.join(name for name, _ in top)}")
+            echo_and_flush(f"\n✨ Smart Overview completed successfully")
+        except Exception as e:
+            echo_and_flush(f"❌ Smart Overview failed: {e}", err=True)
+        return
+
     try:
         echo_and_flush("🧠 SMART OVERVIEW - Intelligent System Summary")
         echo_and_flush("=" * 60)
@@ -411,22 +475,26 @@ def list_tags():
 
 @cli.command()
 @click.argument('note_name')
-@click.argument('tag_name')
-def add_tag(note_name, tag_name):
-    """Fügt einem Note einen Tag hinzu."""
+@click.argument('tag_names', nargs=-1, required=True)
+def add_tag(note_name, tag_names):
+    """Fügt einem Note einen oder mehrere Tags hinzu (ein Schreibzugriff)."""
     try:
         driver = Neo4jHelper.get_driver()
         with driver.session() as session:
             result = session.run("""
                 MATCH (n:Note {name: $note_name})
-                MERGE (t:Tag {name: $tag_name})
+                SET n.updated_at = timestamp()
+                WITH n
+                UNWIND $tag_names AS tag_name
+                MERGE (t:Tag {name: tag_name})
                 MERGE (n)-[:TAGGED_WITH]->(t)
-                RETURN n.name as note, t.name as tag
-            """, note_name=note_name, tag_name=tag_name)
+                RETURN n.name as note, collect(t.name) as tags
+            """, note_name=note_name, tag_names=list(dict.fromkeys(tag_names)))
 
             record = result.single()
-            if record:
-                echo_and_flush(f"✅ Tag '{tag_name}' zu Note '{note_name}' hinzugefügt.")
+            if record and record['note']:
+                for tag_name in record['tags']:
+                    echo_and_flush(f"✅ Tag '{tag_name}' zu Note '{note_name}' hinzugefügt.")
             else:
                 echo_and_flush(f"❌ Note '{note_name}' nicht gefunden.")
 
@@ -562,38 +630,15 @@ def add_note_smart(name, content, description, note_type, project_type):
 def create_performance_tags():
     """Erstellt die Performance-Tags für das System."""
     try:
-        echo_and_flush("🚀 Erstelle Performance-Tags...")
+        from governance_tagging import PERFORMANCE_TAGS, create_tag_definitions
 
-        performance_tags = [
-            {
-                "name": "performance-metrics",
-                "description": "Tag for notes related to performance measurements and metrics",
-                "category": "performance"
-            },
-            {
-                "name": "system-optimization",
-                "description": "Tag for notes about system optimization techniques and improvements",
-                "category": "performance"
-            },
-            {
-                "name": "command-tracking",
-                "description": "Tag for notes related to command execution tracking and monitoring",
-                "category": "performance"
-            }
-        ]
+        echo_and_flush("🚀 Erstelle Performance-Tags...")
 
         driver = Neo4jHelper.get_driver()
         with driver.session() as session:
-            for tag_info in performance_tags:
-                session.run("""
-                    MERGE (t:Tag {name: $name})
-                    SET t.description = $description,
-                        t.category = $category,
-                        t.created_at = datetime(),
-                        t.created_by = 'cli_command'
-                """, **tag_info)
-
-                echo_and_flush(f"✅ Performance Tag erstellt: '{tag_info['name']}'")
+            create_tag_definitions(session, PERFORMANCE_TAGS, created_by='cli_command')
+        for tag_info in PERFORMANCE_TAGS:
+            echo_and_flush(f"✅ Performance Tag erstellt: '{tag_info['name']}'")
 
         echo_and_flush("🎯 Alle Performance-Tags erfolgreich erstellt!")
 
@@ -601,65 +646,81 @@ def create_performance_tags():
         echo_and_flush(f"❌ Fehler beim Erstellen der Performance-Tags: {e}", err=True)
 
 
+@cli.command()
+@click.option('--dry-run', is_flag=True, help='Nur anzeigen, welche Tags hinzukämen')
+@click.option('--performance-only', is_flag=True, help='Nur die Performance-Tags zuweisen')
+@click.option('--page-size', default=1000, show_default=True, help='Notes pro gelesener Seite')
+@click.option('--batch-size', default=5000, show_default=True, help='Tag-Zuweisungen pro Transaktion')
+@click.option('--workers', type=int, help='Prozesse für die Tag-Vorschläge (Standard: CPU-Anzahl)')
+def auto_tag(dry_run, performance_only, page_size, batch_size, workers):
+    """Weist allen Notes die Governance-Tag-Vorschläge gebündelt zu."""
+    try:
+        from governance_tagging import PERFORMANCE_TAGS, BulkTagger
+
+        only_tags = {t['name'] for t in PERFORMANCE_TAGS} if performance_only else None
+        tagger = BulkTagger(Neo4jHelper.get_driver(), page_size=page_size, batch_size=batch_size,
+                            workers=workers, only_tags=only_tags)
+
+        def report_progress(report):
+            echo_and_flush(f"   … {report.notes} Notes geprüft, {report.planned} neue Zuweisungen")
+
+        report = tagger.run(dry_run=dry_run, progress=report_progress)
+
+        if dry_run:
+            echo_and_flush("🔍 Dry-Run – folgende Tags kämen hinzu:")
+            for note_name, tags in report.diff.items():
+                echo_and_flush(f"   + {note_name}: {', '.join(tags)}")
+        echo_and_flush(report.format())
+
+    except Exception as e:
+        echo_and_flush(f"❌ Fehler beim Auto-Tagging: {e}", err=True)
+
+
 # === SEARCH AND FILTER COMMANDS ===
 @cli.command()
 @click.argument('query')
 @click.option('--tag', help='Filtere nach Tag')
 @click.option('--type', 'note_type', help='Filtere nach Note-Typ')
-def search_notes(query, tag, note_type):
+@click.option('--limit', default=20, show_default=True, help='Treffer pro Seite')
+@click.option('--cursor', help='Cursor der nächsten Seite aus einer vorherigen Suche')
+@click.option('--offline', is_flag=True, help='Nur im lokalen Suchindex suchen')
+@click.option('--refresh-index', is_flag=True, help='Lokalen Suchindex vorher aus Neo4j neu aufbauen')
+def search_notes(query, tag, note_type, limit, cursor, offline, refresh_index):
     """Durchsucht Notes nach Inhalt, Namen oder Eigenschaften."""
-    try:
-        driver = Neo4jHelper.get_driver()
-        with driver.session() as session:
-            cypher_query = """
-                MATCH (n:Note)
-                WHERE (toLower(n.name) CONTAINS toLower($query) 
-                       OR toLower(n.content) CONTAINS toLower($query)
-                       OR toLower(n.description) CONTAINS toLower($query))
-            """
-            params = {"query": query}
-
-            # Add tag filter
-            if tag:
-                cypher_query += """
-                    AND EXISTS {
-                        MATCH (n)-[:TAGGED_WITH]->(t:Tag {name: $tag})
-                    }
-                """
-                params["tag"] = tag
+    from note_search import LocalNoteIndex, search_notes as run_search
 
-            # Add type filter
-            if note_type:
-                cypher_query += " AND n.type = $note_type"
-                params["note_type"] = note_type
-
-            cypher_query += """
-                OPTIONAL MATCH (n)-[:TAGGED_WITH]->(t:Tag)
-                RETURN n, collect(t.name) as tags
-                ORDER BY n.name
-                LIMIT 20
-            """
+    try:
+        local_index = LocalNoteIndex()
+        if refresh_index:
+            with Neo4jHelper.get_driver().session() as session:
+                count = local_index.refresh_from_graph(session)
+            echo_and_flush(f"🗂️  Lokaler Suchindex aktualisiert ({count} Notes)")
+
+        driver = None if offline else Neo4jHelper.get_driver()
+        page = run_search(driver, query, tag=tag, note_type=note_type, cursor=cursor,
+                          limit=limit, offline=offline, local_index=local_index)
+        notes = page['results']
+
+        if notes:
+            source = " (offline, lokaler Index)" if page['source'] == 'local' else ""
+            echo_and_flush(f"🔍 Suchergebnisse für '{query}' ({len(notes)} auf dieser Seite){source}:")
+            echo_and_flush("=" * 50)
 
-            result = session.run(cypher_query, params)
-            notes = list(result)
+            for note in notes:
+                tags = [t for t in note['tags'] if t]
 
-            if notes:
-                echo_and_flush(f"🔍 Suchergebnisse für '{query}' ({len(notes)} gefunden):")
-                echo_and_flush("=" * 50)
+                echo_and_flush(f"\n📝 {note['name']}  (Score {note['score']:.2f})")
+                if note.get('type'):
+                    echo_and_flush(f"   🏷️  Typ: {note['type']}")
+                if note.get('description'):
+                    echo_and_flush(f"   📄 {note['description']}")
+                if tags:
+                    echo_and_flush(f"   🏷️  Tags: {', '.join(tags[:3])}")
 
-                for record in notes:
-                    note = record['n']
-                    tags = [t for t in record['tags'] if t]
-
-                    echo_and_flush(f"\n📝 {note['name']}")
-                    if note.get('type'):
-                        echo_and_flush(f"   🏷️  Typ: {note['type']}")
-                    if note.get('description'):
-                        echo_and_flush(f"   📄 {note['description']}")
-                    if tags:
-                        echo_and_flush(f"   🏷️  Tags: {', '.join(tags[:3])}")
-            else:
-                echo_and_flush(f"❌ Keine Notes gefunden für '{query}'")
+            if page['next_cursor']:
+                echo_and_flush(f"\n➡️  Weitere Treffer: --cursor {page['next_cursor']}")
+        else:
+            echo_and_flush(f"❌ Keine Notes gefunden für '{query}'")
 
     except Exception as e:
         echo_and_flush(f"❌ Fehler bei der Suche: {e}", err=True)
@@ -677,6 +738,7 @@ def link_notes(from_note, to_note):
             result = session.run("""
                 MATCH (from:Note {name: $from_note}), (to:Note {name: $to_note})
                 MERGE (from)-[:LINKS_TO]->(to)
+                SET from.updated_at = timestamp()
                 RETURN from.name as from_name, to.name as to_name
             """, from_note=from_note, to_note=to_note)
 
@@ -691,9 +753,15 @@ def link_notes(from_note, to_note):
 
 
 @cli.command()
-def show_network():
+@click.option('--offline', is_flag=True, help='Aus dem lokalen Graph-Snapshot antworten (siehe analytics --refresh)')
+def show_network(offline):
     """Zeigt das Netzwerk aller Notes und deren Verbindungen."""
     try:
+        if offline:
+            result = load_snapshot().network(limit=20)
+            print_network(result)
+            return
+
         driver = Neo4jHelper.get_driver()
         with driver.session() as session:
             result = session.run("""
@@ -707,24 +775,183 @@ def show_network():
                 ORDER BY size(links) DESC, n.name
                 LIMIT 20
             """)
+            print_network(result)
 
-            echo_and_flush("🌐 Notes-Netzwerk (Top 20 nach Verlinkung):")
-            echo_and_flush("=" * 50)
+    except Exception as e:
+        echo_and_flush(f"❌ Fehler beim Anzeigen des Netzwerks: {e}", err=True)
 
-            for record in result:
-                note = record['note']
-                note_type = record['type'] or 'untyped'
-                links = [l for l in record['links'] if l]
-                tags = [t for t in record['tags'] if t]
-
-                echo_and_flush(f"\n📝 {note} ({note_type})")
-                if links:
-                    echo_and_flush(f"   🔗 Links zu: {', '.join(links[:3])}")
-                if tags:
-                    echo_and_flush(f"   🏷️  Tags: {', '.join(tags[:3])}")
+
+def print_network(records):
+    echo_and_flush("🌐 Notes-Netzwerk (Top 20 nach Verlinkung):")
+    echo_and_flush("=" * 50)
+
+    for record in records:
+        note = record['note']
+        note_type = record['type'] or 'untyped'
+        links = [l for l in record['links'] if l]
+        tags = [t for t in record['tags'] if t]
+
+        echo_and_flush(f"\n📝 {note} ({note_type})")
+        if links:
+            echo_and_flush(f"   🔗 Links zu: {', '.join(links[:3])}")
+        if tags:
+            echo_and_flush(f"   🏷️  Tags: {', '.join(tags[:3])}")
+
+
+@cli.command()
+@click.option('--refresh', is_flag=True, help='Snapshot vorher aus Neo4j aktualisieren')
+@click.option('--full', is_flag=True, help='Mit --refresh: kompletten Export statt nur Änderungen')
+@click.option('--note', help='Gemeinsame Nachbarn und Umgebung dieser Note zeigen')
+@click.option('--hops', default=2, show_default=True, help='Reichweite für --note')
+@click.option('--top', default=10, show_default=True, help='Anzahl Einträge pro Rangliste')
+def analytics(refresh, full, note, hops, top):
+    """Graph-Analysen (PageRank, Grad, Komponenten) aus dem lokalen Snapshot."""
+    from graph_analytics import GraphSnapshot
+
+    try:
+        snapshot = GraphSnapshot()
+        if refresh:
+            with Neo4jHelper.get_driver().session() as session:
+                stats = snapshot.refresh_from_graph(session, full=full)
+            echo_and_flush(f"🗂️  Snapshot aktualisiert ({stats['mode']}, {stats['changed']} Notes exportiert, "
+                           f"{stats['notes']} Notes, {stats['links']} Links, {stats['seconds']}s)")
+        snapshot.require()
+
+        if note:
+            echo_and_flush(f"🔗 Gemeinsame Nachbarn von '{note}':")
+            for name, count in snapshot.common_neighbors(note, limit=top):
+                echo_and_flush(f"   {name} ({count})")
+            reachable = snapshot.k_hop(note, k=hops)
+            echo_and_flush(f"\n🧭 In {hops} Schritten erreichbar: {len(reachable)} Notes")
+            for name, distance in sorted(reachable.items(), key=lambda x: (x[1], x[0]))[:top]:
+                echo_and_flush(f"   {name} ({distance})")
+            return
+
+        summary = snapshot.summary()
+        echo_and_flush(f"📊 GRAPH-ANALYSE (Snapshot vom {snapshot_age(snapshot)})")
+        echo_and_flush("=" * 50)
+        echo_and_flush(f"   📝 Notes: {summary['notes']}   🔗 Links: {summary['links']}")
+        echo_and_flush(f"   🧩 Komponenten: {summary['components']} "
+                       f"(größte: {summary['largest_component']} Notes)")
+
+        echo_and_flush("\n⭐ PageRank:")
+        for name, score in snapshot.top(snapshot.pagerank(), limit=top):
+            echo_and_flush(f"   {name:<40} {score:.4f}")
+
+        degree = snapshot.degree_centrality()
+        echo_and_flush("\n🔀 Grad-Zentralität:")
+        for name, score in snapshot.top(degree['centrality'], limit=top):
+            i = snapshot.node_index(name)
+            echo_and_flush(f"   {name:<40} {score:.3f} (ein {degree['in'][i]}, aus {degree['out'][i]})")
 
     except Exception as e:
-        echo_and_flush(f"❌ Fehler beim Anzeigen des Netzwerks: {e}", err=True)
+        echo_and_flush(f"❌ Fehler bei der Graph-Analyse: {e}", err=True)
+
+
+# === SCHEMA AND IMPORT COMMANDS ===
+@cli.command()
+@click.option('--wait/--no-wait', default=True, show_default=True,
+              help='Warten, bis alle Indizes befüllt sind')
+@click.option('--timeout', default=300, show_default=True, help='Maximale Wartezeit in Sekunden')
+def init_schema(wait, timeout):
+    """Legt Uniqueness-Constraints und den Volltext-Index an."""
+    from schema import (format_index_population, index_population,
+                        init_schema as create_schema, wait_for_indexes)
+
+    try:
+        driver = Neo4jHelper.get_driver()
+        with driver.session() as session:
+            result = create_schema(session)
+            for name in result['created']:
+                echo_and_flush(f"✅ Erstellt: {name}")
+            for name in result['existing']:
+                echo_and_flush(f"⏭️  Vorhanden: {name}")
+            for name, error in result['failed'].items():
+                echo_and_flush(f"❌ Fehlgeschlagen: {name}: {error}", err=True)
+
+            echo_and_flush("\n📊 Index-Befüllung:")
+            if wait:
+                last = {}
+
+                def report_progress(indexes):
+                    for index in indexes:
+                        state = (index['state'], index.get('populationPercent'))
+                        if last.get(index['name']) != state:
+                            last[index['name']] = state
+                            echo_and_flush(format_index_population([index]))
+
+                indexes = wait_for_indexes(session, timeout=timeout, progress=report_progress)
+            else:
+                indexes = index_population(session)
+                echo_and_flush(format_index_population(indexes))
+
+            pending = [i['name'] for i in indexes if i['state'] != 'ONLINE']
+            if pending:
+                echo_and_flush(f"⚠️  Noch nicht online: {', '.join(pending)}")
+            else:
+                echo_and_flush("🎯 Alle Indizes online")
+
+    except Exception as e:
+        echo_and_flush(f"❌ Fehler beim Anlegen des Schemas: {e}", err=True)
+
+
+@cli.command()
+@click.argument('file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', default=1000, show_default=True, help='Zeilen pro UNWIND-Transaktion')
+@click.option('--restart', is_flag=True, help='Checkpoint eines abgebrochenen Imports verwerfen')
+def migrate(file, chunk_size, restart):
+    """Importiert Notes, Tags, Templates und Links aus YAML/JSON."""
+    from migrate_structure import checkpoint_path, format_report, migrate_from_file
+
+    try:
+        echo_and_flush(f"📥 Importiere {file} (Chunks à {chunk_size} Zeilen)...")
+        report = migrate_from_file(file, chunk_size=chunk_size, resume=not restart)
+        echo_and_flush(format_report(report))
+        echo_and_flush("✅ Migration abgeschlossen")
+    except Exception as e:
+        echo_and_flush(f"❌ Fehler bei der Migration: {e}", err=True)
+        echo_and_flush(f"💡 Erneut ausführen setzt nach dem letzten Chunk fort ({checkpoint_path(file)})", err=True)
+
+
+
+@cli.command()
+@click.argument('directory', type=click.Path(file_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(['parquet', 'arrow']), default='parquet',
+              show_default=True, help='Parquet oder Arrow IPC')
+def export_graph(directory, file_format):
+    """Exportiert Nodes und Beziehungen spaltenweise, eine Datei pro Label/Typ."""
+    from graph_export import export_graph as write_export
+
+    try:
+        echo_and_flush(f"📤 Exportiere Graph nach {directory} ({file_format})...")
+        driver = Neo4jHelper.get_driver()
+        with driver.session() as session:
+            manifest = write_export(
+                session, directory, file_format=file_format,
+                progress=lambda kind, name, rows: echo_and_flush(f"   ✅ {kind} {name}: {rows} Zeilen"),
+            )
+        for name in manifest['skipped']:
+            echo_and_flush(f"⏭️  Übersprungen (kein gültiger Bezeichner): {name}")
+        echo_and_flush(f"🎯 Export abgeschlossen in {manifest['seconds']:.2f}s")
+    except Exception as e:
+        echo_and_flush(f"❌ Fehler beim Export: {e}", err=True)
+
+
+@cli.command()
+@click.argument('source', type=click.Path(exists=True))
+@click.option('--batch-size', default=10000, show_default=True, help='Zeilen pro UNWIND-Transaktion')
+@click.option('--workers', default=4, show_default=True, help='Parallele Schreib-Transaktionen')
+def import_graph(source, batch_size, workers):
+    """Importiert einen Export (Verzeichnis) oder ein Auto-Backup (.jsonl.gz) online."""
+    from graph_export import format_report, import_path
+
+    try:
+        echo_and_flush(f"📥 Importiere {source} (Batches à {batch_size}, {workers} Worker)...")
+        report = import_path(Neo4jHelper.get_driver(), source, batch_size=batch_size, workers=workers)
+        echo_and_flush(format_report(report))
+        echo_and_flush("✅ Import abgeschlossen")
+    except Exception as e:
+        echo_and_flush(f"❌ Fehler beim Import: {e}", err=True)
 
 
 if __name__ == '__main__':
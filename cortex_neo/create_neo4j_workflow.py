@@ -2,9 +2,14 @@
 """
 Beispiel-Skript: Erstellt die Grundstruktur für das Neo4J-Mapping gemäß Konzept.md
 """
-from neo4j import GraphDatabase
 import os
 
+# Shared, lazily created Neo4j drivers from the cortex-cli package
+try:
+    from .neo4j_connection import get_driver
+except ImportError:
+    from neo4j_connection import get_driver
+
 NEO4J_URI = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.environ.get("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.environ.get("NEO4J_PASSWORD", "neo4jtest")
@@ -18,12 +23,13 @@ STEPS = [
 ]
 
 def create_workflow_structure():
-    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    driver = get_driver(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
     with driver.session() as session:
         # Workflow-Knoten anlegen
         session.run(
             """
-            MERGE (w:Workflow {name: $workflow_name, type: 'Standard', status: 'in progress'})
+            MERGE (w:Workflow {name: $workflow_name})
+            SET w.type = 'Standard', w.status = 'in progress'
             """,
             workflow_name=WORKFLOW_NAME
         )
@@ -32,8 +38,8 @@ def create_workflow_structure():
             session.run(
                 """
                 MATCH (w:Workflow {name: $workflow_name})
-                MERGE (s:Step {name: $step_name, order: $step_order})
-                MERGE (w)-[:HAS_STEP]->(s)
+                MERGE (w)-[:HAS_STEP]->(s:Step {name: $step_name})
+                SET s.order = $step_order
                 """,
                 workflow_name=WORKFLOW_NAME,
                 step_name=step["name"],
@@ -45,14 +51,14 @@ def create_workflow_structure():
             to_step = STEPS[i+1]
             session.run(
                 """
-                MATCH (s1:Step {name: $from_name, order: $from_order})
-                MATCH (s2:Step {name: $to_name, order: $to_order})
+                MATCH (w:Workflow {name: $workflow_name})
+                MATCH (w)-[:HAS_STEP]->(s1:Step {name: $from_name})
+                MATCH (w)-[:HAS_STEP]->(s2:Step {name: $to_name})
                 MERGE (s1)-[:NEXT]->(s2)
                 """,
+                workflow_name=WORKFLOW_NAME,
                 from_name=from_step["name"],
-                from_order=from_step["order"],
-                to_name=to_step["name"],
-                to_order=to_step["order"]
+                to_name=to_step["name"]
             )
     print("Neo4J-Workflow-Struktur erfolgreich erstellt.")
 
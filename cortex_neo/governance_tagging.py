@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Governance bulk tagging for the cortex_neo scripts.
+
+The tagger lives in the project-level ``src`` package
+(``src.governance.bulk_tagging``). Run as ``python cortex_neo/cortex_cli.py``
+only cortex_neo/ is on sys.path, so this module makes the project root
+importable and re-exports what the CLI needs, instead of every command
+repeating the path fallback.
+"""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+try:
+    from src.governance.bulk_tagging import PERFORMANCE_TAGS, BulkTagger, create_tag_definitions
+except ImportError:
+    sys.path.append(str(PROJECT_ROOT))
+    from src.governance.bulk_tagging import PERFORMANCE_TAGS, BulkTagger, create_tag_definitions
+
+__all__ = ["PROJECT_ROOT", "PERFORMANCE_TAGS", "BulkTagger", "create_tag_definitions"]
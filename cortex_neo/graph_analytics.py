@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Offline graph analytics for the Cortex knowledge graph.
+
+The Note/Tag/LINKS_TO graph is exported once into a snapshot of NumPy CSR
+arrays under ``cortex_neo/.cache/graph_snapshot`` (override the cache root
+with CORTEX_NEO_CACHE_DIR):
+
+    links_indptr.npy / links_indices.npy   directed LINKS_TO, note -> note
+    graph_indptr.npy / graph_indices.npy   the same links, undirected
+    tags_indptr.npy  / tags_indices.npy    TAGGED_WITH, note -> tag
+    meta.json                              note and tag names, note types, counts
+
+The arrays are memory-mapped on load, so commands answering from the
+snapshot start without reading the whole graph. PageRank, degree
+centrality, connected components, common neighbors and k-hop reachability
+run as vectorized NumPy operations over the edge arrays, without touching
+the live database.
+
+A refresh only re-exports notes whose ``updated_at`` (epoch ms, as set by
+the CLI) changed since the last snapshot. If the graph's note, link or tag
+assignment counts then disagree with the snapshot (deletions, or writes
+that did not set ``updated_at``) the snapshot is rebuilt from a full
+export.
+"""
+from __future__ import annotations
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    from .note_search import CACHE_DIR
+except ImportError:
+    from note_search import CACHE_DIR
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DIR = CACHE_DIR / "graph_snapshot"
+ARRAYS = ('links_indptr', 'links_indices', 'graph_indptr', 'graph_indices',
+          'tags_indptr', 'tags_indices')
+
+EXPORT_QUERY = """
+MATCH (n:Note)
+WHERE $since IS NULL OR coalesce(n.updated_at, 0) >= $since
+OPTIONAL MATCH (n)-[:LINKS_TO]->(m:Note)
+WITH n, collect(DISTINCT m.name) AS links
+OPTIONAL MATCH (n)-[:TAGGED_WITH]->(t:Tag)
+RETURN n.name AS name, n.type AS type, links, collect(DISTINCT t.name) AS tags
+"""
+
+COUNTS_QUERY = """
+CALL { MATCH (n:Note) RETURN count(n) AS notes }
+CALL { MATCH (a:Note)-[:LINKS_TO]->(b:Note) WITH DISTINCT a, b RETURN count(*) AS links }
+CALL { MATCH (n:Note)-[:TAGGED_WITH]->(t:Tag) WITH DISTINCT n, t RETURN count(*) AS tagged }
+CALL { MATCH (t:Tag) RETURN count(t) AS tags }
+CALL { MATCH (w:Workflow) RETURN count(w) AS workflows }
+RETURN notes, links, tagged, tags, workflows
+"""
+
+
+class SnapshotMissing(FileNotFoundError):
+    """Raised when an offline query finds no snapshot on disk"""
+
+
+def _csr(rows: List[List[int]]) -> Tuple[Any, Any]:
+    """(indptr, indices) of integer rows, each row sorted"""
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(r) for r in rows])
+    indices = np.fromiter((c for r in rows for c in sorted(r)), dtype=np.int32, count=int(indptr[-1]))
+    return indptr, indices
+
+
+def _undirected(indptr, indices, n: int) -> Tuple[Any, Any]:
+    """Symmetric CSR of a directed CSR, without self loops or duplicates"""
+    src = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+    dst = indices.astype(np.int64)
+    keys = np.unique(np.concatenate([src * n + dst, dst * n + src]))
+    rows, cols = keys // n, keys % n
+    keep = rows != cols
+    rows, cols = rows[keep], cols[keep]
+    sym_indptr = np.zeros(n + 1, dtype=np.int64)
+    sym_indptr[1:] = np.cumsum(np.bincount(rows, minlength=n))
+    return sym_indptr, cols.astype(np.int32)
+
+
+class GraphSnapshot:
+    """Memory-mapped CSR snapshot of notes, tags and links"""
+
+    def __init__(self, directory: Path = SNAPSHOT_DIR):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for offline graph analytics: pip install numpy")
+        self.directory = Path(directory)
+        self.notes: List[str] = []
+        self.types: List[Optional[str]] = []
+        self.tags: List[str] = []
+        self.counts: Dict[str, int] = {}
+        self.built_at: Optional[int] = None
+        self.arrays: Dict[str, Any] = {}
+        self._index: Dict[str, int] = {}
+        self._edges: Dict[str, Any] = {}
+
+    # --- building and persistence ---
+
+    def build(self, rows: Iterable[Dict[str, Any]], counts: Optional[Dict[str, int]] = None):
+        """Build from export rows with name, type, links and tags"""
+        rows = [r for r in rows if r.get('name')]
+        self.notes = [r['name'] for r in rows]
+        self.types = [r.get('type') for r in rows]
+        self._index = {name: i for i, name in enumerate(self.notes)}
+        tag_index: Dict[str, int] = {}
+        link_rows, tag_rows = [], []
+        for r in rows:
+            link_rows.append({self._index[m] for m in r.get('links') or [] if m in self._index})
+            tag_rows.append({tag_index.setdefault(t, len(tag_index)) for t in r.get('tags') or [] if t})
+        self.tags = list(tag_index)
+        self._set_arrays(link_rows, tag_rows)
+        self.counts = dict(counts or {})
+        self.counts.update(self._local_counts())
+
+    def _set_arrays(self, link_rows: List[set], tag_rows: List[set]):
+        n = len(self.notes)
+        links_indptr, links_indices = _csr(link_rows)
+        graph_indptr, graph_indices = _undirected(links_indptr, links_indices, n)
+        tags_indptr, tags_indices = _csr(tag_rows)
+        self.arrays = {
+            'links_indptr': links_indptr, 'links_indices': links_indices,
+            'graph_indptr': graph_indptr, 'graph_indices': graph_indices,
+            'tags_indptr': tags_indptr, 'tags_indices': tags_indices,
+        }
+        self._edges = {}
+
+    def _local_counts(self) -> Dict[str, int]:
+        return {
+            'notes': len(self.notes),
+            'links': int(self.arrays['links_indptr'][-1]),
+            'tagged': int(self.arrays['tags_indptr'][-1]),
+        }
+
+    def save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name in ARRAYS:
+            tmp_file = self.directory / f"{name}.tmp.npy"
+            np.save(tmp_file, np.asarray(self.arrays[name]))
+            os.replace(tmp_file, self.directory / f"{name}.npy")
+        # meta.json is written last: a snapshot is complete once it matches
+        tmp_file = self.directory / "meta.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': SNAPSHOT_VERSION,
+                'built_at': self.built_at,
+                'notes': self.notes,
+                'types': self.types,
+                'tags': self.tags,
+                'counts': self.counts,
+            }, f)
+        os.replace(tmp_file, self.directory / "meta.json")
+
+    def load(self, mmap: bool = True) -> bool:
+        """Load the saved snapshot; False if missing or from another version"""
+        try:
+            with open(self.directory / "meta.json", 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != SNAPSHOT_VERSION:
+                return False
+            arrays = {
+                name: np.load(self.directory / f"{name}.npy", mmap_mode='r' if mmap else None)
+                for name in ARRAYS
+            }
+        except (OSError, ValueError):
+            return False
+        self.notes = meta['notes']
+        self.types = meta['types']
+        self.tags = meta['tags']
+        self.counts = meta.get('counts', {})
+        self.built_at = meta.get('built_at')
+        self.arrays = arrays
+        self._index = {name: i for i, name in enumerate(self.notes)}
+        self._edges = {}
+        return True
+
+    def require(self):
+        """Load the snapshot or raise SnapshotMissing"""
+        if not self.arrays and not self.load():
+            raise SnapshotMissing(
+                f"No graph snapshot at {self.directory}; "
+                "build it with `analytics --refresh` while Neo4j is available"
+            )
+
+    # --- refresh from Neo4j ---
+
+    @staticmethod
+    def _graph_counts(session) -> Dict[str, int]:
+        return dict(session.run(COUNTS_QUERY).single().data())
+
+    def refresh_from_graph(self, session, full: bool = False) -> Dict[str, Any]:
+        """Bring the snapshot up to date and save it
+
+        Returns mode ('full' or 'incremental'), changed notes, note and
+        link counts and the duration.
+        """
+        started = time.perf_counter()
+        now_ms = int(time.time() * 1000)
+        counts = self._graph_counts(session)
+        mode, changed = 'full', None
+        if not full and (self.arrays or self.load()) and self.built_at is not None:
+            rows = [r.data() for r in session.run(EXPORT_QUERY, since=self.built_at)]
+            if self._apply_changes(rows) and all(
+                counts.get(key) == value for key, value in self._local_counts().items()
+            ):
+                mode, changed = 'incremental', len(rows)
+        if mode == 'full':
+            rows = [r.data() for r in session.run(EXPORT_QUERY, since=None)]
+            self.build(rows)
+            changed = len(rows)
+        self.counts.update(counts)
+        self.built_at = now_ms
+        self.save()
+        return {
+            'mode': mode,
+            'changed': changed,
+            'notes': len(self.notes),
+            'links': self.counts['links'],
+            'seconds': round(time.perf_counter() - started, 3),
+        }
+
+    def _apply_changes(self, rows: List[Dict[str, Any]]) -> bool:
+        """Replace the rows of changed notes; False if a full export is needed"""
+        notes, types = list(self.notes), list(self.types)
+        index = dict(self._index)
+        for r in rows:
+            if r['name'] not in index:
+                index[r['name']] = len(notes)
+                notes.append(r['name'])
+                types.append(r.get('type'))
+        tag_index = {t: i for i, t in enumerate(self.tags)}
+
+        link_rows = self._rows('links_indptr', 'links_indices')
+        tag_rows = self._rows('tags_indptr', 'tags_indices')
+        link_rows.extend(set() for _ in range(len(notes) - len(link_rows)))
+        tag_rows.extend(set() for _ in range(len(notes) - len(tag_rows)))
+        for r in rows:
+            links = r.get('links') or []
+            if any(m not in index for m in links):
+                # Link target created without updated_at
+                return False
+            i = index[r['name']]
+            types[i] = r.get('type')
+            link_rows[i] = {index[m] for m in links}
+            tag_rows[i] = {tag_index.setdefault(t, len(tag_index)) for t in r.get('tags') or [] if t}
+
+        self.notes, self.types, self._index = notes, types, index
+        self.tags = list(tag_index)
+        self._set_arrays(link_rows, tag_rows)
+        return True
+
+    def _rows(self, indptr_name: str, indices_name: str) -> List[set]:
+        indptr, indices = self.arrays[indptr_name], self.arrays[indices_name]
+        return [set(indices[indptr[i]:indptr[i + 1]].tolist()) for i in range(len(indptr) - 1)]
+
+    # --- analytics ---
+
+    def _edge_arrays(self, kind: str) -> Tuple[Any, Any]:
+        """(source, target) arrays of the 'links' or 'graph' CSR"""
+        if kind not in self._edges:
+            indptr = self.arrays[f"{kind}_indptr"]
+            self._edges[kind] = (
+                np.repeat(np.arange(len(self.notes)), np.diff(indptr)),
+                np.asarray(self.arrays[f"{kind}_indices"], dtype=np.int64),
+            )
+        return self._edges[kind]
+
+    def node_index(self, name: str) -> int:
+        try:
+            return self._index[name]
+        except KeyError:
+            raise KeyError(f"Note '{name}' is not in the graph snapshot") from None
+
+    def degree_centrality(self) -> Dict[str, Any]:
+        """In-, out- and total degree, and total degree / (n - 1)"""
+        n = len(self.notes)
+        out_degree = np.diff(self.arrays['links_indptr'])
+        in_degree = np.bincount(self.arrays['links_indices'], minlength=n)
+        total = np.diff(self.arrays['graph_indptr'])
+        return {
+            'in': in_degree, 'out': out_degree, 'total': total,
+            'centrality': total / max(n - 1, 1),
+        }
+
+    def pagerank(self, damping: float = 0.85, max_iter: int = 100, tol: float = 1e-6):
+        """PageRank over the directed links; dangling notes spread evenly"""
+        n = len(self.notes)
+        if n == 0:
+            return np.zeros(0)
+        src, dst = self._edge_arrays('links')
+        out_degree = np.diff(self.arrays['links_indptr'])
+        weights = 1.0 / out_degree[src]
+        dangling = out_degree == 0
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            spread = np.bincount(dst, weights=rank[src] * weights, minlength=n)
+            new_rank = (1 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+            converged = np.abs(new_rank - rank).sum() < tol
+            rank = new_rank
+            if converged:
+                break
+        return rank
+
+    def connected_components(self):
+        """Component label per note (lowest member index), links undirected"""
+        labels = np.arange(len(self.notes))
+        src, dst = self._edge_arrays('graph')
+        while True:
+            previous = labels.copy()
+            np.minimum.at(labels, src, labels[dst])
+            labels = labels[labels]
+            if np.array_equal(labels, previous):
+                return labels
+
+    def common_neighbors(self, name: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Unlinked notes sharing the most neighbors with a note"""
+        node = self.node_index(name)
+        src, dst = self._edge_arrays('graph')
+        indptr, indices = self.arrays['graph_indptr'], self.arrays['graph_indices']
+        neighbors = np.zeros(len(self.notes), dtype=bool)
+        neighbors[indices[indptr[node]:indptr[node + 1]]] = True
+        counts = np.bincount(dst[neighbors[src]], minlength=len(self.notes))
+        counts[node] = 0
+        counts[neighbors] = 0
+        candidates = np.flatnonzero(counts)
+        order = sorted(candidates.tolist(), key=lambda i: (-counts[i], self.notes[i]))[:limit]
+        return [(self.notes[i], int(counts[i])) for i in order]
+
+    def k_hop(self, name: str, k: int = 2) -> Dict[str, int]:
+        """Notes reachable within k undirected hops, with their distance"""
+        node = self.node_index(name)
+        src, dst = self._edge_arrays('graph')
+        distance = np.full(len(self.notes), -1)
+        distance[node] = 0
+        frontier = np.zeros(len(self.notes), dtype=bool)
+        frontier[node] = True
+        for hop in range(1, k + 1):
+            reached = np.zeros(len(self.notes), dtype=bool)
+            reached[dst[frontier[src]]] = True
+            frontier = reached & (distance < 0)
+            if not frontier.any():
+                break
+            distance[frontier] = hop
+        return {self.notes[i]: int(distance[i]) for i in np.flatnonzero(distance > 0)}
+
+    # --- views for the CLI ---
+
+    def top(self, scores, limit: int = 10) -> List[Tuple[str, float]]:
+        order = np.lexsort((np.arange(len(scores)), -np.asarray(scores)))[:limit]
+        return [(self.notes[i], float(scores[i])) for i in order]
+
+    def links_of(self, node: int) -> List[str]:
+        indptr, indices = self.arrays['links_indptr'], self.arrays['links_indices']
+        return [self.notes[i] for i in indices[indptr[node]:indptr[node + 1]]]
+
+    def tags_of(self, node: int) -> List[str]:
+        indptr, indices = self.arrays['tags_indptr'], self.arrays['tags_indices']
+        return [self.tags[i] for i in indices[indptr[node]:indptr[node + 1]]]
+
+    def network(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Notes with the most outgoing links, as show_network lists them"""
+        out_degree = np.diff(self.arrays['links_indptr'])
+        order = sorted(range(len(self.notes)), key=lambda i: (-out_degree[i], self.notes[i]))[:limit]
+        return [
+            {'note': self.notes[i], 'type': self.types[i],
+             'links': self.links_of(i), 'tags': self.tags_of(i)}
+            for i in order
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts and component structure for status output"""
+        labels = self.connected_components()
+        sizes = np.bincount(labels, minlength=len(self.notes))
+        return {
+            **self.counts,
+            'components': int((sizes > 0).sum()),
+            'largest_component': int(sizes.max()) if len(sizes) else 0,
+            'note_types': sorted({t for t in self.types if t}),
+            'built_at': self.built_at,
+        }
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Columnar export and online restore of the Cortex knowledge graph.
+
+``export_graph`` writes every node label and relationship type into its own
+Parquet (or Arrow IPC) file plus a ``manifest.json``:
+
+    nodes_Note.parquet        one row per node, one column per property
+    rels_LINKS_TO.parquet     _source_label, _source, _target_label, _target
+                              and one column per relationship property
+    manifest.json             format, file format, files, row counts
+
+Nodes are identified by (label, ``name``), as everywhere in this graph (see
+the uniqueness constraints in schema.py); nodes without a name and
+relationships between them are not exported. Temporal values are stored
+as Arrow timestamps; columns Arrow cannot type (mixed types, durations,
+points) are stored as JSON strings and listed in the manifest.
+
+``import_graph`` restores such an export, or a ``.jsonl.gz`` backup of the
+SafeTransactionManager, into the running database: the schema is ensured
+first (plus a name index for labels without a constraint), then all nodes
+and afterwards all relationships are MERGEd in UNWIND batches, written by
+a pool of threads with one session and transaction per batch.
+"""
+from __future__ import annotations
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pa_ipc = pq = None
+    PYARROW_AVAILABLE = False
+
+try:
+    from .schema import UNIQUE_NAME_LABELS, ensure_schema
+except ImportError:
+    from schema import UNIQUE_NAME_LABELS, ensure_schema
+
+EXPORT_FORMAT = "cortex-graph-export"
+EXPORT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+FILE_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_WORKERS = 4
+
+# Columns of a relationship file that are not relationship properties
+REL_KEY_COLUMNS = ('_source_label', '_source', '_target_label', '_target')
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+NODES_QUERY = "MATCH (n:`{label}`) WHERE n.name IS NOT NULL RETURN properties(n) AS props"
+
+RELS_QUERY = """
+MATCH (a)-[r:`{rel_type}`]->(b)
+WHERE a.name IS NOT NULL AND b.name IS NOT NULL
+RETURN head(labels(a)) AS source_label, a.name AS source,
+       head(labels(b)) AS target_label, b.name AS target,
+       properties(r) AS props
+"""
+
+MERGE_NODES_QUERY = """
+UNWIND $rows AS row
+MERGE (n:`{label}` {{name: row.name}})
+SET n += row.props
+"""
+
+MERGE_RELS_QUERY = """
+UNWIND $rows AS row
+MATCH (a:`{source_label}` {{name: row.source}})
+MATCH (b:`{target_label}` {{name: row.target}})
+MERGE (a)-[r:`{rel_type}`]->(b)
+SET r += row.props
+"""
+
+NAME_INDEX_STATEMENT = "CREATE INDEX {name} IF NOT EXISTS FOR (n:`{label}`) ON (n.name)"
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow not installed. Install pyarrow to export or import graph files.")
+
+
+def _identifier(name: str) -> bool:
+    """Labels and types are interpolated into Cypher, so only plain identifiers"""
+    return bool(name) and _IDENTIFIER.match(name) is not None
+
+
+def _native(value: Any) -> Any:
+    """neo4j temporal values -> Python datetime/date/time, lists element-wise"""
+    if isinstance(value, list):
+        return [_native(v) for v in value]
+    to_native = getattr(value, 'to_native', None)
+    if to_native is not None:
+        try:
+            return to_native()
+        except Exception:
+            return str(value)
+    return value
+
+
+def _table(columns: Dict[str, List[Any]]) -> Tuple[Any, List[str]]:
+    """Arrow table of the columns; untypable columns as JSON strings"""
+    arrays, names, json_columns = [], [], []
+    for name, values in columns.items():
+        try:
+            array = pa.array(values)
+            if pa.types.is_null(array.type) and values:
+                array = pa.array(values, type=pa.string())
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError, OverflowError):
+            array = pa.array([None if v is None else json.dumps(v, default=str, ensure_ascii=False)
+                              for v in values], type=pa.string())
+            json_columns.append(name)
+        arrays.append(array)
+        names.append(name)
+    return pa.Table.from_arrays(arrays, names=names), json_columns
+
+
+class _Columns:
+    """Column-wise accumulation of rows with differing property keys"""
+
+    def __init__(self):
+        self.columns: Dict[str, List[Any]] = {}
+        self.rows = 0
+
+    def add(self, values: Dict[str, Any]):
+        for key, value in values.items():
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = [None] * self.rows
+            column.append(_native(value))
+        self.rows += 1
+        for column in self.columns.values():
+            if len(column) < self.rows:
+                column.append(None)
+
+
+def _write_table(table, path: Path, file_format: str):
+    if file_format == 'parquet':
+        pq.write_table(table, str(path))
+    else:
+        with pa_ipc.new_file(str(path), table.schema) as writer:
+            writer.write_table(table)
+
+
+def export_graph(session, directory: str, file_format: str = 'parquet',
+                 progress: Optional[Callable[[str, str, int], None]] = None) -> Dict[str, Any]:
+    """Write all labels and relationship types as columnar files plus manifest
+
+    ``progress(kind, name, rows)`` is called after each file. Returns the
+    manifest with timings.
+    """
+    _require_pyarrow()
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"Unknown file format: {file_format} (expected one of {tuple(FILE_FORMATS)})")
+
+    out = Path(directory)
+    out.mkdir(parents=True, exist_ok=True)
+    suffix = FILE_FORMATS[file_format]
+    started = time.perf_counter()
+    manifest: Dict[str, Any] = {
+        'format': EXPORT_FORMAT,
+        'version': EXPORT_VERSION,
+        'file_format': file_format,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'nodes': {},
+        'relationships': {},
+        'skipped': [],
+    }
+
+    labels = sorted(record['label'] for record in session.run("CALL db.labels() YIELD label RETURN label"))
+    for label in labels:
+        if not _identifier(label):
+            manifest['skipped'].append(label)
+            continue
+        columns = _Columns()
+        for record in session.run(NODES_QUERY.format(label=label)):
+            columns.add(dict(record['props'] or {}))
+        if not columns.rows:
+            continue
+        table, json_columns = _table(columns.columns)
+        file_name = f"nodes_{label}{suffix}"
+        _write_table(table, out / file_name, file_format)
+        manifest['nodes'][label] = {'file': file_name, 'rows': columns.rows, 'json_columns': json_columns}
+        if progress:
+            progress('nodes', label, columns.rows)
+
+    rel_types = sorted(record['relationshipType'] for record in session.run(
+        "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType"))
+    for rel_type in rel_types:
+        if not _identifier(rel_type):
+            manifest['skipped'].append(rel_type)
+            continue
+        columns = _Columns()
+        for record in session.run(RELS_QUERY.format(rel_type=rel_type)):
+            row = {'_source_label': record['source_label'], '_source': record['source'],
+                   '_target_label': record['target_label'], '_target': record['target']}
+            row.update({k: v for k, v in (record['props'] or {}).items() if k not in REL_KEY_COLUMNS})
+            columns.add(row)
+        if not columns.rows:
+            continue
+        table, json_columns = _table(columns.columns)
+        file_name = f"rels_{rel_type}{suffix}"
+        _write_table(table, out / file_name, file_format)
+        manifest['relationships'][rel_type] = {'file': file_name, 'rows': columns.rows,
+                                               'json_columns': json_columns}
+        if progress:
+            progress('relationships', rel_type, columns.rows)
+
+    manifest['seconds'] = round(time.perf_counter() - started, 3)
+    tmp_path = out / f"{MANIFEST_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, out / MANIFEST_FILE)
+    return manifest
+
+
+# A batch is (kind, key, rows): kind 'nodes' with key (label,) and rows
+# {name, props}, or kind 'relationships' with key (rel_type, source_label,
+# target_label) and rows {source, target, props}.
+Batch = Tuple[str, Tuple[str, ...], List[Dict[str, Any]]]
+
+
+def _properties(row: Dict[str, Any], json_columns: List[str], skip=()) -> Dict[str, Any]:
+    props = {}
+    for key, value in row.items():
+        if value is None or key in skip:
+            continue
+        props[key] = json.loads(value) if key in json_columns else value
+    return props
+
+
+def _record_batches(path: Path, file_format: str, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    if file_format == 'parquet':
+        batches = pq.ParquetFile(str(path)).iter_batches(batch_size=batch_size)
+    else:
+        batches = pa_ipc.open_file(pa.memory_map(str(path))).read_all().to_batches(max_chunksize=batch_size)
+    for batch in batches:
+        yield batch.to_pylist()
+
+
+def load_manifest(directory: str) -> Dict[str, Any]:
+    path = Path(directory) / MANIFEST_FILE
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get('format') != EXPORT_FORMAT:
+        raise ValueError(f"{path} is not a Cortex graph export")
+    return manifest
+
+
+def read_export(directory: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Batch]:
+    """Batches of an export directory, all nodes before all relationships"""
+    _require_pyarrow()
+    manifest = load_manifest(directory)
+    file_format = manifest['file_format']
+    root = Path(directory)
+
+    for label, entry in manifest['nodes'].items():
+        json_columns = entry.get('json_columns') or []
+        for records in _record_batches(root / entry['file'], file_format, batch_size):
+            rows = [{'name': r['name'], 'props': _properties(r, json_columns, skip=('name',))}
+                    for r in records if r.get('name') is not None]
+            yield 'nodes', (label,), rows
+
+    for rel_type, entry in manifest['relationships'].items():
+        json_columns = entry.get('json_columns') or []
+        for records in _record_batches(root / entry['file'], file_format, batch_size):
+            grouped: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+            for r in records:
+                grouped.setdefault((r['_source_label'], r['_target_label']), []).append({
+                    'source': r['_source'],
+                    'target': r['_target'],
+                    'props': _properties(r, json_columns, skip=REL_KEY_COLUMNS),
+                })
+            for (source_label, target_label), rows in grouped.items():
+                yield 'relationships', (rel_type, source_label, target_label), rows
+
+
+def read_backup(backup_path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Batch]:
+    """Batches of a SafeTransactionManager backup (``.jsonl.gz``)
+
+    Backups list all nodes before the relationships, so batches are
+    flushed per kind in file order.
+    """
+    try:
+        from src.safe_transactions import iter_backup
+    except ImportError:
+        sys.path.append(str(Path(__file__).resolve().parents[1]))
+        from src.safe_transactions import iter_backup
+
+    pending: Dict[Tuple[str, Tuple[str, ...]], List[Dict[str, Any]]] = {}
+    current_kind = None
+    for record in iter_backup(backup_path):
+        kind = {'node': 'nodes', 'rel': 'relationships'}.get(record.get('t'))
+        if kind is None:
+            continue
+        if kind != current_kind:
+            for (k, key), rows in pending.items():
+                yield k, key, rows
+            pending, current_kind = {}, kind
+
+        props = dict(record.get('properties') or {})
+        if kind == 'nodes':
+            name = props.pop('name', None)
+            if name is None:
+                continue
+            key = (record['label'],)
+            row = {'name': name, 'props': props}
+        else:
+            if record.get('source_name') is None or record.get('target_name') is None:
+                continue
+            key = (record['type'], (record.get('source_labels') or [None])[0],
+                   (record.get('target_labels') or [None])[0])
+            row = {'source': record['source_name'], 'target': record['target_name'], 'props': props}
+
+        rows = pending.setdefault((kind, key), [])
+        rows.append(row)
+        if len(rows) >= batch_size:
+            yield kind, key, rows
+            del pending[(kind, key)]
+
+    for (kind, key), rows in pending.items():
+        yield kind, key, rows
+
+
+def batch_query(kind: str, key: Tuple[str, ...]) -> str:
+    """MERGE statement for a batch; raises ValueError for unsafe names"""
+    if not all(_identifier(name) for name in key):
+        raise ValueError(f"Invalid label or relationship type in {key}")
+    if kind == 'nodes':
+        return MERGE_NODES_QUERY.format(label=key[0])
+    rel_type, source_label, target_label = key
+    return MERGE_RELS_QUERY.format(rel_type=rel_type, source_label=source_label, target_label=target_label)
+
+
+def _write_rows(tx, query: str, rows: List[Dict[str, Any]]):
+    return tx.run(query, rows=rows).consume().counters
+
+
+def _ensure_name_indexes(driver, labels):
+    """Range index on name for labels the schema does not constrain"""
+    with driver.session() as session:
+        for label in sorted(set(labels) - set(UNIQUE_NAME_LABELS)):
+            if _identifier(label):
+                session.run(NAME_INDEX_STATEMENT.format(name=f"{label.lower()}_name", label=label)).consume()
+
+
+def import_graph(driver, batches: Iterator[Batch], workers: int = DEFAULT_WORKERS,
+                 labels: Optional[List[str]] = None,
+                 progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, Any]:
+    """MERGE batches into the graph with ``workers`` parallel write transactions
+
+    All node batches are committed before the first relationship batch is
+    written, so relationship MATCHes find their endpoints. At most
+    ``2 * workers`` batches are held in memory. For ``labels`` outside the
+    schema constraints a name index is created first.
+    ``progress(kind, rows_done)`` is called after each committed batch.
+    """
+    workers = max(int(workers), 1)
+    report: Dict[str, Any] = {'schema': ensure_schema(driver), 'kinds': {}, 'rows': 0}
+    if labels:
+        _ensure_name_indexes(driver, labels)
+
+    def write(query, rows):
+        with driver.session() as session:
+            session.execute_write(_write_rows, query, rows)
+        return len(rows)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight: Dict[Any, str] = {}
+        current_kind = None
+        kind_started = started
+
+        def drain(limit):
+            while len(in_flight) > limit:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, rows = in_flight.pop(future), future.result()
+                    stats = report['kinds'][kind]
+                    stats['rows'] += rows
+                    stats['batches'] += 1
+                    report['rows'] += rows
+                    if progress:
+                        progress(kind, stats['rows'])
+
+        def close_kind():
+            if current_kind is not None:
+                drain(0)
+                stats = report['kinds'][current_kind]
+                seconds = time.perf_counter() - kind_started
+                stats['seconds'] = round(seconds, 3)
+                stats['rows_per_second'] = round(stats['rows'] / seconds, 1) if seconds > 0 else 0.0
+
+        for kind, key, rows in batches:
+            if not rows:
+                continue
+            if kind != current_kind:
+                # Barrier: every node is committed before relationships start
+                close_kind()
+                current_kind, kind_started = kind, time.perf_counter()
+                report['kinds'].setdefault(kind, {'rows': 0, 'batches': 0})
+            in_flight[pool.submit(write, batch_query(kind, key), rows)] = kind
+            drain(2 * workers - 1)
+        close_kind()
+
+    seconds = time.perf_counter() - started
+    report['seconds'] = round(seconds, 3)
+    report['rows_per_second'] = round(report['rows'] / seconds, 1) if seconds > 0 else 0.0
+    return report
+
+
+def import_path(driver, source: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                workers: int = DEFAULT_WORKERS,
+                progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, Any]:
+    """Import an export directory or a ``.jsonl.gz`` backup file"""
+    if os.path.isdir(source):
+        labels = list(load_manifest(source)['nodes'])
+        batches = read_export(source, batch_size)
+    else:
+        labels = None
+        batches = read_backup(source, batch_size)
+    return import_graph(driver, batches, workers=workers, labels=labels, progress=progress)
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Human-readable import summary"""
+    lines = []
+    schema = report.get('schema')
+    if schema is not None:
+        lines.append(f"{'schema':<14} {len(schema['created'])} created, {len(schema['existing'])} existing")
+    for kind, stats in report['kinds'].items():
+        lines.append(f"{kind:<14} {stats['rows']:>8} rows  {stats['batches']:>5} batches  "
+                     f"{stats.get('rows_per_second', 0.0):>10.1f} rows/s")
+    lines.append(f"{'total':<14} {report['rows']:>8} rows in {report['seconds']:.2f}s "
+                 f"({report['rows_per_second']:.1f} rows/s)")
+    return "\n".join(lines)
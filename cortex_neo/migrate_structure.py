@@ -3,6 +3,10 @@
 Migration script to map Obsidian-like structure (Notes, Tags, Templates, Links) into Neo4j.
 Idempotent: uses MERGE for nodes and relationships.
 
+Rows are imported per kind in UNWIND batches, one write transaction per
+chunk. An interrupted file import resumes after the last committed chunk
+(see ``<file>.checkpoint.json``).
+
 Input file formats: YAML or JSON with keys: notes, tags, templates, links, assignments
 
 Example (YAML):
@@ -39,14 +43,26 @@ assignments:
 from __future__ import annotations
 import os
 import json
-from typing import Any, Dict
-from neo4j import GraphDatabase
+import time
+import hashlib
+from typing import Any, Callable, Dict, List, Optional
 
 try:
     import yaml  # type: ignore
 except Exception:  # pragma: no cover - optional dep
     yaml = None
 
+# Shared, lazily created Neo4j drivers from the cortex-cli package
+try:
+    from .neo4j_connection import get_driver
+except ImportError:
+    from neo4j_connection import get_driver
+
+try:
+    from .schema import ensure_schema
+except ImportError:
+    from schema import ensure_schema
+
 NEO4J_URI = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.environ.get("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.environ.get("NEO4J_PASSWORD", "neo4jtest")
@@ -62,91 +78,206 @@ def _load_file(path: str) -> Dict[str, Any]:
     return json.loads(text or '{}')
 
 
-def _ensure_note(session, name: str):
-    session.run("MERGE (n:Note {name: $name})", name=name)
+# One UNWIND statement per row kind, in import order. Every statement MERGEs
+# its nodes and relationships, so re-running a chunk is harmless.
+BULK_QUERIES = {
+    'notes': "UNWIND $rows AS row MERGE (:Note {name: row.name})",
+    'templates': "UNWIND $rows AS row MERGE (:Template {name: row.name})",
+    'tags': "UNWIND $rows AS row MERGE (:Tag {name: row.name})",
+    'links': """
+        UNWIND $rows AS row
+        MERGE (a:Note {name: row.source})
+        MERGE (b:Note {name: row.target})
+        MERGE (a)-[:LINKS_TO]->(b)
+        """,
+    'uses_template': """
+        UNWIND $rows AS row
+        MERGE (n:Note {name: row.note})
+        MERGE (t:Template {name: row.template})
+        MERGE (n)-[:USES_TEMPLATE]->(t)
+        """,
+    'tagged_with': """
+        UNWIND $rows AS row
+        MERGE (n:Note {name: row.note})
+        MERGE (t:Tag {name: row.tag})
+        MERGE (n)-[:TAGGED_WITH]->(t)
+        """,
+}
 
+DEFAULT_CHUNK_SIZE = 1000
 
-def _ensure_template(session, name: str):
-    session.run("MERGE (t:Template {name: $name})", name=name)
 
+def collect_rows(data: Dict[str, Any]) -> Dict[str, List[Dict[str, str]]]:
+    """Group the valid entries of a structure file into rows per kind"""
+    assignments = data.get('assignments') or {}
+    rows: Dict[str, List[Dict[str, str]]] = {
+        kind: [{'name': n} for n in (data.get(kind) or []) if isinstance(n, str) and n]
+        for kind in ('notes', 'templates', 'tags')
+    }
+    rows['links'] = [
+        {'source': l['from'], 'target': l['to']}
+        for l in (data.get('links') or [])
+        if isinstance(l, dict) and l.get('from') and l.get('to')
+    ]
+    rows['uses_template'] = [
+        {'note': u['note'], 'template': u['template']}
+        for u in (assignments.get('uses_template') or [])
+        if isinstance(u, dict) and u.get('note') and u.get('template')
+    ]
+    rows['tagged_with'] = [
+        {'note': tg['note'], 'tag': tg['tag']}
+        for tg in (assignments.get('tagged_with') or [])
+        if isinstance(tg, dict) and tg.get('note') and tg.get('tag')
+    ]
+    return rows
 
-def _ensure_tag(session, name: str):
-    session.run("MERGE (t:Tag {name: $name})", name=name)
 
+def _fingerprint(rows: Dict[str, List[Dict[str, str]]], chunk_size: int) -> str:
+    payload = json.dumps([chunk_size, rows], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
 
-def _link_notes(session, from_note: str, to_note: str):
-    session.run(
-        """
-        MERGE (a:Note {name: $from})
-        MERGE (b:Note {name: $to})
-        MERGE (a)-[:LINKS_TO]->(b)
-        """,
-        **{"from": from_note, "to": to_note},
-    )
 
+def _load_checkpoint(path: Optional[str], fingerprint: str) -> Dict[str, int]:
+    """Committed chunks per kind, if the checkpoint belongs to this input"""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if checkpoint.get('fingerprint') != fingerprint:
+        # Input or chunk size changed; chunk numbers no longer line up
+        return {}
+    return {kind: int(n) for kind, n in (checkpoint.get('completed') or {}).items()}
 
-def _use_template(session, note: str, template: str):
-    session.run(
-        """
-        MERGE (n:Note {name: $note})
-        MERGE (t:Template {name: $template})
-        MERGE (n)-[:USES_TEMPLATE]->(t)
-        """,
-        note=note, template=template,
-    )
 
+def _save_checkpoint(path: str, fingerprint: str, completed: Dict[str, int]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({'fingerprint': fingerprint, 'completed': completed}, f)
+    os.replace(tmp_path, path)
 
-def _tag_note(session, note: str, tag: str):
-    session.run(
-        """
-        MERGE (n:Note {name: $note})
-        MERGE (t:Tag {name: $tag})
-        MERGE (n)-[:TAGGED_WITH]->(t)
-        """,
-        note=note, tag=tag,
-    )
 
+def _write_chunk(tx, query: str, rows: List[Dict[str, str]]) -> None:
+    tx.run(query, rows=rows).consume()
 
-def migrate_from_data(data: Dict[str, Any]) -> None:
-    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
-    notes = data.get('notes') or []
-    templates = data.get('templates') or []
-    tags = data.get('tags') or []
-    links = data.get('links') or []
-    assignments = data.get('assignments') or {}
 
+def migrate_from_data(data: Dict[str, Any], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      checkpoint_file: Optional[str] = None,
+                      progress: Optional[Callable[[str, int, int], None]] = None) -> Dict[str, Any]:
+    """Import a structure dict in UNWIND batches
+
+    Rows are grouped by kind and written in chunks of ``chunk_size``, one
+    explicit write transaction per chunk. With ``checkpoint_file`` the
+    number of committed chunks per kind is recorded after every commit; a
+    later call with the same data and chunk size skips those chunks. The
+    checkpoint is removed once the import completes.
+
+    The schema constraints and indexes are created first (once per
+    process), so every MERGE is an index lookup.
+
+    ``progress(kind, rows_done, rows_total)`` is called after each chunk.
+    Returns per-kind row counts, timings and rows per second.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    driver = get_driver(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
+    rows_by_kind = collect_rows(data)
+    fingerprint = _fingerprint(rows_by_kind, chunk_size)
+    completed = _load_checkpoint(checkpoint_file, fingerprint)
+
+    report: Dict[str, Any] = {'kinds': {}, 'rows': 0, 'skipped_rows': 0,
+                              'schema': ensure_schema(driver)}
+    started = time.perf_counter()
     with driver.session() as session:
-        for n in notes:
-            if isinstance(n, str) and n:
-                _ensure_note(session, n)
-        for t in templates:
-            if isinstance(t, str) and t:
-                _ensure_template(session, t)
-        for t in tags:
-            if isinstance(t, str) and t:
-                _ensure_tag(session, t)
-        for l in links:
-            if isinstance(l, dict) and l.get('from') and l.get('to'):
-                _link_notes(session, l['from'], l['to'])
-
-        for u in (assignments.get('uses_template') or []):
-            if isinstance(u, dict) and u.get('note') and u.get('template'):
-                _use_template(session, u['note'], u['template'])
-        for tg in (assignments.get('tagged_with') or []):
-            if isinstance(tg, dict) and tg.get('note') and tg.get('tag'):
-                _tag_note(session, tg['note'], tg['tag'])
-
-
-def migrate_from_file(path: str) -> None:
+        for kind, query in BULK_QUERIES.items():
+            rows = rows_by_kind[kind]
+            done_chunks = completed.get(kind, 0)
+            skipped = min(done_chunks * chunk_size, len(rows))
+            kind_started = time.perf_counter()
+
+            for offset in range(skipped, len(rows), chunk_size):
+                session.execute_write(_write_chunk, query, rows[offset:offset + chunk_size])
+                done_chunks += 1
+                completed[kind] = done_chunks
+                if checkpoint_file:
+                    _save_checkpoint(checkpoint_file, fingerprint, completed)
+                if progress:
+                    progress(kind, min(offset + chunk_size, len(rows)), len(rows))
+
+            seconds = time.perf_counter() - kind_started
+            written = len(rows) - skipped
+            report['kinds'][kind] = {
+                'rows': written,
+                'skipped_rows': skipped,
+                'chunks': -(-written // chunk_size),
+                'seconds': round(seconds, 3),
+                'rows_per_second': round(written / seconds, 1) if seconds > 0 else 0.0,
+            }
+            report['rows'] += written
+            report['skipped_rows'] += skipped
+
+    seconds = time.perf_counter() - started
+    report['seconds'] = round(seconds, 3)
+    report['rows_per_second'] = round(report['rows'] / seconds, 1) if seconds > 0 else 0.0
+
+    if checkpoint_file and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    return report
+
+
+def checkpoint_path(path: str) -> str:
+    """Default checkpoint file next to a structure file"""
+    return f"{path}.checkpoint.json"
+
+
+def migrate_from_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      resume: bool = True,
+                      progress: Optional[Callable[[str, int, int], None]] = None) -> Dict[str, Any]:
+    """Import a YAML/JSON structure file, resuming an interrupted import
+
+    With ``resume=False`` an existing checkpoint is discarded first.
+    """
     data = _load_file(path)
-    migrate_from_data(data)
+    checkpoint_file = checkpoint_path(path)
+    if not resume and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    return migrate_from_data(data, chunk_size=chunk_size,
+                             checkpoint_file=checkpoint_file, progress=progress)
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Human-readable import summary"""
+    lines = []
+    schema = report.get('schema')
+    if schema is not None:
+        line = f"{'schema':<14} {len(schema['created'])} created, {len(schema['existing'])} existing"
+        if schema['failed']:
+            line += f", failed: {', '.join(schema['failed'])}"
+        lines.append(line)
+    for kind, stats in report['kinds'].items():
+        line = (f"{kind:<14} {stats['rows']:>8} rows  {stats['chunks']:>5} chunks  "
+                f"{stats['rows_per_second']:>10.1f} rows/s")
+        if stats['skipped_rows']:
+            line += f"  (resumed, {stats['skipped_rows']} already committed)"
+        lines.append(line)
+    lines.append(f"{'total':<14} {report['rows']:>8} rows in {report['seconds']:.2f}s "
+                 f"({report['rows_per_second']:.1f} rows/s)")
+    return "\n".join(lines)
 
 
 if __name__ == "__main__":
     import argparse
     p = argparse.ArgumentParser(description="Migrate Notes/Tags/Templates/Links into Neo4j")
     p.add_argument("file", help="Path to YAML or JSON structure file")
+    p.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                   help="Rows per UNWIND transaction")
+    p.add_argument("--restart", action="store_true",
+                   help="Ignore the checkpoint of an interrupted import")
     args = p.parse_args()
-    migrate_from_file(args.file)
+    report = migrate_from_file(args.file, chunk_size=args.chunk_size, resume=not args.restart)
+    print(format_report(report))
     print("Migration complete.")
 
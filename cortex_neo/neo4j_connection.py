@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Neo4j driver access for code outside the cortex-cli package.
+
+The process-wide driver registry lives in cortex-cli
+(``cortex.utils.neo4j_registry``), which is not installed with the root
+requirements. This module makes the package importable from the
+repository checkout and re-exports the registry functions, so scripts and
+modules import ``get_driver``/``close_driver`` from here instead of
+repeating the path fallback.
+"""
+
+import sys
+from pathlib import Path
+
+CORTEX_CLI_ROOT = Path(__file__).resolve().parents[1] / "cortex-cli"
+
+try:
+    from cortex.utils.neo4j_registry import close_driver, connection_settings, get_driver
+except ImportError:
+    sys.path.append(str(CORTEX_CLI_ROOT))
+    from cortex.utils.neo4j_registry import close_driver, connection_settings, get_driver
+
+__all__ = ["CORTEX_CLI_ROOT", "close_driver", "connection_settings", "get_driver"]
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Note search for the Cortex knowledge graph.
+
+Online, notes are searched through the ``note_fulltext`` index (see
+schema.py) with Lucene relevance scores. Results are ordered by score and
+name and paged with an opaque cursor that encodes the last (score, name),
+so every page is a fresh index query with no OFFSET to skip.
+
+Offline, the same search runs against a local inverted index built from
+the graph with ``LocalNoteIndex.refresh_from_graph`` and stored under
+``cortex_neo/.cache`` (override with CORTEX_NEO_CACHE_DIR).
+"""
+from __future__ import annotations
+import base64
+import bisect
+import json
+import math
+import os
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from neo4j.exceptions import ClientError, ServiceUnavailable, SessionExpired
+
+try:
+    from .schema import NOTE_FULLTEXT_INDEX, ensure_schema
+except ImportError:
+    from schema import NOTE_FULLTEXT_INDEX, ensure_schema
+
+DEFAULT_PAGE_SIZE = 20
+INDEX_VERSION = 1
+CACHE_DIR = Path(os.environ.get("CORTEX_NEO_CACHE_DIR", Path(__file__).resolve().parent / ".cache"))
+LOCAL_INDEX_FILE = CACHE_DIR / "note_index.json"
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+LUCENE_SPECIAL = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+# Local field weights, roughly matching how often a term in the field
+# describes the note itself
+FIELD_WEIGHTS = {'name': 3.0, 'description': 2.0, 'content': 1.0}
+
+
+class InvalidCursor(ValueError):
+    """Raised for cursors that were not produced by this module"""
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def build_fulltext_query(text: str) -> str:
+    """Lucene query requiring every term, as a whole word or a prefix
+
+    Whole-word matches are boosted above prefix matches. Special
+    characters are escaped, so user input cannot change the query syntax.
+    """
+    clauses = []
+    for term in tokenize(text):
+        escaped = LUCENE_SPECIAL.sub(r'\\\1', term)
+        clauses.append(f"({escaped}^2 OR {escaped}*)")
+    return " AND ".join(clauses)
+
+
+def encode_cursor(score: float, name: str) -> str:
+    payload = json.dumps([score, name], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        score, name = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return float(score), str(name)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid search cursor: {cursor!r}") from e
+
+
+def _page(results: List[Dict[str, Any]], limit: int, source: str) -> Dict[str, Any]:
+    """Trim a limit+1 result list to a page and derive the next cursor"""
+    has_more = len(results) > limit
+    results = results[:limit]
+    next_cursor = None
+    if has_more and results:
+        next_cursor = encode_cursor(results[-1]['score'], results[-1]['name'])
+    return {'results': results, 'next_cursor': next_cursor, 'source': source}
+
+
+def search_fulltext(session, query: str, tag: Optional[str] = None,
+                    note_type: Optional[str] = None, cursor: Optional[str] = None,
+                    limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """One page of full-text results, best match first"""
+    lucene = build_fulltext_query(query)
+    if not lucene:
+        return {'results': [], 'next_cursor': None, 'source': 'fulltext'}
+
+    params: Dict[str, Any] = {'index': NOTE_FULLTEXT_INDEX, 'lucene': lucene, 'limit': limit + 1}
+    cypher = """
+        CALL db.index.fulltext.queryNodes($index, $lucene) YIELD node AS n, score
+    """
+    predicates = []
+    if cursor:
+        params['after_score'], params['after_name'] = decode_cursor(cursor)
+        predicates.append(
+            "(score < $after_score OR (score = $after_score AND n.name > $after_name))"
+        )
+    if note_type:
+        predicates.append("n.type = $note_type")
+        params['note_type'] = note_type
+    if tag:
+        # Tag lookup goes through the Tag(name) uniqueness index
+        predicates.append("EXISTS { MATCH (n)-[:TAGGED_WITH]->(:Tag {name: $tag}) }")
+        params['tag'] = tag
+    if predicates:
+        cypher += " WHERE " + " AND ".join(predicates)
+    cypher += """
+        WITH n, score
+        ORDER BY score DESC, n.name ASC
+        LIMIT $limit
+        OPTIONAL MATCH (n)-[:TAGGED_WITH]->(t:Tag)
+        WITH n, score, collect(t.name) AS tags
+        RETURN n.name AS name, n.type AS type, n.description AS description, tags, score
+        ORDER BY score DESC, name ASC
+    """
+    results = [record.data() for record in session.run(cypher, params)]
+    return _page(results, limit, 'fulltext')
+
+
+class LocalNoteIndex:
+    """Inverted index over note name, description and content
+
+    Scores are weighted tf-idf sums; like the online search every query
+    term must match a whole word or a word prefix.
+    """
+
+    def __init__(self, index_file: Path = LOCAL_INDEX_FILE):
+        self.index_file = Path(index_file)
+        self.notes: Dict[str, Dict[str, Any]] = {}
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.built_at: Optional[float] = None
+        self._terms: List[str] = []
+
+    def build(self, notes: Iterable[Dict[str, Any]]):
+        """Index notes given as dicts with name, content, description, type, tags"""
+        postings: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.notes = {}
+        for note in notes:
+            name = note.get('name')
+            if not name:
+                continue
+            self.notes[name] = {
+                'type': note.get('type'),
+                'description': note.get('description'),
+                'tags': sorted(t for t in (note.get('tags') or []) if t),
+            }
+            for field_name, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(note.get(field_name)):
+                    postings[token][name] += weight
+        self.postings = {term: dict(docs) for term, docs in postings.items()}
+        self._terms = sorted(self.postings)
+        self.built_at = time.time()
+
+    def refresh_from_graph(self, session) -> int:
+        """Rebuild from all notes in the graph and save; returns the note count"""
+        records = session.run("""
+            MATCH (n:Note)
+            OPTIONAL MATCH (n)-[:TAGGED_WITH]->(t:Tag)
+            RETURN n.name AS name, n.content AS content, n.description AS description,
+                   n.type AS type, collect(t.name) AS tags
+        """)
+        self.build(record.data() for record in records)
+        self.save()
+        return len(self.notes)
+
+    def save(self):
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': INDEX_VERSION,
+                'built_at': self.built_at,
+                'notes': self.notes,
+                'postings': self.postings,
+            }, f)
+        os.replace(tmp_file, self.index_file)
+
+    def load(self) -> bool:
+        """Load the saved index; False if missing or from another version"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('version') != INDEX_VERSION:
+            return False
+        self.notes = data.get('notes', {})
+        self.postings = data.get('postings', {})
+        self.built_at = data.get('built_at')
+        self._terms = sorted(self.postings)
+        return True
+
+    def _term_scores(self, term: str) -> Dict[str, float]:
+        """Scores of notes containing the term as a word or word prefix"""
+        scores: Dict[str, float] = defaultdict(float)
+        total = max(len(self.notes), 1)
+        start = bisect.bisect_left(self._terms, term)
+        for candidate in self._terms[start:]:
+            if not candidate.startswith(term):
+                break
+            docs = self.postings[candidate]
+            idf = math.log(1 + total / len(docs))
+            boost = 2.0 if candidate == term else 1.0
+            for name, weight in docs.items():
+                scores[name] += boost * weight * idf
+        return scores
+
+    def search(self, query: str, tag: Optional[str] = None, note_type: Optional[str] = None,
+               cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """One page of local results, in the same shape as search_fulltext"""
+        terms = tokenize(query)
+        if not terms:
+            return {'results': [], 'next_cursor': None, 'source': 'local'}
+
+        totals: Optional[Dict[str, float]] = None
+        for term in terms:
+            term_scores = self._term_scores(term)
+            if totals is None:
+                totals = dict(term_scores)
+            else:
+                totals = {name: totals[name] + s for name, s in term_scores.items() if name in totals}
+            if not totals:
+                break
+
+        after = decode_cursor(cursor) if cursor else None
+        ranked = []
+        for name, score in (totals or {}).items():
+            note = self.notes[name]
+            if note_type and note.get('type') != note_type:
+                continue
+            if tag and tag not in note['tags']:
+                continue
+            score = round(score, 6)
+            if after and (score > after[0] or (score == after[0] and name <= after[1])):
+                continue
+            ranked.append((-score, name))
+        ranked.sort()
+
+        results = [
+            {'name': name, 'type': self.notes[name].get('type'),
+             'description': self.notes[name].get('description'),
+             'tags': self.notes[name]['tags'], 'score': -neg_score}
+            for neg_score, name in ranked[:limit + 1]
+        ]
+        return _page(results, limit, 'local')
+
+
+def search_notes(driver, query: str, tag: Optional[str] = None,
+                 note_type: Optional[str] = None, cursor: Optional[str] = None,
+                 limit: int = DEFAULT_PAGE_SIZE, offline: bool = False,
+                 local_index: Optional[LocalNoteIndex] = None) -> Dict[str, Any]:
+    """Full-text search, falling back to the local index if the graph is down
+
+    The schema (and with it ``note_fulltext``) is created on the first
+    search per driver, as migrate and import do. If the index still cannot
+    be queried, e.g. because creating it failed, the local index is used.
+    Pass ``driver=None`` or ``offline=True`` to search locally only.
+    Raises the graph error if there is no local index to fall back to.
+    """
+    local_index = local_index or LocalNoteIndex()
+    if not offline and driver is not None:
+        try:
+            ensure_schema(driver)
+            with driver.session() as session:
+                return search_fulltext(session, query, tag, note_type, cursor, limit)
+        except (ServiceUnavailable, SessionExpired, OSError):
+            if not local_index.load():
+                raise
+            return local_index.search(query, tag, note_type, cursor, limit)
+        except ClientError as e:
+            if not local_index.load():
+                raise RuntimeError(
+                    f"Full-text index {NOTE_FULLTEXT_INDEX} cannot be queried ({e}); "
+                    "create it with `init-schema`"
+                ) from e
+            return local_index.search(query, tag, note_type, cursor, limit)
+
+    if not local_index.notes and not local_index.load():
+        raise FileNotFoundError(
+            f"No local search index at {local_index.index_file}; "
+            "build it with `search-notes --refresh-index` while Neo4j is available"
+        )
+    return local_index.search(query, tag, note_type, cursor, limit)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Schema bootstrap for the Cortex knowledge graph.
+
+Creates uniqueness constraints on ``name`` for Note, Tag, Template and
+Workflow (each backed by a range index, so ``{name: $x}`` lookups and
+MERGEs no longer scan the label), a plain range index on Step(name) and
+the full-text index ``note_fulltext`` on Note name/content/description.
+
+Step names are only unique within their workflow ("Review" may be a step
+of several workflows), so Step gets an index but no constraint.
+
+All statements use IF NOT EXISTS and can be run any number of times.
+"""
+from __future__ import annotations
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+UNIQUE_NAME_LABELS = ('Note', 'Tag', 'Template', 'Workflow')
+NAME_INDEX_LABELS = ('Step',)
+NOTE_FULLTEXT_INDEX = 'note_fulltext'
+NOTE_FULLTEXT_PROPERTIES = ('name', 'content', 'description')
+
+
+def schema_statements() -> List[Tuple[str, str]]:
+    """(schema object name, Cypher statement) pairs in creation order"""
+    statements = [
+        (f"{label.lower()}_name_unique",
+         f"CREATE CONSTRAINT {label.lower()}_name_unique IF NOT EXISTS "
+         f"FOR (n:{label}) REQUIRE n.name IS UNIQUE")
+        for label in UNIQUE_NAME_LABELS
+    ]
+    statements += [
+        (f"{label.lower()}_name",
+         f"CREATE INDEX {label.lower()}_name IF NOT EXISTS FOR (n:{label}) ON (n.name)")
+        for label in NAME_INDEX_LABELS
+    ]
+    properties = ', '.join(f"n.{p}" for p in NOTE_FULLTEXT_PROPERTIES)
+    statements.append((
+        NOTE_FULLTEXT_INDEX,
+        f"CREATE FULLTEXT INDEX {NOTE_FULLTEXT_INDEX} IF NOT EXISTS "
+        f"FOR (n:Note) ON EACH [{properties}]"
+    ))
+    return statements
+
+
+def init_schema(session) -> Dict[str, Any]:
+    """Create missing constraints and indexes
+
+    A statement that fails (e.g. a uniqueness constraint over existing
+    duplicate names) is reported under ``failed`` and does not stop the
+    others.
+    """
+    result: Dict[str, Any] = {'created': [], 'existing': [], 'failed': {}}
+    for name, statement in schema_statements():
+        try:
+            counters = session.run(statement).consume().counters
+        except Exception as e:
+            result['failed'][name] = str(e)
+            continue
+        if counters.constraints_added or counters.indexes_added:
+            result['created'].append(name)
+        else:
+            result['existing'].append(name)
+    return result
+
+
+def index_population(session) -> List[Dict[str, Any]]:
+    """State and population percentage of the Cortex schema indexes
+
+    Includes the range indexes backing the uniqueness constraints.
+    """
+    labels = list(UNIQUE_NAME_LABELS + NAME_INDEX_LABELS)
+    records = session.run(
+        """
+        SHOW INDEXES
+        YIELD name, type, labelsOrTypes, properties, state, populationPercent
+        WHERE any(label IN labelsOrTypes WHERE label IN $labels)
+        RETURN name, type, labelsOrTypes, properties, state, populationPercent
+        ORDER BY name
+        """,
+        labels=labels,
+    )
+    return [record.data() for record in records]
+
+
+def wait_for_indexes(session, timeout: float = 300.0, poll_interval: float = 1.0,
+                     progress: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+                     ) -> List[Dict[str, Any]]:
+    """Poll until all schema indexes are ONLINE (or FAILED) or timeout
+
+    ``progress`` receives the index list after every poll.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        indexes = index_population(session)
+        if progress:
+            progress(indexes)
+        if all(i['state'] != 'POPULATING' for i in indexes) or time.monotonic() >= deadline:
+            return indexes
+        time.sleep(poll_interval)
+
+
+_ensured: "weakref.WeakKeyDictionary[Any, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+def ensure_schema(driver) -> Dict[str, Any]:
+    """Run init_schema once per driver in this process
+
+    Used by the migration and import paths. Later calls for the same
+    driver return the same shape without touching the database: what the
+    first call created is then reported under ``existing``.
+    """
+    first = _ensured.get(driver)
+    if first is None:
+        with driver.session() as session:
+            result = init_schema(session)
+        _ensured[driver] = result
+        return result
+    return {
+        'created': [],
+        'existing': first['created'] + first['existing'],
+        'failed': dict(first['failed']),
+    }
+
+
+def format_index_population(indexes: List[Dict[str, Any]]) -> str:
+    """One line per index: name, state and population percentage"""
+    return "\n".join(
+        f"{i['name']:<28} {i['state']:<11} {float(i.get('populationPercent') or 0):5.1f}%"
+        for i in indexes
+    )
@@ -13,9 +13,13 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
-from neo4j import GraphDatabase
 import logging
 
+# Shared, lazily created Neo4j drivers from the cortex-cli package
+from cortex_neo.neo4j_connection import get_driver
+
+from src.governance.bulk_tagging import PERFORMANCE_TAGS, BulkTagger, create_tag_definitions
+
 # Configuration
 NEO4J_URI = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.environ.get("NEO4J_USER", "neo4j")
@@ -28,56 +32,17 @@ logger = logging.getLogger(__name__)
 def create_performance_tags():
     """Create performance-related tags in the Neo4j database"""
 
-    # Define the performance tags to create
-    performance_tags = [
-        {
-            "name": "performance-metrics",
-            "description": "Tag for notes related to performance measurements and metrics",
-            "category": "performance"
-        },
-        {
-            "name": "system-optimization",
-            "description": "Tag for notes about system optimization techniques and improvements",
-            "category": "performance"
-        },
-        {
-            "name": "command-tracking",
-            "description": "Tag for notes related to command execution tracking and monitoring",
-            "category": "performance"
-        }
-    ]
-
-    driver = None
     try:
-        # Connect to Neo4j
-        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+        # Shared driver; closed by the registry at exit
+        driver = get_driver(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
 
         with driver.session() as session:
-            # Create each performance tag
-            for tag_info in performance_tags:
-                # Create tag with properties
-                result = session.run("""
-                    MERGE (t:Tag {name: $name})
-                    SET t.description = $description,
-                        t.category = $category,
-                        t.created_at = datetime(),
-                        t.created_by = 'performance_tag_script'
-                    RETURN t.name as name
-                """,
-                name=tag_info["name"],
-                description=tag_info["description"],
-                category=tag_info["category"]
-                )
-
-                # Verify tag was created
-                tag_record = result.single()
-                if tag_record:
-                    logger.info(f"✅ Created performance tag: '{tag_record['name']}'")
-                    print(f"✅ Created performance tag: '{tag_record['name']}'")
-                    print(f"   📝 Description: {tag_info['description']}")
-                else:
-                    logger.warning(f"⚠️  Tag '{tag_info['name']}' may already exist")
-                    print(f"⚠️  Tag '{tag_info['name']}' may already exist")
+            # All tags in one UNWIND transaction
+            create_tag_definitions(session, PERFORMANCE_TAGS, created_by='performance_tag_script')
+            for tag_info in PERFORMANCE_TAGS:
+                logger.info(f"✅ Created performance tag: '{tag_info['name']}'")
+                print(f"✅ Created performance tag: '{tag_info['name']}'")
+                print(f"   📝 Description: {tag_info['description']}")
 
             # Verify all tags were created by counting them
             count_result = session.run("""
@@ -107,17 +72,38 @@ def create_performance_tags():
         print(f"❌ Error creating performance tags: {e}")
         return False
 
-    finally:
-        if driver:
-            driver.close()
-
     return True
 
+def assign_performance_tags(dry_run=False, workers=None):
+    """Assign the performance tags to all matching notes in batched writes"""
+    tagger = BulkTagger(
+        get_driver(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD),
+        workers=workers,
+        only_tags={t["name"] for t in PERFORMANCE_TAGS},
+    )
+    report = tagger.run(dry_run=dry_run)
+    if dry_run:
+        for note_name, tags in report.diff.items():
+            print(f"   + {note_name}: {', '.join(tags)}")
+    print(report.format())
+    return report
+
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Create (and optionally assign) performance tags")
+    parser.add_argument("--assign", action="store_true", help="Assign the tags to all matching notes")
+    parser.add_argument("--dry-run", action="store_true", help="With --assign: only show the diff")
+    parser.add_argument("--workers", type=int, help="Processes for tag suggestions (default: CPU count)")
+    args = parser.parse_args()
+
     print("🚀 Creating performance tags for Cortex system...")
     print("=" * 60)
 
     success = create_performance_tags()
+    if success and args.assign:
+        print("\n🏷️  Assigning performance tags...")
+        assign_performance_tags(dry_run=args.dry_run, workers=args.workers)
 
     if success:
         print("=" * 60)
@@ -126,7 +112,8 @@ if __name__ == "__main__":
         print("   • performance-metrics: For performance measurement notes")
         print("   • system-optimization: For system improvement notes")
         print("   • command-tracking: For command monitoring notes")
-        print("\nTo assign these tags to notes, use the governance CLI or Neo4j directly.")
+        if not args.assign:
+            print("\nTo assign these tags to notes, run this script with --assign (add --dry-run to preview).")
     else:
         print("❌ Performance tags creation failed. Check logs for details.")
         sys.exit(1)
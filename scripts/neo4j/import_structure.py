@@ -1,4 +1,10 @@
-from neo4j import GraphDatabase
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+# Shared, lazily created Neo4j drivers from the cortex-cli package
+from cortex_neo.neo4j_connection import get_driver
+from cortex_neo.schema import ensure_schema
 
 # Connection details
 NEO4J_URI = "bolt://localhost:7687"
@@ -22,7 +28,9 @@ for stmt in raw_statements:
 
 # Connect and execute
 print(f"Connecting to Neo4J at {NEO4J_URI}...")
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+driver = get_driver(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
+schema = ensure_schema(driver)
+print(f"Schema: {len(schema['created'])} created, {len(schema['existing'])} existing")
 with driver.session() as session:
     for i, stmt in enumerate(statements, 1):
         try:
@@ -3,9 +3,13 @@
 Validiert, ob der Decision-Workflow und seine Schritte korrekt in Neo4J angelegt sind.
 Kann als CI-Job (z.B. in cortex-ci) ausgeführt werden.
 """
-from neo4j import GraphDatabase
 import os
 import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+# Shared, lazily created Neo4j drivers from the cortex-cli package
+from cortex_neo.neo4j_connection import get_driver
 
 NEO4J_URI = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.environ.get("NEO4J_USER", "neo4j")
@@ -20,7 +24,7 @@ EXPECTED_STEPS = [
 ]
 
 def validate_workflow_structure():
-    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    driver = get_driver(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
     with driver.session() as session:
         # Prüfe, ob Workflow existiert
         result = session.run(
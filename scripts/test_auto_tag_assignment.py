@@ -13,6 +13,7 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.governance.bulk_tagging import BulkTagger
 from src.governance.data_governance import DataGovernanceEngine
 import logging
 
@@ -211,14 +212,14 @@ def test_tag_assignment_integration():
     print("=" * 40)
 
     try:
-        from neo4j import GraphDatabase
+        from cortex.utils.neo4j_registry import get_driver
 
         # Neo4j connection settings
         NEO4J_URI = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
         NEO4J_USER = os.environ.get("NEO4J_USER", "neo4j")
         NEO4J_PASSWORD = os.environ.get("NEO4J_PASSWORD", "neo4jtest")
 
-        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+        driver = get_driver(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
 
         with driver.session() as session:
             # Check if performance tags exist in the database
@@ -238,12 +239,18 @@ def test_tag_assignment_integration():
 
                 print(f"\n📊 Total performance tags available: {len(performance_tags)}")
                 print("🔗 Integration ready: Governance system can automatically assign these tags")
+
+                # Dry run of the bulk pipeline: which notes would get which tags
+                tagger = BulkTagger(driver, only_tags={r['name'] for r in performance_tags})
+                report = tagger.run(dry_run=True)
+                print(f"\n🧪 Bulk assignment dry run:")
+                for note_name, tags in list(report.diff.items())[:20]:
+                    print(f"   + {note_name}: {', '.join(tags)}")
+                print(report.format())
             else:
                 print("⚠️  No performance tags found in database")
                 print("💡 Run the create_performance_tags.py script first")
 
-        driver.close()
-
     except Exception as e:
         print(f"⚠️  Could not check Neo4j integration: {e}")
         print("💡 Make sure Neo4j is running and accessible")
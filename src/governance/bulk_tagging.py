@@ -0,0 +1,257 @@
+"""
+Cortex Bulk-Tagging
+Weist Tags für viele Notes in einem Durchlauf zu, statt einen MERGE pro Tag.
+
+Notes werden seitenweise (nach Name, ohne OFFSET) aus Neo4j gelesen, die
+Tag-Vorschläge von ``DataGovernanceEngine._suggest_tags`` in einem
+Prozess-Pool berechnet und nur fehlende ``TAGGED_WITH``-Beziehungen per
+UNWIND geschrieben, in Transaktionen mit höchstens ``batch_size``
+Beziehungen. Im Dry-Run wird nichts geschrieben, sondern der Diff
+(Note -> neue Tags) zurückgegeben.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .data_governance import DataGovernanceEngine
+
+PERFORMANCE_TAGS = [
+    {
+        "name": "performance-metrics",
+        "description": "Tag for notes related to performance measurements and metrics",
+        "category": "performance",
+    },
+    {
+        "name": "system-optimization",
+        "description": "Tag for notes about system optimization techniques and improvements",
+        "category": "performance",
+    },
+    {
+        "name": "command-tracking",
+        "description": "Tag for notes related to command execution tracking and monitoring",
+        "category": "performance",
+    },
+]
+
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_BATCH_SIZE = 5000
+
+_NOTE_PAGE_RETURN = """
+OPTIONAL MATCH (n)-[:TAGGED_WITH]->(t:Tag)
+WITH n, collect(t.name) AS tags
+OPTIONAL MATCH (n)-[:USES_TEMPLATE]->(tpl:Template)
+RETURN n.name AS name, n.content AS content, n.type AS type,
+       tags, head(collect(tpl.name)) AS template
+ORDER BY name
+"""
+
+# Erste und folgende Seiten getrennt: ein schlichtes n.name > $after
+# (ohne "$after IS NULL OR ...") kann den Index auf Note(name) nutzen
+NOTE_FIRST_PAGE_QUERY = """
+MATCH (n:Note)
+WITH n ORDER BY n.name LIMIT $limit""" + _NOTE_PAGE_RETURN
+
+NOTE_NEXT_PAGE_QUERY = """
+MATCH (n:Note)
+WHERE n.name > $after
+WITH n ORDER BY n.name LIMIT $limit""" + _NOTE_PAGE_RETURN
+
+TAG_DEFINITIONS_QUERY = """
+UNWIND $tags AS tag
+MERGE (t:Tag {name: tag.name})
+SET t.description = tag.description,
+    t.category = tag.category,
+    t.created_at = coalesce(t.created_at, datetime()),
+    t.created_by = coalesce(t.created_by, $created_by)
+"""
+
+ASSIGN_TAGS_QUERY = """
+UNWIND $rows AS row
+MATCH (n:Note {name: row.note})
+SET n.updated_at = timestamp()
+WITH n, row
+UNWIND row.tags AS tag_name
+MERGE (t:Tag {name: tag_name})
+MERGE (n)-[:TAGGED_WITH]->(t)
+"""
+
+
+@dataclass
+class TaggingReport:
+    """Ergebnis und Durchsatz eines Bulk-Tagging-Laufs"""
+
+    dry_run: bool = False
+    pages: int = 0
+    notes: int = 0
+    changed_notes: int = 0
+    planned: int = 0
+    written: int = 0
+    transactions: int = 0
+    seconds: float = 0.0
+    suggest_seconds: float = 0.0
+    write_seconds: float = 0.0
+    diff: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def notes_per_second(self) -> float:
+        return self.notes / self.seconds if self.seconds else 0.0
+
+    @property
+    def writes_per_second(self) -> float:
+        return self.written / self.write_seconds if self.write_seconds else 0.0
+
+    def format(self) -> str:
+        lines = [
+            f"{'notes':<14} {self.notes:>8} in {self.pages} pages  "
+            f"{self.notes_per_second:>10.1f} notes/s",
+            f"{'changed':<14} {self.changed_notes:>8} notes, {self.planned} new tag assignments",
+        ]
+        if self.dry_run:
+            lines.append(f"{'dry run':<14} nothing written")
+        else:
+            lines.append(
+                f"{'written':<14} {self.written:>8} relationships in {self.transactions} transactions  "
+                f"{self.writes_per_second:>10.1f} writes/s"
+            )
+        lines.append(
+            f"{'total':<14} {self.seconds:.2f}s (suggest {self.suggest_seconds:.2f}s, "
+            f"write {self.write_seconds:.2f}s)"
+        )
+        return "\n".join(lines)
+
+
+def create_tag_definitions(session, tags: Sequence[Dict[str, Any]] = PERFORMANCE_TAGS,
+                           created_by: str = "bulk_tagging") -> int:
+    """Legt Tags mit Beschreibung und Kategorie in einer Anweisung an"""
+    session.run(TAG_DEFINITIONS_QUERY, tags=list(tags), created_by=created_by).consume()
+    return len(tags)
+
+
+def iter_note_pages(session, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Alle Notes mit vorhandenen Tags und Template, seitenweise nach Name"""
+    after = None
+    while True:
+        if after is None:
+            result = session.run(NOTE_FIRST_PAGE_QUERY, limit=page_size)
+        else:
+            result = session.run(NOTE_NEXT_PAGE_QUERY, after=after, limit=page_size)
+        page = [record.data() for record in result]
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        after = page[-1]["name"]
+
+
+def suggest_tags_for_notes(engine: DataGovernanceEngine,
+                           notes: Iterable[Dict[str, Any]]) -> List[Tuple[str, List[str]]]:
+    """(Note-Name, vorgeschlagene Tags) mit derselben Logik wie validate_note_creation"""
+    return [
+        (note["name"], sorted(engine._suggest_tags(note.get("content"), note.get("type"), note.get("template"))))
+        for note in notes
+    ]
+
+
+_worker_engine: Optional[DataGovernanceEngine] = None
+
+
+def _init_worker(config_file: Optional[str]):
+    global _worker_engine
+    _worker_engine = DataGovernanceEngine(config_file)
+
+
+def _suggest_chunk(notes: List[Dict[str, Any]]) -> List[Tuple[str, List[str]]]:
+    return suggest_tags_for_notes(_worker_engine or DataGovernanceEngine(), notes)
+
+
+def _write_batch(tx, rows: List[Dict[str, Any]]) -> int:
+    return tx.run(ASSIGN_TAGS_QUERY, rows=rows).consume().counters.relationships_created
+
+
+class BulkTagger:
+    """Seitenweises Auto-Tagging aller Notes mit gebündelten Schreibzugriffen"""
+
+    def __init__(self, driver, config_file: Optional[str] = None,
+                 page_size: int = DEFAULT_PAGE_SIZE, batch_size: int = DEFAULT_BATCH_SIZE,
+                 workers: Optional[int] = None, only_tags: Optional[Set[str]] = None):
+        self.driver = driver
+        self.config_file = config_file
+        self.page_size = page_size
+        self.batch_size = batch_size
+        # None: so viele Prozesse wie CPUs; 0 oder 1: im aktuellen Prozess
+        self.workers = workers
+        self.only_tags = set(only_tags) if only_tags else None
+
+    def plan(self, note: Dict[str, Any], suggested: List[str]) -> List[str]:
+        """Vorgeschlagene Tags, die der Note noch fehlen"""
+        existing = set(note.get("tags") or [])
+        return [
+            tag for tag in suggested
+            if tag not in existing and (self.only_tags is None or tag in self.only_tags)
+        ]
+
+    def run(self, dry_run: bool = False,
+            progress: Optional[Callable[[TaggingReport], None]] = None) -> TaggingReport:
+        """Taggt alle Notes; ``progress`` erhält den Zwischenstand nach jeder Seite"""
+        report = TaggingReport(dry_run=dry_run)
+        started = time.perf_counter()
+        pending: List[Dict[str, Any]] = []
+        pending_count = 0
+
+        workers = self.workers if self.workers is not None else (os.cpu_count() or 1)
+        pool = None
+        if workers > 1:
+            pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(self.config_file,))
+        engine = DataGovernanceEngine(self.config_file) if pool is None else None
+
+        try:
+            with self.driver.session() as session:
+                for page in iter_note_pages(session, self.page_size):
+                    suggest_started = time.perf_counter()
+                    if pool is None:
+                        suggestions = suggest_tags_for_notes(engine, page)
+                    else:
+                        chunk = max(len(page) // (workers * 4), 1)
+                        chunks = [page[i:i + chunk] for i in range(0, len(page), chunk)]
+                        suggestions = [s for part in pool.map(_suggest_chunk, chunks) for s in part]
+                    report.suggest_seconds += time.perf_counter() - suggest_started
+
+                    for note, (_, suggested) in zip(page, suggestions):
+                        new_tags = self.plan(note, suggested)
+                        if not new_tags:
+                            continue
+                        report.changed_notes += 1
+                        report.planned += len(new_tags)
+                        if dry_run:
+                            report.diff[note["name"]] = new_tags
+                            continue
+                        if pending and pending_count + len(new_tags) > self.batch_size:
+                            self._flush(session, pending, report)
+                            pending, pending_count = [], 0
+                        pending.append({"note": note["name"], "tags": new_tags})
+                        pending_count += len(new_tags)
+
+                    report.pages += 1
+                    report.notes += len(page)
+                    report.seconds = time.perf_counter() - started
+                    if progress:
+                        progress(report)
+
+                if pending:
+                    self._flush(session, pending, report)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _flush(self, session, rows: List[Dict[str, Any]], report: TaggingReport):
+        write_started = time.perf_counter()
+        report.written += session.execute_write(_write_batch, rows)
+        report.transactions += 1
+        report.write_seconds += time.perf_counter() - write_started
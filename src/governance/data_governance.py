@@ -8,7 +8,10 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 import os
+import sys
 import json
+import time
+from pathlib import Path
 
 # Neo4j Integration - kann durch Umgebungsvariable deaktiviert werden
 NEO4J_DISABLED = os.environ.get("NEO4J_DISABLED", "").lower() in ("1", "true", "yes")
@@ -16,12 +19,25 @@ NEO4J_DISABLED = os.environ.get("NEO4J_DISABLED", "").lower() in ("1", "true", "
 try:
     if NEO4J_DISABLED:
         raise ImportError("Neo4j intentionally disabled")
-    from neo4j import GraphDatabase
+    import neo4j  # noqa: F401
+
+    # Prozessweite Treiber-Registry aus dem cortex-cli Paket
+    try:
+        from cortex_neo.neo4j_connection import get_driver
+    except ImportError:
+        sys.path.append(str(Path(__file__).resolve().parents[2]))
+        from cortex_neo.neo4j_connection import get_driver
 
     NEO4J_AVAILABLE = True
 except ImportError:
     NEO4J_AVAILABLE = False
 
+# Sekunden bis zum nächsten Verbindungsversuch nach einem Fehlschlag
+CONNECT_RETRY_SECONDS = float(os.environ.get("NEO4J_CONNECT_RETRY_SECONDS", "30"))
+
+# Zeitpunkt (monotonic) des letzten fehlgeschlagenen Verbindungsversuchs je (uri, user)
+_failed_connects: Dict[tuple, float] = {}
+
 
 class ValidationLevel(Enum):
     STRICT = "strict"  # Blockiert bei Fehlern
@@ -49,19 +65,32 @@ class Neo4jTemplateManager:
         # self._connect()
 
     def _connect(self):
-        """Verbindet zu Neo4j"""
+        """Verbindet zu Neo4j
+
+        Nach einem Fehlschlag wird für CONNECT_RETRY_SECONDS kein neuer
+        Versuch unternommen (prozessweit je uri/user), damit nicht jeder
+        Aufruf erneut auf den Verbindungs-Timeout wartet.
+        """
         if not NEO4J_AVAILABLE:
             return False
 
+        key = (self.uri, self.user)
+        failed_at = _failed_connects.get(key)
+        if failed_at is not None and time.monotonic() - failed_at < CONNECT_RETRY_SECONDS:
+            return False
+
         try:
             from neo4j.exceptions import ServiceUnavailable
 
-            self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
-            # Verwende einen sehr kurzen Timeout für die Connectivity-Prüfung
-            self.driver.verify_connectivity()
+            # Geteilter Treiber; die Verbindung wird hier einmalig geprüft
+            driver = get_driver(self.uri, self.user, self.password)
+            driver.verify_connectivity()
+            self.driver = driver
+            _failed_connects.pop(key, None)
             return True
         except (Exception, ServiceUnavailable):
             self.driver = None
+            _failed_connects[key] = time.monotonic()
             return False
 
     def is_connected(self):
@@ -791,6 +820,31 @@ class DataGovernanceEngine:
 
         return result
 
+    def validate_note_batch(self, notes: List[Dict[str, str]]) -> List[ValidationResult]:
+        """Validiert mehrere Notes gemeinsam (z. B. für Batch-Importe).
+
+        Jede Note (Keys: name, content, description, note_type, optional
+        template) wird wie in ``validate_note_creation`` geprüft; ein Name,
+        der im Batch mehrfach vorkommt, ist ab dem zweiten Vorkommen ein Fehler.
+        """
+        results = []
+        seen = set()
+        for note in notes:
+            name = note.get("name") or ""
+            result = self.validate_note_creation(
+                name=name,
+                content=note.get("content") or "",
+                description=note.get("description") or "",
+                note_type=note.get("note_type") or "",
+                template=note.get("template"),
+            )
+            if name and name in seen:
+                result.errors.append(f"Name '{name}' kommt im Batch mehrfach vor")
+                result.passed = False
+            seen.add(name)
+            results.append(result)
+        return results
+
     def _validate_required_fields(
         self, result: ValidationResult, name: str, content: str, description: str, rules: dict, validation_level: ValidationLevel
     ):
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Batched knowledge operations for the MCP server (``cortex_batch``).
+
+A batch is a list of operations in the argument shapes of the single tools:
+
+    {"op": "add", "title": ..., "content": ..., "category": ..., "tags": [...], "description": ...}
+    {"op": "link", "source_id": ..., "target_id": ..., "relationship": ...}
+    {"op": "tag", "note": ..., "tags": [...]}
+
+Everything is checked before anything is written: the shape of every
+operation, and all new notes together through
+``DataGovernanceEngine.validate_note_batch`` (which also rejects a title
+used twice in the batch). The valid operations are then written in one
+transaction of three UNWIND statements (notes, then links, then tags), so
+links and tags may refer to notes added earlier in the same batch.
+
+An atomic batch is all or nothing: an invalid operation rejects it before
+the write, and a link or tag whose note does not exist rolls the
+transaction back (``BatchPlan.verify`` runs inside it).
+
+The report has one result per operation, in input order, with a
+``status`` of ``ok``, ``invalid`` (not written, see ``errors``),
+``not_found`` (a link or tag whose note does not exist) or ``skipped``
+(an atomic batch that was rejected because of other operations).
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+OPERATIONS = ("add", "link", "tag")
+MAX_OPERATIONS = 5000
+
+ADD_NOTES_QUERY = """
+UNWIND $notes AS note
+MERGE (n:Note {name: note.name})
+SET n.content = note.content,
+    n.description = note.description,
+    n.type = note.type,
+    n.created_with_governance = true,
+    n.updated_at = timestamp()
+FOREACH (tag_name IN note.tags |
+    MERGE (t:Tag {name: tag_name})
+    MERGE (n)-[:TAGGED_WITH]->(t))
+RETURN note.index AS index
+"""
+
+LINK_NOTES_QUERY = """
+UNWIND $links AS link
+MATCH (a:Note {name: link.source}), (b:Note {name: link.target})
+MERGE (a)-[r:LINKS_TO]->(b)
+SET r.relationship = link.relationship, a.updated_at = timestamp()
+RETURN link.index AS index
+"""
+
+TAG_NOTES_QUERY = """
+UNWIND $tags AS item
+MATCH (n:Note {name: item.note})
+FOREACH (tag_name IN item.tags |
+    MERGE (t:Tag {name: tag_name})
+    MERGE (n)-[:TAGGED_WITH]->(t))
+RETURN item.index AS index
+"""
+
+
+class BatchRejected(Exception):
+    """Raised inside the transaction of an atomic batch to roll it back"""
+
+    def __init__(self, missing: List[int]):
+        super().__init__(f"{len(missing)} operation(s) found no note")
+        self.missing = missing
+
+
+def _text(operation: Dict[str, Any], key: str, errors: List[str], default: Optional[str] = None) -> str:
+    value = operation.get(key, default)
+    if not isinstance(value, str) or not value.strip():
+        errors.append(f"'{key}' is required")
+        return ""
+    return value.strip()
+
+
+def _tags(operation: Dict[str, Any], errors: List[str], required: bool = False) -> List[str]:
+    tags = operation.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+        errors.append("'tags' must be a list of strings")
+        return []
+    tags = list(dict.fromkeys(t.strip() for t in tags if t.strip()))
+    if required and not tags:
+        errors.append("'tags' is required")
+    return tags
+
+
+def parse_operation(index: int, operation: Any) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """Normalized write item of one operation, or the reasons it is malformed"""
+    if not isinstance(operation, dict):
+        return None, ["operation must be an object"]
+    op = operation.get("op")
+    errors: List[str] = []
+    if op == "add":
+        item = {
+            "name": _text(operation, "title", errors),
+            "content": _text(operation, "content", errors),
+            "description": (operation.get("description") or "").strip(),
+            "type": (operation.get("category") or "general").strip(),
+            "tags": _tags(operation, errors),
+        }
+    elif op == "link":
+        item = {
+            "source": _text(operation, "source_id", errors),
+            "target": _text(operation, "target_id", errors),
+            "relationship": _text(operation, "relationship", errors, "related_to"),
+        }
+    elif op == "tag":
+        item = {"note": _text(operation, "note", errors), "tags": _tags(operation, errors, required=True)}
+    else:
+        return None, [f"unknown op {op!r} (expected one of {', '.join(OPERATIONS)})"]
+    return {"index": index, "op": op, **item}, errors
+
+
+@dataclass
+class BatchPlan:
+    """Validated operations of a batch and their results"""
+
+    results: List[Dict[str, Any]]
+    notes: List[Dict[str, Any]] = field(default_factory=list)
+    links: List[Dict[str, Any]] = field(default_factory=list)
+    tags: List[Dict[str, Any]] = field(default_factory=list)
+    atomic: bool = False
+
+    def statements(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """The write statements for one transaction, in dependency order"""
+        statements = []
+        for query, key, items in ((ADD_NOTES_QUERY, "notes", self.notes),
+                                  (LINK_NOTES_QUERY, "links", self.links),
+                                  (TAG_NOTES_QUERY, "tags", self.tags)):
+            if items:
+                statements.append((query, {key: [{k: v for k, v in item.items() if k != "op"}
+                                                 for item in items]}))
+        return statements
+
+    @staticmethod
+    def _written(rows: List[List[Dict[str, Any]]]) -> set:
+        return {row["index"] for statement_rows in rows for row in statement_rows}
+
+    def verify(self, rows: List[List[Dict[str, Any]]]):
+        """Raise BatchRejected unless every operation wrote a row (atomic check)"""
+        written = self._written(rows)
+        missing = [item["index"] for item in self.notes + self.links + self.tags
+                   if item["index"] not in written]
+        if missing:
+            raise BatchRejected(missing)
+
+    def apply(self, rows: List[List[Dict[str, Any]]]):
+        """Mark written operations ok and unmatched links/tags not_found"""
+        written = self._written(rows)
+        for item in self.notes + self.links + self.tags:
+            result = self.results[item["index"]]
+            if item["index"] in written:
+                result["status"] = "ok"
+            else:
+                result["status"] = "not_found"
+                result.setdefault("errors", []).append("note not found")
+
+    def reject(self, missing: List[int]):
+        """Mark a rolled back atomic batch: missing not_found, the rest skipped"""
+        missing = set(missing)
+        for item in self.notes + self.links + self.tags:
+            result = self.results[item["index"]]
+            if item["index"] in missing:
+                result["status"] = "not_found"
+                result.setdefault("errors", []).append("note not found")
+            else:
+                result["status"] = "skipped"
+                result.setdefault("errors", []).append("batch rolled back: other operations found no note")
+
+    def report(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for result in self.results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        return {"total": len(self.results), **counts, "results": self.results}
+
+
+def plan_batch(operations: List[Any], governance, atomic: bool = False) -> BatchPlan:
+    """Check all operations; the notes are validated together by governance
+
+    With ``atomic``, a single invalid operation leaves the plan empty and
+    marks all other operations ``skipped``; the write is then checked with
+    ``verify``.
+    """
+    if len(operations) > MAX_OPERATIONS:
+        raise ValueError(f"At most {MAX_OPERATIONS} operations per batch, got {len(operations)}")
+
+    items, results = [], []
+    for index, operation in enumerate(operations):
+        item, errors = parse_operation(index, operation)
+        result: Dict[str, Any] = {"index": index, "op": item["op"] if item else None}
+        if item and item["op"] == "add":
+            result["name"] = item["name"]
+        if errors:
+            result.update(status="invalid", errors=errors)
+        else:
+            result["status"] = "pending"
+            items.append(item)
+        results.append(result)
+
+    notes = [item for item in items if item["op"] == "add"]
+    validations = governance.validate_note_batch([
+        {"name": n["name"], "content": n["content"], "description": n["description"], "note_type": n["type"]}
+        for n in notes
+    ])
+    for note, validation in zip(notes, validations):
+        result = results[note["index"]]
+        if validation.warnings:
+            result["warnings"] = list(validation.warnings)
+        if not validation.passed:
+            result.update(status="invalid", errors=list(validation.errors))
+
+    valid = [item for item in items if results[item["index"]]["status"] == "pending"]
+    if atomic and len(valid) < len(results):
+        for item in valid:
+            results[item["index"]].update(status="skipped", errors=["batch rejected: other operations are invalid"])
+        return BatchPlan(results)
+
+    return BatchPlan(
+        results,
+        notes=[item for item in valid if item["op"] == "add"],
+        links=[item for item in valid if item["op"] == "link"],
+        tags=[item for item in valid if item["op"] == "tag"],
+        atomic=atomic,
+    )
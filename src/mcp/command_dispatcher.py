@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+In-process dispatch of Cortex CLI commands for the MCP server.
+
+Instead of starting ``python cortex_neo/cortex_cli.py <command>`` for every
+resource read and tool call, the Click group of the CLI is imported once and
+invoked as a library call on a bounded thread pool. The module, Click and the
+Neo4j driver registry stay warm between calls, and a blocking command only
+occupies a pool thread, so concurrent MCP requests overlap instead of
+stalling the event loop.
+
+Output is captured per call: ``sys.stdout``/``sys.stderr`` are replaced once
+by streams that write into the buffer of the calling pool thread (and to the
+original stream everywhere else). The result keeps the subprocess shape
+(``returncode``, ``stdout``, ``stderr``, ``success``).
+
+Commands in ``SUBPROCESS_COMMANDS`` (long running, spawning process pools,
+or writing checkpoints) and everything else when the CLI cannot be imported
+still run in a subprocess, started with ``asyncio.create_subprocess_exec``
+so no pool thread waits for it; the process is killed when the call times
+out or is cancelled. A timed out in-process command cannot be interrupted;
+its result is discarded and its pool thread is freed when it finishes.
+Callers pass the executor of their priority class (see execution), so such
+a command only holds up calls of its own class.
+
+Relative paths in commands resolve against the server's working directory,
+which the MCP configuration sets to the project root.
+"""
+
+import asyncio
+import io
+import logging
+import os
+import sys
+import threading
+import traceback
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+CORTEX_CLI_PATH = PROJECT_ROOT / "cortex_neo" / "cortex_cli.py"
+
+# Commands that keep running in their own process
+SUBPROCESS_COMMANDS = frozenset({
+    "auto-tag",
+    "migrate",
+    "export-graph",
+    "import-graph",
+    "init-schema",
+    "system-backup",
+    "data-import",
+})
+
+
+def default_workers() -> int:
+    value = os.environ.get("CORTEX_MCP_WORKERS")
+    try:
+        return max(int(value), 1) if value else min(8, (os.cpu_count() or 1) + 4)
+    except ValueError:
+        logger.warning("Invalid CORTEX_MCP_WORKERS=%r", value)
+        return min(8, (os.cpu_count() or 1) + 4)
+
+
+def command_result(returncode: int, stdout: str, stderr: str) -> Dict[str, Any]:
+    return {
+        "returncode": returncode,
+        "stdout": stdout,
+        "stderr": stderr,
+        "success": returncode == 0,
+    }
+
+
+class _ThreadCapture(io.TextIOBase):
+    """Stream that writes to the calling thread's capture buffer, if any"""
+
+    def __init__(self, original):
+        self._original = original
+        self._local = threading.local()
+
+    @property
+    def encoding(self):
+        return "utf-8"
+
+    @property
+    def _target(self):
+        return getattr(self._local, "buffer", None) or self._original
+
+    def start(self) -> io.StringIO:
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+
+    def stop(self) -> str:
+        buffer, self._local.buffer = self._local.buffer, None
+        return buffer.getvalue()
+
+    def write(self, text):
+        return self._target.write(text)
+
+    def flush(self):
+        self._target.flush()
+
+    def isatty(self):
+        return False if getattr(self._local, "buffer", None) else self._original.isatty()
+
+    def __getattr__(self, name):
+        # fileno, buffer etc. of the real stream (e.g. for the stdio transport)
+        return getattr(self._original, name)
+
+
+_capture_lock = threading.Lock()
+
+
+def _install_capture():
+    with _capture_lock:
+        if not isinstance(sys.stdout, _ThreadCapture):
+            sys.stdout = _ThreadCapture(sys.stdout)
+        if not isinstance(sys.stderr, _ThreadCapture):
+            sys.stderr = _ThreadCapture(sys.stderr)
+    return sys.stdout, sys.stderr
+
+
+class CommandDispatcher:
+    """Runs CLI commands on a bounded pool, in-process where possible"""
+
+    def __init__(self, cli_path: Path = CORTEX_CLI_PATH, project_root: Path = PROJECT_ROOT,
+                 max_workers: Optional[int] = None, in_process: bool = True):
+        self.cli_path = Path(cli_path)
+        self.project_root = Path(project_root)
+        self.max_workers = max_workers or default_workers()
+        self.in_process = in_process
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._cli = None
+        self._cli_error: Optional[str] = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="cortex-cmd")
+        return self._pool
+
+    def load_cli(self):
+        """The CLI's Click group, imported once; None if it cannot be imported"""
+        if self._cli is not None or self._cli_error is not None:
+            return self._cli
+        with self._load_lock:
+            if self._cli is None and self._cli_error is None:
+                for path in (self.project_root, self.cli_path.parent):
+                    if str(path) not in sys.path:
+                        sys.path.append(str(path))
+                try:
+                    import importlib
+                    self._cli = importlib.import_module(self.cli_path.stem).cli
+                except Exception as e:
+                    self._cli_error = str(e)
+                    logger.warning("Cortex CLI not importable, using subprocesses: %s", e)
+        return self._cli
+
+    def uses_subprocess(self, command: str) -> bool:
+        return not self.in_process or command in SUBPROCESS_COMMANDS or self.load_cli() is None
+
+    async def run(self, command, args: Optional[List[str]] = None,
+                  timeout: int = 30, executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """Run ``command args...``; ``command`` may also be a full argv list
+
+        In-process commands run on ``executor``, or on the dispatcher's own
+        pool if none is given.
+        """
+        argv = [str(a) for a in (command if isinstance(command, (list, tuple)) else [command])]
+        argv += [str(a) for a in (args or [])]
+        if not argv:
+            return command_result(-1, "", "Command execution error: no command given")
+
+        if self.uses_subprocess(argv[0]):
+            call = self.run_subprocess(argv)
+        else:
+            call = asyncio.get_running_loop().run_in_executor(executor or self.pool, self.run_in_process, argv)
+        try:
+            return await asyncio.wait_for(call, timeout)
+        except asyncio.TimeoutError:
+            return command_result(-1, "", f"Command timeout after {timeout} seconds")
+        except Exception as e:
+            return command_result(-1, "", f"Command execution error: {str(e)}")
+
+    def run_in_process(self, argv: List[str]) -> Dict[str, Any]:
+        """Invoke the Click group in this thread and capture its output"""
+        import click
+
+        stdout, stderr = _install_capture()
+        stdout.start()
+        stderr.start()
+        returncode = 0
+        try:
+            rv = self.load_cli().main(args=argv, prog_name=self.cli_path.name, standalone_mode=False)
+            if isinstance(rv, int) and not isinstance(rv, bool):
+                returncode = rv
+        except click.ClickException as e:
+            e.show()
+            returncode = e.exit_code
+        except click.Abort:
+            print("Aborted!", file=sys.stderr)
+            returncode = 1
+        except SystemExit as e:
+            returncode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+        finally:
+            out, err = stdout.stop(), stderr.stop()
+        return command_result(returncode, out, err)
+
+    async def run_subprocess(self, argv: List[str]) -> Dict[str, Any]:
+        """Run the CLI in its own interpreter
+
+        The process is killed if the awaiting call is cancelled, which is
+        also how a timeout in ``run`` ends it.
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, str(self.cli_path), *argv,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=str(self.project_root),
+            )
+        except Exception as e:
+            return command_result(-1, "", f"Command execution error: {str(e)}")
+        try:
+            stdout, stderr = await process.communicate()
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+        return command_result(process.returncode, stdout.decode(errors="replace"),
+                              stderr.decode(errors="replace"))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -27,11 +27,11 @@ For Claude Desktop, configure in claude_desktop_config.json:
 
 import asyncio
 import json
-import subprocess
 import sys
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
+from urllib.parse import parse_qs
 
 # Import MCP components with better error handling
 MCP_AVAILABLE = False
@@ -128,6 +128,45 @@ server = Server("cortex-py-unified")
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 CORTEX_CLI_PATH = PROJECT_ROOT / "cortex_neo" / "cortex_cli.py"
 
+# Async Neo4j access from the cortex-cli package; without it the graph
+# resources and tools go through the CLI only
+GRAPH_AVAILABLE = False
+try:
+    try:
+        from cortex.utils.neo4j_async import AsyncGraph, close_async_drivers
+    except ImportError:
+        sys.path.append(str(PROJECT_ROOT / "cortex-cli"))
+        from cortex.utils.neo4j_async import AsyncGraph, close_async_drivers
+    from neo4j.exceptions import DriverError, Neo4jError
+
+    try:
+        from note_search import NOTE_FULLTEXT_INDEX, build_fulltext_query, decode_cursor, encode_cursor
+    except ImportError:
+        sys.path.append(str(PROJECT_ROOT / "cortex_neo"))
+        from note_search import NOTE_FULLTEXT_INDEX, build_fulltext_query, decode_cursor, encode_cursor
+
+    GRAPH_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: async Neo4j access not available: {e}", file=sys.stderr)
+
+
+try:
+    from .command_dispatcher import CommandDispatcher
+    from .resource_cache import ALL_RESOURCES as CACHED_RESOURCES, ResourceCache
+    from .execution import ExecutionLayer, RequestTimeout, ServerBusy, call_executor, call_timeout
+    from . import batch_operations, streaming
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parent))
+    from command_dispatcher import CommandDispatcher
+    from resource_cache import ALL_RESOURCES as CACHED_RESOURCES, ResourceCache
+    from execution import ExecutionLayer, RequestTimeout, ServerBusy, call_executor, call_timeout
+    import batch_operations
+    import streaming
+
+
+class GraphUnavailable(Exception):
+    """The graph could not be queried directly; use the CLI instead"""
+
 
 class CortexMCPServer:
     """Unified Cortex MCP Server implementation"""
@@ -135,6 +174,12 @@ class CortexMCPServer:
     def __init__(self):
         self.project_root = PROJECT_ROOT
         self.cortex_cli_path = CORTEX_CLI_PATH
+        # Shared by all handlers, so concurrent requests share its session limit
+        self.graph = AsyncGraph() if GRAPH_AVAILABLE else None
+        self.dispatcher = CommandDispatcher(self.cortex_cli_path, self.project_root)
+        self.resource_cache = ResourceCache()
+        self.execution = ExecutionLayer()
+        self._governance = None
 
     def get_cortex_cli_path(self) -> Path:
         """Get the path to the Cortex CLI"""
@@ -145,44 +190,163 @@ class CortexMCPServer:
         return self.cortex_cli_path.exists()
 
     async def run_cortex_command(
-        self, command: str, args: List[str] = None, timeout: int = 30
+        self, command: str, args: List[str] = None, timeout: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Run a Cortex CLI command and return the result"""
-        if args is None:
-            args = []
+        """Run a Cortex CLI command and return the result
+
+        Runs in-process on the thread pool of the current call's priority
+        class (the dispatcher's pool outside of one), or in a subprocess for
+        isolation-sensitive commands (see command_dispatcher). Without
+        ``timeout`` the time left for the current tool call is used, or 30
+        seconds outside of one.
+        """
+        if timeout is None:
+            timeout = call_timeout(30)
+        return await self.dispatcher.run(command, args, timeout=timeout, executor=call_executor())
+
+    async def _graph_read(self, query: str, **params) -> List[Dict[str, Any]]:
+        if self.graph is None:
+            raise GraphUnavailable("async Neo4j driver not installed")
+        try:
+            return await self.graph.read(query, **params)
+        except (DriverError, Neo4jError, OSError) as e:
+            raise GraphUnavailable(str(e)) from e
 
+    async def _graph_write(self, query: str, **params) -> List[Dict[str, Any]]:
+        if self.graph is None:
+            raise GraphUnavailable("async Neo4j driver not installed")
         try:
-            cmd_args = [sys.executable, str(self.cortex_cli_path), command] + args
-
-            result = subprocess.run(
-                cmd_args,
-                capture_output=True,
-                text=True,
-                cwd=str(self.project_root),
-                timeout=timeout,
-            )
+            return await self.graph.write(query, **params)
+        except (DriverError, Neo4jError, OSError) as e:
+            raise GraphUnavailable(str(e)) from e
+
+    async def _graph_write_many(self, statements: List[Tuple[str, Dict[str, Any]]],
+                                check=None) -> List[List[Dict[str, Any]]]:
+        if self.graph is None:
+            raise GraphUnavailable("async Neo4j driver not installed")
+        try:
+            return await self.graph.write_many(statements, check)
+        except (DriverError, Neo4jError, OSError) as e:
+            raise GraphUnavailable(str(e)) from e
+
+    @property
+    def governance(self):
+        """DataGovernanceEngine for batch validation, created on first use"""
+        if self._governance is None:
+            if str(self.project_root) not in sys.path:
+                sys.path.append(str(self.project_root))
+            from src.governance.data_governance import DataGovernanceEngine
+
+            self._governance = DataGovernanceEngine()
+        return self._governance
+
+    async def run_batch(self, operations: List[Any], atomic: bool = False) -> Dict[str, Any]:
+        """Validate add/link/tag operations together and write them in one transaction
+
+        Returns the per-operation report (see batch_operations). Raises
+        ValueError for oversized batches. An atomic batch in which a link or
+        tag finds no note is rolled back and reported as rejected.
+        """
+        plan = await asyncio.to_thread(batch_operations.plan_batch, operations, self.governance, atomic)
+        statements = plan.statements()
+        if statements:
+            try:
+                rows = await self._graph_write_many(statements, plan.verify if plan.atomic else None)
+            except batch_operations.BatchRejected as e:
+                plan.reject(e.missing)
+            else:
+                plan.apply(rows)
+        return plan.report()
+
+    async def graph_overview(self) -> Dict[str, Any]:
+        """Node and relationship counts, queried concurrently"""
+        notes, tags, templates, workflows, links = await asyncio.gather(
+            self._graph_read("MATCH (n:Note) RETURN count(n) AS count"),
+            self._graph_read("MATCH (t:Tag) RETURN count(t) AS count"),
+            self._graph_read("MATCH (t:Template) RETURN count(t) AS count"),
+            self._graph_read("MATCH (w:Workflow) RETURN count(w) AS count"),
+            self._graph_read("MATCH (:Note)-[r:LINKS_TO]->(:Note) RETURN count(r) AS count"),
+        )
+        return {
+            "notes": notes[0]["count"],
+            "tags": tags[0]["count"],
+            "templates": templates[0]["count"],
+            "workflows": workflows[0]["count"],
+            "links": links[0]["count"],
+        }
+
+    async def list_links(
+        self, limit: int = streaming.DEFAULT_LINK_PAGE, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """One page of links between notes, ordered by source and target
 
-            return {
-                "returncode": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "success": result.returncode == 0,
-            }
+        Raises ValueError for an invalid cursor.
+        """
+        query, params = streaming.link_page_query(cursor, limit)
+        rows = await self._graph_read(query, **params)
+        return streaming.link_page(rows, limit)
 
-        except subprocess.TimeoutExpired:
-            return {
-                "returncode": -1,
-                "stdout": "",
-                "stderr": f"Command timeout after {timeout} seconds",
-                "success": False,
-            }
-        except Exception as e:
-            return {
-                "returncode": -1,
-                "stdout": "",
-                "stderr": f"Command execution error: {str(e)}",
-                "success": False,
-            }
+    async def search_knowledge(
+        self, query: str, category: str = "", limit: int = 10, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """One page of full-text results over notes, best match first
+
+        Raises ValueError for an invalid cursor.
+        """
+        lucene = build_fulltext_query(query) if GRAPH_AVAILABLE else ""
+        if not lucene:
+            return {"results": [], "next_cursor": None}
+        after_score, after_name = decode_cursor(cursor) if cursor else (None, None)
+        rows = await self._graph_read(
+            """
+            CALL db.index.fulltext.queryNodes($index, $lucene) YIELD node AS n, score
+            WHERE ($category = '' OR n.type = $category)
+              AND ($after_score IS NULL OR score < $after_score
+                   OR (score = $after_score AND n.name > $after_name))
+            RETURN n.name AS name, n.type AS type, n.description AS description, score
+            ORDER BY score DESC, name ASC
+            LIMIT $limit
+            """,
+            index=NOTE_FULLTEXT_INDEX,
+            lucene=lucene,
+            category=category or "",
+            after_score=after_score,
+            after_name=after_name,
+            limit=limit + 1,
+        )
+        results = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit and results:
+            next_cursor = encode_cursor(results[-1]["score"], results[-1]["name"])
+        return {"results": results, "next_cursor": next_cursor}
+
+    async def export_data(self, file_format: str = "json", category: str = "") -> Dict[str, Any]:
+        """Stream notes and links page by page into an export file
+
+        Returns the export handle (see streaming); the data itself is read
+        back through the cortex://exports/<handle> resource.
+        """
+        if self.graph is None:
+            raise GraphUnavailable("async Neo4j driver not installed")
+        with streaming.ExportWriter(file_format) as writer:
+            async for records in streaming.export_records(self._graph_read, category):
+                writer.write(records)
+        return writer.summary()
+
+    async def link_knowledge(self, source: str, target: str, relationship: str) -> bool:
+        """Link two existing notes; False if either does not exist"""
+        rows = await self._graph_write(
+            """
+            MATCH (a:Note {name: $source}), (b:Note {name: $target})
+            MERGE (a)-[r:LINKS_TO]->(b)
+            SET r.relationship = $relationship, a.updated_at = timestamp()
+            RETURN a.name AS source
+            """,
+            source=source,
+            target=target,
+            relationship=relationship,
+        )
+        return bool(rows)
 
 
 # Create server instance
@@ -197,7 +361,7 @@ async def handle_list_resources() -> List[Resource]:
             uri="cortex://status",
             name="Cortex System Status",
             description="Current status of the Cortex system and Neo4j database",
-            mimeType="text/plain",
+            mimeType="application/json",
         ),
         Resource(
             uri="cortex://knowledge-graph",
@@ -214,7 +378,7 @@ async def handle_list_resources() -> List[Resource]:
         Resource(
             uri="cortex://links",
             name="Knowledge Links",
-            description="Overview of knowledge links and relationships",
+            description="Knowledge links and relationships, paged with ?cursor=&limit=",
             mimeType="application/json",
         ),
         Resource(
@@ -233,38 +397,100 @@ async def handle_list_resources() -> List[Resource]:
 
 
 async def handle_read_resource(uri: str) -> str:
-    """Read a specific Cortex resource"""
+    """Read a specific Cortex resource
+
+    status, knowledge-graph, templates and links are served from the
+    resource cache as ``{"etag": ..., "data": <text>}``; ``?etag=<etag>``
+    returns a not-modified marker while the cached text still has that ETag.
+    Failed renders and pages other than the first are returned as plain text.
+    """
+    base_uri, _, query = uri.partition("?")
+    params = {key: values[0] for key, values in parse_qs(query).items()}
+    etag = params.pop("etag", None)
+    if base_uri in CACHED_RESOURCES:
+        if params:
+            # Pages other than the first (cursor/limit) are not cached
+            text, _ = await execute_render(base_uri, params)
+            return text
+        if cortex_server.resource_cache.not_modified(base_uri, etag):
+            return json.dumps({"not_modified": True, "etag": etag})
+        text, etag = await cortex_server.resource_cache.get(base_uri, lambda: execute_render(base_uri))
+        if etag is None:
+            return text
+        return json.dumps({"etag": etag, "data": text})
+    text, _ = await render_resource(base_uri, params)
+    return text
+
+
+async def execute_render(uri: str, params: Optional[Dict[str, str]] = None) -> Tuple[str, bool]:
+    """Render a polled resource in the interactive class of the execution layer"""
+    try:
+        return await cortex_server.execution.run(uri, lambda: render_resource(uri, params))
+    except (ServerBusy, RequestTimeout) as e:
+        return f'{{"error": "Resource unavailable", "details": "{e}"}}', False
+
+
+async def render_resource(uri: str, params: Optional[Dict[str, str]] = None) -> Tuple[str, bool]:
+    """Render a resource; returns (text, ok), failures are not cached
+
+    ``params`` are the query parameters of the URI (``cursor``, ``limit``).
+    """
+    params = params or {}
 
     if uri == "cortex://status":
         if not cortex_server.is_cortex_cli_available():
-            return "Cortex CLI not available - please check installation"
+            return "Cortex CLI not available - please check installation", False
 
         result = await cortex_server.run_cortex_command("status")
         if result["success"]:
-            return result["stdout"] or "Cortex system is operational"
+            return result["stdout"] or "Cortex system is operational", True
         else:
-            return f"Status check failed: {result['stderr']}"
+            return f"Status check failed: {result['stderr']}", False
 
     elif uri == "cortex://knowledge-graph":
+        try:
+            return json.dumps(await cortex_server.graph_overview(), indent=2), True
+        except GraphUnavailable:
+            pass
+
         result = await cortex_server.run_cortex_command("graph-info")
         if result["success"]:
-            return result["stdout"] or '{"status": "Graph information not available"}'
+            return result["stdout"] or '{"status": "Graph information not available"}', True
         else:
-            return f'{{"error": "Failed to get graph info", "details": "{result["stderr"]}"}}'
+            return f'{{"error": "Failed to get graph info", "details": "{result["stderr"]}"}}', False
 
     elif uri == "cortex://templates":
         result = await cortex_server.run_cortex_command("template-list")
         if result["success"]:
-            return result["stdout"] or '{"templates": []}'
+            return result["stdout"] or '{"templates": []}', True
         else:
-            return f'{{"error": "Failed to list templates", "details": "{result["stderr"]}"}}'
+            return f'{{"error": "Failed to list templates", "details": "{result["stderr"]}"}}', False
 
     elif uri == "cortex://links":
+        limit = streaming.page_limit(params.get("limit"), streaming.DEFAULT_LINK_PAGE)
+        try:
+            page = await cortex_server.list_links(limit, params.get("cursor"))
+            return json.dumps(page, indent=2), True
+        except GraphUnavailable:
+            pass
+        except ValueError as e:
+            return json.dumps({"error": "Invalid cursor", "details": str(e)}), False
+
         result = await cortex_server.run_cortex_command("link-list")
         if result["success"]:
-            return result["stdout"] or '{"links": []}'
+            return result["stdout"] or '{"links": []}', True
         else:
-            return f'{{"error": "Failed to list links", "details": "{result["stderr"]}"}}'
+            return f'{{"error": "Failed to list links", "details": "{result["stderr"]}"}}', False
+
+    elif uri.startswith("cortex://exports/"):
+        handle = uri[len("cortex://exports/"):]
+        try:
+            chunk = await asyncio.to_thread(
+                streaming.read_export_chunk, handle, params.get("cursor"), params.get("limit")
+            )
+            return json.dumps(chunk), True
+        except (FileNotFoundError, ValueError) as e:
+            return json.dumps({"error": "Export not readable", "details": str(e)}), False
 
     elif uri == "cortex://help":
         help_text = """
@@ -277,6 +503,14 @@ Resources:
 - cortex://links - Knowledge links and relationships
 - cortex://help - This help information
 - cortex://config - System configuration
+- cortex://exports/<handle> - Chunks of a file written by cortex_export_data
+
+cortex://links and cortex://exports/<handle> are paged: pass ?limit=<n> and
+the next_cursor of the previous page as ?cursor=<cursor>.
+
+status, knowledge-graph, templates and links are cached and returned as
+{"etag": ..., "data": ...}; append ?etag=<etag> to get a not-modified marker
+while unchanged.
 
 Tools:
 - cortex_run_command - Execute any Cortex CLI command
@@ -285,6 +519,7 @@ Tools:
 - cortex_search_knowledge - Search existing knowledge
 - cortex_create_template - Create a new knowledge template
 - cortex_link_knowledge - Create links between knowledge items
+- cortex_batch - Add, link and tag many knowledge items in one call
 - cortex_export_data - Export knowledge data
 - cortex_import_data - Import knowledge data
 - cortex_backup_system - Create system backup
@@ -296,7 +531,7 @@ Usage Examples:
 - Ask Claude: "Search for information about Python"
 - Ask Claude: "Create a backup of the knowledge graph"
         """.strip()
-        return help_text
+        return help_text, True
 
     elif uri == "cortex://config":
         try:
@@ -314,10 +549,12 @@ Usage Examples:
                     "backup": True,
                     "ai_integration": True,
                 },
+                "resource_cache": cortex_server.resource_cache.metrics(),
+                "execution": cortex_server.execution.metrics(),
             }
-            return json.dumps(config_data, indent=2)
+            return json.dumps(config_data, indent=2), True
         except Exception as e:
-            return f'{{"error": "Failed to get configuration", "details": "{str(e)}"}}'
+            return f'{{"error": "Failed to get configuration", "details": "{str(e)}"}}', False
 
     else:
         raise ValueError(f"Unknown resource: {uri}")
@@ -400,9 +637,13 @@ async def handle_list_tools() -> List[Tool]:
                     },
                     "limit": {
                         "type": "integer",
-                        "description": "Maximum number of results",
+                        "description": "Maximum number of results per page",
                         "default": 10,
                     },
+                    "cursor": {
+                        "type": "string",
+                        "description": "next_cursor of the previous page (optional)",
+                    },
                 },
                 "required": ["query"],
             },
@@ -448,9 +689,46 @@ async def handle_list_tools() -> List[Tool]:
                 "required": ["source_id", "target_id"],
             },
         ),
+        Tool(
+            name="cortex_batch",
+            description="Add, link and tag many knowledge items in one call: validated together, "
+            "written in one transaction, with one result per operation",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "operations": {
+                        "type": "array",
+                        "description": "Operations with the arguments of cortex_add_knowledge (op 'add'), "
+                        "cortex_link_knowledge (op 'link'), or a note and its tags (op 'tag')",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "op": {"type": "string", "enum": ["add", "link", "tag"]},
+                                "title": {"type": "string"},
+                                "content": {"type": "string"},
+                                "description": {"type": "string"},
+                                "category": {"type": "string"},
+                                "source_id": {"type": "string"},
+                                "target_id": {"type": "string"},
+                                "relationship": {"type": "string"},
+                                "note": {"type": "string"},
+                                "tags": {"type": "array", "items": {"type": "string"}},
+                            },
+                            "required": ["op"],
+                        },
+                    },
+                    "atomic": {
+                        "type": "boolean",
+                        "description": "Write nothing if any operation is invalid or finds no note",
+                        "default": False,
+                    },
+                },
+                "required": ["operations"],
+            },
+        ),
         Tool(
             name="cortex_export_data",
-            description="Export knowledge data in various formats",
+            description="Export knowledge data to a file; returns a handle to read it via cortex://exports/<handle>",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -520,6 +798,21 @@ async def handle_list_tools() -> List[Tool]:
 
 
 async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+    """Execute a Cortex tool and evict the cached resources it may change
+
+    The call runs in its priority class of the execution layer; a full
+    queue or an expired timeout is reported as an error text.
+    """
+    try:
+        return await cortex_server.execution.run(name, lambda: call_tool(name, arguments))
+    except (ServerBusy, RequestTimeout) as e:
+        return [TextContent(type="text", text=f"Error: {e}")]
+    finally:
+        if name != "cortex_validate_links" or arguments.get("fix_errors"):
+            cortex_server.resource_cache.invalidate_for_tool(name)
+
+
+async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     """Execute a Cortex tool"""
 
     if name == "cortex_run_command":
@@ -574,16 +867,30 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
     elif name == "cortex_search_knowledge":
         query = arguments.get("query", "")
         category = arguments.get("category", "")
-        limit = arguments.get("limit", 10)
+        limit = streaming.page_limit(arguments.get("limit", 10), 10)
+        cursor = arguments.get("cursor") or None
 
         if not query:
             return [TextContent(type="text", text="Error: Query is required")]
 
-        args = ["--query", query, "--limit", str(limit)]
+        try:
+            page = await cortex_server.search_knowledge(query, category, limit, cursor)
+            output = json.dumps(page, indent=2) if page["results"] or cursor else "No results found"
+            return [TextContent(type="text", text=output)]
+        except GraphUnavailable:
+            pass
+        except ValueError as e:
+            return [TextContent(type="text", text=f"Error: {e}")]
+
+        # search-notes creates the full-text index if it is missing and
+        # falls back to the local search index when the graph is down
+        args = [query, "--limit", str(limit)]
         if category:
-            args.extend(["--category", category])
+            args.extend(["--type", category])
+        if cursor:
+            args.extend(["--cursor", cursor])
 
-        result = await cortex_server.run_cortex_command("knowledge-search", args)
+        result = await cortex_server.run_cortex_command("search-notes", args)
 
         if result["success"]:
             output = result["stdout"] or "No results found"
@@ -600,8 +907,6 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
             return [TextContent(type="text", text="Error: Name and structure are required")]
 
         # Convert structure to JSON string
-        import json
-
         structure_json = json.dumps(structure)
 
         result = await cortex_server.run_cortex_command(
@@ -623,6 +928,15 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
         if not source_id or not target_id:
             return [TextContent(type="text", text="Error: Source and target IDs are required")]
 
+        try:
+            if await cortex_server.link_knowledge(source_id, target_id, relationship):
+                output = f"Link created successfully between '{source_id}' and '{target_id}'"
+            else:
+                output = f"Failed to create link: '{source_id}' or '{target_id}' not found"
+            return [TextContent(type="text", text=output)]
+        except GraphUnavailable:
+            pass
+
         result = await cortex_server.run_cortex_command(
             "link-create",
             ["--source", source_id, "--target", target_id, "--relationship", relationship],
@@ -635,10 +949,33 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
 
         return [TextContent(type="text", text=output)]
 
+    elif name == "cortex_batch":
+        operations = arguments.get("operations")
+        atomic = bool(arguments.get("atomic", False))
+
+        if not isinstance(operations, list) or not operations:
+            return [TextContent(type="text", text="Error: A non-empty list of operations is required")]
+
+        try:
+            report = await cortex_server.run_batch(operations, atomic)
+            return [TextContent(type="text", text=json.dumps(report, indent=2))]
+        except ValueError as e:
+            return [TextContent(type="text", text=f"Error: {e}")]
+        except GraphUnavailable as e:
+            return [TextContent(type="text", text=f"Error: cortex_batch needs direct Neo4j access ({e})")]
+
     elif name == "cortex_export_data":
         format = arguments.get("format", "json")
         filter = arguments.get("filter", "")
 
+        try:
+            export = await cortex_server.export_data(format, filter)
+            return [TextContent(type="text", text=json.dumps(export, indent=2))]
+        except GraphUnavailable:
+            pass
+        except ValueError as e:
+            return [TextContent(type="text", text=f"Error: {e}")]
+
         result = await cortex_server.run_cortex_command(
             "data-export", ["--format", format, "--filter", filter]
         )
@@ -734,6 +1071,11 @@ async def main():
     except Exception as e:
         print(f"MCP Server error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        cortex_server.dispatcher.shutdown()
+        cortex_server.execution.shutdown()
+        if GRAPH_AVAILABLE:
+            await close_async_drivers()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Execution layer for MCP tool calls and resource renders.
+
+Every request is assigned a priority class (``TOOL_CLASSES``): interactive
+reads, writes, and heavy exports/imports/backups. Each class has its own
+concurrency limit, so a running export never holds up ``cortex_status``,
+and its own queue limit: a request arriving while ``max_queue`` requests
+of its class are already waiting is rejected at once (``ServerBusy``)
+instead of piling up.
+
+Each call runs under the timeout of its class. A timed out call raises
+``RequestTimeout`` to its handler; the server keeps running. If the client
+abandons a request, the MCP session cancels the handler task and the
+cancellation propagates into the queued or running call, which releases
+its slot. CLI subprocesses are killed with it; in-process CLI commands
+cannot be interrupted and finish in the background (see command_dispatcher).
+
+Blocking work of a call runs on the thread pool of its class, sized to the
+class concurrency. An abandoned or timed out command keeps only a thread
+of its own class busy, so exports and imports that run over cannot starve
+interactive reads of threads.
+
+The timeout and the thread pool of the current call are visible to nested
+code through ``call_timeout()`` and ``call_executor()``, so CLI commands
+started by a heavy tool get the heavy timeout instead of the default 30
+seconds and run on the heavy pool.
+
+Queue wait and execution time are recorded per tool and reported by
+``metrics()`` (shown in ``cortex://config``).
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import time
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class PriorityClass:
+    name: str
+    max_concurrency: int
+    max_queue: int
+    timeout: float
+
+
+DEFAULT_CLASSES = {
+    "interactive": PriorityClass("interactive", max_concurrency=8, max_queue=64, timeout=30.0),
+    "write": PriorityClass("write", max_concurrency=4, max_queue=32, timeout=60.0),
+    "heavy": PriorityClass("heavy", max_concurrency=1, max_queue=4, timeout=600.0),
+}
+
+# Tools not listed here (and all resource reads) are interactive
+TOOL_CLASSES = {
+    "cortex_add_knowledge": "write",
+    "cortex_create_template": "write",
+    "cortex_link_knowledge": "write",
+    "cortex_batch": "write",
+    "cortex_run_command": "write",
+    "cortex_export_data": "heavy",
+    "cortex_import_data": "heavy",
+    "cortex_backup_system": "heavy",
+    "cortex_validate_links": "heavy",
+}
+
+_call_timeout: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "cortex_call_timeout", default=None
+)
+
+
+_call_executor: contextvars.ContextVar[Optional[Executor]] = contextvars.ContextVar(
+    "cortex_call_executor", default=None
+)
+
+
+def call_timeout(default: float) -> float:
+    """Seconds left for the current call, or default outside of one"""
+    deadline = _call_timeout.get()
+    if deadline is None:
+        return default
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def call_executor() -> Optional[Executor]:
+    """Thread pool of the current call's class, or None outside of one"""
+    return _call_executor.get()
+
+
+def classes_from_env(classes: Dict[str, PriorityClass] = DEFAULT_CLASSES) -> Dict[str, PriorityClass]:
+    """Apply CORTEX_MCP_<CLASS>_CONCURRENCY / _QUEUE / _TIMEOUT overrides"""
+    result = {}
+    for name, cls in classes.items():
+        values = {"max_concurrency": cls.max_concurrency, "max_queue": cls.max_queue,
+                  "timeout": cls.timeout}
+        for field, suffix, cast in (("max_concurrency", "CONCURRENCY", int),
+                                    ("max_queue", "QUEUE", int),
+                                    ("timeout", "TIMEOUT", float)):
+            variable = f"CORTEX_MCP_{name.upper()}_{suffix}"
+            value = os.environ.get(variable)
+            if value:
+                try:
+                    values[field] = max(cast(value), cast(1) if field == "max_concurrency" else cast(0))
+                except ValueError:
+                    logger.warning("Invalid %s=%r", variable, value)
+        result[name] = PriorityClass(name, **values)
+    return result
+
+
+class ServerBusy(Exception):
+    """The request's class already has max_queue requests waiting"""
+
+
+class RequestTimeout(Exception):
+    """The call did not finish within its class timeout"""
+
+
+@dataclass
+class ToolStats:
+    priority: str
+    calls: int = 0
+    completed: int = 0
+    failed: int = 0
+    timeouts: int = 0
+    cancelled: int = 0
+    rejected: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    exec_seconds: float = 0.0
+    max_exec_seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        started = self.completed + self.failed + self.timeouts + self.cancelled
+        return {
+            "priority": self.priority,
+            "calls": self.calls,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(1000 * self.wait_seconds / self.calls, 2) if self.calls else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait_seconds, 2),
+            "avg_exec_ms": round(1000 * self.exec_seconds / started, 2) if started else 0.0,
+            "max_exec_ms": round(1000 * self.max_exec_seconds, 2),
+        }
+
+
+class _ClassState:
+    """Slots and queue depth of one priority class in one event loop"""
+
+    def __init__(self, cls: PriorityClass):
+        self.cls = cls
+        self.slots = asyncio.Semaphore(cls.max_concurrency)
+        self.waiting = 0
+        self.running = 0
+
+
+class ExecutionLayer:
+    """Per-class concurrency limits, backpressure, timeouts and metrics"""
+
+    def __init__(self, classes: Optional[Dict[str, PriorityClass]] = None,
+                 tool_classes: Optional[Dict[str, str]] = None):
+        self.classes = classes_from_env() if classes is None else dict(classes)
+        self.tool_classes = dict(TOOL_CLASSES if tool_classes is None else tool_classes)
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _ClassState]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._stats: Dict[str, ToolStats] = {}
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+
+    def priority_of(self, name: str) -> str:
+        priority = self.tool_classes.get(name, "interactive")
+        return priority if priority in self.classes else "interactive"
+
+    def _state(self, priority: str) -> _ClassState:
+        # Semaphores belong to an event loop
+        states = self._states.setdefault(asyncio.get_running_loop(), {})
+        state = states.get(priority)
+        if state is None:
+            state = states[priority] = _ClassState(self.classes[priority])
+        return state
+
+    def executor(self, priority: str) -> ThreadPoolExecutor:
+        """Thread pool of a class with one thread per concurrency slot"""
+        executor = self._executors.get(priority)
+        if executor is None:
+            executor = self._executors[priority] = ThreadPoolExecutor(
+                max_workers=self.classes[priority].max_concurrency,
+                thread_name_prefix=f"cortex-{priority}",
+            )
+        return executor
+
+    async def run(self, name: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Run ``call()`` in the class of ``name``
+
+        Raises ServerBusy when the class queue is full and RequestTimeout
+        when the class timeout expires; CancelledError propagates.
+        """
+        priority = self.priority_of(name)
+        state = self._state(priority)
+        stats = self._stats.setdefault(name, ToolStats(priority))
+        stats.calls += 1
+
+        if state.slots.locked() and state.waiting >= state.cls.max_queue:
+            stats.rejected += 1
+            raise ServerBusy(
+                f"{priority} queue full ({state.waiting} waiting, {state.running} running), retry later"
+            )
+
+        queued = time.monotonic()
+        state.waiting += 1
+        try:
+            await state.slots.acquire()
+        except asyncio.CancelledError:
+            stats.cancelled += 1
+            raise
+        finally:
+            state.waiting -= 1
+            waited = time.monotonic() - queued
+            stats.wait_seconds += waited
+            stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+
+        started = time.monotonic()
+        state.running += 1
+        token = _call_timeout.set(started + state.cls.timeout)
+        executor_token = _call_executor.set(self.executor(priority))
+        try:
+            result = await asyncio.wait_for(call(), state.cls.timeout)
+            stats.completed += 1
+            return result
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise RequestTimeout(f"{name} timed out after {state.cls.timeout:g} seconds") from None
+        except asyncio.CancelledError:
+            stats.cancelled += 1
+            raise
+        except Exception:
+            stats.failed += 1
+            raise
+        finally:
+            _call_executor.reset(executor_token)
+            _call_timeout.reset(token)
+            state.running -= 1
+            state.slots.release()
+            elapsed = time.monotonic() - started
+            stats.exec_seconds += elapsed
+            stats.max_exec_seconds = max(stats.max_exec_seconds, elapsed)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Class limits with current load, and per-tool wait/exec statistics"""
+        load: Dict[str, Dict[str, int]] = {}
+        for states in list(self._states.values()):
+            for priority, state in states.items():
+                current = load.setdefault(priority, {"waiting": 0, "running": 0})
+                current["waiting"] += state.waiting
+                current["running"] += state.running
+        return {
+            "classes": {
+                name: {
+                    "max_concurrency": cls.max_concurrency,
+                    "max_queue": cls.max_queue,
+                    "timeout_seconds": cls.timeout,
+                    **load.get(name, {"waiting": 0, "running": 0}),
+                }
+                for name, cls in self.classes.items()
+            },
+            "tools": {name: stats.as_dict() for name, stats in sorted(self._stats.items())},
+        }
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
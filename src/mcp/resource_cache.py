@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+TTL cache with invalidation for MCP resources.
+
+Claude Desktop polls the status, knowledge-graph, templates and links
+resources repeatedly. Each rendered resource is kept for a per-resource TTL
+together with an ETag (a hash of its text); write tools evict the keys they
+affect (see ``WRITE_INVALIDATIONS``), so a read after a write never sees the
+old text.
+
+Concurrent reads of an expired key share one computation. A computation
+that started before an invalidation of its key is returned to the callers
+that were already waiting but not cached, and later reads start anew. Failed renders (CLI errors) are never cached.
+
+Every successful read returns the ETag with the text, and clients
+revalidate with ``cortex://links?etag=<etag>``: if the cached text still
+has that ETag, a short not-modified marker is returned instead of the
+resource. The current ETags and the hit/miss counters are listed in
+``cortex://config``.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds a rendered resource stays valid without an invalidation
+DEFAULT_TTLS = {
+    "cortex://status": 10.0,
+    "cortex://knowledge-graph": 30.0,
+    "cortex://templates": 300.0,
+    "cortex://links": 60.0,
+}
+
+ALL_RESOURCES = tuple(DEFAULT_TTLS)
+
+# Resource keys evicted after a tool call; None means all of them
+WRITE_INVALIDATIONS: Dict[str, Optional[Tuple[str, ...]]] = {
+    "cortex_run_command": None,
+    "cortex_add_knowledge": ("cortex://status", "cortex://knowledge-graph"),
+    "cortex_create_template": ("cortex://templates", "cortex://knowledge-graph"),
+    "cortex_link_knowledge": ("cortex://links", "cortex://knowledge-graph"),
+    "cortex_batch": ("cortex://status", "cortex://knowledge-graph", "cortex://links"),
+    "cortex_import_data": None,
+    "cortex_validate_links": ("cortex://links", "cortex://knowledge-graph"),
+}
+
+
+def compute_etag(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def default_ttls() -> Dict[str, float]:
+    """DEFAULT_TTLS, or one TTL for all resources from CORTEX_MCP_CACHE_TTL (0 disables)"""
+    value = os.environ.get("CORTEX_MCP_CACHE_TTL")
+    if not value:
+        return dict(DEFAULT_TTLS)
+    try:
+        return {key: max(float(value), 0.0) for key in DEFAULT_TTLS}
+    except ValueError:
+        logger.warning("Invalid CORTEX_MCP_CACHE_TTL=%r", value)
+        return dict(DEFAULT_TTLS)
+
+
+@dataclass
+class CacheEntry:
+    text: str
+    etag: str
+    stored_at: float
+    expires_at: float
+
+
+@dataclass
+class KeyStats:
+    hits: int = 0
+    misses: int = 0
+    not_modified: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses,
+                "not_modified": self.not_modified, "invalidations": self.invalidations}
+
+
+class ResourceCache:
+    """Rendered resource texts with TTL, ETag and write invalidation"""
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttls = default_ttls() if ttls is None else dict(ttls)
+        self.clock = clock
+        self._entries: Dict[str, CacheEntry] = {}
+        self._generations: Dict[str, int] = {}
+        self._pending: Dict[str, "asyncio.Future[Tuple[str, bool]]"] = {}
+        self._stats: Dict[str, KeyStats] = {}
+
+    def caches(self, key: str) -> bool:
+        return self.ttls.get(key, 0) > 0
+
+    def _key_stats(self, key: str) -> KeyStats:
+        return self._stats.setdefault(key, KeyStats())
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """The entry for key if it has not expired"""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= self.clock():
+            del self._entries[key]
+            entry = None
+        return entry
+
+    async def get(self, key: str,
+                  render: Callable[[], Awaitable[Tuple[str, bool]]]) -> Tuple[str, Optional[str]]:
+        """(text, etag) of key, rendered on a miss
+
+        ``render`` returns (text, ok); only ok texts are cached and get an
+        ETag, a failed render returns (text, None).
+        """
+        entry = self.lookup(key)
+        stats = self._key_stats(key)
+        if entry is not None:
+            stats.hits += 1
+            return entry.text, entry.etag
+
+        stats.misses += 1
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._render(key, render))
+            self._pending[key] = pending
+            pending.add_done_callback(
+                lambda done: self._pending.pop(key) if self._pending.get(key) is done else None
+            )
+        text, ok = await asyncio.shield(pending)
+        return text, compute_etag(text) if ok else None
+
+    async def _render(self, key: str, render) -> Tuple[str, bool]:
+        generation = self._generations.get(key, 0)
+        text, ok = await render()
+        if ok and self.caches(key) and self._generations.get(key, 0) == generation:
+            now = self.clock()
+            self._entries[key] = CacheEntry(text, compute_etag(text), now, now + self.ttls[key])
+        return text, ok
+
+    def not_modified(self, key: str, etag: Optional[str]) -> bool:
+        """Whether etag matches the cached text of key (counted as revalidation)"""
+        entry = self.lookup(key)
+        if etag and entry is not None and entry.etag == etag:
+            self._key_stats(key).not_modified += 1
+            return True
+        return False
+
+    def invalidate(self, keys: Optional[Iterable[str]] = None) -> int:
+        """Evict keys (all if None); returns the number of evicted entries"""
+        evicted = 0
+        for key in (ALL_RESOURCES if keys is None else keys):
+            self._generations[key] = self._generations.get(key, 0) + 1
+            # Reads after the write start a new render instead of joining this one
+            self._pending.pop(key, None)
+            self._key_stats(key).invalidations += 1
+            if self._entries.pop(key, None) is not None:
+                evicted += 1
+        return evicted
+
+    def invalidate_for_tool(self, tool_name: str) -> int:
+        """Evict what a write tool may have changed; read-only tools evict nothing"""
+        if tool_name not in WRITE_INVALIDATIONS:
+            return 0
+        return self.invalidate(WRITE_INVALIDATIONS[tool_name])
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters overall and per resource, plus the live entries with ETag and age"""
+        totals = KeyStats()
+        for stats in self._stats.values():
+            totals.hits += stats.hits
+            totals.misses += stats.misses
+            totals.not_modified += stats.not_modified
+            totals.invalidations += stats.invalidations
+        lookups = totals.hits + totals.misses
+        now = self.clock()
+        return {
+            **totals.as_dict(),
+            "hit_rate": round(totals.hits / lookups, 3) if lookups else 0.0,
+            "ttl_seconds": self.ttls,
+            "resources": {key: stats.as_dict() for key, stats in sorted(self._stats.items())},
+            "entries": {
+                key: {"etag": entry.etag, "age_seconds": round(now - entry.stored_at, 1)}
+                for key, entry in sorted(self._entries.items())
+                if entry.expires_at > now
+            },
+        }
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Cursor pagination and streamed exports for the MCP server.
+
+Search results and the link list are returned a page at a time: a page
+carries ``next_cursor`` (None on the last page), which the client passes
+back as ``cursor``. Cursors are opaque, URL-safe keyset positions (the last
+(source, target) for links, the last (score, name) for search). The first
+page and the following pages of links and exports use separate queries:
+a following page starts with a plain range on ``Note.name``, which the
+planner serves from the name index, so it does not re-read the rows before
+the cursor. Search pages filter the full-text hits by (score, name).
+
+Exports are written to a file page by page and the tool returns a handle
+instead of the data. The file is read back in byte chunks through the
+``cortex://exports/<handle>`` resource, again with ``cursor``/``limit``;
+memory stays flat regardless of graph size. Files live in
+``cortex_neo/.cache/exports`` (override with CORTEX_MCP_EXPORT_DIR).
+"""
+
+import base64
+import csv
+import json
+import os
+import re
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+EXPORT_DIR = Path(os.environ.get("CORTEX_MCP_EXPORT_DIR", PROJECT_ROOT / "cortex_neo" / ".cache" / "exports"))
+EXPORT_FORMATS = {"json": ".jsonl", "yaml": ".yaml", "csv": ".csv"}
+CSV_COLUMNS = ["kind", "name", "type", "description", "tags", "source", "target", "relationship"]
+
+DEFAULT_LINK_PAGE = 500
+MAX_PAGE = 5000
+DEFAULT_CHUNK_BYTES = 64 * 1024
+MAX_CHUNK_BYTES = 1024 * 1024
+EXPORT_PAGE_SIZE = 1000
+
+_HANDLE = re.compile(r'^cortex-export-[0-9]{8}-[0-9]{6}-[0-9a-f]{8}\.(jsonl|yaml|csv)$')
+
+
+class InvalidCursor(ValueError):
+    """Raised for cursors that were not produced by this module"""
+
+
+def encode_cursor(*position: Any) -> str:
+    payload = json.dumps(list(position), separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(position, list) or len(position) != size:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+    return position
+
+
+def page_limit(limit: Any, default: int, maximum: int = MAX_PAGE) -> int:
+    """Clamp a client supplied limit to 1..maximum"""
+    try:
+        return min(max(int(limit), 1), maximum)
+    except (TypeError, ValueError):
+        return default
+
+
+_LINK_PAGE_RETURN = """
+RETURN a.name AS source, b.name AS target, r.relationship AS relationship
+ORDER BY source, target
+LIMIT $limit
+"""
+
+LINK_FIRST_PAGE_QUERY = """
+MATCH (a:Note)-[r:LINKS_TO]->(b:Note)""" + _LINK_PAGE_RETURN
+
+# a.name >= $after_source seeks the index; the second WHERE drops the
+# links of the cursor's source up to and including its target
+LINK_NEXT_PAGE_QUERY = """
+MATCH (a:Note) WHERE a.name >= $after_source
+MATCH (a)-[r:LINKS_TO]->(b:Note)
+WHERE a.name > $after_source OR b.name > $after_target""" + _LINK_PAGE_RETURN
+
+_EXPORT_NOTES_RETURN = """
+WITH n ORDER BY n.name LIMIT $limit
+OPTIONAL MATCH (n)-[:TAGGED_WITH]->(t:Tag)
+RETURN n.name AS name, n.type AS type, n.description AS description, collect(t.name) AS tags
+ORDER BY name
+"""
+
+EXPORT_NOTES_FIRST_PAGE_QUERY = """
+MATCH (n:Note)
+WHERE $category = '' OR n.type = $category""" + _EXPORT_NOTES_RETURN
+
+EXPORT_NOTES_NEXT_PAGE_QUERY = """
+MATCH (n:Note)
+WHERE n.name > $after AND ($category = '' OR n.type = $category)""" + _EXPORT_NOTES_RETURN
+
+
+def link_page_query(cursor: Optional[str], limit: int) -> Tuple[str, Dict[str, Any]]:
+    """Query and parameters of the link page after cursor (None: first page)"""
+    # One extra row tells whether there is a next page
+    if not cursor:
+        return LINK_FIRST_PAGE_QUERY, {"limit": limit + 1}
+    after_source, after_target = decode_cursor(cursor, 2)
+    return LINK_NEXT_PAGE_QUERY, {"after_source": after_source, "after_target": after_target,
+                                  "limit": limit + 1}
+
+
+def link_page(rows: List[Dict[str, Any]], limit: int) -> Dict[str, Any]:
+    """Trim a limit+1 row list to a page and derive the next cursor"""
+    links = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit and links:
+        next_cursor = encode_cursor(links[-1]["source"], links[-1]["target"])
+    return {"links": links, "next_cursor": next_cursor}
+
+
+class ExportWriter:
+    """Writes export records to a file as they arrive"""
+
+    def __init__(self, file_format: str = "json", directory: Optional[Path] = None):
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {file_format} (expected one of {tuple(EXPORT_FORMATS)})")
+        self.format = file_format
+        self.directory = Path(directory or EXPORT_DIR)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.handle = f"cortex-export-{stamp}-{uuid.uuid4().hex[:8]}{EXPORT_FORMATS[file_format]}"
+        self.path = self.directory / self.handle
+        self.rows = 0
+        self._file = None
+        self._csv = None
+
+    def __enter__(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._file = open(f"{self.path}.tmp", "w", encoding="utf-8", newline="")
+        if self.format == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+            self._csv.writeheader()
+        return self
+
+    def write(self, records: List[Dict[str, Any]]):
+        """Append one page of records"""
+        if self.format == "json":
+            self._file.writelines(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in records)
+        elif self.format == "csv":
+            self._csv.writerows({**r, "tags": ";".join(r.get("tags") or [])} for r in records)
+        else:
+            import yaml
+            self._file.write(yaml.safe_dump(records, allow_unicode=True, sort_keys=False) if records else "")
+        self.rows += len(records)
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is None:
+            os.replace(f"{self.path}.tmp", self.path)
+        else:
+            os.remove(f"{self.path}.tmp")
+        return False
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "handle": self.handle,
+            "uri": f"cortex://exports/{self.handle}",
+            "path": str(self.path),
+            "format": self.format,
+            "rows": self.rows,
+            "bytes": self.path.stat().st_size if self.path.exists() else 0,
+        }
+
+
+async def export_records(graph_read, category: str = "",
+                         page_size: int = EXPORT_PAGE_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Pages of note records, then pages of link records, read by keyset"""
+    after = None
+    while True:
+        if after is None:
+            rows = await graph_read(EXPORT_NOTES_FIRST_PAGE_QUERY, category=category or "", limit=page_size)
+        else:
+            rows = await graph_read(EXPORT_NOTES_NEXT_PAGE_QUERY, after=after,
+                                    category=category or "", limit=page_size)
+        if rows:
+            yield [{"kind": "note", **row} for row in rows]
+        if len(rows) < page_size:
+            break
+        after = rows[-1]["name"]
+
+    cursor = None
+    while True:
+        query, params = link_page_query(cursor, page_size)
+        rows = await graph_read(query, **params)
+        page = link_page(rows, page_size)
+        if page["links"]:
+            yield [{"kind": "link", **link} for link in page["links"]]
+        if page["next_cursor"] is None:
+            break
+        cursor = page["next_cursor"]
+
+
+def export_path(handle: str, directory: Optional[Path] = None) -> Path:
+    """File of an export handle; raises FileNotFoundError for unknown handles"""
+    path = Path(directory or EXPORT_DIR) / handle
+    if not _HANDLE.match(handle) or not path.is_file():
+        raise FileNotFoundError(f"Unknown export: {handle}")
+    return path
+
+
+def read_export_chunk(handle: str, cursor: Optional[str] = None, limit: Any = None,
+                      directory: Optional[Path] = None) -> Dict[str, Any]:
+    """Up to ``limit`` bytes of an export, ending at a line boundary if possible"""
+    path = export_path(handle, directory)
+    offset = int(decode_cursor(cursor, 1)[0]) if cursor else 0
+    size = page_limit(limit, DEFAULT_CHUNK_BYTES, MAX_CHUNK_BYTES)
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(size)
+        at_end = not f.read(1)
+    if not at_end:
+        newline = data.rfind(b"\n")
+        if newline >= 0:
+            data = data[:newline + 1]
+    # Never split a UTF-8 sequence: drop an incomplete tail, the next chunk starts there
+    text = data.decode("utf-8", errors="ignore") if at_end else _complete_utf8(data)
+    return {
+        "handle": handle,
+        "offset": offset,
+        "data": text,
+        "next_cursor": None if at_end else encode_cursor(offset + len(text.encode("utf-8"))),
+    }
+
+
+def _complete_utf8(data: bytes) -> str:
+    for cut in range(0, 4):
+        try:
+            return data[:len(data) - cut].decode("utf-8")
+        except UnicodeDecodeError:
+            continue
+    return data.decode("utf-8", errors="ignore")
@@ -19,6 +19,20 @@ from markdown.md_manager import (
 )
 from governance.data_governance import DataGovernanceEngine, ValidationResult
 
+# Shared Markdown parse cache from the cortex-cli package (optional)
+try:
+    from cortex.utils.parse_cache import get_parse_cache
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[2] / "cortex-cli"))
+    try:
+        from cortex.utils.parse_cache import get_parse_cache
+    except ImportError:
+        get_parse_cache = None
+
+# Key of the cached per-file analysis; bump the version whenever
+# _analyze_markdown_content changes, so stale analyses are recomputed
+ANALYSIS_CACHE_KEY = "md_system.analysis:v1"
+
 
 @dataclass
 class IntegratedValidationResult:
@@ -221,42 +235,50 @@ class CortexMarkdownIntegration:
         md_files = list(self.workspace_root.rglob("*.md"))
         analysis["total_files"] = len(md_files)
 
+        parse_cache = get_parse_cache(self.workspace_root) if get_parse_cache else None
+
         for md_file in md_files:
             try:
-                content = md_file.read_text(encoding='utf-8')
+                if parse_cache is not None:
+                    file_analysis = parse_cache.derive(
+                        md_file, ANALYSIS_CACHE_KEY, self._analyze_markdown_content
+                    )
+                    if file_analysis is None:
+                        continue
+                else:
+                    file_analysis = self._analyze_markdown_content(
+                        md_file.read_text(encoding='utf-8')
+                    )
 
-                # Analyze structure
-                structure = self.md_manager.analyze_markdown_structure(content)
-                analysis["structure_scores"].append(
-                    self.md_manager.validate_markdown(content).structure_score
-                )
+                analysis["structure_scores"].append(file_analysis["structure_score"])
 
                 # Content type analysis
-                if structure.frontmatter and structure.frontmatter.category:
-                    category = structure.frontmatter.category
+                category = file_analysis["category"]
+                if category:
                     analysis["by_content_type"][category] = analysis["by_content_type"].get(category, 0) + 1
 
                 # Tag analysis
-                if structure.frontmatter and structure.frontmatter.tags:
-                    for tag in structure.frontmatter.tags:
-                        analysis["tag_analysis"]["most_common"][tag] = (
-                            analysis["tag_analysis"]["most_common"].get(tag, 0) + 1
-                        )
+                for tag in file_analysis["tags"]:
+                    analysis["tag_analysis"]["most_common"][tag] = (
+                        analysis["tag_analysis"]["most_common"].get(tag, 0) + 1
+                    )
 
                 # Validation
-                validation = self.md_manager.validate_markdown(content)
-                if validation.is_valid:
+                if file_analysis["is_valid"]:
                     analysis["validation_summary"]["passed"] += 1
                 else:
                     analysis["validation_summary"]["failed"] += 1
 
-                if validation.warnings:
+                if file_analysis["has_warnings"]:
                     analysis["validation_summary"]["warnings"] += 1
 
             except Exception as e:
                 # Skip files that can't be read
                 continue
 
+        if parse_cache is not None:
+            parse_cache.save()
+
         # Calculate average structure score
         if analysis["structure_scores"]:
             analysis["average_structure_score"] = sum(analysis["structure_scores"]) / len(analysis["structure_scores"])
@@ -265,6 +287,23 @@ class CortexMarkdownIntegration:
 
         return analysis
 
+    def _analyze_markdown_content(self, content: str) -> Dict[str, any]:
+        """Structure and validation facts for one file (cacheable, JSON-safe)
+
+        Cached under ANALYSIS_CACHE_KEY; bump its version when this changes.
+        """
+        structure = self.md_manager.analyze_markdown_structure(content)
+        validation = self.md_manager.validate_markdown(content)
+        frontmatter = structure.frontmatter
+
+        return {
+            "structure_score": validation.structure_score,
+            "category": frontmatter.category if frontmatter else None,
+            "tags": list(frontmatter.tags or []) if frontmatter else [],
+            "is_valid": validation.is_valid,
+            "has_warnings": bool(validation.warnings)
+        }
+
     def generate_workspace_report(self) -> str:
         """Generate a comprehensive markdown workspace report"""
         analysis = self.analyze_workspace_markdown()
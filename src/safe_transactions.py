@@ -6,93 +6,322 @@ Zweck: Sichere Neo4j-Transaktionen mit automatischen Backups
 """
 
 import os
+import gzip
 import json
+import time
 import logging
-from datetime import datetime
-from typing import Dict, Any, List, Callable
+from dataclasses import dataclass
+from datetime import date, datetime
+from datetime import time as dt_time
+from typing import Dict, Any, Iterator, List, Callable, Optional
 from functools import wraps
 import yaml
 
 logger = logging.getLogger(__name__)
 
+BACKUP_FORMAT = "cortex-graph-backup"
+BACKUP_VERSION = 2  # 2: Temporalwerte typisiert ({"$datetime": iso} usw.)
+BACKUP_NODE_TYPES = ['Note', 'Workflow', 'Step', 'Tag', 'Template']
+BACKUP_STATE_FILE = "backup_state.json"
+
+
+@dataclass
+class BackupPolicy:
+    """
+    Wann vor einer Transaktion ein Backup erstellt wird
+
+    mode: 'always' (vor jeder Operation), 'every_n' (vor jeder n-ten
+    Operation) oder 'interval' (höchstens alle interval_seconds).
+    Jedes full_every-te Backup ist ein Vollbackup, die übrigen sind
+    inkrementell (0 = immer Vollbackups).
+    """
+    mode: str = 'always'
+    every_n: int = 10
+    interval_seconds: float = 300.0
+    full_every: int = 20
+
+    MODES = ('always', 'every_n', 'interval')
+
+    def __post_init__(self):
+        if self.mode not in self.MODES:
+            raise ValueError(f"Unknown backup policy mode: {self.mode} (expected one of {self.MODES})")
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'BackupPolicy':
+        """Policy aus dem Abschnitt safety.backup_policy der safety_config.yaml"""
+        policy = (config or {}).get('safety', {}).get('backup_policy') or {}
+        return cls(**{k: v for k, v in policy.items() if k in cls.__dataclass_fields__})
+
+    def is_due(self, ops_since_backup: int, seconds_since_backup: Optional[float]) -> bool:
+        """Ob vor der nächsten Operation ein Backup fällig ist"""
+        if seconds_since_backup is None or self.mode == 'always':
+            return True
+        if self.mode == 'every_n':
+            return ops_since_backup + 1 >= max(self.every_n, 1)
+        return seconds_since_backup >= self.interval_seconds
+
+
+def load_backup_policy(config_path: str = "cortex_neo/safety_config.yaml") -> BackupPolicy:
+    """Liest die Backup-Policy; Standard-Policy wenn keine Konfiguration existiert"""
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return BackupPolicy.from_config(yaml.safe_load(f) or {})
+    except FileNotFoundError:
+        return BackupPolicy()
+
+
+def _typed_value(value: Any) -> Any:
+    """
+    Property-Wert für das Backup
+
+    Neo4j-Temporalwerte werden typisiert geschrieben ({"$datetime": iso},
+    {"$date": ...}, {"$time": ...}, {"$duration": ...}), damit ein Restore
+    sie wieder als Temporalwerte statt als Strings anlegt.
+    """
+    try:
+        from neo4j.time import Date, DateTime, Duration, Time
+    except ImportError:
+        Date = DateTime = Duration = Time = ()
+    # Duration ist ein Tupel und muss vor der Listen-Behandlung geprüft werden
+    if isinstance(value, DateTime):
+        return {'$datetime': value.iso_format()}
+    if isinstance(value, Date):
+        return {'$date': value.iso_format()}
+    if isinstance(value, Time):
+        return {'$time': value.iso_format()}
+    if isinstance(value, Duration):
+        return {'$duration': value.iso_format()}
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, date):
+        return {'$date': value.isoformat()}
+    if isinstance(value, dt_time):
+        return {'$time': value.isoformat()}
+    if isinstance(value, (list, tuple)):
+        return [_typed_value(v) for v in value]
+    return value
+
+
+def _backup_line(record: Dict[str, Any]) -> str:
+    record = {**record, 'properties': {k: _typed_value(v) for k, v in record['properties'].items()}}
+    return json.dumps(record, default=str, ensure_ascii=False) + "\n"
+
+
+def _temporal_parsers() -> Dict[str, Callable[[str], Any]]:
+    try:
+        from neo4j.time import Date, DateTime, Duration, Time
+    except ImportError:
+        # Ohne Treiber Python-Typen (Nanosekunden werden abgeschnitten)
+        return {'$datetime': datetime.fromisoformat, '$date': date.fromisoformat,
+                '$time': dt_time.fromisoformat}
+    return {'$datetime': DateTime.from_iso_format, '$date': Date.from_iso_format,
+            '$time': Time.from_iso_format, '$duration': Duration.from_iso_format}
+
+
+def iter_backup(backup_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Liest ein Backup zeilenweise (Header, dann Node- und Relationship-Records)
+
+    Typisierte Temporalwerte werden wieder in Neo4j-Temporalwerte umgewandelt;
+    Backups der Version 1 enthalten sie noch als Strings.
+    """
+    parsers = _temporal_parsers()
+
+    def decode(obj: Dict[str, Any]) -> Any:
+        if len(obj) == 1:
+            tag, value = next(iter(obj.items()))
+            if tag in parsers and isinstance(value, str):
+                return parsers[tag](value)
+        return obj
+
+    with gzip.open(backup_path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line, object_hook=decode)
+
+
 class SafeTransactionManager:
     """
     Manager für sichere Neo4j-Transaktionen mit automatischen Backups
+
+    Backups werden Record für Record als gzip-komprimiertes JSONL
+    geschrieben (erste Zeile: Header, dann ein Node bzw. eine Relationship
+    pro Zeile), ohne den Graphen im Speicher zu sammeln. Inkrementelle
+    Backups enthalten nur Nodes und Relationships, deren updated_at
+    (Epoch-ms, wie von timestamp() gesetzt) oder created_at seit dem
+    letzten Backup liegt; Löschungen und Änderungen ohne Zeitstempel
+    erfasst das nächste Vollbackup.
+
+    Ohne policy gilt safety.backup_policy aus der safety_config.yaml.
     """
 
-    def __init__(self, driver, backup_dir: str = "cortex_neo/backups/auto"):
+    def __init__(self, driver, backup_dir: str = "cortex_neo/backups/auto",
+                 policy: Optional[BackupPolicy] = None):
         self.driver = driver
         self.backup_dir = backup_dir
+        self.policy = policy if policy is not None else load_backup_policy()
         self.ensure_backup_dir()
+        self.state_file = os.path.join(self.backup_dir, BACKUP_STATE_FILE)
+        self.state = self._load_state()
 
     def ensure_backup_dir(self):
         """Stelle sicher, dass das Backup-Verzeichnis existiert"""
         os.makedirs(self.backup_dir, exist_ok=True)
 
-    def _create_backup(self, operation_name: str = None) -> str:
-        """Erstellt ein Backup vor der Operation"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_filename = f"backup_{operation_name}_{timestamp}.yaml" if operation_name else f"backup_{timestamp}.yaml"
-        backup_path = os.path.join(self.backup_dir, backup_filename)
+    def _load_state(self) -> Dict[str, Any]:
+        state = {'last_backup_ms': None, 'last_backup_path': "", 'backups_since_full': None,
+                 'ops_since_backup': 0}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        return state
+
+    def _save_state(self):
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_file, self.state_file)
+
+    def _create_backup(self, operation_name: str = None, incremental: Optional[bool] = None) -> str:
+        """
+        Erstellt ein Backup vor der Operation
+
+        incremental=None entscheidet nach Policy (full_every) und danach,
+        ob bereits ein Vollbackup existiert.
+        """
+        since_ms = self.state.get('last_backup_ms')
+        if incremental is None:
+            backups_since_full = self.state.get('backups_since_full')
+            incremental = (
+                since_ms is not None and backups_since_full is not None
+                and self.policy.full_every > 0
+                and backups_since_full + 1 < self.policy.full_every
+            )
+        if since_ms is None:
+            incremental = False
+
+        started_ms = int(time.time() * 1000)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        kind = 'incr' if incremental else 'full'
+        name = f"{operation_name}_" if operation_name else ""
+        backup_path = os.path.join(self.backup_dir, f"backup_{name}{kind}_{timestamp}.jsonl.gz")
+        tmp_path = f"{backup_path}.tmp"
 
         try:
-            with self.driver.session() as session:
-                # Sichere alle Daten
-                backup_data = {
+            counts = {'nodes': 0, 'relationships': 0}
+            with self.driver.session() as session, \
+                    gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    'format': BACKUP_FORMAT,
+                    'version': BACKUP_VERSION,
+                    'kind': 'incremental' if incremental else 'full',
+                    'since_ms': since_ms if incremental else None,
                     'timestamp': timestamp,
                     'operation': operation_name,
-                    'nodes': {},
-                    'relationships': []
-                }
+                }) + "\n")
+
+                for record in self._stream_nodes(session, since_ms if incremental else None):
+                    f.write(_backup_line(record))
+                    counts['nodes'] += 1
+                for record in self._stream_relationships(session, since_ms if incremental else None):
+                    f.write(_backup_line(record))
+                    counts['relationships'] += 1
+            os.replace(tmp_path, backup_path)
+
+            self.state.update(
+                last_backup_ms=started_ms,
+                last_backup_path=backup_path,
+                backups_since_full=(self.state.get('backups_since_full') or 0) + 1 if incremental else 0,
+                ops_since_backup=0,
+            )
+            self._save_state()
+            logger.info(f"Backup created: {backup_path} ({counts['nodes']} nodes, "
+                        f"{counts['relationships']} relationships)")
+            return backup_path
 
-                # Sichere alle Nodes
-                node_types = ['Note', 'Workflow', 'Step', 'Tag', 'Template']
-                for node_type in node_types:
-                    result = session.run(f"MATCH (n:{node_type}) RETURN n")
-                    backup_data['nodes'][node_type] = []
-                    for record in result:
-                        node = dict(record['n'])
-                        backup_data['nodes'][node_type].append(node)
+        except Exception as e:
+            logger.error(f"Backup creation failed: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return ""
 
-                # Sichere alle Relationships
-                result = session.run("""
-                    MATCH (a)-[r]->(b) 
-                    RETURN type(r) as rel_type, 
-                           labels(a) as source_labels, 
-                           a.name as source_name,
-                           labels(b) as target_labels,
-                           b.name as target_name,
-                           properties(r) as rel_props
-                """)
-
-                for record in result:
-                    backup_data['relationships'].append({
-                        'type': record['rel_type'],
-                        'source_labels': record['source_labels'],
-                        'source_name': record['source_name'],
-                        'target_labels': record['target_labels'],
-                        'target_name': record['target_name'],
-                        'properties': dict(record['rel_props']) if record['rel_props'] else {}
-                    })
-
-                # Schreibe Backup
-                with open(backup_path, 'w', encoding='utf-8') as f:
-                    yaml.safe_dump(backup_data, f, allow_unicode=True, default_flow_style=False)
-
-                logger.info(f"Backup created: {backup_path}")
+    @staticmethod
+    def _changed_since(var: str) -> str:
+        return (f"(coalesce({var}.updated_at, 0) >= $since "
+                f"OR ({var}.created_at IS NOT NULL AND {var}.created_at >= datetime({{epochMillis: $since}})))")
+
+    def _stream_nodes(self, session, since_ms: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """Nodes der gesicherten Labels, Record für Record"""
+        for node_type in BACKUP_NODE_TYPES:
+            if since_ms is None:
+                result = session.run(f"MATCH (n:{node_type}) RETURN properties(n) as props")
+            else:
+                result = session.run(
+                    f"MATCH (n:{node_type}) WHERE {self._changed_since('n')} "
+                    f"RETURN properties(n) as props",
+                    since=since_ms,
+                )
+            for record in result:
+                yield {'t': 'node', 'label': node_type, 'properties': dict(record['props'] or {})}
+
+    def _stream_relationships(self, session, since_ms: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """Relationships (inkrementell: geändert oder an geänderten Nodes)"""
+        query = """
+            MATCH (a)-[r]->(b)
+            {where}
+            RETURN type(r) as rel_type,
+                   labels(a) as source_labels,
+                   a.name as source_name,
+                   labels(b) as target_labels,
+                   b.name as target_name,
+                   properties(r) as rel_props
+        """
+        if since_ms is None:
+            result = session.run(query.format(where=""))
+        else:
+            where = "WHERE " + " OR ".join(self._changed_since(v) for v in ('r', 'a', 'b'))
+            result = session.run(query.format(where=where), since=since_ms)
+        for record in result:
+            yield {
+                't': 'rel',
+                'type': record['rel_type'],
+                'source_labels': record['source_labels'],
+                'source_name': record['source_name'],
+                'target_labels': record['target_labels'],
+                'target_name': record['target_name'],
+                'properties': dict(record['rel_props']) if record['rel_props'] else {}
+            }
+
+    def _backup_if_due(self, operation_name: str) -> str:
+        """
+        Erstellt ein Backup, wenn die Policy es verlangt; sonst das letzte Backup
+
+        Schlägt ein fälliges Backup fehl, ist das Ergebnis "" statt des
+        älteren Snapshots.
+        """
+        last_ms = self.state.get('last_backup_ms')
+        seconds_since = None if last_ms is None else time.time() - last_ms / 1000
+        backup_path = None
+        if self.policy.is_due(self.state.get('ops_since_backup', 0), seconds_since):
+            backup_path = self._create_backup(operation_name)
+            if backup_path:
                 return backup_path
 
-        except Exception as e:
-            logger.error(f"Backup creation failed: {e}")
+        self.state['ops_since_backup'] = self.state.get('ops_since_backup', 0) + 1
+        self._save_state()
+        if backup_path is not None:
             return ""
+        return self.state.get('last_backup_path', "")
 
     def safe_transaction(self, operation_name: str):
         """Decorator für sichere Transaktionen mit automatischem Backup"""
         def decorator(func: Callable):
             @wraps(func)
             def wrapper(*args, **kwargs):
-                # Erstelle Backup vor der Operation
-                backup_path = self._create_backup(operation_name)
+                # Erstelle Backup vor der Operation (gemäß Backup-Policy)
+                backup_path = self._backup_if_due(operation_name)
 
                 try:
                     with self.driver.session() as session:
@@ -104,21 +333,58 @@ class SafeTransactionManager:
 
                 except Exception as e:
                     logger.error(f"Transaction '{operation_name}' failed: {e}")
-                    logger.error(f"Backup available at: {backup_path}")
+                    if backup_path:
+                        logger.error(f"Backup available at: {backup_path}")
+                    else:
+                        logger.error("No backup available for this operation")
                     raise e
 
             return wrapper
         return decorator
 
 
+STATS_NODE_LABELS = {
+    'notes': 'Note', 'workflows': 'Workflow', 'steps': 'Step', 'tags': 'Tag', 'templates': 'Template'
+}
+STATS_REL_TYPES = {
+    'note_links': 'LINKS_TO', 'workflow_links': 'HAS_STEP',
+    'tag_links': 'TAGGED_WITH', 'template_links': 'USES_TEMPLATE'
+}
+
+
+def _count_store_query() -> str:
+    """Alle Zähler in einer Abfrage; jede Zählung kommt aus dem Count Store"""
+    calls = [
+        f"CALL {{ MATCH (n:{label}) RETURN count(n) AS {key} }}"
+        for key, label in STATS_NODE_LABELS.items()
+    ] + [
+        f"CALL {{ MATCH ()-[r:{rel_type}]->() RETURN count(r) AS {key} }}"
+        for key, rel_type in STATS_REL_TYPES.items()
+    ]
+    keys = list(STATS_NODE_LABELS) + list(STATS_REL_TYPES)
+    return "\n".join(calls) + "\nRETURN " + ", ".join(keys)
+
+
 class DataIntegrityValidator:
     """
     Validator für Datenintegrität und Anomalie-Detection
+
+    Statistiken werden in einem Roundtrip gesammelt (apoc.meta.stats falls
+    installiert, sonst eine CALL {}-Abfrage über den Count Store). Die
+    Prüfung auf verwaiste Daten läuft als eine Abfrage und wird
+    orphan_cache_ttl Sekunden zwischengespeichert.
     """
 
-    def __init__(self, driver, baseline_file: str = "monitoring/baseline_stats.json"):
+    def __init__(self, driver, baseline_file: str = "monitoring/baseline_stats.json",
+                 orphan_cache_ttl: float = 300.0, series_file: Optional[str] = None):
         self.driver = driver
         self.baseline_file = baseline_file
+        self.orphan_cache_ttl = orphan_cache_ttl
+        self.series_file = series_file or os.path.join(
+            os.path.dirname(baseline_file), "stats_series.jsonl"
+        )
+        self._apoc_available: Optional[bool] = None
+        self._orphan_cache: Optional[tuple] = None  # (monotonic time, issues)
         self.ensure_baseline_dir()
 
     def ensure_baseline_dir(self):
@@ -127,42 +393,47 @@ class DataIntegrityValidator:
         if baseline_dir:
             os.makedirs(baseline_dir, exist_ok=True)
 
+    def _has_apoc(self, session) -> bool:
+        """Prüft einmalig, ob apoc.meta.stats installiert ist"""
+        if self._apoc_available is None:
+            try:
+                record = session.run("""
+                    SHOW PROCEDURES YIELD name
+                    WHERE name = 'apoc.meta.stats'
+                    RETURN count(*) > 0 AS available
+                """).single()
+                self._apoc_available = bool(record and record['available'] is True)
+            except Exception:
+                self._apoc_available = False
+        return self._apoc_available
+
+    def _collect_counts(self, session) -> Dict[str, int]:
+        if self._has_apoc(session):
+            record = session.run(
+                "CALL apoc.meta.stats() YIELD labels, relTypesCount RETURN labels, relTypesCount"
+            ).single()
+            labels = dict(record['labels'] or {})
+            rel_types = dict(record['relTypesCount'] or {})
+            counts = {key: int(labels.get(label, 0)) for key, label in STATS_NODE_LABELS.items()}
+            counts.update({key: int(rel_types.get(t, 0)) for key, t in STATS_REL_TYPES.items()})
+            return counts
+
+        record = session.run(_count_store_query()).single()
+        return {
+            key: (record.get(key) or 0) if record else 0
+            for key in list(STATS_NODE_LABELS) + list(STATS_REL_TYPES)
+        }
+
     def get_current_stats(self) -> Dict[str, Any]:
-        """Sammelt aktuelle Datenbank-Statistiken"""
+        """Sammelt aktuelle Datenbank-Statistiken in einem Roundtrip"""
         try:
             with self.driver.session() as session:
-                stats = {}
-
-                # Node counts
-                for node_type in ['Note', 'Workflow', 'Step', 'Tag', 'Template']:
-                    result = session.run(f"MATCH (n:{node_type}) RETURN count(n) as count").single()
-                    stats[node_type.lower() + 's'] = result['count'] if result else 0
-
-                # Relationship counts
-                rel_result = session.run("""
-                    MATCH ()-[r:LINKS_TO]->() RETURN count(r) as note_links
-                    UNION ALL
-                    MATCH ()-[r:HAS_STEP]->() RETURN count(r) as workflow_links
-                    UNION ALL
-                    MATCH ()-[r:TAGGED_WITH]->() RETURN count(r) as tag_links
-                    UNION ALL  
-                    MATCH ()-[r:USES_TEMPLATE]->() RETURN count(r) as template_links
-                """)
-
-                stats['note_links'] = 0
-                stats['workflow_links'] = 0
-                stats['tag_links'] = 0
-                stats['template_links'] = 0
-
-                for record in rel_result:
-                    for key, value in record.items():
-                        if key in stats:
-                            stats[key] = value
+                stats: Dict[str, Any] = self._collect_counts(session)
 
                 # Health metrics
                 stats['timestamp'] = datetime.now().isoformat()
-                stats['total_nodes'] = sum(v for k, v in stats.items() if k.endswith('s') and k != 'links')
-                stats['total_relationships'] = sum(v for k, v in stats.items() if k.endswith('_links'))
+                stats['total_nodes'] = sum(stats[k] for k in STATS_NODE_LABELS)
+                stats['total_relationships'] = sum(stats[k] for k in STATS_REL_TYPES)
 
                 return stats
 
@@ -170,9 +441,9 @@ class DataIntegrityValidator:
             logger.error(f"Failed to collect current stats: {e}")
             return {}
 
-    def save_baseline(self):
-        """Speichert aktuelle Statistiken als Baseline"""
-        stats = self.get_current_stats()
+    def save_baseline(self, stats: Optional[Dict[str, Any]] = None):
+        """Speichert (aktuelle) Statistiken als Baseline"""
+        stats = stats if stats is not None else self.get_current_stats()
         try:
             with open(self.baseline_file, 'w') as f:
                 json.dump(stats, f, indent=2)
@@ -180,8 +451,13 @@ class DataIntegrityValidator:
         except Exception as e:
             logger.error(f"Failed to save baseline: {e}")
 
-    def load_baseline(self) -> Dict[str, Any]:
-        """Lädt Baseline-Statistiken"""
+    def load_baseline(self, current: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Lädt Baseline-Statistiken
+
+        Existiert keine Baseline, werden current (oder frisch gesammelte)
+        Statistiken als neue Baseline gespeichert und zurückgegeben.
+        """
         try:
             if os.path.exists(self.baseline_file):
                 with open(self.baseline_file, 'r') as f:
@@ -189,8 +465,9 @@ class DataIntegrityValidator:
             else:
                 # Erstelle neue Baseline wenn keine existiert
                 logger.info("No baseline found, creating new one...")
-                self.save_baseline()
-                return self.get_current_stats()
+                stats = current if current is not None else self.get_current_stats()
+                self.save_baseline(stats)
+                return stats
         except Exception as e:
             logger.error(f"Failed to load baseline: {e}")
             return {}
@@ -199,7 +476,7 @@ class DataIntegrityValidator:
         """Validiert Datenintegrität gegen Baseline"""
         try:
             current = self.get_current_stats()
-            baseline = self.load_baseline()
+            baseline = self.load_baseline(current)
 
             if not baseline:
                 logger.warning("No baseline available for comparison")
@@ -233,42 +510,103 @@ class DataIntegrityValidator:
             return False
 
     def _check_orphaned_data(self) -> List[str]:
-        """Überprüft auf verwaiste Daten"""
+        """Überprüft in einer Abfrage auf verwaiste Tags und Templates (mit TTL-Cache)"""
+        now = time.monotonic()
+        if self._orphan_cache and now - self._orphan_cache[0] < self.orphan_cache_ttl:
+            return list(self._orphan_cache[1])
+
         issues = []
 
         try:
             with self.driver.session() as session:
-                # Verwaiste Tags (ohne Notes)
                 result = session.run("""
-                    MATCH (t:Tag)
-                    WHERE NOT EXISTS((:Note)-[:TAGGED_WITH]->(t))
-                    RETURN count(t) as orphaned_tags
+                    CALL {
+                        MATCH (t:Tag)
+                        WHERE NOT EXISTS { MATCH (:Note)-[:TAGGED_WITH]->(t) }
+                        RETURN count(t) as orphaned_tags
+                    }
+                    CALL {
+                        MATCH (t:Template)
+                        WHERE NOT EXISTS { MATCH (:Note)-[:USES_TEMPLATE]->(t) }
+                        RETURN count(t) as orphaned_templates
+                    }
+                    RETURN orphaned_tags, orphaned_templates
                 """).single()
 
                 if result and result['orphaned_tags'] > 0:
                     issues.append(f"Found {result['orphaned_tags']} orphaned tags")
 
-                # Verwaiste Templates
-                result = session.run("""
-                    MATCH (t:Template)
-                    WHERE NOT EXISTS((:Note)-[:USES_TEMPLATE]->(t))
-                    RETURN count(t) as orphaned_templates
-                """).single()
-
                 if result and result['orphaned_templates'] > 0:
                     issues.append(f"Found {result['orphaned_templates']} orphaned templates")
 
+            self._orphan_cache = (now, list(issues))
+
         except Exception as e:
             logger.error(f"Orphaned data check failed: {e}")
             issues.append("Could not check for orphaned data")
 
         return issues
 
+    def record_sample(self) -> Dict[str, Any]:
+        """Hängt einen Statistik-Messpunkt an die Zeitreihe an (JSONL)"""
+        stats = self.get_current_stats()
+        if stats:
+            stats['orphan_issues'] = self._check_orphaned_data()
+            with open(self.series_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(stats) + "\n")
+        return stats
+
+    def load_series(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Liest die letzten limit Messpunkte der Zeitreihe"""
+        if not os.path.exists(self.series_file):
+            return []
+        with open(self.series_file, 'r', encoding='utf-8') as f:
+            samples = [json.loads(line) for line in f if line.strip()]
+        return samples[-limit:] if limit else samples
+
+    def trend_alerts(self, window: int = 10, threshold: float = 0.2) -> List[str]:
+        """
+        Vergleicht den letzten Messpunkt mit dem Mittel der window davor
+
+        Meldet Zähler, die um mehr als threshold (relativ) abweichen.
+        """
+        samples = self.load_series(window + 1)
+        if len(samples) < 2:
+            return []
+        latest, history = samples[-1], samples[:-1]
+
+        alerts = []
+        for key in list(STATS_NODE_LABELS) + list(STATS_REL_TYPES):
+            average = sum(s.get(key, 0) for s in history) / len(history)
+            if average <= 0:
+                continue
+            change = (latest.get(key, 0) - average) / average
+            if abs(change) > threshold:
+                alerts.append(f"{key}: {average:.1f} -> {latest.get(key, 0)} ({change:+.1%} vs. trend)")
+        return alerts
+
+    def monitor(self, interval_seconds: float = 300.0, samples: Optional[int] = None,
+                window: int = 10, threshold: float = 0.2):
+        """
+        Monitoring-Modus: schreibt alle interval_seconds einen Messpunkt
+
+        Jeder Messpunkt kostet einen Roundtrip für die Zähler; die
+        Orphan-Prüfung läuft höchstens einmal pro orphan_cache_ttl.
+        """
+        taken = 0
+        while samples is None or taken < samples:
+            self.record_sample()
+            taken += 1
+            for alert in self.trend_alerts(window, threshold):
+                logger.warning(f"Integrity trend alert: {alert}")
+            if samples is None or taken < samples:
+                time.sleep(interval_seconds)
+
     def emergency_restore_check(self) -> bool:
         """Überprüft ob ein Notfall-Restore nötig ist (kritischer Datenverlust)"""
         try:
             current = self.get_current_stats()
-            baseline = self.load_baseline()
+            baseline = self.load_baseline(current)
 
             # Kritische Schwellenwerte
             critical_loss_threshold = 0.8  # 80% Datenverlust
@@ -311,7 +649,13 @@ def ensure_safe_environment():
                 'auto_backup': True,
                 'backup_retention_days': 30,
                 'auto_restore_on_critical': False,
-                'integrity_check_interval': 3600
+                'integrity_check_interval': 3600,
+                'backup_policy': {
+                    'mode': 'always',
+                    'every_n': 10,
+                    'interval_seconds': 300,
+                    'full_every': 20
+                }
             },
             'monitoring': {
                 'baseline_update_interval': 86400,
@@ -328,6 +672,25 @@ def ensure_safe_environment():
         logger.info(f"Created default safety config: {config_path}")
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Safe transactions setup and integrity monitoring")
+    parser.add_argument("--monitor", action="store_true", help="Integritäts-Zeitreihe fortlaufend schreiben")
+    parser.add_argument("--interval", type=float, default=300.0, help="Sekunden zwischen Messpunkten")
+    parser.add_argument("--samples", type=int, help="Anzahl Messpunkte (Standard: endlos)")
+    args = parser.parse_args()
+
     # Test und Setup
     ensure_safe_environment()
     print("✅ Safe transactions module initialized successfully")
+
+    if args.monitor:
+        import sys
+        from pathlib import Path
+
+        sys.path.append(str(Path(__file__).resolve().parents[1]))
+        from cortex_neo.neo4j_connection import get_driver
+
+        validator = DataIntegrityValidator(get_driver(), "cortex_neo/monitoring/baseline_stats.json")
+        print(f"📈 Monitoring → {validator.series_file}")
+        validator.monitor(args.interval, args.samples)
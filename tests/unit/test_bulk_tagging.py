@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the bulk tagging pipeline in src/governance/bulk_tagging.py
+"""
+
+import pytest
+from unittest.mock import Mock
+from pathlib import Path
+import sys
+
+# Add project root to Python path dynamically
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.governance import bulk_tagging
+from src.governance.bulk_tagging import PERFORMANCE_TAGS, BulkTagger
+
+
+NOTES = [
+    {"name": "Benchmarks", "content": "latency and throughput benchmark", "type": None,
+     "tags": [], "template": None},
+    {"name": "Caching", "content": "query optimization with caching", "type": None,
+     "tags": ["system-optimization"], "template": None},
+    {"name": "Shell", "content": "shell command history audit", "type": None,
+     "tags": [], "template": None},
+    {"name": "Poetry", "content": "roses are red", "type": None, "tags": [], "template": None},
+]
+
+
+def make_driver(notes):
+    """Driver whose session pages through notes by name and records writes"""
+    session = Mock()
+    session.writes = []
+
+    def run(query, after=None, limit=None):
+        remaining = [n for n in sorted(notes, key=lambda n: n["name"]) if after is None or n["name"] > after]
+        return [Mock(data=Mock(return_value=dict(n))) for n in remaining[:limit]]
+
+    def execute_write(fn, rows):
+        session.writes.append(rows)
+        return sum(len(r["tags"]) for r in rows)
+
+    session.run.side_effect = run
+    session.execute_write.side_effect = execute_write
+    driver = Mock()
+    driver.session.return_value.__enter__ = Mock(return_value=session)
+    driver.session.return_value.__exit__ = Mock(return_value=None)
+    return driver, session
+
+
+PERFORMANCE_ONLY = {t["name"] for t in PERFORMANCE_TAGS}
+
+
+class TestBulkTagging:
+    """Paged reads, suggestion diff and bounded write batches"""
+
+    def test_dry_run_reports_only_missing_tags(self):
+        driver, session = make_driver(NOTES)
+
+        report = BulkTagger(driver, page_size=2, workers=1, only_tags=PERFORMANCE_ONLY).run(dry_run=True)
+
+        assert report.pages == 2
+        assert report.notes == 4
+        assert report.diff["Benchmarks"] == ["performance-metrics"]
+        assert "Caching" not in report.diff
+        assert "command-tracking" in report.diff["Shell"]
+        assert session.writes == []
+
+    def test_next_pages_use_a_plain_name_range(self):
+        driver, session = make_driver(NOTES)
+
+        pages = list(bulk_tagging.iter_note_pages(session, page_size=2))
+
+        assert [len(page) for page in pages] == [2, 2]
+        first, second = session.run.call_args_list[:2]
+        assert first.args[0] == bulk_tagging.NOTE_FIRST_PAGE_QUERY and "after" not in first.kwargs
+        assert second.args[0] == bulk_tagging.NOTE_NEXT_PAGE_QUERY and second.kwargs["after"] == "Caching"
+        assert "IS NULL" not in bulk_tagging.NOTE_NEXT_PAGE_QUERY
+
+    def test_writes_are_batched_by_relationship_count(self):
+        driver, session = make_driver(NOTES)
+
+        report = BulkTagger(driver, batch_size=2, workers=1, only_tags=PERFORMANCE_ONLY).run()
+
+        assert all(sum(len(r["tags"]) for r in rows) <= 2 for rows in session.writes)
+        assert report.transactions == len(session.writes)
+        assert report.written == report.planned
+        assert "writes/s" in report.format()
+
+    def test_worker_pool_matches_in_process_suggestions(self):
+        driver, _ = make_driver(NOTES)
+        in_process = BulkTagger(driver, workers=1).run(dry_run=True)
+
+        driver, _ = make_driver(NOTES)
+        pooled = BulkTagger(driver, workers=2).run(dry_run=True)
+
+        assert pooled.diff == in_process.diff
+
+    def test_tag_definitions_are_written_in_one_statement(self):
+        session = Mock()
+
+        assert bulk_tagging.create_tag_definitions(session) == 3
+        session.run.assert_called_once()
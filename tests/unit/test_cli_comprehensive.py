@@ -112,6 +112,17 @@ class TestCortexCLIComprehensive:
             result = self.run_cli_command(command, python_exec, cli_path, cli_env)
             assert result.returncode in [0, 1], f"Tag command {' '.join(command)} crashed: {result.stderr}"
 
+    def test_governance_tag_commands_import_their_tagger(self, python_exec, cli_path, cli_env):
+        """Test tagging commands find src.governance when run as a plain script"""
+        cli_env.pop("PYTHONPATH", None)
+        cli_env["NEO4J_URI"] = "bolt://127.0.0.1:1"  # unreachable: fail fast after the import
+
+        for command in (["create-performance-tags"], ["auto-tag", "--dry-run"]):
+            result = self.run_cli_command(command, python_exec, cli_path, cli_env)
+            output = result.stdout + result.stderr
+            assert result.returncode == 0, f"Command {' '.join(command)} crashed: {output}"
+            assert "No module named" not in output, output
+
     def test_search_and_network_commands(self, python_exec, cli_path, cli_env):
         """Test search and network commands exist"""
         commands = [
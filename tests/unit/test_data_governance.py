@@ -201,6 +201,21 @@ class TestValidation:
         # Sollte bestehen, da alle Required Keywords vorhanden sind
         assert result.passed == True or len(result.errors) == 0
 
+    def test_validate_note_batch(self, governance_engine):
+        """Batch-Validierung prüft jede Note und erkennt doppelte Namen im Batch"""
+        note = {
+            "name": "FastAPI Framework Test",
+            "content": "FastAPI ist ein modernes Web-Framework für Python. **Verwendung:** API-Entwicklung.",
+            "description": "Test für FastAPI Framework",
+            "note_type": "framework",
+        }
+        results = governance_engine.validate_note_batch(
+            [note, {"name": "x", "content": "kurz"}, dict(note)]
+        )
+
+        assert [r.passed for r in results] == [True, False, False]
+        assert any("mehrfach" in e for e in results[2].errors)
+
     def test_extract_keywords_from_content(self, governance_engine):
         """Test der Keyword-Extraktion"""
         content = (
@@ -337,6 +352,21 @@ class TestNeo4jTemplateManager:
         """Test der Verbindungsprüfung bei bestehender Verbindung"""
         assert connected_mock_manager.is_connected() == True
 
+    def test_failed_connect_is_not_retried_immediately(self):
+        """Nach einem Verbindungsfehler wartet is_connected() nicht erneut auf den Timeout"""
+        from src.governance import data_governance
+
+        driver = Mock()
+        driver.verify_connectivity.side_effect = OSError("connection refused")
+        with patch.object(data_governance, "NEO4J_AVAILABLE", True), patch.object(
+            data_governance, "get_driver", return_value=driver, create=True
+        ), patch.dict(data_governance._failed_connects, clear=True):
+            manager = Neo4jTemplateManager(uri="bolt://unreachable:7687")
+            assert manager.is_connected() == False
+            assert Neo4jTemplateManager(uri="bolt://unreachable:7687").is_connected() == False
+
+        assert driver.verify_connectivity.call_count == 1
+
     def test_get_templates_for_project_no_connection(self, mock_neo4j_manager):
         """Test Template-Abruf ohne Neo4j-Verbindung"""
         templates = mock_neo4j_manager.get_templates_for_project("test", ["keyword"])
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline graph snapshot in cortex_neo/graph_analytics.py
+"""
+
+import pytest
+from unittest.mock import Mock
+from pathlib import Path
+import sys
+
+# Add project root to Python path dynamically
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+np = pytest.importorskip("numpy")
+
+from cortex_neo import graph_analytics
+from cortex_neo.graph_analytics import GraphSnapshot, SnapshotMissing
+
+
+# Home links to A and B, both link to Hub; Lonely is isolated
+ROWS = [
+    {"name": "Home", "type": "index", "links": ["A", "B"], "tags": ["start"]},
+    {"name": "A", "type": "project", "links": ["Hub"], "tags": ["research"]},
+    {"name": "B", "type": "project", "links": ["Hub"], "tags": ["research", "important"]},
+    {"name": "Hub", "type": None, "links": [], "tags": []},
+    {"name": "Lonely", "type": None, "links": [], "tags": []},
+]
+
+
+def graph_session(rows, counts, changed_rows=None):
+    """Session answering the counts and export queries"""
+    session = Mock()
+
+    def run(query, since=None):
+        if query == graph_analytics.COUNTS_QUERY:
+            return Mock(single=Mock(return_value=Mock(data=Mock(return_value=counts))))
+        selected = rows if since is None else (changed_rows or [])
+        return [Mock(data=Mock(return_value=r)) for r in selected]
+
+    session.run.side_effect = run
+    return session
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    snapshot = GraphSnapshot(tmp_path / "snapshot")
+    snapshot.build(ROWS)
+    return snapshot
+
+
+class TestGraphAnalytics:
+    """Vectorized analytics over the CSR snapshot"""
+
+    def test_degree_and_pagerank(self, snapshot):
+        degree = snapshot.degree_centrality()
+        hub = snapshot.node_index("Hub")
+
+        assert degree["in"][hub] == 2
+        assert degree["total"][snapshot.node_index("Home")] == 2
+        rank = snapshot.pagerank()
+        assert rank.sum() == pytest.approx(1.0)
+        assert snapshot.top(rank, limit=1)[0][0] == "Hub"
+
+    def test_components_common_neighbors_and_k_hop(self, snapshot):
+        labels = snapshot.connected_components()
+
+        assert len(set(labels.tolist())) == 2
+        assert snapshot.common_neighbors("Home") == [("Hub", 2)]
+        assert snapshot.k_hop("A", k=2) == {"Home": 1, "Hub": 1, "B": 2}
+        with pytest.raises(KeyError):
+            snapshot.k_hop("Missing")
+
+    def test_saved_snapshot_is_memory_mapped(self, snapshot, tmp_path):
+        snapshot.save()
+
+        loaded = GraphSnapshot(tmp_path / "snapshot")
+        assert loaded.load()
+        assert isinstance(loaded.arrays["graph_indices"], np.memmap)
+        assert loaded.network(limit=1)[0] == {
+            "note": "Home", "type": "index", "links": ["A", "B"], "tags": ["start"]
+        }
+        with pytest.raises(SnapshotMissing):
+            GraphSnapshot(tmp_path / "other").require()
+
+
+class TestSnapshotRefresh:
+    """Changed notes are merged; count mismatches force a full export"""
+
+    COUNTS = {"notes": 5, "links": 4, "tagged": 4, "tags": 3, "workflows": 0}
+
+    def test_incremental_refresh_applies_changed_notes(self, tmp_path):
+        snapshot = GraphSnapshot(tmp_path / "snapshot")
+        snapshot.refresh_from_graph(graph_session(ROWS, self.COUNTS))
+
+        changed = [{"name": "Lonely", "type": None, "links": ["Hub"], "tags": []}]
+        counts = dict(self.COUNTS, links=5)
+        stats = GraphSnapshot(tmp_path / "snapshot").refresh_from_graph(
+            graph_session(ROWS, counts, changed)
+        )
+
+        assert stats["mode"] == "incremental"
+        assert stats["changed"] == 1
+        refreshed = GraphSnapshot(tmp_path / "snapshot")
+        refreshed.require()
+        assert refreshed.k_hop("Lonely", k=1) == {"Hub": 1}
+
+    def test_count_mismatch_falls_back_to_full_export(self, tmp_path):
+        snapshot = GraphSnapshot(tmp_path / "snapshot")
+        snapshot.refresh_from_graph(graph_session(ROWS, self.COUNTS))
+
+        remaining = ROWS[:4]
+        stats = snapshot.refresh_from_graph(graph_session(remaining, dict(self.COUNTS, notes=4)))
+
+        assert stats["mode"] == "full"
+        assert snapshot.notes == ["Home", "A", "B", "Hub"]
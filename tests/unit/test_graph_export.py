@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar graph export/import in cortex_neo/graph_export.py
+"""
+
+import gzip
+import json
+import threading
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import Mock
+from pathlib import Path
+import sys
+
+# Add project root to Python path dynamically
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("pyarrow")
+
+from cortex_neo import graph_export
+
+
+CREATED = datetime(2025, 8, 15, 12, 0, tzinfo=timezone.utc)
+
+NODES = {
+    "Note": [
+        {"name": "Home", "content": "start", "created_at": CREATED},
+        {"name": "ProjectA", "updated_at": 1755259200000, "aliases": ["A"]},
+        {"name": "Mixed", "weight": "heavy"},
+        {"name": "Odd", "weight": 3},
+    ],
+    "Tag": [{"name": "important"}],
+}
+
+RELS = {
+    "LINKS_TO": [
+        {"source_label": "Note", "source": "Home", "target_label": "Note", "target": "ProjectA",
+         "props": {"auto": True, "weight": 2}},
+    ],
+    "TAGGED_WITH": [
+        {"source_label": "Note", "source": "ProjectA", "target_label": "Tag", "target": "important",
+         "props": {}},
+    ],
+}
+
+
+def export_session():
+    """Session answering the label, type and per-label export queries"""
+    session = Mock()
+
+    def run(query):
+        if "db.labels" in query:
+            return [{"label": label} for label in NODES] + [{"label": "Bad Label"}]
+        if "db.relationshipTypes" in query:
+            return [{"relationshipType": rel_type} for rel_type in RELS]
+        for label, nodes in NODES.items():
+            if query == graph_export.NODES_QUERY.format(label=label):
+                return [{"props": n} for n in nodes]
+        for rel_type, rels in RELS.items():
+            if query == graph_export.RELS_QUERY.format(rel_type=rel_type):
+                return rels
+        return []
+
+    session.run.side_effect = run
+    return session
+
+
+def import_driver():
+    """Driver whose sessions record (query, rows) per write transaction"""
+    writes = []
+    lock = threading.Lock()
+
+    def execute_write(fn, query, rows):
+        with lock:
+            writes.append((query, rows))
+
+    session = Mock()
+    session.execute_write.side_effect = execute_write
+    driver = Mock()
+    driver.session.return_value.__enter__ = Mock(return_value=session)
+    driver.session.return_value.__exit__ = Mock(return_value=None)
+    return driver, writes
+
+
+class TestGraphExport:
+    """One columnar file per label/type, restored by batched MERGEs"""
+
+    @pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+    def test_export_round_trip(self, tmp_path, file_format):
+        manifest = graph_export.export_graph(export_session(), str(tmp_path), file_format=file_format)
+
+        assert manifest["nodes"]["Note"]["rows"] == 4
+        assert manifest["nodes"]["Note"]["json_columns"] == ["weight"]
+        assert manifest["skipped"] == ["Bad Label"]
+        assert (tmp_path / f"rels_LINKS_TO{graph_export.FILE_FORMATS[file_format]}").exists()
+
+        batches = list(graph_export.read_export(str(tmp_path)))
+        notes = {row["name"]: row["props"] for kind, key, rows in batches if key == ("Note",) for row in rows}
+        assert notes["Home"] == {"content": "start", "created_at": CREATED}
+        assert notes["ProjectA"] == {"updated_at": 1755259200000, "aliases": ["A"]}
+        assert notes["Mixed"] == {"weight": "heavy"} and notes["Odd"] == {"weight": 3}
+        assert ("relationships", ("LINKS_TO", "Note", "Note"),
+                [{"source": "Home", "target": "ProjectA", "props": {"auto": True, "weight": 2}}]) in batches
+
+    def test_import_commits_nodes_before_relationships(self, tmp_path):
+        graph_export.export_graph(export_session(), str(tmp_path))
+        driver, writes = import_driver()
+
+        report = graph_export.import_path(driver, str(tmp_path), batch_size=2, workers=3)
+
+        kinds = ["nodes" if "MERGE (n:" in query else "relationships" for query, _ in writes]
+        assert kinds == sorted(kinds, key=lambda k: k != "nodes")
+        assert all(len(rows) <= 2 for _, rows in writes)
+        assert report["kinds"]["nodes"]["rows"] == 5
+        assert report["kinds"]["relationships"]["rows"] == 2
+        assert report["rows"] == 7
+        assert "rows/s" in graph_export.format_report(report)
+
+    def test_import_from_backup(self, tmp_path):
+        backup = tmp_path / "backup_full.jsonl.gz"
+        records = [
+            {"format": "cortex-graph-backup", "version": 1, "kind": "full"},
+            {"t": "node", "label": "Note", "properties": {"name": "Home", "content": "start"}},
+            {"t": "node", "label": "Note", "properties": {"content": "no name"}},
+            {"t": "rel", "type": "LINKS_TO", "source_labels": ["Note"], "source_name": "Home",
+             "target_labels": ["Note"], "target_name": "Home", "properties": {}},
+        ]
+        with gzip.open(backup, "wt", encoding="utf-8") as f:
+            f.write("\n".join(json.dumps(r) for r in records))
+
+        batches = list(graph_export.read_backup(str(backup)))
+
+        assert batches == [
+            ("nodes", ("Note",), [{"name": "Home", "props": {"content": "start"}}]),
+            ("relationships", ("LINKS_TO", "Note", "Note"),
+             [{"source": "Home", "target": "Home", "props": {}}]),
+        ]
+
+    def test_unsafe_names_are_rejected(self):
+        with pytest.raises(ValueError):
+            graph_export.batch_query("nodes", ("Note`) DETACH DELETE (n",))
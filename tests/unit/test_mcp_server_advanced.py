@@ -6,7 +6,7 @@ Addresses significant coverage gaps in MCP server functionality
 
 import pytest
 import asyncio
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 import json
 import os
 from pathlib import Path
@@ -200,5 +200,535 @@ class TestMCPServerErrorHandling:
         assert isinstance(cli_available, bool)
 
 
+class TestMCPGraphAccess:
+    """Graph resources and tools query Neo4j asynchronously, CLI as fallback"""
+
+    @pytest.mark.asyncio
+    async def test_knowledge_graph_counts_are_queried_concurrently(self):
+        from src.mcp import cortex_mcp_server as module
+
+        server = CortexMCPServer()
+        in_flight = {"now": 0, "peak": 0}
+
+        async def read(query, **params):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return [{"count": 3}]
+
+        server.graph = Mock(read=read)
+        with patch.object(module, "cortex_server", server):
+            result = json.loads(json.loads(await module.handle_read_resource("cortex://knowledge-graph"))["data"])
+
+        assert result["notes"] == 3
+        assert in_flight["peak"] == 5
+
+    @pytest.mark.asyncio
+    async def test_unavailable_graph_falls_back_to_cli(self):
+        from src.mcp import cortex_mcp_server as module
+
+        server = CortexMCPServer()
+        server.graph = None
+        cli_result = {"returncode": 0, "stdout": '{"links": ["cli"]}', "stderr": "", "success": True}
+        with patch.object(module, "cortex_server", server), patch.object(
+            server, "run_cortex_command", return_value=cli_result
+        ) as run_command:
+            result = await module.handle_read_resource("cortex://links")
+
+        run_command.assert_called_once_with("link-list")
+        assert "cli" in result
+
+    @pytest.mark.asyncio
+    async def test_search_falls_back_to_search_notes_cli(self):
+        from src.mcp import cortex_mcp_server as module
+
+        server = CortexMCPServer()
+        server.graph = None
+        cli_result = {"returncode": 0, "stdout": "🔍 Alpha", "stderr": "", "success": True}
+        with patch.object(module, "cortex_server", server), patch.object(
+            server, "run_cortex_command", return_value=cli_result
+        ) as run_command:
+            result = await module.handle_call_tool(
+                "cortex_search_knowledge", {"query": "alpha", "category": "research", "limit": 5})
+
+        command, args = run_command.call_args[0]
+        assert command == "search-notes"
+        assert args == ["alpha", "--limit", "5", "--type", "research"]
+        assert result[0].text == "🔍 Alpha"
+        cli = server.dispatcher.load_cli()
+        if cli is not None:
+            cli.get_command(None, command).make_context(command, list(args))
+
+
+
+class TestCommandDispatcher:
+    """CLI commands run in-process on a bounded pool, subprocess as fallback"""
+
+    @staticmethod
+    def echo_cli():
+        import click
+        import time
+
+        @click.group()
+        def cli():
+            pass
+
+        @cli.command()
+        @click.argument("word")
+        def echo(word):
+            time.sleep(0.2)
+            click.echo(word)
+            click.echo(f"err {word}", err=True)
+
+        return cli
+
+    @pytest.mark.asyncio
+    async def test_concurrent_commands_overlap_and_capture_their_own_output(self):
+        from src.mcp.command_dispatcher import CommandDispatcher
+
+        dispatcher = CommandDispatcher(max_workers=4)
+        dispatcher._cli = self.echo_cli()
+        started = asyncio.get_running_loop().time()
+
+        with patch("asyncio.create_subprocess_exec") as mock_subprocess:
+            results = await asyncio.gather(*(dispatcher.run("echo", [w]) for w in "abcd"))
+
+        assert asyncio.get_running_loop().time() - started < 0.6
+        assert [r["stdout"] for r in results] == ["a\n", "b\n", "c\n", "d\n"]
+        assert [r["stderr"] for r in results] == ["err a\n", "err b\n", "err c\n", "err d\n"]
+        assert all(r["success"] for r in results)
+        mock_subprocess.assert_not_called()
+        dispatcher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_usage_errors_keep_the_cli_return_code(self):
+        from src.mcp.command_dispatcher import CommandDispatcher
+
+        dispatcher = CommandDispatcher()
+        dispatcher._cli = self.echo_cli()
+
+        result = await dispatcher.run(["no-such-command"])
+
+        assert result["returncode"] == 2
+        assert result["success"] is False
+        assert "No such command" in result["stderr"]
+        dispatcher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_isolation_sensitive_commands_use_a_subprocess(self):
+        from src.mcp.command_dispatcher import CommandDispatcher
+
+        process = Mock(returncode=0)
+        process.communicate = AsyncMock(return_value=(b"migrated", b""))
+        dispatcher = CommandDispatcher()
+        dispatcher._cli = self.echo_cli()
+
+        with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=process)) as mock_subprocess:
+            result = await dispatcher.run("migrate", ["structure.yaml"])
+
+        assert result == {"returncode": 0, "stdout": "migrated", "stderr": "", "success": True}
+        assert mock_subprocess.call_args.args[-2:] == ("migrate", "structure.yaml")
+        assert dispatcher._pool is None
+        dispatcher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timed_out_subprocess_is_killed(self):
+        from src.mcp.command_dispatcher import CommandDispatcher
+
+        async def communicate():
+            await asyncio.sleep(1)
+
+        process = Mock(returncode=None)
+        process.communicate = communicate
+        process.wait = AsyncMock(return_value=-9)
+        dispatcher = CommandDispatcher(in_process=False)
+
+        with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=process)):
+            result = await dispatcher.run("migrate", timeout=0.05)
+
+        assert result["stderr"] == "Command timeout after 0.05 seconds"
+        process.kill.assert_called_once_with()
+        process.wait.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_in_process_commands_run_on_the_given_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from src.mcp.command_dispatcher import CommandDispatcher
+
+        dispatcher = CommandDispatcher()
+        dispatcher._cli = self.echo_cli()
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cortex-heavy")
+
+        result = await dispatcher.run("echo", ["a"], executor=executor)
+
+        assert result["stdout"] == "a\n"
+        assert dispatcher._pool is None
+        executor.shutdown()
+
+
+
+class TestMCPResourceCache:
+    """Polled resources are cached with ETags and evicted by write tools"""
+
+    @staticmethod
+    def cached_server(stdout="tpl-v1"):
+        server = CortexMCPServer()
+        server.graph = None
+        server.run_cortex_command = Mock(
+            side_effect=lambda command, *args, **kwargs: asyncio.sleep(
+                0, {"returncode": 0, "stdout": stdout, "stderr": "", "success": True}
+            )
+        )
+        return server
+
+    @pytest.mark.asyncio
+    async def test_repeated_reads_are_served_from_cache(self):
+        from src.mcp import cortex_mcp_server as module
+
+        server = self.cached_server()
+        with patch.object(module, "cortex_server", server):
+            results = await asyncio.gather(*(module.handle_read_resource("cortex://templates") for _ in range(3)))
+            results.append(await module.handle_read_resource("cortex://templates"))
+            config = json.loads(await module.handle_read_resource("cortex://config"))
+
+        etag = config["resource_cache"]["entries"]["cortex://templates"]["etag"]
+        assert [json.loads(r) for r in results] == [{"etag": etag, "data": "tpl-v1"}] * 4
+        server.run_cortex_command.assert_called_once_with("template-list")
+        cache = config["resource_cache"]
+        assert cache["hits"] == 1 and cache["misses"] == 3
+
+    @pytest.mark.asyncio
+    async def test_write_tool_evicts_affected_resources(self):
+        from src.mcp import cortex_mcp_server as module
+
+        server = self.cached_server()
+        with patch.object(module, "cortex_server", server):
+            await module.handle_read_resource("cortex://templates")
+            await module.handle_read_resource("cortex://links")
+            await module.handle_call_tool(
+                "cortex_create_template", {"name": "Decision", "structure": {"a": 1}}
+            )
+            await module.handle_read_resource("cortex://templates")
+            await module.handle_read_resource("cortex://links")
+
+        commands = [c.args[0] for c in server.run_cortex_command.call_args_list]
+        assert commands == ["template-list", "link-list", "template-create", "template-list"]
+
+    @pytest.mark.asyncio
+    async def test_etag_revalidation_and_failures_are_not_cached(self):
+        from src.mcp import cortex_mcp_server as module
+
+        server = self.cached_server()
+        with patch.object(module, "cortex_server", server):
+            etag = json.loads(await module.handle_read_resource("cortex://templates"))["etag"]
+            revalidated = json.loads(await module.handle_read_resource(f"cortex://templates?etag={etag}"))
+            stale = json.loads(await module.handle_read_resource("cortex://templates?etag=outdated"))
+
+            server.run_cortex_command = Mock(side_effect=lambda *a, **k: asyncio.sleep(
+                0, {"returncode": 1, "stdout": "", "stderr": "down", "success": False}))
+            await module.handle_read_resource("cortex://links")
+            failed = await module.handle_read_resource("cortex://links")
+
+        assert etag == server.resource_cache.metrics()["entries"]["cortex://templates"]["etag"]
+        assert revalidated == {"not_modified": True, "etag": etag}
+        assert stale == {"etag": etag, "data": "tpl-v1"}
+        assert "etag" not in failed
+        assert server.run_cortex_command.call_count == 2
+
+
+
+class TestMCPExecutionLayer:
+    """Priority classes with concurrency limits, backpressure and timeouts"""
+
+    @staticmethod
+    def layer(heavy_timeout=5.0, heavy_queue=1):
+        from src.mcp.execution import ExecutionLayer, PriorityClass
+
+        return ExecutionLayer(classes={
+            "interactive": PriorityClass("interactive", max_concurrency=2, max_queue=4, timeout=5.0),
+            "heavy": PriorityClass("heavy", max_concurrency=1, max_queue=heavy_queue, timeout=heavy_timeout),
+        }, tool_classes={"export": "heavy"})
+
+    @pytest.mark.asyncio
+    async def test_heavy_calls_do_not_block_interactive_ones(self):
+        layer = self.layer()
+        export = asyncio.ensure_future(layer.run("export", lambda: asyncio.sleep(0.3, "exported")))
+        await asyncio.sleep(0)
+
+        status = await asyncio.wait_for(layer.run("status", lambda: asyncio.sleep(0, "ok")), 0.1)
+
+        assert status == "ok"
+        assert not export.done()
+        assert await export == "exported"
+        tools = layer.metrics()["tools"]
+        assert tools["export"]["priority"] == "heavy"
+        assert tools["status"]["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_is_rejected(self):
+        from src.mcp.execution import ServerBusy
+
+        layer = self.layer(heavy_queue=1)
+        running = asyncio.ensure_future(layer.run("export", lambda: asyncio.sleep(0.1, 1)))
+        await asyncio.sleep(0)
+        queued = asyncio.ensure_future(layer.run("export", lambda: asyncio.sleep(0, 2)))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServerBusy):
+            await layer.run("export", lambda: asyncio.sleep(0, 3))
+
+        assert await asyncio.gather(running, queued) == [1, 2]
+        stats = layer.metrics()["tools"]["export"]
+        assert stats["rejected"] == 1 and stats["completed"] == 2
+        assert stats["max_wait_ms"] > 50
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_cancellation_release_the_slot(self):
+        from src.mcp.execution import RequestTimeout
+
+        layer = self.layer(heavy_timeout=0.05)
+        with pytest.raises(RequestTimeout):
+            await layer.run("export", lambda: asyncio.sleep(1))
+
+        abandoned = asyncio.ensure_future(layer.run("export", lambda: asyncio.sleep(0.04)))
+        await asyncio.sleep(0.01)
+        abandoned.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await abandoned
+
+        assert await layer.run("export", lambda: asyncio.sleep(0, "done")) == "done"
+        stats = layer.metrics()["tools"]["export"]
+        assert (stats["timeouts"], stats["cancelled"], stats["completed"]) == (1, 1, 1)
+        assert layer.metrics()["classes"]["heavy"]["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_each_class_runs_on_its_own_executor(self):
+        from src.mcp.execution import call_executor
+
+        layer = self.layer()
+
+        async def current():
+            return call_executor()
+
+        heavy = await layer.run("export", current)
+        interactive = await layer.run("status", current)
+
+        assert heavy is layer.executor("heavy") and heavy._max_workers == 1
+        assert interactive is layer.executor("interactive") and interactive._max_workers == 2
+        assert call_executor() is None
+        layer.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_tool_timeout_is_reported_and_exported_in_config(self):
+        from src.mcp import cortex_mcp_server as module
+
+        server = CortexMCPServer()
+        server.execution = self.layer(heavy_timeout=0.05)
+        server.execution.tool_classes["cortex_backup_system"] = "heavy"
+
+        async def slow_command(command, args=None, timeout=None):
+            await asyncio.sleep(1)
+
+        server.run_cortex_command = slow_command
+        with patch.object(module, "cortex_server", server):
+            result = await module.handle_call_tool("cortex_backup_system", {"backup_name": "nightly"})
+            config = json.loads(await module.handle_read_resource("cortex://config"))
+
+        assert "timed out" in result[0].text
+        assert config["execution"]["tools"]["cortex_backup_system"]["timeouts"] == 1
+
+
+class TestMCPPagination:
+    """Search and links are paged by cursor, exports are streamed to a file"""
+
+    LINKS = [{"source": s, "target": t, "relationship": "relates"}
+             for s, t in [("A", "B"), ("A", "C"), ("B", "C"), ("C", "A"), ("D", "A")]]
+    NOTES = [{"name": n, "type": "project", "description": "Über " + n, "tags": ["x"]}
+             for n in ["Alpha", "Beta", "Gamma"]]
+
+    @classmethod
+    async def read(cls, query, **params):
+        """Keyset pages over NOTES and LINKS, as Neo4j would return them"""
+        if "LINKS_TO" in query:
+            after = (params.get("after_source"), params.get("after_target"))
+            rows = [l for l in cls.LINKS if after[0] is None or (l["source"], l["target"]) > after]
+        elif "queryNodes" in query:
+            scored = [{"name": n["name"], "type": n["type"], "description": n["description"],
+                       "score": 1.0} for n in cls.NOTES]
+            rows = [r for r in scored if params["after_score"] is None
+                    or (r["score"], r["name"]) > (params["after_score"], params["after_name"])]
+        else:
+            rows = [n for n in cls.NOTES if params.get("after") is None or n["name"] > params["after"]]
+        return rows[:params["limit"]]
+
+    @pytest.fixture
+    def server(self):
+        server = CortexMCPServer()
+        server.graph = Mock(read=self.read)
+        return server
+
+    @pytest.mark.asyncio
+    async def test_links_are_paged_by_cursor(self, server):
+        from src.mcp import cortex_mcp_server as module
+
+        seen, uri = [], "cortex://links?limit=2"
+        with patch.object(module, "cortex_server", server):
+            while uri:
+                page = json.loads(await module.handle_read_resource(uri))
+                seen += [(l["source"], l["target"]) for l in page["links"]]
+                uri = page["next_cursor"] and f"cortex://links?limit=2&cursor={page['next_cursor']}"
+            invalid = json.loads(await module.handle_read_resource("cortex://links?cursor=bogus"))
+
+        assert seen == [(l["source"], l["target"]) for l in self.LINKS]
+        assert invalid["error"] == "Invalid cursor"
+
+    def test_next_pages_start_with_a_plain_name_range(self):
+        from src.mcp import streaming
+
+        first, first_params = streaming.link_page_query(None, 2)
+        following, params = streaming.link_page_query(streaming.encode_cursor("A", "C"), 2)
+
+        assert first == streaming.LINK_FIRST_PAGE_QUERY and first_params == {"limit": 3}
+        assert following == streaming.LINK_NEXT_PAGE_QUERY
+        assert params == {"after_source": "A", "after_target": "C", "limit": 3}
+        for query in (streaming.LINK_NEXT_PAGE_QUERY, streaming.EXPORT_NOTES_NEXT_PAGE_QUERY):
+            assert "IS NULL" not in query
+
+    @pytest.mark.asyncio
+    async def test_search_returns_next_cursor(self, server):
+        from src.mcp import cortex_mcp_server as module
+
+        with patch.object(module, "cortex_server", server):
+            first = json.loads((await module.handle_call_tool(
+                "cortex_search_knowledge", {"query": "project", "limit": 2}))[0].text)
+            second = json.loads((await module.handle_call_tool(
+                "cortex_search_knowledge",
+                {"query": "project", "limit": 2, "cursor": first["next_cursor"]}))[0].text)
+
+        assert [r["name"] for r in first["results"]] == ["Alpha", "Beta"]
+        assert [r["name"] for r in second["results"]] == ["Gamma"]
+        assert second["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_export_is_written_to_a_file_and_read_in_chunks(self, server, tmp_path):
+        from src.mcp import cortex_mcp_server as module
+
+        with patch.object(module, "cortex_server", server), \
+                patch.object(module.streaming, "EXPORT_DIR", tmp_path):
+            export = json.loads((await module.handle_call_tool(
+                "cortex_export_data", {"format": "json"}))[0].text)
+            lines, cursor = [], ""
+            while cursor is not None:
+                chunk = json.loads(await module.handle_read_resource(
+                    f"{export['uri']}?limit=100" + (f"&cursor={cursor}" if cursor else "")))
+                assert chunk["data"].endswith("\n")
+                lines += chunk["data"].splitlines()
+                cursor = chunk["next_cursor"]
+            missing = json.loads(await module.handle_read_resource("cortex://exports/../secrets"))
+
+        records = [json.loads(line) for line in lines]
+        assert export["rows"] == len(records) == len(self.NOTES) + len(self.LINKS)
+        assert records[0] == {"kind": "note", **self.NOTES[0]}
+        assert records[-1]["kind"] == "link"
+        assert "error" in missing
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+class TestMCPBatch:
+    """cortex_batch validates operations together and writes them in one transaction"""
+
+    CONTENT = "# Notiz\nInhalt aus einer Chat-Session mit genug Details für die Validierung."
+
+    @staticmethod
+    def batch_server(existing=("Home",)):
+        server = CortexMCPServer()
+        notes = set(existing)
+        transactions = []
+
+        async def write_many(statements, check=None):
+            transactions.append(statements)
+            rows, visible = [], set(notes)
+            for query, params in statements:
+                if "notes" in params:
+                    visible.update(n["name"] for n in params["notes"])
+                    rows.append([{"index": n["index"]} for n in params["notes"]])
+                elif "links" in params:
+                    rows.append([{"index": l["index"]} for l in params["links"]
+                                 if l["source"] in visible and l["target"] in visible])
+                else:
+                    rows.append([{"index": t["index"]} for t in params["tags"] if t["note"] in visible])
+            if check is not None:
+                check(rows)  # raising rolls back: visible is not committed
+            notes.update(visible)
+            return rows
+
+        server.graph = Mock(write_many=write_many)
+        server.notes = notes
+        return server, transactions
+
+    @pytest.mark.asyncio
+    async def test_mixed_batch_reports_each_operation(self):
+        from src.mcp import cortex_mcp_server as module
+
+        server, transactions = self.batch_server()
+        operations = [
+            {"op": "add", "title": "Chat Session Notes", "content": self.CONTENT, "tags": ["chat"]},
+            {"op": "add", "title": "x", "content": "kurz"},
+            {"op": "link", "source_id": "Chat Session Notes", "target_id": "Home"},
+            {"op": "link", "source_id": "Home", "target_id": "Missing"},
+            {"op": "tag", "note": "Home", "tags": ["start"]},
+            {"op": "delete", "note": "Home"},
+        ]
+        with patch.object(module, "cortex_server", server):
+            report = json.loads((await module.handle_call_tool(
+                "cortex_batch", {"operations": operations}))[0].text)
+
+        assert [r["status"] for r in report["results"]] == [
+            "ok", "invalid", "ok", "not_found", "ok", "invalid"]
+        assert (report["ok"], report["invalid"], report["not_found"]) == (3, 2, 1)
+        assert len(transactions) == 1 and len(transactions[0]) == 3
+        assert server.execution.metrics()["tools"]["cortex_batch"]["priority"] == "write"
+
+    @pytest.mark.asyncio
+    async def test_atomic_batch_with_invalid_operation_writes_nothing(self):
+        server, transactions = self.batch_server()
+        report = await server.run_batch(
+            [{"op": "add", "title": "Chat Session Notes", "content": self.CONTENT},
+             {"op": "link", "source_id": "Home"}],
+            atomic=True,
+        )
+
+        assert [r["status"] for r in report["results"]] == ["skipped", "invalid"]
+        assert transactions == []
+
+    @pytest.mark.asyncio
+    async def test_atomic_batch_with_missing_note_is_rolled_back(self):
+        server, transactions = self.batch_server()
+        report = await server.run_batch(
+            [{"op": "add", "title": "Chat Session Notes", "content": self.CONTENT},
+             {"op": "link", "source_id": "Chat Session Notes", "target_id": "Home"},
+             {"op": "tag", "note": "Missing", "tags": ["x"]}],
+            atomic=True,
+        )
+
+        assert [r["status"] for r in report["results"]] == ["skipped", "skipped", "not_found"]
+        assert len(transactions) == 1
+        assert server.notes == {"Home"}
+
+    @pytest.mark.asyncio
+    async def test_large_batch_is_one_transaction(self):
+        server, transactions = self.batch_server()
+        operations = [{"op": "add", "title": f"Chat Message {i}", "content": self.CONTENT}
+                      for i in range(500)]
+        operations += [{"op": "link", "source_id": f"Chat Message {i}", "target_id": f"Chat Message {i + 1}"}
+                       for i in range(499)]
+
+        report = await server.run_batch(operations)
+
+        assert report["ok"] == len(operations)
+        assert len(transactions) == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
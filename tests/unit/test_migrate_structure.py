@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched structure import in cortex_neo/migrate_structure.py
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from pathlib import Path
+import sys
+
+# Add project root to Python path dynamically
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from cortex_neo import migrate_structure
+
+
+STRUCTURE = {
+    "notes": ["Home", "ProjectA", "ProjectB", "", 3],
+    "templates": ["Project"],
+    "tags": ["important", "research"],
+    "links": [
+        {"from": "Home", "to": "ProjectA"},
+        {"from": "ProjectA", "to": "ProjectB"},
+        {"from": "ProjectB"},
+    ],
+    "assignments": {
+        "uses_template": [{"note": "ProjectA", "template": "Project"}],
+        "tagged_with": [
+            {"note": "ProjectA", "tag": "important"},
+            {"note": "ProjectB", "tag": "research"},
+        ],
+    },
+}
+
+
+@pytest.fixture
+def session():
+    """Session whose execute_write records (kind, rows) per transaction"""
+    session = Mock()
+    session.writes = []
+
+    def execute_write(fn, query, rows):
+        kind = next(k for k, q in migrate_structure.BULK_QUERIES.items() if q == query)
+        session.writes.append((kind, list(rows)))
+        fn(Mock(), query, rows)
+
+    session.execute_write.side_effect = execute_write
+    driver = Mock()
+    driver.session.return_value.__enter__ = Mock(return_value=session)
+    driver.session.return_value.__exit__ = Mock(return_value=None)
+    with patch.object(migrate_structure, "get_driver", return_value=driver):
+        yield session
+
+
+class TestBulkMigration:
+    """Rows are grouped by kind and written in UNWIND chunks"""
+
+    def test_collect_rows_skips_invalid_entries(self):
+        rows = migrate_structure.collect_rows(STRUCTURE)
+
+        assert rows["notes"] == [{"name": "Home"}, {"name": "ProjectA"}, {"name": "ProjectB"}]
+        assert rows["links"] == [
+            {"source": "Home", "target": "ProjectA"},
+            {"source": "ProjectA", "target": "ProjectB"},
+        ]
+        assert len(rows["tagged_with"]) == 2
+
+    def test_rows_are_written_in_chunks(self, session):
+        report = migrate_structure.migrate_from_data(STRUCTURE, chunk_size=2)
+
+        assert [kind for kind, _ in session.writes] == [
+            "notes", "notes", "templates", "tags", "links", "uses_template", "tagged_with"
+        ]
+        assert all(len(rows) <= 2 for _, rows in session.writes)
+        assert report["rows"] == 11
+        assert report["kinds"]["notes"]["chunks"] == 2
+
+    def test_resume_after_failure_skips_committed_chunks(self, session, tmp_path):
+        checkpoint = str(tmp_path / "structure.yaml.checkpoint.json")
+        writes = session.execute_write.side_effect
+
+        def fail_on_links(fn, query, rows):
+            if query == migrate_structure.BULK_QUERIES["links"]:
+                raise RuntimeError("connection lost")
+            writes(fn, query, rows)
+
+        session.execute_write.side_effect = fail_on_links
+        with pytest.raises(RuntimeError):
+            migrate_structure.migrate_from_data(STRUCTURE, chunk_size=2, checkpoint_file=checkpoint)
+        assert Path(checkpoint).exists()
+
+        session.writes.clear()
+        session.execute_write.side_effect = writes
+        report = migrate_structure.migrate_from_data(STRUCTURE, chunk_size=2, checkpoint_file=checkpoint)
+
+        assert [kind for kind, _ in session.writes] == ["links", "uses_template", "tagged_with"]
+        assert report["skipped_rows"] == 6
+        assert not Path(checkpoint).exists()
+
+    def test_checkpoint_of_other_input_is_ignored(self, session, tmp_path):
+        checkpoint = tmp_path / "checkpoint.json"
+        checkpoint.write_text('{"fingerprint": "other", "completed": {"notes": 5}}')
+
+        report = migrate_structure.migrate_from_data(STRUCTURE, chunk_size=2,
+                                                     checkpoint_file=str(checkpoint))
+
+        assert report["skipped_rows"] == 0
+        assert report["kinds"]["notes"]["rows"] == 3
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the schema bootstrap in cortex_neo/schema.py
+"""
+
+from unittest.mock import Mock
+from pathlib import Path
+import sys
+
+# Add project root to Python path dynamically
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from cortex_neo import schema
+
+
+def _counters(added):
+    summary = Mock()
+    summary.counters.constraints_added = added
+    summary.counters.indexes_added = 0
+    return Mock(consume=Mock(return_value=summary))
+
+
+class TestSchemaBootstrap:
+    """Constraints and indexes are created idempotently"""
+
+    def test_statements_cover_all_labels_and_fulltext_index(self):
+        statements = dict(schema.schema_statements())
+
+        for label in ("Note", "Tag", "Template", "Workflow"):
+            statement = statements[f"{label.lower()}_name_unique"]
+            assert "IF NOT EXISTS" in statement
+            assert f"(n:{label}) REQUIRE n.name IS UNIQUE" in statement
+        # Step names repeat across workflows: indexed, not unique
+        assert "step_name_unique" not in statements
+        assert "FOR (n:Step) ON (n.name)" in statements["step_name"]
+        assert "ON EACH [n.name, n.content, n.description]" in statements["note_fulltext"]
+
+    def test_init_schema_reports_created_existing_and_failed(self):
+        session = Mock()
+
+        def run(statement):
+            if "(n:Workflow)" in statement:
+                raise RuntimeError("duplicate names")
+            return _counters(1 if "CONSTRAINT note_" in statement else 0)
+
+        session.run.side_effect = run
+        result = schema.init_schema(session)
+
+        assert result["created"] == ["note_name_unique"]
+        assert "tag_name_unique" in result["existing"]
+        assert list(result["failed"]) == ["workflow_name_unique"]
+
+    def test_ensure_schema_runs_once_per_driver(self):
+        session = Mock()
+        session.run.return_value = _counters(0)
+        driver = Mock()
+        driver.session.return_value.__enter__ = Mock(return_value=session)
+        driver.session.return_value.__exit__ = Mock(return_value=None)
+
+        first = schema.ensure_schema(driver)
+        second = schema.ensure_schema(driver)
+
+        assert second["created"] == [] and second["failed"] == {}
+        assert sorted(second["existing"]) == sorted(first["created"] + first["existing"])
+        assert session.run.call_count == len(schema.schema_statements())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for the full-text note search in cortex_neo/note_search.py
+"""
+
+import pytest
+from unittest.mock import MagicMock, Mock, patch
+from pathlib import Path
+import sys
+
+# Add project root to Python path dynamically
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from neo4j.exceptions import ClientError, ServiceUnavailable
+
+from cortex_neo import note_search
+
+
+NOTES = [
+    {"name": "Neo4j Performance", "description": "Index tuning", "content": "query plans",
+     "type": "research", "tags": ["performance"]},
+    {"name": "Python Tips", "description": "performance hints", "content": "profiling",
+     "type": "guide", "tags": ["python"]},
+    {"name": "Perf Log", "description": None, "content": "performance numbers",
+     "type": "research", "tags": ["performance"]},
+    {"name": "Unrelated", "description": "gardening", "content": "tomatoes",
+     "type": "misc", "tags": []},
+]
+
+
+@pytest.fixture
+def local_index(tmp_path):
+    index = note_search.LocalNoteIndex(tmp_path / "note_index.json")
+    index.build(NOTES)
+    index.save()
+    return index
+
+
+class TestFulltextQuery:
+    """Lucene query construction and cursors"""
+
+    def test_terms_are_required_and_escaped(self):
+        query = note_search.build_fulltext_query("Neo4j perf")
+        assert query == "(neo4j^2 OR neo4j*) AND (perf^2 OR perf*)"
+
+    def test_cursor_round_trip(self):
+        cursor = note_search.encode_cursor(1.25, "Note A")
+        assert note_search.decode_cursor(cursor) == (1.25, "Note A")
+        with pytest.raises(note_search.InvalidCursor):
+            note_search.decode_cursor("not-a-cursor")
+
+    def test_fulltext_page_has_next_cursor(self):
+        session = Mock()
+        session.run.return_value = [
+            Mock(data=Mock(return_value={"name": n, "type": None, "description": None,
+                                         "tags": [], "score": s}))
+            for n, s in (("A", 3.0), ("B", 2.0), ("C", 1.0))
+        ]
+
+        page = note_search.search_fulltext(session, "perf", tag="performance", limit=2)
+
+        cypher, params = session.run.call_args[0]
+        assert "db.index.fulltext.queryNodes" in cypher
+        assert params["limit"] == 3 and params["tag"] == "performance"
+        assert [r["name"] for r in page["results"]] == ["A", "B"]
+        assert note_search.decode_cursor(page["next_cursor"]) == (2.0, "B")
+
+
+class TestLocalNoteIndex:
+    """Offline search over the local inverted index"""
+
+    def test_ranking_prefers_name_matches(self, local_index):
+        page = local_index.search("performance")
+
+        names = [r["name"] for r in page["results"]]
+        assert names[0] == "Neo4j Performance"
+        assert set(names) == {"Neo4j Performance", "Python Tips", "Perf Log"}
+        assert page["source"] == "local"
+
+    def test_prefix_match_and_filters(self, local_index):
+        assert [r["name"] for r in local_index.search("perf", tag="python")["results"]] == ["Python Tips"]
+        assert {r["name"] for r in local_index.search("perf", note_type="research")["results"]} == {
+            "Neo4j Performance", "Perf Log"
+        }
+
+    def test_cursor_pages_cover_all_results_once(self, local_index):
+        seen, cursor = [], None
+        while True:
+            page = local_index.search("perf", cursor=cursor, limit=1)
+            seen.extend(r["name"] for r in page["results"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert seen == [r["name"] for r in local_index.search("perf", limit=10)["results"]]
+        assert len(seen) == 3
+
+    def test_falls_back_to_local_index_when_graph_is_down(self, local_index):
+        driver = Mock()
+        driver.session.side_effect = ServiceUnavailable("down")
+        index = note_search.LocalNoteIndex(local_index.index_file)
+
+        page = note_search.search_notes(driver, "tomatoes", local_index=index)
+
+        assert page["source"] == "local"
+        assert [r["name"] for r in page["results"]] == ["Unrelated"]
+
+    def test_schema_is_ensured_before_searching(self):
+        driver = MagicMock()
+        session = driver.session.return_value.__enter__.return_value
+        session.run.return_value = []
+
+        with patch.object(note_search, "ensure_schema") as ensure:
+            page = note_search.search_notes(driver, "perf")
+
+        ensure.assert_called_once_with(driver)
+        assert page == {"results": [], "next_cursor": None, "source": "fulltext"}
+
+    def test_missing_fulltext_index_falls_back_to_local_index(self, local_index, tmp_path):
+        driver = MagicMock()
+        session = driver.session.return_value.__enter__.return_value
+        session.run.side_effect = ClientError("There is no such fulltext schema index: note_fulltext")
+
+        with patch.object(note_search, "ensure_schema"):
+            page = note_search.search_notes(
+                driver, "tomatoes", local_index=note_search.LocalNoteIndex(local_index.index_file))
+            with pytest.raises(RuntimeError, match="init-schema"):
+                note_search.search_notes(
+                    driver, "tomatoes", local_index=note_search.LocalNoteIndex(tmp_path / "none.json"))
+
+        assert page["source"] == "local"
+        assert [r["name"] for r in page["results"]] == ["Unrelated"]
@@ -7,17 +7,22 @@ Addresses critical 0% coverage gap in data backup and integrity validation
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 import os
+import gzip
 import tempfile
 import json
 from pathlib import Path
 from datetime import datetime
 
+from neo4j.time import Date, DateTime, Duration
+
 # Add project root to Python path dynamically
 project_root = Path(__file__).resolve().parent.parent.parent
 import sys
 sys.path.insert(0, str(project_root))
 
-from src.safe_transactions import SafeTransactionManager, DataIntegrityValidator, ensure_safe_environment
+from src.safe_transactions import (
+    BackupPolicy, SafeTransactionManager, DataIntegrityValidator, ensure_safe_environment, iter_backup
+)
 
 
 class TestSafeTransactionManager:
@@ -90,6 +95,118 @@ class TestSafeTransactionManager:
         # Test passes if no exception is raised
 
 
+class TestStreamingBackups:
+    """Test suite for gzip JSONL backups and the backup policy"""
+
+    @pytest.fixture
+    def session(self):
+        session = Mock()
+
+        def run(query, **params):
+            if "MATCH (a)-[r]->(b)" in query:
+                records = [{"rel_type": "TAGGED_WITH", "source_labels": ["Note"], "source_name": "A",
+                            "target_labels": ["Tag"], "target_name": "t", "rel_props": {}}]
+            elif "MATCH (n:Note)" in query:
+                records = [{"props": {"name": "A", "created_at": datetime(2025, 8, 15)}}]
+            else:
+                records = []
+            return iter(records)
+
+        session.run.side_effect = run
+        session.begin_transaction.return_value.__enter__ = Mock(return_value=Mock())
+        session.begin_transaction.return_value.__exit__ = Mock(return_value=None)
+        return session
+
+    @pytest.fixture
+    def manager(self, session, tmp_path):
+        driver = Mock()
+        driver.session.return_value.__enter__ = Mock(return_value=session)
+        driver.session.return_value.__exit__ = Mock(return_value=None)
+        return SafeTransactionManager(driver=driver, backup_dir=str(tmp_path),
+                                      policy=BackupPolicy(full_every=3))
+
+    def test_backup_is_streamed_as_gzip_jsonl(self, manager):
+        backup_path = manager._create_backup("add_note")
+
+        records = list(iter_backup(backup_path))
+        assert backup_path.endswith(".jsonl.gz")
+        assert records[0]["kind"] == "full" and records[0]["operation"] == "add_note"
+        assert records[1] == {"t": "node", "label": "Note",
+                              "properties": {"name": "A", "created_at": DateTime(2025, 8, 15, 0, 0, 0)}}
+        assert records[2]["t"] == "rel" and records[2]["type"] == "TAGGED_WITH"
+
+    def test_temporal_values_keep_their_type(self, manager, session):
+        props = {"name": "A", "created_at": DateTime(2025, 8, 15, 1, 2, 3, 123456789),
+                 "due": Date(2025, 9, 1), "every": Duration(days=2, seconds=3)}
+        session.run.side_effect = lambda query, **params: iter(
+            [{"props": props}] if "MATCH (n:Note)" in query else [])
+
+        backup_path = manager._create_backup("add_note")
+
+        with gzip.open(backup_path, 'rt', encoding='utf-8') as f:
+            raw = f.read()
+        assert '{"$datetime": "2025-08-15T01:02:03.123456789"}' in raw
+        assert list(iter_backup(backup_path))[1]["properties"] == props
+
+    def test_failed_backup_is_not_reported_as_available(self, manager, session):
+        assert manager._backup_if_due("op")
+        session.run.side_effect = RuntimeError("connection lost")
+
+        assert manager._backup_if_due("op") == ""
+
+    def test_incremental_backups_between_full_backups(self, manager, session, tmp_path):
+        kinds = [next(iter_backup(manager._create_backup("op")))["kind"] for _ in range(4)]
+
+        assert kinds == ["full", "incremental", "incremental", "full"]
+        incremental_queries = [c for c in session.run.call_args_list if "since" in c.kwargs]
+        assert incremental_queries and all("updated_at" in c.args[0] for c in incremental_queries)
+
+        # The chain continues in a new manager
+        reopened = SafeTransactionManager(driver=manager.driver, backup_dir=str(tmp_path),
+                                          policy=BackupPolicy(full_every=3))
+        assert next(iter_backup(reopened._create_backup("op")))["kind"] == "incremental"
+
+    def test_every_n_policy(self, manager):
+        manager.policy = BackupPolicy(mode="every_n", every_n=3)
+
+        @manager.safe_transaction("op")
+        def write(tx):
+            return True
+
+        for _ in range(7):
+            write()
+
+        backups = [f for f in os.listdir(manager.backup_dir) if f.endswith(".jsonl.gz")]
+        assert len(backups) == 3  # before op 1, op 4 and op 7
+
+    def test_interval_policy(self):
+        policy = BackupPolicy(mode="interval", interval_seconds=60)
+
+        assert policy.is_due(0, None)
+        assert not policy.is_due(5, 30.0)
+        assert policy.is_due(5, 61.0)
+        with pytest.raises(ValueError):
+            BackupPolicy(mode="sometimes")
+
+    def test_policy_from_config(self):
+        config = {"safety": {"backup_policy": {"mode": "every_n", "every_n": 5, "unknown": 1}}}
+
+        policy = BackupPolicy.from_config(config)
+        assert policy.mode == "every_n" and policy.every_n == 5
+
+    def test_manager_uses_configured_policy(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        assert SafeTransactionManager(Mock(), backup_dir="backups").policy == BackupPolicy()
+
+        (tmp_path / "cortex_neo").mkdir()
+        (tmp_path / "cortex_neo" / "safety_config.yaml").write_text(
+            "safety:\n  backup_policy:\n    mode: interval\n    interval_seconds: 120\n",
+            encoding="utf-8")
+        manager = SafeTransactionManager(Mock(), backup_dir="backups")
+
+        assert manager.policy.mode == "interval" and manager.policy.interval_seconds == 120
+
+
 class TestDataIntegrityValidator:
     """Test suite for DataIntegrityValidator"""
 
@@ -205,6 +322,86 @@ class TestDataIntegrityValidator:
         assert isinstance(result, bool)
 
 
+class TestSingleQueryStats:
+    """Test suite for round-trip-efficient stats, orphan caching and monitoring"""
+
+    @pytest.fixture
+    def session(self):
+        session = Mock()
+        counts = {"notes": 10, "workflows": 1, "steps": 4, "tags": 3, "templates": 2,
+                  "note_links": 7, "workflow_links": 4, "tag_links": 5, "template_links": 2}
+
+        def run(query, **params):
+            result = Mock()
+            if "SHOW PROCEDURES" in query:
+                result.single.return_value = {"available": False}
+            elif "orphaned_tags" in query:
+                result.single.return_value = {"orphaned_tags": 1, "orphaned_templates": 0}
+            else:
+                result.single.return_value = dict(counts)
+            return result
+
+        session.run.side_effect = run
+        return session
+
+    @pytest.fixture
+    def validator(self, session, tmp_path):
+        driver = Mock()
+        driver.session.return_value.__enter__ = Mock(return_value=session)
+        driver.session.return_value.__exit__ = Mock(return_value=None)
+        return DataIntegrityValidator(driver=driver, baseline_file=str(tmp_path / "baseline.json"))
+
+    def test_stats_in_one_query(self, validator, session):
+        validator.get_current_stats()
+        session.run.reset_mock()
+
+        stats = validator.get_current_stats()
+
+        assert session.run.call_count == 1
+        query = session.run.call_args[0][0]
+        assert query.count("CALL {") == 9
+        assert stats["total_nodes"] == 20
+        assert stats["total_relationships"] == 18
+
+    def test_apoc_meta_stats_when_available(self, validator, session):
+        validator._apoc_available = True
+        session.run.side_effect = lambda query, **params: Mock(single=Mock(return_value={
+            "labels": {"Note": 42, "Tag": 2}, "relTypesCount": {"LINKS_TO": 9}
+        }))
+
+        stats = validator.get_current_stats()
+
+        assert "apoc.meta.stats" in session.run.call_args[0][0]
+        assert stats["notes"] == 42 and stats["note_links"] == 9 and stats["workflows"] == 0
+
+    def test_orphan_check_is_cached(self, validator, session):
+        assert validator._check_orphaned_data() == ["Found 1 orphaned tags"]
+        assert validator._check_orphaned_data() == ["Found 1 orphaned tags"]
+
+        orphan_queries = [c for c in session.run.call_args_list if "orphaned_tags" in c.args[0]]
+        assert len(orphan_queries) == 1
+
+    def test_missing_baseline_reuses_current_stats(self, validator, session):
+        assert validator.validate_integrity() is False  # orphaned tag
+
+        count_queries = [c for c in session.run.call_args_list if "count(n) AS notes" in c.args[0]]
+        assert len(count_queries) == 1
+        assert os.path.exists(validator.baseline_file)
+
+    def test_monitoring_series_and_trend_alerts(self, validator, session):
+        validator.monitor(interval_seconds=0, samples=3)
+        assert len(validator.load_series()) == 3
+        assert validator.trend_alerts() == []
+
+        session.run.side_effect = lambda query, **params: Mock(single=Mock(return_value={
+            "notes": 2, "orphaned_tags": 0, "orphaned_templates": 0
+        }))
+        validator.record_sample()
+
+        alerts = validator.trend_alerts(window=3)
+        assert any(alert.startswith("notes:") for alert in alerts)
+
+
 class TestSafeTransactionIntegration:
     """Integration tests for safe transaction components"""
 